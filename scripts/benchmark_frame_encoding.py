@@ -0,0 +1,124 @@
+"""Benchmark of the frame encoding profiles of the OpenCVFrameExtractor.
+
+Extracts every frame of a video with each encoding profile, encoding inline, and
+prints the frames extracted per second and the mean size of an encoded frame.
+Without a video, it writes a noisy MJPG video of the given size to extract from.
+
+Usage, from the root of the repository:
+
+    python scripts/benchmark_frame_encoding.py --frames 60
+    python scripts/benchmark_frame_encoding.py --video video.mp4 --frames 60
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from video_processor.adapters.outbound import OpenCVFrameExtractor
+from video_processor.domain.value_objects import FrameSelection, TempFile
+from video_processor.infrastructure.config import (
+    FrameEncodingSettings,
+    FrameExtractorSettings,
+)
+
+PROFILES = {
+    "jpeg default (q95)": {},
+    "jpeg q80 4:2:0": {"QUALITY": 80, "JPEG_CHROMA_SUBSAMPLING": "420"},
+    "jpeg q80 4:2:0 optimize": {
+        "QUALITY": 80,
+        "JPEG_CHROMA_SUBSAMPLING": "420",
+        "JPEG_OPTIMIZE": True,
+    },
+    "jpeg q80 max width 640": {
+        "QUALITY": 80,
+        "JPEG_CHROMA_SUBSAMPLING": "420",
+        "MAX_WIDTH": 640,
+    },
+    "jpeg q80 640 grayscale": {
+        "QUALITY": 80,
+        "JPEG_CHROMA_SUBSAMPLING": "420",
+        "MAX_WIDTH": 640,
+        "GRAYSCALE": True,
+    },
+    "webp q80": {"FORMAT": "webp", "QUALITY": 80},
+    "webp q80 max width 640": {"FORMAT": "webp", "QUALITY": 80, "MAX_WIDTH": 640},
+    "png level 1": {"FORMAT": "png", "PNG_COMPRESSION": 1},
+}
+
+
+def _write_video(path: str, count: int, width: int, height: int) -> None:
+    """Write a video of a moving gradient with Gaussian noise, like a noisy camera."""
+
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter.fourcc(*"MJPG"), 30, (width, height))
+    for index in range(count):
+        image = np.roll(gradient, index * 8, axis=1) + rng.normal(
+            0, 4, (height, width, 3)
+        )
+        writer.write(np.clip(image, 0, 255).astype(np.uint8))
+
+    writer.release()
+
+
+def _decode(path: str, count: int) -> float:
+    """Decode the frames without encoding them, returning the wall seconds."""
+
+    capture = cv2.VideoCapture(path)
+    started_at = time.perf_counter()
+    for _ in range(count):
+        if not capture.read()[0]:
+            raise RuntimeError(f"Failed to decode {count} frames of {path}")
+
+    elapsed = time.perf_counter() - started_at
+    capture.release()
+    return elapsed
+
+
+def _extract(path: str, count: int, profile: dict) -> tuple[float, int]:
+    """Extract the frames with a profile, returning the wall seconds and bytes."""
+
+    extractor = OpenCVFrameExtractor(
+        FrameExtractorSettings(READ_MODE="scan", ENCODER_THREADS=0),
+        FrameEncodingSettings(**profile),
+    )
+    started_at = time.perf_counter()
+    size = sum(
+        len(frame.content)
+        for frame in extractor.extract(
+            TempFile(path=path), FrameSelection(indexes=range(count))
+        )
+    )
+    return time.perf_counter() - started_at, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", help="video to extract instead of a noisy one")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.video
+        if path is None:
+            path = os.path.join(temp_dir, "video.avi")
+            _write_video(path, args.frames, args.width, args.height)
+
+        print(f"decoding only: {args.frames / _decode(path, args.frames):.0f} fps")
+        print(f"{'profile':24} {'fps':>5} {'KiB/frame':>10}")
+        for name, profile in PROFILES.items():
+            elapsed, size = _extract(path, args.frames, profile)
+            print(
+                f"{name:24} {args.frames / elapsed:5.0f} "
+                f"{size / args.frames / 1024:10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
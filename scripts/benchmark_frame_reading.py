@@ -0,0 +1,128 @@
+"""Benchmark of the seek and scan planning of the OpenCVFrameExtractor.
+
+Extracts every Nth frame of each video, seeking to every frame, grabbing through
+every gap, and planning each gap with and without the keyframe index, and prints
+the best wall time of each read mode over the repeats. Frames are encoded inline.
+
+When no video is given, an mp4v video with 12-frame GOPs and an MJPG video of
+keyframes only are generated, the GOP sizes OpenCV writes them with. FFmpeg warns
+that it tags the MJPG one as mp4v. Videos of other GOP sizes can be given, e.g.
+encoded with `ffmpeg -i input.mp4 -c:v libx264 -g 60 gop60.mp4`.
+
+Usage, from the root of the repository:
+
+    python scripts/benchmark_frame_reading.py --frames 600 --steps 1 5 30 120 --repeat 3
+    python scripts/benchmark_frame_reading.py --video gop60.mp4 gop250.mp4
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Literal
+
+import cv2
+import numpy as np
+
+from video_processor.adapters.outbound import (
+    MP4VideoMetadataReader,
+    NamedTempFileManager,
+    OpenCVFrameExtractor,
+    OpenCVVideoMetadataReader,
+)
+from video_processor.domain.value_objects import FrameSelection, TempFile, VideoMetadata
+from video_processor.infrastructure.config import FrameExtractorSettings
+
+ReadMode = Literal["seek", "scan", "auto"]
+# Codecs of the generated videos, written with 12-frame GOPs and keyframes only
+GENERATED_FOURCCS = ("mp4v", "MJPG")
+
+
+def _write_video(path: str, fourcc: str, count: int, width: int, height: int) -> None:
+    """Write a video of noise moving across the frame, so no frame can be skipped."""
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter.fourcc(*fourcc), 30, (width, height))
+    for index in range(count):
+        writer.write(np.roll(image, index * 4, axis=1))
+
+    writer.release()
+
+
+def _describe_gop(metadata: VideoMetadata) -> str:
+    keyframes = metadata.keyframe_indexes
+    if not keyframes or len(keyframes) < 2:
+        return "unknown"
+
+    return f"{statistics.median(np.diff(np.asarray(keyframes))):.0f}"
+
+
+def _extract(
+    path: str,
+    selection: FrameSelection,
+    mode: ReadMode,
+    metadata: VideoMetadata | None,
+    repeat: int,
+) -> float:
+    """Extract the selected frames in a read mode, returning the best wall seconds
+    over the repeats."""
+
+    extractor = OpenCVFrameExtractor(
+        FrameExtractorSettings(READ_MODE=mode, ENCODER_THREADS=0)
+    )
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for _ in extractor.extract(TempFile(path=path), selection, metadata=metadata):
+            pass
+
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", nargs="+", help="videos instead of generated ones")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--steps", type=int, nargs="+", default=[1, 5, 30, 120])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    temp_file_manager = NamedTempFileManager()
+    metadata_reader = MP4VideoMetadataReader(
+        temp_file_manager, fallback_reader=OpenCVVideoMetadataReader(temp_file_manager)
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = args.video or []
+        if not paths:
+            for fourcc in GENERATED_FOURCCS:
+                paths.append(os.path.join(temp_dir, f"{fourcc}.mp4"))
+                _write_video(paths[-1], fourcc, args.frames, args.width, args.height)
+
+        print(
+            f"{'video':16} {'gop':>7} {'every':>5} {'seek s':>7} {'scan s':>7} "
+            f"{'auto s':>7} {'no index s':>10}"
+        )
+        for path in paths:
+            metadata = metadata_reader.read(TempFile(path=path))
+            for step in args.steps:
+                selection = FrameSelection(indexes=range(0, metadata.frame_count, step))
+                modes: tuple[ReadMode, ...] = ("seek", "scan", "auto")
+                seek, scan, auto = (
+                    _extract(path, selection, mode, metadata, args.repeat)
+                    for mode in modes
+                )
+                print(
+                    f"{os.path.basename(path):16} {_describe_gop(metadata):>7} "
+                    f"{step:5d} {seek:7.2f} {scan:7.2f} {auto:7.2f} "
+                    f"{_extract(path, selection, 'auto', None, args.repeat):10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
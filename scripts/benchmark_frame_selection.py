@@ -0,0 +1,90 @@
+"""Benchmark of building and validating frame selections of very long videos.
+
+Times FrameSelection(indexes=...) and its repr for each encoding of the indexes,
+and the UniformFrameSelector selecting every frame, for each number of frames. The
+cost of the compact encodings should stay flat as the number of frames grows,
+while a list is validated index by index.
+
+Usage, from the root of the repository:
+
+    python scripts/benchmark_frame_selection.py --frames 1000000 10000000
+"""
+
+import argparse
+import time
+from array import array
+from typing import Callable
+
+from video_processor.adapters.outbound import UniformFrameSelector
+from video_processor.domain.value_objects import (
+    FrameIndexRuns,
+    FrameSelection,
+    VideoMetadata,
+)
+from video_processor.infrastructure.config import UniformFrameSelectorSettings
+
+# Consecutive frames per run of the FrameIndexRuns encoding
+RUN_LENGTH = 1000
+
+
+def _time(function: Callable[[], object]) -> float:
+    """Call the function, returning the wall milliseconds it took."""
+
+    started_at = time.perf_counter()
+    function()
+    return 1000 * (time.perf_counter() - started_at)
+
+
+def _build_encodings(
+    count: int,
+) -> dict[str, range | array | FrameIndexRuns | list[int]]:
+    """Build the indexes of every frame of a video in each encoding."""
+
+    return {
+        "list": list(range(count)),
+        "range": range(count),
+        "array('I')": array("I", range(count)),
+        "FrameIndexRuns": FrameIndexRuns(
+            (start, min(RUN_LENGTH, count - start))
+            for start in range(0, count, RUN_LENGTH)
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--frames", type=int, nargs="+", default=[1_000_000, 10_000_000]
+    )
+    args = parser.parse_args()
+
+    selector = UniformFrameSelector(
+        UniformFrameSelectorSettings(
+            MODE="percentage", PERCENTAGE_THRESHOLD=1.0, MAX_FRAMES=max(args.frames)
+        )
+    )
+    print(f"{'frames':>10} {'encoding':16} {'validate ms':>12} {'repr ms':>8}")
+    for count in args.frames:
+        for name, indexes in _build_encodings(count).items():
+            selection = FrameSelection(indexes=indexes)
+            print(
+                f"{count:10d} {name:16} "
+                f"{_time(lambda: FrameSelection(indexes=indexes)):12.2f} "
+                f"{_time(lambda: repr(selection)):8.2f}"
+            )
+
+        metadata = VideoMetadata(
+            path="video.mp4",
+            duration_seconds=count / 30,
+            frame_count=count,
+            fps=30.0,
+            size_in_bytes=0,
+        )
+        print(
+            f"{count:10d} {'uniform select':16} "
+            f"{_time(lambda: selector.select(metadata)):12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
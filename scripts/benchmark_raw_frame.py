@@ -0,0 +1,79 @@
+"""Microbenchmark of building the RawFrame of an encoded frame.
+
+Times, per frame, copying the buffer of the encoder into bytes against wrapping it
+in a read-only memoryview, and constructing the RawFrame with validation against
+model_construct. It then builds all the frames end to end both ways.
+
+Usage, from the root of the repository:
+
+    python scripts/benchmark_raw_frame.py --frames 5000 --size 300000
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+from video_processor.domain.value_objects import RawFrame
+
+
+def _to_view(buffer: np.ndarray) -> memoryview:
+    """Wrap an encoded buffer like the OpenCVFrameExtractor does."""
+    return buffer.data.toreadonly().cast("B")
+
+
+def _time_per_frame(function: Callable[[int], object], count: int) -> float:
+    """Call the function for each frame, returning the microseconds per call."""
+
+    started_at = time.perf_counter()
+    for index in range(count):
+        function(index)
+
+    return 1e6 * (time.perf_counter() - started_at) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=300_000)
+    args = parser.parse_args()
+
+    # Stands for the buffers imencode returns, one per frame
+    rng = np.random.default_rng(0)
+    buffers = [
+        rng.integers(0, 256, args.size, dtype=np.uint8) for _ in range(args.frames)
+    ]
+    views = [_to_view(buffer) for buffer in buffers]
+
+    timings = {
+        "tobytes() copy": lambda index: buffers[index].tobytes(),
+        "read-only memoryview": lambda index: _to_view(buffers[index]),
+        "RawFrame() validated": lambda index: RawFrame(
+            index=index, filename=f"frame_{index}.jpg", content=views[index]
+        ),
+        "RawFrame.model_construct()": lambda index: RawFrame.model_construct(
+            index=index, filename=f"frame_{index}.jpg", content=views[index]
+        ),
+    }
+    print(f"per frame, at {args.frames} frames of {args.size} bytes:")
+    for name, function in timings.items():
+        print(f"  {name:28} {_time_per_frame(function, args.frames):8.1f} us")
+
+    # Frames are kept, as they are until packaged, so copies are not reused
+    print("end to end:")
+    for name, to_content in (
+        ("copied bytes", lambda buffer: buffer.tobytes()),
+        ("read-only memoryviews", _to_view),
+    ):
+        started_at = time.perf_counter()
+        frames = [
+            RawFrame(index=index, filename=f"frame_{index}.jpg", content=to_content(b))
+            for index, b in enumerate(buffers)
+        ]
+        elapsed = time.perf_counter() - started_at
+        print(f"  {name:28} {elapsed:8.2f} s for {len(frames)} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark of the compression policy of the ZIPFramePackager.
+
+Packages noisy frames of each image format with each compression method, and
+prints the CPU and wall time per frame and the size saved against storing them.
+With several thread counts, it also compares compressing inline and on threads.
+
+Usage, from the root of the repository:
+
+    python scripts/benchmark_zip_compression.py --frames 20 --threads 0 2
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from video_processor.adapters.outbound import ZIPFramePackager
+from video_processor.domain.ports import OutputUpload
+from video_processor.domain.value_objects import RawFrame
+from video_processor.infrastructure.config import FramePackagerSettings
+
+FORMATS = ("jpg", "png", "bmp")
+COMPRESSIONS = ("stored", "deflate:1", "deflate:9", "bzip2:9", "lzma")
+
+
+class _CountingUpload(OutputUpload):
+    """An upload discarding the archive, counting its bytes."""
+
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, data: bytes | memoryview) -> int:
+        self.size += len(data)
+        return len(data)
+
+    def complete(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        pass
+
+
+def _build_frames(extension: str, count: int, width: int, height: int) -> list:
+    """Encode frames of a gradient with Gaussian noise, like a noisy video."""
+
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    frames = []
+    for index in range(count):
+        image = gradient + rng.normal(0, 20, (height, width, 3)) + index
+        ret, buffer = cv2.imencode(
+            f".{extension}", np.clip(image, 0, 255).astype(np.uint8)
+        )
+        if not ret:
+            raise RuntimeError(f"Failed to encode a {extension} frame")
+
+        frames.append(
+            RawFrame(
+                index=index,
+                filename=f"frame_{index}.{extension}",
+                content=buffer.tobytes(),
+            )
+        )
+
+    return frames
+
+
+def _package(frames: list, compression: str, threads: int) -> tuple[float, float, int]:
+    """Package the frames, returning the CPU and wall seconds and archive size."""
+
+    packager = ZIPFramePackager(
+        temp_file_manager=None,  # type: ignore[arg-type]
+        settings=FramePackagerSettings(
+            COMPRESSION_POLICY={"*": compression},
+            COMPRESSION_THREADS=threads,
+            WRITE_MANIFEST=False,
+        ),
+    )
+    upload = _CountingUpload()
+    cpu_started_at = time.process_time()
+    wall_started_at = time.perf_counter()
+    packager.package_to_upload(iter(frames), upload)
+    return (
+        time.process_time() - cpu_started_at,
+        time.perf_counter() - wall_started_at,
+        upload.size,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--threads", type=int, nargs="+", default=[0])
+    args = parser.parse_args()
+
+    print(
+        f"{'format':6} {'compression':11} {'threads':>7} {'cpu ms':>8} "
+        f"{'wall ms':>8} {'saved':>7}"
+    )
+    for extension in FORMATS:
+        frames = _build_frames(extension, args.frames, args.width, args.height)
+        _, _, stored_size = _package(frames, "stored", 0)
+        for compression in COMPRESSIONS:
+            for threads in args.threads:
+                cpu, wall, size = _package(frames, compression, threads)
+                print(
+                    f"{extension:6} {compression:11} {threads:7d} "
+                    f"{1000 * cpu / len(frames):8.1f} "
+                    f"{1000 * wall / len(frames):8.1f} "
+                    f"{100 * (1 - size / stored_size):6.1f}%"
+                )
+
+
+if __name__ == "__main__":
+    main()
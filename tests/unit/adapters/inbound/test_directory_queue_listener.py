@@ -0,0 +1,74 @@
+"""Tests for the DirectoryQueueListener class"""
+
+import json
+import uuid
+
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.inbound import DirectoryQueueListener
+
+
+def _build_settings(mocker: MockerFixture, directory):
+    settings = mocker.Mock()
+    settings.DIRECTORY = str(directory)
+    settings.POLL_INTERVAL_SECONDS = 0
+    return settings
+
+
+def test_should_process_queued_messages_in_name_order(mocker: MockerFixture, tmp_path):
+    """Given a raw event and an SNS wrapped event queued in the directory
+    When the listener consumes the queue
+    Then it should process both in name order, delete them and ignore hidden files
+    """
+
+    # Given
+    first_event = {"video_id": str(uuid.uuid4()), "upload_path": "videos/a.mp4"}
+    second_event = {"video_id": str(uuid.uuid4()), "upload_path": "videos/b.mp4"}
+    (tmp_path / "002.json").write_text(
+        json.dumps({"Message": json.dumps(second_event)})
+    )
+    (tmp_path / "001.json").write_text(json.dumps(first_event))
+    (tmp_path / ".003.json").write_text("{")
+    shutdown_event = mocker.Mock(shutdown=False)
+    use_case = mocker.Mock()
+    use_case.execute.side_effect = lambda command: setattr(
+        shutdown_event, "shutdown", use_case.execute.call_count == 2
+    )
+    listener = DirectoryQueueListener(use_case, _build_settings(mocker, tmp_path))
+
+    # When
+    listener.listen(shutdown_event=shutdown_event)
+
+    # Then
+    upload_paths = [call.args[0].upload_path for call in use_case.execute.mock_calls]
+    assert upload_paths == ["videos/a.mp4", "videos/b.mp4"]
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_file()) == [".003.json"]
+    assert list((tmp_path / "processing").iterdir()) == []
+
+
+def test_should_move_failed_messages_to_failed_directory(
+    mocker: MockerFixture, tmp_path
+):
+    """Given a queued message whose processing fails
+    When the listener consumes the queue
+    Then it should move the message into the failed directory
+    """
+
+    # Given
+    (tmp_path / "001.json").write_text("not json")
+    shutdown_event = mocker.Mock(shutdown=False)
+    use_case = mocker.Mock()
+    sleep = mocker.patch(
+        "video_processor.adapters.inbound.directory_queue_listener.time.sleep",
+        side_effect=lambda seconds: setattr(shutdown_event, "shutdown", True),
+    )
+    listener = DirectoryQueueListener(use_case, _build_settings(mocker, tmp_path))
+
+    # When
+    listener.listen(shutdown_event=shutdown_event)
+
+    # Then
+    use_case.execute.assert_not_called()
+    assert (tmp_path / "failed" / "001.json").read_text() == "not json"
+    assert not (tmp_path / "001.json").exists()
+    sleep.assert_called_once_with(0)
@@ -10,6 +10,7 @@ from pytest_mock import MockerFixture
 from video_processor.adapters.inbound.video_uploaded_listener import (
     VideoUploadedListener,
 )
+from video_processor.domain.exceptions import VideoValidationError
 
 
 def test_should_process_and_delete_message_on_success(mocker: MockerFixture):
@@ -25,8 +26,8 @@ def test_should_process_and_delete_message_on_success(mocker: MockerFixture):
     settings.VISIBILITY_TIMEOUT_SECONDS = 5
     settings.MAX_NUMBER_OF_MESSAGES_PER_BATCH = 1
     use_case = mocker.Mock()
-    boto_session = mocker.Mock()
-    listener = VideoUploadedListener(boto_session, use_case, settings)
+    client_factory = mocker.Mock()
+    listener = VideoUploadedListener(client_factory, use_case, settings)
     video_id = uuid.uuid4()
     upload_path = "s3://bucket/key.mp4"
     inner_message = json.dumps({"video_id": str(video_id), "upload_path": upload_path})
@@ -63,8 +64,8 @@ def test_should_raise_when_receive_messages_throws_boto_error(mocker: MockerFixt
     settings.VISIBILITY_TIMEOUT_SECONDS = 5
     settings.MAX_NUMBER_OF_MESSAGES_PER_BATCH = 1
     use_case = mocker.Mock()
-    boto_session = mocker.Mock()
-    listener = VideoUploadedListener(boto_session, use_case, settings)
+    client_factory = mocker.Mock()
+    listener = VideoUploadedListener(client_factory, use_case, settings)
     queue = mocker.Mock()
     error = BotoCoreClientError({"Error": {}}, "ReceiveMessage")
     queue.receive_messages.side_effect = error
@@ -88,8 +89,8 @@ def test_should_delete_message_when_processing_raises_exception(mocker: MockerFi
     settings.MAX_NUMBER_OF_MESSAGES_PER_BATCH = 1
     use_case = mocker.Mock()
     use_case.execute.side_effect = Exception("processing failed")
-    boto_session = mocker.Mock()
-    listener = VideoUploadedListener(boto_session, use_case, settings)
+    client_factory = mocker.Mock()
+    listener = VideoUploadedListener(client_factory, use_case, settings)
     video_id = uuid.uuid4()
     upload_path = "s3://bucket/key.mp4"
     inner_message = json.dumps({"video_id": str(video_id), "upload_path": upload_path})
@@ -108,3 +109,149 @@ def test_should_delete_message_when_processing_raises_exception(mocker: MockerFi
     assert messages == [message]
     assert use_case.execute.call_count == 1
     message.delete.assert_called_once()
+
+
+def _build_message(mocker: MockerFixture, message_id: str, upload_path: str):
+    inner_message = json.dumps(
+        {"video_id": str(uuid.uuid4()), "upload_path": upload_path}
+    )
+    message = mocker.Mock()
+    message.body = json.dumps({"Message": inner_message})
+    message.message_id = message_id
+    return message
+
+
+def _build_prefetch_settings(mocker: MockerFixture):
+    settings = mocker.Mock()
+    settings.QUEUE_NAME = "test-queue"
+    settings.WAIT_TIME_SECONDS = 1
+    settings.VISIBILITY_TIMEOUT_SECONDS = 5
+    settings.MAX_NUMBER_OF_MESSAGES_PER_BATCH = 1
+    settings.PREFETCH_DEPTH = 1
+    return settings
+
+
+def test_should_prefetch_next_message_and_return_it_on_shutdown(
+    mocker: MockerFixture,
+):
+    """Given a listener in prefetch mode and two messages in the queue
+    When the listener processes the first message and is then asked to shut down
+    Then it should have prefetched both videos, processed the first one and
+        returned the unstarted one to the queue
+    """
+
+    # Given
+    settings = _build_prefetch_settings(mocker)
+    shutdown_event = mocker.Mock(shutdown=False)
+    use_case = mocker.Mock()
+    use_case.execute.side_effect = lambda command: setattr(
+        shutdown_event, "shutdown", True
+    )
+    prefetcher = mocker.Mock()
+    client_factory = mocker.Mock()
+    queue = client_factory.resource.return_value.get_queue_by_name.return_value
+    first = _build_message(mocker, "msg-1", "s3://bucket/first.mp4")
+    second = _build_message(mocker, "msg-2", "s3://bucket/second.mp4")
+    queue.receive_messages.return_value = [first, second]
+    listener = VideoUploadedListener(client_factory, use_case, settings, prefetcher)
+
+    # When
+    listener.listen(shutdown_event=shutdown_event)
+
+    # Then
+    queue.receive_messages.assert_called_once_with(
+        MessageAttributeNames=["All"],
+        MaxNumberOfMessages=2,
+        WaitTimeSeconds=1,
+        VisibilityTimeout=10,
+    )
+    assert prefetcher.prefetch.call_args_list == [
+        mocker.call("s3://bucket/first.mp4"),
+        mocker.call("s3://bucket/second.mp4"),
+    ]
+    assert use_case.execute.call_count == 1
+    assert use_case.execute.call_args[0][0].upload_path == "s3://bucket/first.mp4"
+    first.change_visibility.assert_called_once_with(VisibilityTimeout=5)
+    first.delete.assert_called_once()
+    second.change_visibility.assert_called_once_with(VisibilityTimeout=0)
+    second.delete.assert_not_called()
+    assert prefetcher.discard.call_args_list == [
+        mocker.call("s3://bucket/first.mp4"),
+        mocker.call("s3://bucket/second.mp4"),
+    ]
+
+
+def test_should_skip_prefetched_message_no_longer_in_flight(mocker: MockerFixture):
+    """Given a listener in prefetch mode and a message whose visibility expired while
+        it was waiting
+    When the listener reaches that message
+    Then it should skip it, discard its prefetched video and process the next one
+    """
+
+    # Given
+    settings = _build_prefetch_settings(mocker)
+    shutdown_event = mocker.Mock(shutdown=False)
+    use_case = mocker.Mock()
+    use_case.execute.side_effect = lambda command: setattr(
+        shutdown_event, "shutdown", True
+    )
+    prefetcher = mocker.Mock()
+    client_factory = mocker.Mock()
+    queue = client_factory.resource.return_value.get_queue_by_name.return_value
+    expired = _build_message(mocker, "msg-1", "s3://bucket/expired.mp4")
+    expired.change_visibility.side_effect = BotoCoreClientError(
+        {"Error": {"Code": "MessageNotInflight"}}, "ChangeMessageVisibility"
+    )
+    valid = _build_message(mocker, "msg-2", "s3://bucket/valid.mp4")
+    queue.receive_messages.side_effect = [[expired, valid], []]
+    listener = VideoUploadedListener(client_factory, use_case, settings, prefetcher)
+
+    # When
+    listener.listen(shutdown_event=shutdown_event)
+
+    # Then
+    assert queue.receive_messages.call_args_list[1].kwargs["WaitTimeSeconds"] == 0
+    assert prefetcher.discard.call_args_list == [
+        mocker.call("s3://bucket/expired.mp4"),
+        mocker.call("s3://bucket/valid.mp4"),
+    ]
+    expired.delete.assert_not_called()
+    assert use_case.execute.call_count == 1
+    assert use_case.execute.call_args[0][0].upload_path == "s3://bucket/valid.mp4"
+    valid.delete.assert_called_once()
+
+
+def test_should_discard_prefetched_video_when_job_fails_before_download(
+    mocker: MockerFixture,
+):
+    """Given a listener in prefetch mode and a message whose job fails before its
+        video is downloaded
+    When the listener processes that message
+    Then it should delete the message and discard its prefetched video
+    """
+
+    # Given
+    settings = _build_prefetch_settings(mocker)
+    settings.PREFETCH_DEPTH = 1
+    shutdown_event = mocker.Mock(shutdown=False)
+
+    def execute(command):
+        shutdown_event.shutdown = True
+        raise VideoValidationError("Video is too large")
+
+    use_case = mocker.Mock()
+    use_case.execute.side_effect = execute
+    prefetcher = mocker.Mock()
+    client_factory = mocker.Mock()
+    queue = client_factory.resource.return_value.get_queue_by_name.return_value
+    rejected = _build_message(mocker, "msg-1", "s3://bucket/rejected.mp4")
+    queue.receive_messages.side_effect = [[rejected], []]
+    listener = VideoUploadedListener(client_factory, use_case, settings, prefetcher)
+
+    # When
+    listener.listen(shutdown_event=shutdown_event)
+
+    # Then
+    prefetcher.prefetch.assert_called_once_with("s3://bucket/rejected.mp4")
+    rejected.delete.assert_called_once()
+    prefetcher.discard.assert_called_once_with("s3://bucket/rejected.mp4")
@@ -0,0 +1,44 @@
+"""Fixtures shared by the tests of the outbound adapters"""
+
+from typing import Callable, Iterable
+
+import cv2
+import numpy as np
+import pytest
+
+# Size of the grey frames written by default, as (width, height)
+FRAME_SIZE = (32, 24)
+
+
+@pytest.fixture
+def write_video() -> Callable[..., None]:
+    """Get a function writing a 10 fps video to a path.
+
+    The video is made of the given frames, or of `frame_count` grey frames getting
+    brighter by 5 at each frame, so that every frame differs from the others.
+    """
+
+    def write(
+        path: str,
+        frame_count: int = 0,
+        frames: Iterable[np.ndarray] | None = None,
+        fourcc: str = "MJPG",
+    ) -> None:
+        if frames is None:
+            width, height = FRAME_SIZE
+            frames = (
+                np.full((height, width, 3), index * 5, dtype=np.uint8)
+                for index in range(frame_count)
+            )
+
+        frames = list(frames)
+        height, width = frames[0].shape[:2]
+        writer = cv2.VideoWriter(
+            path, cv2.VideoWriter.fourcc(*fourcc), 10, (width, height)
+        )
+        for frame in frames:
+            writer.write(frame)
+
+        writer.release()
+
+    return write
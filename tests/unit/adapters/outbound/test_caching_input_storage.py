@@ -0,0 +1,271 @@
+"""Tests for the CachingInputStorage class"""
+
+import os
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import CachingInputStorage, NamedTempFileManager
+from video_processor.domain.exceptions import StorageError
+from video_processor.domain.value_objects import StoredFileInfo, TempFile
+
+
+def _build_inner_storage(mocker: MockerFixture, objects: dict):
+    """Build a fake InputStorage serving the given {path: (etag, content)} objects."""
+
+    def get_file_info(source_path):
+        etag, content = objects[source_path]
+        return StoredFileInfo(path=source_path, size_in_bytes=len(content), etag=etag)
+
+    def download_to_file(source_path, temp_file, file_info=None):
+        with open(temp_file.path, "wb") as f:
+            f.write(objects[source_path][1])
+
+    inner = mocker.Mock()
+    inner.get_file_info.side_effect = get_file_info
+    inner.download_to_file.side_effect = download_to_file
+    return inner
+
+
+def _build_settings(mocker: MockerFixture, directory, max_size_in_bytes: int):
+    settings = mocker.Mock()
+    settings.DIRECTORY = str(directory)
+    settings.MAX_SIZE_IN_BYTES = max_size_in_bytes
+    return settings
+
+
+def _read(temp_file: TempFile) -> bytes:
+    with open(temp_file.path, "rb") as f:
+        return f.read()
+
+
+def test_should_serve_second_download_from_cache(mocker: MockerFixture, tmp_path):
+    """Given a video that was already downloaded through the cache
+    When downloading it again using CachingInputStorage
+    Then it should hard link the cached video into the temp file without
+        downloading it again
+    """
+
+    # Given
+    inner = _build_inner_storage(mocker, {"s3://b/v.mp4": ('"e1"', b"video")})
+    settings = _build_settings(mocker, tmp_path / "cache", 1024)
+    storage = CachingInputStorage(input_storage=inner, settings=settings)
+    first = TempFile(path=str(tmp_path / "first.mp4"))
+    second = TempFile(path=str(tmp_path / "second.mp4"))
+
+    # When
+    storage.download_to_file("s3://b/v.mp4", first)
+    storage.download_to_file("s3://b/v.mp4", second)
+
+    # Then
+    assert _read(first) == b"video"
+    assert _read(second) == b"video"
+    assert inner.download_to_file.call_count == 1
+    assert os.stat(first.path).st_ino == os.stat(second.path).st_ino
+    stats = storage.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 0)
+    assert (stats.entries, stats.size_in_bytes) == (1, 5)
+
+    # Deleting a temp file must not remove the cache entry
+    os.remove(first.path)
+    os.remove(second.path)
+    third = TempFile(path=str(tmp_path / "third.mp4"))
+    storage.download_to_file("s3://b/v.mp4", third)
+    assert _read(third) == b"video"
+    assert inner.download_to_file.call_count == 1
+
+
+def test_should_miss_when_etag_changes(mocker: MockerFixture, tmp_path):
+    """Given a cached video that was replaced in storage
+    When downloading it using CachingInputStorage
+    Then it should download the new version instead of serving the stale one
+    """
+
+    # Given
+    objects = {"s3://b/v.mp4": ('"e1"', b"old")}
+    inner = _build_inner_storage(mocker, objects)
+    settings = _build_settings(mocker, tmp_path / "cache", 1024)
+    storage = CachingInputStorage(input_storage=inner, settings=settings)
+    storage.download_to_file("s3://b/v.mp4", TempFile(path=str(tmp_path / "a")))
+    objects["s3://b/v.mp4"] = ('"e2"', b"new")
+    temp_file = TempFile(path=str(tmp_path / "b"))
+
+    # When
+    storage.download_to_file("s3://b/v.mp4", temp_file)
+
+    # Then
+    assert _read(temp_file) == b"new"
+    assert storage.stats.misses == 2
+
+
+def test_should_evict_least_recently_used_videos(mocker: MockerFixture, tmp_path):
+    """Given a cache whose budget fits two videos
+    When a third video is downloaded using CachingInputStorage
+    Then it should evict the least recently used video
+    """
+
+    # Given
+    objects = {
+        "a.mp4": ('"a"', b"a" * 10),
+        "b.mp4": ('"b"', b"b" * 10),
+        "c.mp4": ('"c"', b"c" * 10),
+    }
+    inner = _build_inner_storage(mocker, objects)
+    settings = _build_settings(mocker, tmp_path / "cache", 25)
+    storage = CachingInputStorage(input_storage=inner, settings=settings)
+
+    # When
+    storage.download_to_file("a.mp4", TempFile(path=str(tmp_path / "1")))
+    storage.download_to_file("b.mp4", TempFile(path=str(tmp_path / "2")))
+    storage.download_to_file("a.mp4", TempFile(path=str(tmp_path / "3")))
+    storage.download_to_file("c.mp4", TempFile(path=str(tmp_path / "4")))
+    storage.download_to_file("a.mp4", TempFile(path=str(tmp_path / "5")))
+    storage.download_to_file("b.mp4", TempFile(path=str(tmp_path / "6")))
+
+    # Then
+    downloaded = [call.args[0] for call in inner.download_to_file.call_args_list]
+    assert downloaded == ["a.mp4", "b.mp4", "c.mp4", "b.mp4"]
+    stats = storage.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 4, 2)
+    assert stats.size_in_bytes == 20
+    assert len(os.listdir(tmp_path / "cache")) == 2
+    assert _read(TempFile(path=str(tmp_path / "1"))) == b"a" * 10
+
+
+def test_should_bypass_cache_for_videos_larger_than_budget(
+    mocker: MockerFixture, tmp_path
+):
+    """Given a video larger than the cache budget
+    When downloading it using CachingInputStorage
+    Then it should download it straight into the temp file without caching it
+    """
+
+    # Given
+    inner = _build_inner_storage(mocker, {"v.mp4": ('"e"', b"x" * 100)})
+    settings = _build_settings(mocker, tmp_path / "cache", 10)
+    storage = CachingInputStorage(input_storage=inner, settings=settings)
+    temp_file = TempFile(path=str(tmp_path / "v.mp4"))
+
+    # When
+    storage.download_to_file("v.mp4", temp_file)
+
+    # Then
+    inner.download_to_file.assert_called_once_with(
+        "v.mp4", temp_file, StoredFileInfo(path="v.mp4", size_in_bytes=100, etag='"e"')
+    )
+    assert os.listdir(tmp_path / "cache") == []
+    assert storage.stats.entries == 0
+
+
+def test_should_reload_entries_and_drop_partial_files_on_start(
+    mocker: MockerFixture, tmp_path
+):
+    """Given a cache directory left by a previous process
+    When creating a CachingInputStorage on it
+    Then it should index the complete entries and remove the partial downloads
+    """
+
+    # Given
+    inner = _build_inner_storage(mocker, {"v.mp4": ('"e"', b"video")})
+    settings = _build_settings(mocker, tmp_path / "cache", 1024)
+    CachingInputStorage(input_storage=inner, settings=settings).download_to_file(
+        "v.mp4", TempFile(path=str(tmp_path / "first"))
+    )
+    (tmp_path / "cache" / "abc.123.part").write_bytes(b"partial")
+
+    # When
+    storage = CachingInputStorage(input_storage=inner, settings=settings)
+    storage.download_to_file("v.mp4", TempFile(path=str(tmp_path / "second")))
+
+    # Then
+    assert inner.download_to_file.call_count == 1
+    assert storage.stats.hits == 1
+    assert not (tmp_path / "cache" / "abc.123.part").exists()
+
+
+def test_should_use_given_file_info_instead_of_reading_it_again(
+    mocker: MockerFixture, tmp_path
+):
+    """Given the file info of a video already read by the caller
+    When downloading it twice with that file info using CachingInputStorage
+    Then it should key the cache entry by its ETag without reading the file info
+        from the wrapped storage, and pass it down to the download
+    """
+
+    # Given
+    inner = _build_inner_storage(mocker, {"v.mp4": ('"e"', b"video")})
+    settings = _build_settings(mocker, tmp_path / "cache", 1024)
+    storage = CachingInputStorage(input_storage=inner, settings=settings)
+    file_info = StoredFileInfo(path="v.mp4", size_in_bytes=5, etag='"e"')
+
+    # When
+    storage.download_to_file("v.mp4", TempFile(path=str(tmp_path / "1")), file_info)
+    storage.download_to_file("v.mp4", TempFile(path=str(tmp_path / "2")), file_info)
+
+    # Then
+    inner.get_file_info.assert_not_called()
+    inner.download_to_file.assert_called_once()
+    assert inner.download_to_file.call_args.args[2] == file_info
+    assert storage.stats.hits == 1
+
+
+def test_should_not_cache_failed_downloads(mocker: MockerFixture, tmp_path):
+    """Given a download that fails in the wrapped storage
+    When downloading the video using CachingInputStorage
+    Then it should raise the StorageError and leave no entry in the cache
+    """
+
+    # Given
+    inner = _build_inner_storage(mocker, {"v.mp4": ('"e"', b"video")})
+    inner.download_to_file.side_effect = StorageError("Failed to download file")
+    settings = _build_settings(mocker, tmp_path / "cache", 1024)
+    storage = CachingInputStorage(input_storage=inner, settings=settings)
+
+    # When / Then
+    with pytest.raises(StorageError):
+        storage.download_to_file("v.mp4", TempFile(path=str(tmp_path / "v.mp4")))
+
+    assert os.listdir(tmp_path / "cache") == []
+    assert storage.stats.entries == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "memfd_create"), reason="requires memfd_create")
+def test_should_copy_cached_video_into_memfd_temp_file(mocker: MockerFixture, tmp_path):
+    """Given a video cached by CachingInputStorage and memfd temporary files
+    When downloading it into memory-backed temp files on a miss and on a hit
+    Then it should copy the cached video into each memfd instead of linking it
+    """
+
+    # Given
+    inner = _build_inner_storage(mocker, {"s3://b/v.mp4": ('"e1"', b"video")})
+    storage = CachingInputStorage(
+        input_storage=inner, settings=_build_settings(mocker, tmp_path / "cache", 1024)
+    )
+    manager_settings = mocker.Mock()
+    manager_settings.STORAGE = "memfd"
+    manager_settings.DIRECTORY = str(tmp_path)
+    manager_settings.MEMORY_MAX_FILE_SIZE_IN_BYTES = 1024
+    manager_settings.MEMORY_HEADROOM_IN_BYTES = 0
+    manager_settings.FADVISE = False
+    mocker.patch(
+        "video_processor.adapters.outbound.named_temp_file_manager"
+        "._get_available_memory",
+        return_value=10_000,
+    )
+    manager = NamedTempFileManager(manager_settings)
+    first = manager.create(b"", ".mp4", size_hint=5)
+    second = manager.create(b"", ".mp4", size_hint=5)
+
+    # When
+    storage.download_to_file("s3://b/v.mp4", first)
+    storage.download_to_file("s3://b/v.mp4", second)
+
+    # Then
+    assert second.path.startswith("/proc/self/fd/")
+    assert _read(first) == _read(second) == b"video"
+    assert storage.stats.hits == 1
+    assert inner.download_to_file.call_count == 1
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+    manager.delete(first)
+    manager.delete(second)
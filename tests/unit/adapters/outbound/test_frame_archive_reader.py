@@ -0,0 +1,188 @@
+"""Tests for the FrameArchiveReader class"""
+
+import io
+import zipfile
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import FrameArchiveReader, ZIPFramePackager
+from video_processor.domain.exceptions import FrameArchiveReadingError
+from video_processor.domain.value_objects import RawFrame, StoredFileInfo
+
+
+def _package(mocker: MockerFixture, frames: list[RawFrame]) -> bytes:
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"jpg": "stored", "*": "deflate"}
+    settings.COMPRESSION_THREADS = 0
+    settings.WRITE_MANIFEST = True
+    written = io.BytesIO()
+    upload = mocker.Mock()
+    upload.write.side_effect = written.write
+    ZIPFramePackager(mocker.Mock(), settings).package_to_upload(iter(frames), upload)
+    return written.getvalue()
+
+
+def _input_storage(mocker: MockerFixture, archives: dict[str, bytes]):
+    input_storage = mocker.Mock()
+    input_storage.get_file_info.side_effect = lambda path: StoredFileInfo(
+        path=path, size_in_bytes=len(archives[path])
+    )
+    input_storage.read_range.side_effect = lambda path, start, length: archives[path][
+        start : start + length
+    ]
+    return input_storage
+
+
+def _settings(mocker: MockerFixture, index_read_size: int = 64 * 1024):
+    settings = mocker.Mock()
+    settings.INDEX_READ_SIZE_IN_BYTES = index_read_size
+    settings.INDEX_CACHE_SIZE = 2
+    return settings
+
+
+def test_should_read_frame_with_one_ranged_read_once_index_is_loaded(
+    mocker: MockerFixture,
+):
+    """Given an archive written by the ZIPFramePackager with its manifest
+    When reading frames using the FrameArchiveReader
+    Then it should load the index from the end of the archive with one ranged read,
+        and read each frame with one ranged read of its entry
+    """
+
+    # Given
+    frames = [
+        RawFrame(
+            index=index * 5,
+            filename=f"frame_{index * 5}.{'jpg' if index % 2 else 'bmp'}",
+            content=bytes([index]) * 1000,
+            timestamp=index / 2,
+        )
+        for index in range(20)
+    ]
+    archive = _package(mocker, frames)
+    input_storage = _input_storage(mocker, {"video.zip": archive})
+    reader = FrameArchiveReader(input_storage, _settings(mocker))
+
+    # When
+    index = reader.get_index("video.zip")
+    index_reads = input_storage.read_range.call_count
+    contents = [reader.read_frame("video.zip", frame.index) for frame in frames]
+
+    # Then
+    assert [(entry.index, entry.timestamp) for entry in index] == [
+        (frame.index, frame.timestamp) for frame in frames
+    ]
+    assert contents == [frame.content for frame in frames]
+    input_storage.get_file_info.assert_called_once_with("video.zip")
+    assert index_reads == 1
+    assert input_storage.read_range.call_count == 1 + len(frames)
+    assert all(
+        call.args[2] < 1100 for call in input_storage.read_range.call_args_list[1:]
+    )
+
+
+def test_should_index_archive_without_manifest_from_central_directory(
+    mocker: MockerFixture,
+):
+    """Given a ZIP archive without manifest, whose central directory does not fit in
+        the index read
+    When reading frames using the FrameArchiveReader
+    Then it should index the frames from the central directory by the index in their
+        name, and read and decompress them
+    """
+
+    # Given
+    written = io.BytesIO()
+    with zipfile.ZipFile(written, mode="w") as zip_file:
+        zip_file.writestr("README.txt", b"frames")
+        for index in range(10):
+            zip_file.writestr(
+                f"frame_{index * 3}.png",
+                bytes([index]) * 500,
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+
+    input_storage = _input_storage(mocker, {"video.zip": written.getvalue()})
+    reader = FrameArchiveReader(input_storage, _settings(mocker, index_read_size=64))
+
+    # When
+    index = reader.get_index("video.zip")
+    content = reader.read_frame("video.zip", 27)
+
+    # Then
+    assert [entry.index for entry in index] == list(range(0, 30, 3))
+    assert content == bytes([9]) * 500
+
+
+@pytest.mark.parametrize("cache_size, expected_loads", [(1, 3), (2, 2)])
+def test_should_keep_indexes_of_most_recently_used_archives(
+    mocker: MockerFixture, cache_size: int, expected_loads: int
+):
+    """Given two archives and an index cache of one or two archives
+    When reading frames of the first, the second and the first archive again
+    Then it should load the index of the first archive again only once it was evicted
+    """
+
+    # Given
+    frame = RawFrame(index=0, filename="frame_0.jpg", content=b"frame0_content")
+    archive = _package(mocker, [frame])
+    input_storage = _input_storage(mocker, {"a.zip": archive, "b.zip": archive})
+    settings = _settings(mocker)
+    settings.INDEX_CACHE_SIZE = cache_size
+    reader = FrameArchiveReader(input_storage, settings)
+
+    # When
+    for archive_path in ["a.zip", "b.zip", "a.zip"]:
+        reader.read_frame(archive_path, 0)
+
+    # Then
+    assert input_storage.get_file_info.call_count == expected_loads
+
+
+def test_should_raise_error_for_frame_not_in_archive(mocker: MockerFixture):
+    """Given an archive
+    When reading a frame that is not in it using the FrameArchiveReader
+    Then it should raise a FrameArchiveReadingError
+    """
+
+    # Given
+    frame = RawFrame(index=0, filename="frame_0.jpg", content=b"frame0_content")
+    input_storage = _input_storage(mocker, {"video.zip": _package(mocker, [frame])})
+    reader = FrameArchiveReader(input_storage, _settings(mocker))
+
+    # When / Then
+    with pytest.raises(FrameArchiveReadingError, match="Frame 7 is not in archive"):
+        reader.read_frame("video.zip", 7)
+
+
+def test_should_drop_index_of_replaced_archive(mocker: MockerFixture):
+    """Given an archive whose index is loaded, then replaced by another archive
+    When reading a frame using the FrameArchiveReader
+    Then it should raise a FrameArchiveReadingError and load the index of the new
+        archive on the next read
+    """
+
+    # Given
+    archives = {
+        "video.zip": _package(
+            mocker,
+            [RawFrame(index=0, filename="frame_0.jpg", content=b"first_content")],
+        )
+    }
+    input_storage = _input_storage(mocker, archives)
+    reader = FrameArchiveReader(input_storage, _settings(mocker))
+    reader.get_index("video.zip")
+    archives["video.zip"] = _package(
+        mocker, [RawFrame(index=0, filename="frame_0.jpg", content=b"other_content")]
+    )
+
+    # When
+    with pytest.raises(FrameArchiveReadingError, match="Bad CRC-32"):
+        reader.read_frame("video.zip", 0)
+
+    content = reader.read_frame("video.zip", 0)
+
+    # Then
+    assert content == b"other_content"
+    assert input_storage.get_file_info.call_count == 2
@@ -1,13 +1,32 @@
-"""Tests for the UniformFrameSelector class"""
+"""Tests for the frame selector classes"""
+
+from array import array
 
 import pytest
 from pytest_mock import MockerFixture
 
-from video_processor.adapters.outbound.frame_selectors import UniformFrameSelector
+from video_processor.adapters.outbound.frame_selectors import (
+    KeyframeAlignedFrameSelector,
+    UniformFrameSelector,
+)
 from video_processor.domain.exceptions import FrameSelectionError
 from video_processor.domain.value_objects import FrameSelection, VideoMetadata
 
 
+def _uniform_settings(mocker: MockerFixture, **overrides):
+    settings = mocker.Mock()
+    settings.MODE = "percentage"
+    settings.PERCENTAGE_THRESHOLD = 0.01
+    settings.INTERVAL_SECONDS = 1.0
+    settings.TARGET_PROCESSING_SECONDS = 120.0
+    settings.MIN_FRAMES = 1
+    settings.MAX_FRAMES = 1000
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    return settings
+
+
 def test_should_select_20_frames_for_200_frames_with_10_percent_threshold(
     mocker: MockerFixture,
 ):
@@ -18,8 +37,7 @@ def test_should_select_20_frames_for_200_frames_with_10_percent_threshold(
     """
 
     # Given
-    settings = mocker.Mock()
-    settings.PERCENTAGE_THRESHOLD = 0.1
+    settings = _uniform_settings(mocker, PERCENTAGE_THRESHOLD=0.1)
     selector = UniformFrameSelector(settings)
     metadata = VideoMetadata(
         path="test_video.mp4",
@@ -45,8 +63,7 @@ def test_should_select_first_frame_if_total_frames_is_1(mocker: MockerFixture):
     """
 
     # Given
-    settings = mocker.Mock()
-    settings.PERCENTAGE_THRESHOLD = 0.1
+    settings = _uniform_settings(mocker, PERCENTAGE_THRESHOLD=0.1)
     selector = UniformFrameSelector(settings)
     metadata = VideoMetadata(
         path="test_video.mp4",
@@ -71,8 +88,7 @@ def test_should_raise_error_for_invalid_percentage_threshold(mocker: MockerFixtu
     """
 
     # Given
-    settings = mocker.Mock()
-    settings.PERCENTAGE_THRESHOLD = -0.5  # Invalid threshold
+    settings = _uniform_settings(mocker, PERCENTAGE_THRESHOLD=-0.5)
     selector = UniformFrameSelector(settings)
     metadata = VideoMetadata(
         path="test_video.mp4",
@@ -96,8 +112,7 @@ def test_should_raise_error_for_video_with_no_frames(mocker: MockerFixture):
     """
 
     # Given
-    settings = mocker.Mock()
-    settings.PERCENTAGE_THRESHOLD = 0.1
+    settings = _uniform_settings(mocker, PERCENTAGE_THRESHOLD=0.1)
     selector = UniformFrameSelector(settings)
     metadata = VideoMetadata(
         path="test_video.mp4",
@@ -112,3 +127,199 @@ def test_should_raise_error_for_video_with_no_frames(mocker: MockerFixture):
         selector.select(metadata)
 
     assert "Video has no frames to select" == str(exc_info.value)
+
+
+@pytest.mark.parametrize(
+    "frame_count, overrides, expected_indexes",
+    [
+        # 60 s at 10 fps, one frame every 10 s
+        (
+            600,
+            {"MODE": "interval", "INTERVAL_SECONDS": 10.0},
+            [0, 100, 200, 300, 400, 500],
+        ),
+        # 60 s at 10 fps, capped to 3 frames spread across the video
+        (
+            600,
+            {"MODE": "interval", "INTERVAL_SECONDS": 10.0, "MAX_FRAMES": 3},
+            [0, 299, 599],
+        ),
+        # 1 s at 10 fps, raised to 3 frames
+        (
+            10,
+            {"MODE": "interval", "INTERVAL_SECONDS": 10.0, "MIN_FRAMES": 3},
+            [0, 4, 9],
+        ),
+        # 2 hours at 10 fps with the percentage mode, capped to 4 frames
+        (
+            72000,
+            {"PERCENTAGE_THRESHOLD": 0.01, "MAX_FRAMES": 4},
+            [0, 23999, 47999, 71999],
+        ),
+    ],
+)
+def test_should_select_frames_by_interval_within_frame_bounds(
+    mocker: MockerFixture,
+    frame_count: int,
+    overrides: dict,
+    expected_indexes: list[int],
+):
+    """Given a video and a selection mode with a minimum and maximum number of frames
+    When selecting frames using the UniformFrameSelector
+    Then it should select the frames of the mode, spread uniformly across the video
+        when their number is out of bounds
+    """
+
+    # Given
+    selector = UniformFrameSelector(_uniform_settings(mocker, **overrides))
+    metadata = VideoMetadata(
+        path="test_video.mp4",
+        duration_seconds=frame_count / 10,
+        frame_count=frame_count,
+        fps=10.0,
+        size_in_bytes=1024,
+    )
+
+    # When
+    selection = selector.select(metadata)
+
+    # Then
+    assert selection.indexes == expected_indexes
+
+
+def test_should_select_frames_by_interval_using_frame_timestamps(
+    mocker: MockerFixture,
+):
+    """Given a video with variable frame timestamps
+    When selecting frames every second using the UniformFrameSelector
+    Then it should select the first frame shown at or after each second
+    """
+
+    # Given
+    selector = UniformFrameSelector(
+        _uniform_settings(mocker, MODE="interval", INTERVAL_SECONDS=1.0)
+    )
+    metadata = VideoMetadata(
+        path="test_video.mp4",
+        duration_seconds=2.5,
+        frame_count=6,
+        fps=2.4,
+        size_in_bytes=1024,
+        frame_timestamps=array("d", [0.0, 0.2, 1.1, 1.5, 2.0, 2.5]),
+    )
+
+    # When
+    selection = selector.select(metadata)
+
+    # Then
+    assert selection.indexes == [0, 2, 4]
+
+
+def test_should_size_selection_from_frame_cost_in_budget_mode(mocker: MockerFixture):
+    """Given a target processing time of 10 seconds and a frame cost of 0.5 seconds
+    When selecting frames in budget mode using the UniformFrameSelector
+    Then it should select 20 frames uniformly distributed across the video
+    """
+
+    # Given
+    frame_cost_tracker = mocker.Mock()
+    frame_cost_tracker.seconds_per_frame = 0.5
+    settings = _uniform_settings(mocker, MODE="budget", TARGET_PROCESSING_SECONDS=10.0)
+    selector = UniformFrameSelector(settings, frame_cost_tracker=frame_cost_tracker)
+    metadata = VideoMetadata(
+        path="test_video.mp4",
+        duration_seconds=100.0,
+        frame_count=1000,
+        fps=10.0,
+        size_in_bytes=1024,
+    )
+
+    # When
+    selection = selector.select(metadata)
+
+    # Then
+    assert len(selection.indexes) == 20
+    assert selection.indexes[0] == 0
+    assert selection.indexes[-1] == 999
+
+
+def test_should_raise_error_in_budget_mode_without_frame_cost_tracker(
+    mocker: MockerFixture,
+):
+    """Given the budget mode and no frame cost tracker
+    When selecting frames using the UniformFrameSelector
+    Then it should raise a FrameSelectionError
+    """
+
+    # Given
+    selector = UniformFrameSelector(_uniform_settings(mocker, MODE="budget"))
+    metadata = VideoMetadata(
+        path="test_video.mp4",
+        duration_seconds=100.0,
+        frame_count=1000,
+        fps=10.0,
+        size_in_bytes=1024,
+    )
+
+    # When / Then
+    with pytest.raises(FrameSelectionError):
+        selector.select(metadata)
+
+
+def test_should_align_selected_frames_on_nearest_keyframes(mocker: MockerFixture):
+    """Given a selection of frames and a video with a keyframe index
+    When selecting frames using the KeyframeAlignedFrameSelector
+    Then it should move each frame onto the nearest keyframe within the allowed
+        drift, and keep the frames without a close enough or free keyframe
+    """
+
+    # Given
+    frame_selector = mocker.Mock()
+    frame_selector.select.return_value = FrameSelection(indexes=[0, 27, 31, 60, 95])
+    settings = mocker.Mock()
+    settings.MAX_DRIFT_IN_FRAMES = 5
+    selector = KeyframeAlignedFrameSelector(frame_selector, settings)
+    metadata = VideoMetadata(
+        path="test_video.mp4",
+        duration_seconds=4.0,
+        frame_count=100,
+        fps=25.0,
+        size_in_bytes=1024,
+        keyframe_indexes=array("q", [0, 30, 90]),
+    )
+
+    # When
+    selection = selector.select(metadata)
+
+    # Then
+    # 27 -> 30, 31 keeps its index as keyframe 30 is taken, 60 has no keyframe
+    # within 5 frames, 95 -> 90
+    assert selection.indexes == [0, 30, 31, 60, 90]
+    frame_selector.select.assert_called_once_with(metadata, video_session=None)
+
+
+def test_should_keep_selection_without_keyframe_index(mocker: MockerFixture):
+    """Given a video without a keyframe index
+    When selecting frames using the KeyframeAlignedFrameSelector
+    Then it should return the selection of the wrapped selector
+    """
+
+    # Given
+    frame_selector = mocker.Mock()
+    frame_selector.select.return_value = FrameSelection(indexes=[0, 27])
+    settings = mocker.Mock()
+    settings.MAX_DRIFT_IN_FRAMES = 5
+    selector = KeyframeAlignedFrameSelector(frame_selector, settings)
+    metadata = VideoMetadata(
+        path="test_video.mp4",
+        duration_seconds=4.0,
+        frame_count=100,
+        fps=25.0,
+        size_in_bytes=1024,
+    )
+
+    # When
+    selection = selector.select(metadata)
+
+    # Then
+    assert selection == FrameSelection(indexes=[0, 27])
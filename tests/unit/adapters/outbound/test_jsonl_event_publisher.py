@@ -0,0 +1,64 @@
+"""Tests for the JsonlEventPublisher class"""
+
+import json
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import JsonlEventPublisher
+from video_processor.domain.events import VideoProcessingStartedEvent
+from video_processor.domain.exceptions import EventPublishingError
+
+
+def _build_event() -> VideoProcessingStartedEvent:
+    return VideoProcessingStartedEvent(
+        id=UUID("12345678-1234-5678-1234-567812345678"),
+        version=1,
+        video_id=UUID("12345678-1234-5678-1234-567812345678"),
+        processing_started_at=datetime(2024, 1, 1, 12, 0, 0),
+    )
+
+
+def test_should_append_events_to_jsonl_file(mocker: MockerFixture, tmp_path):
+    """Given a valid DomainEvent
+    When publishing it twice using JsonlEventPublisher
+    Then it should append one JSON line per event with its type and message
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.PATH = str(tmp_path / "local" / "events.jsonl")
+    publisher = JsonlEventPublisher(settings=settings)
+    event = _build_event()
+
+    # When
+    publisher.publish(event)
+    publisher.publish(event)
+
+    # Then
+    lines = (tmp_path / "local" / "events.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == {
+        "event_type": "video.processing_started",
+        "message": json.loads(event.model_dump_json()),
+    }
+
+
+def test_should_raise_error_when_file_cannot_be_written(
+    mocker: MockerFixture, tmp_path
+):
+    """Given an events path that cannot be written
+    When publishing an event using JsonlEventPublisher
+    Then it should raise an EventPublishingError
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.PATH = str(tmp_path)
+    publisher = JsonlEventPublisher(settings=settings)
+
+    # When / Then
+    with pytest.raises(EventPublishingError):
+        publisher.publish(_build_event())
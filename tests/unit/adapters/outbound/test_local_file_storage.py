@@ -0,0 +1,181 @@
+"""Tests for the LocalInputStorage and LocalOutputStorage classes"""
+
+import errno
+import io
+import os
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import LocalInputStorage, LocalOutputStorage
+from video_processor.domain.exceptions import StorageError
+from video_processor.domain.value_objects import FileContent, TempFile
+
+
+def _build_settings(mocker: MockerFixture, directory, link_files: bool = True):
+    settings = mocker.Mock()
+    settings.DIRECTORY = str(directory)
+    settings.LINK_FILES = link_files
+    return settings
+
+
+def test_should_hard_link_video_into_temp_file(mocker: MockerFixture, tmp_path):
+    """Given a video in the local input directory
+    When downloading it using LocalInputStorage
+    Then it should hand it out as a hard link into the temp file
+    """
+
+    # Given
+    (tmp_path / "input").mkdir()
+    (tmp_path / "input" / "key.mp4").write_bytes(b"video")
+    temp_file = TempFile(path=str(tmp_path / "temp.mp4"))
+    (tmp_path / "temp.mp4").write_bytes(b"")
+    storage = LocalInputStorage(settings=_build_settings(mocker, tmp_path / "input"))
+
+    # When
+    storage.download_to_file("s3://bucket/key.mp4", temp_file)
+
+    # Then
+    assert (tmp_path / "temp.mp4").read_bytes() == b"video"
+    assert os.stat(temp_file.path).st_ino == os.stat(tmp_path / "input/key.mp4").st_ino
+
+
+def test_should_copy_video_when_hard_link_fails(mocker: MockerFixture, tmp_path):
+    """Given a video on another filesystem than the temp file
+    When downloading it using LocalInputStorage
+    Then it should copy it into the temp file
+    """
+
+    # Given
+    (tmp_path / "input").mkdir()
+    content = os.urandom(3 * 1024 * 1024)
+    (tmp_path / "input" / "key.mp4").write_bytes(content)
+    temp_file = TempFile(path=str(tmp_path / "temp.mp4"))
+    mocker.patch("os.link", side_effect=OSError(errno.EXDEV, "Cross-device link"))
+    storage = LocalInputStorage(settings=_build_settings(mocker, tmp_path / "input"))
+
+    # When
+    storage.download_to_file("key.mp4", temp_file)
+
+    # Then
+    assert (tmp_path / "temp.mp4").read_bytes() == content
+    assert os.stat(temp_file.path).st_ino != os.stat(tmp_path / "input/key.mp4").st_ino
+
+
+def test_should_read_local_file_info_and_range(mocker: MockerFixture, tmp_path):
+    """Given a video in the local input directory
+    When reading its info and a byte range using LocalInputStorage
+    Then it should return its size, content type, an ETag and the requested bytes
+    """
+
+    # Given
+    (tmp_path / "key.mp4").write_bytes(b"0123456789")
+    storage = LocalInputStorage(settings=_build_settings(mocker, tmp_path))
+
+    # When
+    file_info = storage.get_file_info("key.mp4")
+    content = storage.read_range("key.mp4", start=2, length=4)
+
+    # Then
+    assert file_info.size_in_bytes == 10
+    assert file_info.content_type == "video/mp4"
+    assert file_info.etag
+    assert content == b"2345"
+
+
+def test_should_raise_storage_error_for_missing_or_outside_files(
+    mocker: MockerFixture, tmp_path
+):
+    """Given paths that are missing or outside of the input directory
+    When downloading them using LocalInputStorage
+    Then it should raise a StorageError
+    """
+
+    # Given
+    storage = LocalInputStorage(settings=_build_settings(mocker, tmp_path))
+    temp_file = TempFile(path=str(tmp_path / "temp.mp4"))
+
+    # When / Then
+    with pytest.raises(StorageError):
+        storage.download_to_file("missing.mp4", temp_file)
+
+    with pytest.raises(StorageError, match="outside of the storage directory"):
+        storage.download_to_file("../escape.mp4", temp_file)
+
+
+def test_should_write_uploaded_file_into_output_directory(
+    mocker: MockerFixture, tmp_path
+):
+    """Given a file content
+    When uploading it using LocalOutputStorage
+    Then it should write it under the output directory without leaving partial files
+    """
+
+    # Given
+    storage = LocalOutputStorage(settings=_build_settings(mocker, tmp_path / "out"))
+    file_content = FileContent(path="frames.zip", content=b"zip")
+
+    # When
+    storage.upload_file(file_content, "s3://bucket/videos/frames.zip")
+
+    # Then
+    assert (tmp_path / "out" / "videos" / "frames.zip").read_bytes() == b"zip"
+    assert os.listdir(tmp_path / "out" / "videos") == ["frames.zip"]
+
+
+@pytest.mark.parametrize("completed", [True, False])
+def test_should_stream_upload_into_output_directory(
+    mocker: MockerFixture, tmp_path, completed: bool
+):
+    """Given an upload opened on LocalOutputStorage
+    When writing into it and completing or aborting it
+    Then it should leave the complete file under the output directory, or nothing,
+        and no partial file
+    """
+
+    # Given
+    storage = LocalOutputStorage(settings=_build_settings(mocker, tmp_path / "out"))
+    upload = storage.open_upload("s3://bucket/videos/frames.zip")
+
+    # When
+    upload.write(b"zip-")
+    upload.write(memoryview(b"content"))
+    if completed:
+        upload.complete()
+    else:
+        upload.abort()
+
+    # Then
+    if completed:
+        assert os.listdir(tmp_path / "out" / "videos") == ["frames.zip"]
+        assert (tmp_path / "out" / "videos" / "frames.zip").read_bytes() == (
+            b"zip-content"
+        )
+    else:
+        assert os.listdir(tmp_path / "out" / "videos") == []
+
+
+@pytest.mark.parametrize("source", ["local_path", "fileobj"])
+def test_should_write_uploaded_file_left_on_disk_into_output_directory(
+    mocker: MockerFixture, tmp_path, source: str
+):
+    """Given a file content left in a local file or in a file object
+    When uploading it using LocalOutputStorage
+    Then it should copy it under the output directory
+    """
+
+    # Given
+    (tmp_path / "frames.zip").write_bytes(b"zip")
+    storage = LocalOutputStorage(settings=_build_settings(mocker, tmp_path / "out"))
+    file_content = (
+        FileContent(path="frames.zip", local_path=str(tmp_path / "frames.zip"))
+        if source == "local_path"
+        else FileContent(path="frames.zip", fileobj=io.BytesIO(b"zip"))
+    )
+
+    # When
+    storage.upload_file(file_content, "videos/frames.zip")
+
+    # Then
+    assert (tmp_path / "out" / "videos" / "frames.zip").read_bytes() == b"zip"
+    assert (tmp_path / "frames.zip").exists()
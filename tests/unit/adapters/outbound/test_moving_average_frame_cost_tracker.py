@@ -0,0 +1,28 @@
+"""Tests for the MovingAverageFrameCostTracker class"""
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import MovingAverageFrameCostTracker
+
+
+def test_should_move_estimate_towards_measurements(mocker: MockerFixture):
+    """Given a frame cost tracker starting at 0.1 seconds per frame
+    When recording measurements, including one without frames
+    Then it should move the estimate towards each measurement by the smoothing
+        factor and ignore the measurement without frames
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.INITIAL_SECONDS_PER_FRAME = 0.1
+    settings.SMOOTHING = 0.5
+    tracker = MovingAverageFrameCostTracker(settings)
+
+    # When
+    tracker.record(frame_count=10, elapsed_seconds=3.0)
+    tracker.record(frame_count=0, elapsed_seconds=5.0)
+
+    # Then
+    # 0.1 + 0.5 * (0.3 - 0.1)
+    assert tracker.seconds_per_frame == pytest.approx(0.2)
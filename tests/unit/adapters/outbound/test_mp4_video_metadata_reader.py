@@ -0,0 +1,175 @@
+"""Tests for the MP4VideoMetadataReader class"""
+
+import struct
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import MP4VideoMetadataReader
+from video_processor.domain.exceptions import VideoMetadataReadingError
+from video_processor.domain.value_objects import TempFile
+
+
+def _box(box_type: bytes, *payloads: bytes) -> bytes:
+    payload = b"".join(payloads)
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _table(box_type: bytes, entries: list[tuple[int, ...]], version: int = 0) -> bytes:
+    code = "i" if version == 1 else "I"
+    rows = b"".join(struct.pack(">" + code * len(entry), *entry) for entry in entries)
+    return _box(
+        box_type, bytes([version, 0, 0, 0]), struct.pack(">I", len(entries)), rows
+    )
+
+
+def _build_mp4(
+    timescale: int, duration: int, stbl: list[bytes], moov_boxes: tuple = ()
+) -> bytes:
+    mdhd = _box(b"mdhd", bytes(4), struct.pack(">IIII", 0, 0, timescale, duration))
+    hdlr = _box(b"hdlr", bytes(8), b"vide", bytes(12))
+    audio_trak = _box(
+        b"trak", _box(b"mdia", _box(b"hdlr", bytes(8), b"soun", bytes(12)))
+    )
+    video_trak = _box(
+        b"trak", _box(b"mdia", mdhd, hdlr, _box(b"minf", _box(b"stbl", *stbl)))
+    )
+
+    return (
+        _box(b"ftyp", b"isom", bytes(4))
+        + _box(b"mdat", bytes(64))
+        + _box(b"moov", audio_trak, video_trak, *moov_boxes)
+    )
+
+
+def test_should_read_exact_frames_of_reordered_video(mocker: MockerFixture, tmp_path):
+    """Given an MP4 whose frames are stored in decoding order with B-frames
+    When reading its metadata using MP4VideoMetadataReader
+    Then it should return the exact frame count, the presentation timestamps and the
+        keyframes in presentation order
+    """
+
+    # Given
+    # Decoding order I0 P3 B1 B2 I4 P7 B5 B6, 1 frame = 10 ticks at 100 ticks/s
+    stbl = [
+        _table(b"stts", [(8, 10)]),
+        _table(
+            b"ctts",
+            [(1, 10), (1, 30), (2, 0), (1, 10), (1, 30), (2, 0)],
+            version=1,
+        ),
+        _table(b"stss", [(1,), (5,)]),
+        _box(b"stsz", bytes(4), struct.pack(">II", 0, 8), bytes(32)),
+    ]
+
+    path = tmp_path / "video.mp4"
+    path.write_bytes(_build_mp4(timescale=100, duration=80, stbl=stbl))
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.get_size.return_value = 1024
+    reader = MP4VideoMetadataReader(temp_file_manager=temp_file_manager)
+
+    # When
+    metadata = reader.read(TempFile(path=str(path)))
+
+    # Then
+    assert metadata.frame_count == 8
+    assert metadata.duration_seconds == 0.8
+    assert metadata.fps == 10.0
+    assert metadata.size_in_bytes == 1024
+    assert list(metadata.frame_timestamps) == pytest.approx(
+        [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
+    )
+    assert list(metadata.keyframe_indexes) == [0, 4]
+
+
+def test_should_read_video_written_by_opencv(
+    mocker: MockerFixture, tmp_path, write_video
+):
+    """Given an MP4 file written by OpenCV
+    When reading its metadata using MP4VideoMetadataReader
+    Then it should match the frames that were written
+    """
+
+    # Given
+    path = str(tmp_path / "video.mp4")
+    write_video(path, frame_count=25, fourcc="mp4v")
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.get_size.return_value = 1024
+    reader = MP4VideoMetadataReader(temp_file_manager=temp_file_manager)
+
+    # When
+    metadata = reader.read(TempFile(path=path))
+
+    # Then
+    assert metadata.frame_count == 25
+    assert metadata.fps == pytest.approx(10.0)
+    assert len(metadata.frame_timestamps) == 25
+    assert metadata.keyframe_indexes[0] == 0
+
+
+def test_should_use_fallback_reader_for_other_containers(
+    mocker: MockerFixture, tmp_path
+):
+    """Given a file that is not an MP4
+    When reading its metadata using MP4VideoMetadataReader
+    Then it should delegate to the fallback reader, or raise a
+        VideoMetadataReadingError without one
+    """
+
+    # Given
+    path = tmp_path / "video.avi"
+    path.write_bytes(b"RIFF\x00\x00\x00\x00AVI LIST")
+    temp_file = TempFile(path=str(path))
+    fallback_reader = mocker.Mock()
+    reader = MP4VideoMetadataReader(
+        temp_file_manager=mocker.Mock(), fallback_reader=fallback_reader
+    )
+
+    # When
+    metadata = reader.read(temp_file, video_session=None)
+
+    # Then
+    assert metadata is fallback_reader.read.return_value
+    fallback_reader.read.assert_called_once_with(temp_file, video_session=None)
+    with pytest.raises(VideoMetadataReadingError):
+        MP4VideoMetadataReader(temp_file_manager=mocker.Mock()).read(temp_file)
+
+
+@pytest.mark.parametrize(
+    "stbl, moov_boxes",
+    [
+        ([_box(b"stts"), _box(b"stsz")], (_box(b"mvex"),)),
+        ([_table(b"stts", []), _table(b"stsz", [(0, 0)])], (_box(b"mvex"),)),
+        ([_table(b"stts", []), _table(b"stsz", [(0, 0)])], ()),
+        ([_table(b"stts", [(8, 10)])], (_box(b"mvex", _box(b"trex", bytes(24))),)),
+    ],
+)
+def test_should_use_fallback_reader_for_fragmented_or_empty_mp4(
+    mocker: MockerFixture, tmp_path, stbl: list[bytes], moov_boxes: tuple
+):
+    """Given a fragmented MP4, whose samples are described in its moof boxes, or an
+        MP4 with empty sample tables
+    When reading its metadata using MP4VideoMetadataReader
+    Then it should delegate to the fallback reader
+    """
+
+    # Given
+    path = tmp_path / "video.mp4"
+    path.write_bytes(
+        _build_mp4(timescale=100, duration=0, stbl=stbl, moov_boxes=moov_boxes)
+        + _box(b"moof", bytes(16))
+    )
+    temp_file = TempFile(path=str(path))
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.get_size.return_value = 1024
+    fallback_reader = mocker.Mock()
+    reader = MP4VideoMetadataReader(
+        temp_file_manager=temp_file_manager, fallback_reader=fallback_reader
+    )
+
+    # When
+    metadata = reader.read(temp_file)
+
+    # Then
+    assert metadata is fallback_reader.read.return_value
+    fallback_reader.read.assert_called_once_with(temp_file, video_session=None)
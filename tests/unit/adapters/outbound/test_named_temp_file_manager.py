@@ -131,3 +131,107 @@ def test_should_raise_error_on_get_size_failure(mocker):
 
     # Cleanup
     manager.delete(temp_file)
+
+
+def _build_settings(mocker, storage, tmp_path):
+    settings = mocker.Mock()
+    settings.STORAGE = storage
+    settings.DIRECTORY = str(tmp_path / "disk")
+    settings.TMPFS_DIRECTORY = str(tmp_path / "tmpfs")
+    settings.MEMORY_MAX_FILE_SIZE_IN_BYTES = 1024
+    settings.MEMORY_HEADROOM_IN_BYTES = 100
+    settings.FADVISE = True
+    (tmp_path / "disk").mkdir()
+    (tmp_path / "tmpfs").mkdir()
+    return settings
+
+
+@pytest.mark.skipif(not hasattr(os, "memfd_create"), reason="requires memfd_create")
+def test_should_create_small_file_as_memfd(mocker, tmp_path):
+    """Given the memfd storage and enough available memory
+    When creating a temporary file with a small size hint using the
+        NamedTempFileManager
+    Then it should create a memory file that can be reopened by path, and close it
+        on delete
+    """
+
+    # Given
+    manager = NamedTempFileManager(_build_settings(mocker, "memfd", tmp_path))
+    mocker.patch(
+        "video_processor.adapters.outbound.named_temp_file_manager"
+        "._get_available_memory",
+        return_value=10_000,
+    )
+
+    # When
+    temp_file = manager.create(b"", ".mp4", size_hint=500)
+    with open(temp_file.path, "wb") as f:
+        f.write(b"video")
+
+    # Then
+    assert temp_file.path.startswith("/proc/self/fd/")
+    assert manager.get_size(temp_file) == 5
+    with open(temp_file.path, "rb") as f:
+        assert f.read() == b"video"
+
+    fd = int(temp_file.path.rsplit("/", 1)[1])
+    manager.delete(temp_file)
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+
+def test_should_create_small_file_in_tmpfs_directory(mocker, tmp_path):
+    """Given the tmpfs storage and enough available memory
+    When creating a temporary file with a small size hint using the
+        NamedTempFileManager
+    Then it should create the file in the tmpfs directory
+    """
+
+    # Given
+    manager = NamedTempFileManager(_build_settings(mocker, "tmpfs", tmp_path))
+    mocker.patch(
+        "video_processor.adapters.outbound.named_temp_file_manager"
+        "._get_available_memory",
+        return_value=10_000,
+    )
+
+    # When
+    temp_file = manager.create(b"", ".mp4", size_hint=500)
+
+    # Then
+    assert os.path.dirname(temp_file.path) == str(tmp_path / "tmpfs")
+    manager.delete(temp_file)
+    assert not os.path.exists(temp_file.path)
+
+
+@pytest.mark.parametrize(
+    "size_hint, available_memory",
+    [
+        (None, 10_000),  # unknown size
+        (2048, 10_000),  # larger than the memory threshold
+        (500, 900),  # does not fit with the other files and the headroom
+    ],
+)
+def test_should_fall_back_to_disk(mocker, tmp_path, size_hint, available_memory):
+    """Given the tmpfs storage
+    When creating a temporary file that should not be placed in memory using the
+        NamedTempFileManager
+    Then it should create the file on disk
+    """
+
+    # Given
+    manager = NamedTempFileManager(_build_settings(mocker, "tmpfs", tmp_path))
+    mocker.patch(
+        "video_processor.adapters.outbound.named_temp_file_manager"
+        "._get_available_memory",
+        return_value=available_memory,
+    )
+    in_memory = manager.create(b"", ".mp4", size_hint=400)
+
+    # When
+    temp_file = manager.create(b"", ".mp4", size_hint=size_hint)
+
+    # Then
+    assert os.path.dirname(temp_file.path) == str(tmp_path / "disk")
+    manager.delete(temp_file)
+    manager.delete(in_memory)
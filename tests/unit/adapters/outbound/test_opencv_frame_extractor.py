@@ -1,34 +1,47 @@
 """Tests for the OpenCVFrameExtractor class"""
 
+from array import array
+
 import cv2
+import numpy as np
 import pytest
 from pytest_mock import MockerFixture
 
-from video_processor.adapters.outbound import OpenCVFrameExtractor
+from video_processor.adapters.outbound import (
+    OpenCVFrameExtractor,
+    opencv_frame_extractor,
+)
 from video_processor.domain.exceptions import FrameExtractionError
-from video_processor.domain.value_objects import FrameSelection, RawFrame, TempFile
+from video_processor.domain.value_objects import (
+    FrameSelection,
+    RawFrame,
+    TempFile,
+    VideoMetadata,
+)
 
 
 def test_should_extract_frames(mocker: MockerFixture):
     """Given a TempFile containing a video and a FrameSelection with specific indexes
-    When extracting frames using OpenCVFrameExtractor
+    When extracting frames using OpenCVFrameExtractor in seek mode
     Then it should return an iterator of RawFrame objects corresponding to the
         requested indexes
     """
 
     # Given
     temp_file = TempFile(path="temp_video.mp4", content=b"")
-    extractor = OpenCVFrameExtractor()
+    settings = mocker.Mock()
+    settings.READ_MODE = "seek"
+    settings.ENCODER_THREADS = 0
+    settings.MAX_PENDING_FRAMES = 1
+    extractor = OpenCVFrameExtractor(settings)
     mock_capture = mocker.Mock()
     mock_capture.isOpened.return_value = True
     frame_obj_0 = object()
     frame_obj_1 = object()
     mock_capture.read.side_effect = [(True, frame_obj_0), (True, frame_obj_1)]
     mock_videocap = mocker.patch("cv2.VideoCapture", return_value=mock_capture)
-    mock_buffer1 = mocker.Mock()
-    mock_buffer1.tobytes.return_value = b"jpg-bytes-0"
-    mock_buffer2 = mocker.Mock()
-    mock_buffer2.tobytes.return_value = b"jpg-bytes-5"
+    mock_buffer1 = np.frombuffer(b"jpg-bytes-0", dtype=np.uint8)
+    mock_buffer2 = np.frombuffer(b"jpg-bytes-5", dtype=np.uint8)
     mock_imencode = mocker.patch(
         "cv2.imencode", side_effect=[(True, mock_buffer1), (True, mock_buffer2)]
     )
@@ -175,3 +188,330 @@ def test_should_raise_error_on_cv2_exception(mocker: MockerFixture):
     mock_capture.set.assert_called_once_with(cv2.CAP_PROP_POS_FRAMES, 0)
     mock_capture.read.assert_called_once()
     mock_capture.release.assert_called_once()
+
+
+def test_should_plan_seeks_and_scans_from_keyframes(mocker: MockerFixture):
+    """Given a video with keyframes every 30 frames and a FrameSelection
+    When extracting frames using OpenCVFrameExtractor in auto mode
+    Then it should grab through the gaps that decode fewer frames than seeking from
+        the keyframe before the next frame, and seek over the others
+    """
+
+    # Given
+    temp_file = TempFile(path="temp_video.mp4", content=b"")
+    settings = mocker.Mock()
+    settings.READ_MODE = "auto"
+    settings.ESTIMATED_GOP_SIZE = 250
+    settings.SEEK_COST_IN_FRAMES = 2
+    settings.ENCODER_THREADS = 2
+    settings.MAX_PENDING_FRAMES = 2
+    extractor = OpenCVFrameExtractor(settings)
+    metadata = VideoMetadata(
+        path=temp_file.path,
+        duration_seconds=10.0,
+        frame_count=100,
+        fps=10.0,
+        size_in_bytes=1024,
+        keyframe_indexes=array("q", [0, 30, 60, 90]),
+    )
+    mock_capture = mocker.Mock()
+    mock_capture.isOpened.return_value = True
+    mock_capture.grab.return_value = True
+    mock_capture.read.return_value = (True, object())
+    mocker.patch("cv2.VideoCapture", return_value=mock_capture)
+    mock_buffer = np.frombuffer(b"jpg-bytes", dtype=np.uint8)
+    mocker.patch("cv2.imencode", return_value=(True, mock_buffer))
+
+    # 5 is 2 grabs away, 40 is 10 frames after keyframe 30 and 50 is 9 grabs away
+    frame_selection = FrameSelection(indexes=[2, 5, 40, 50])
+
+    # When
+    frames = list(extractor.extract(temp_file, frame_selection, metadata=metadata))
+
+    # Then
+    assert [frame.index for frame in frames] == [2, 5, 40, 50]
+    assert mock_capture.set.call_args_list == [
+        mocker.call(cv2.CAP_PROP_POS_FRAMES, 2),
+        mocker.call(cv2.CAP_PROP_POS_FRAMES, 40),
+    ]
+    assert mock_capture.grab.call_count == 2 + 9
+
+
+def test_should_extract_same_frames_when_scanning_and_seeking(
+    mocker: MockerFixture, tmp_path, write_video
+):
+    """Given a video and a FrameSelection
+    When extracting frames using OpenCVFrameExtractor in scan and in seek mode
+    Then it should extract the same frames
+    """
+
+    # Given
+    temp_file = TempFile(path=str(tmp_path / "video.avi"))
+    write_video(temp_file.path, frame_count=30)
+    frame_selection = FrameSelection(indexes=[0, 3, 4, 17, 29])
+    extracted = {}
+
+    # When
+    for read_mode in ("scan", "seek"):
+        settings = mocker.Mock()
+        settings.READ_MODE = read_mode
+        settings.ENCODER_THREADS = 0
+        settings.MAX_PENDING_FRAMES = 1
+        extractor = OpenCVFrameExtractor(settings)
+        extracted[read_mode] = list(extractor.extract(temp_file, frame_selection))
+
+    # Then
+    assert [frame.index for frame in extracted["scan"]] == [0, 3, 4, 17, 29]
+    assert extracted["scan"] == extracted["seek"]
+
+
+def test_should_encode_frames_in_threads_in_selection_order(
+    mocker: MockerFixture, tmp_path, write_video
+):
+    """Given a video and a FrameSelection
+    When extracting frames using OpenCVFrameExtractor with encoder threads
+    Then it should yield the same frames as when encoding inline, in selection order
+    """
+
+    # Given
+    temp_file = TempFile(path=str(tmp_path / "video.avi"))
+    write_video(temp_file.path, frame_count=30)
+    frame_selection = FrameSelection(indexes=range(0, 30, 3))
+    extracted = {}
+
+    # When
+    for encoder_threads in (0, 3):
+        settings = mocker.Mock()
+        settings.READ_MODE = "auto"
+        settings.ESTIMATED_GOP_SIZE = 60
+        settings.SEEK_COST_IN_FRAMES = 5
+        settings.ENCODER_THREADS = encoder_threads
+        settings.MAX_PENDING_FRAMES = 2
+        extractor = OpenCVFrameExtractor(settings)
+        extracted[encoder_threads] = list(extractor.extract(temp_file, frame_selection))
+
+    # Then
+    assert [frame.index for frame in extracted[3]] == list(range(0, 30, 3))
+    assert extracted[3] == extracted[0]
+
+
+@pytest.mark.parametrize(
+    "frame_timestamps, expected_timestamps",
+    [
+        (None, [0.0, 0.4, 0.8]),
+        (array("d", [index / 5 + 1 for index in range(10)]), [1.0, 1.8, 2.6]),
+    ],
+)
+def test_should_give_frames_their_timestamp(
+    mocker: MockerFixture,
+    tmp_path,
+    write_video,
+    frame_timestamps: array | None,
+    expected_timestamps: list[float],
+):
+    """Given a video and its metadata, with or without the timestamp of each frame
+    When extracting frames using OpenCVFrameExtractor
+    Then it should give each frame its timestamp, from the frame rate when the frame
+        timestamps are unknown
+    """
+
+    # Given
+    temp_file = TempFile(path=str(tmp_path / "video.avi"))
+    write_video(temp_file.path, frame_count=10)
+    metadata = VideoMetadata(
+        path=temp_file.path,
+        duration_seconds=1.0,
+        frame_count=10,
+        fps=10.0,
+        size_in_bytes=1000,
+        frame_timestamps=frame_timestamps,
+    )
+    extractor = OpenCVFrameExtractor()
+
+    # When
+    frames = list(
+        extractor.extract(
+            temp_file, FrameSelection(indexes=[0, 4, 8]), metadata=metadata
+        )
+    )
+
+    # Then
+    assert [frame.timestamp for frame in frames] == pytest.approx(expected_timestamps)
+
+
+@pytest.mark.parametrize(
+    "image_format, grayscale, extension, expected_shape",
+    [
+        ("jpeg", False, ".jpg", (12, 16, 3)),
+        ("webp", False, ".webp", (12, 16, 3)),
+        ("png", True, ".png", (12, 16)),
+    ],
+)
+def test_should_encode_frames_following_encoding_profile(
+    mocker: MockerFixture,
+    tmp_path,
+    write_video,
+    image_format: str,
+    grayscale: bool,
+    extension: str,
+    expected_shape: tuple[int, ...],
+):
+    """Given a 32x24 video and an encoding profile with a maximum width of 16
+    When extracting frames using OpenCVFrameExtractor
+    Then it should downscale the frames and encode them in the format of the profile,
+        with the extension of the format
+    """
+
+    # Given
+    temp_file = TempFile(path=str(tmp_path / "video.avi"))
+    write_video(temp_file.path, frame_count=5)
+    encoding_settings = mocker.Mock()
+    encoding_settings.FORMAT = image_format
+    encoding_settings.QUALITY = 80
+    encoding_settings.PNG_COMPRESSION = 1
+    encoding_settings.JPEG_CHROMA_SUBSAMPLING = "420"
+    encoding_settings.JPEG_OPTIMIZE = True
+    encoding_settings.MAX_WIDTH = 16
+    encoding_settings.MAX_HEIGHT = None
+    encoding_settings.GRAYSCALE = grayscale
+    extractor = OpenCVFrameExtractor(encoding_settings=encoding_settings)
+
+    # When
+    frames = list(extractor.extract(temp_file, FrameSelection(indexes=[0, 4])))
+
+    # Then
+    assert [frame.filename for frame in frames] == [
+        f"frame_0{extension}",
+        f"frame_4{extension}",
+    ]
+    image = cv2.imdecode(
+        np.frombuffer(frames[1].content, dtype=np.uint8), cv2.IMREAD_UNCHANGED
+    )
+    assert image.shape == expected_shape
+
+
+@pytest.mark.parametrize("encoder_threads", [0, 2])
+def test_should_decode_frames_into_reused_buffers(
+    mocker: MockerFixture, encoder_threads: int
+):
+    """Given a FrameSelection of many frames
+    When extracting frames using OpenCVFrameExtractor
+    Then it should let the capture allocate one buffer per pending frame plus one,
+        and decode the next frames into these buffers
+    """
+
+    # Given
+    temp_file = TempFile(path="temp_video.mp4", content=b"")
+    settings = mocker.Mock()
+    settings.READ_MODE = "scan"
+    settings.ENCODER_THREADS = encoder_threads
+    settings.MAX_PENDING_FRAMES = 2
+    extractor = OpenCVFrameExtractor(settings)
+    allocated = []
+
+    def read(image=None):
+        if image is None:
+            image = np.zeros((24, 32, 3), dtype=np.uint8)
+            allocated.append(image)
+
+        return True, image
+
+    mock_capture = mocker.Mock()
+    mock_capture.isOpened.return_value = True
+    mock_capture.read.side_effect = read
+    mocker.patch("cv2.VideoCapture", return_value=mock_capture)
+    mock_buffer = np.frombuffer(b"jpg-bytes", dtype=np.uint8)
+    mocker.patch("cv2.imencode", return_value=(True, mock_buffer))
+
+    # When
+    frames = list(extractor.extract(temp_file, FrameSelection(indexes=range(20))))
+
+    # Then
+    assert [frame.index for frame in frames] == list(range(20))
+    assert mock_capture.read.call_count == 20
+    assert len(allocated) == 3
+    reused = [call.kwargs["image"] for call in mock_capture.read.call_args_list[3:]]
+    assert all(any(image is buffer for buffer in allocated) for image in reused)
+
+
+class _FakeCapture:
+    """A capture decoding frames of a fake video into the given buffers."""
+
+    def __init__(self, frame_count: int):
+        self.frame_count = frame_count
+        self.position = 0
+
+    def isOpened(self) -> bool:
+        return True
+
+    def set(self, prop: int, value: float) -> bool:
+        self.position = int(value)
+        return True
+
+    def grab(self) -> bool:
+        self.position += 1
+        return self.position <= self.frame_count
+
+    def read(self, image=None):
+        if self.position >= self.frame_count:
+            return False, None
+
+        if image is None:
+            image = np.empty((24, 32, 3), dtype=np.uint8)
+
+        image.fill(self.position % 256)
+        self.position += 1
+        return True, image
+
+    def release(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    "encoder_threads, max_pending_frames", [(0, 1), (2, 2), (4, 8)]
+)
+def test_should_allocate_a_bounded_number_of_buffers_for_many_frames(
+    mocker: MockerFixture, caplog, encoder_threads: int, max_pending_frames: int
+):
+    """Given a FrameSelection of many frames of a long video
+    When extracting frames using OpenCVFrameExtractor
+    Then it should allocate one buffer per pending frame plus one whatever the
+        number of frames, encode each frame from its own image, and log the
+        allocations with the peak RSS
+    """
+
+    # Given
+    temp_file = TempFile(path="temp_video.mp4", content=b"")
+    settings = mocker.Mock()
+    settings.READ_MODE = "auto"
+    settings.ESTIMATED_GOP_SIZE = 250
+    settings.SEEK_COST_IN_FRAMES = 30
+    settings.ENCODER_THREADS = encoder_threads
+    settings.MAX_PENDING_FRAMES = max_pending_frames
+    extractor = OpenCVFrameExtractor(settings)
+    rings = []
+    ring_class = opencv_frame_extractor._FrameBufferRing
+    mocker.patch.object(
+        opencv_frame_extractor,
+        "_FrameBufferRing",
+        side_effect=lambda size: rings.append(ring_class(size)) or rings[-1],
+    )
+    mocker.patch("cv2.VideoCapture", return_value=_FakeCapture(frame_count=5000))
+    mocker.patch(
+        "cv2.imencode",
+        side_effect=lambda ext, image, *params: (True, image[:1, :1, 0].copy()),
+    )
+    indexes = [*range(0, 600), *range(1000, 1500, 5), *range(3000, 3600)]
+
+    # When
+    with caplog.at_level("DEBUG", logger=opencv_frame_extractor.__name__):
+        frames = list(extractor.extract(temp_file, FrameSelection(indexes=indexes)))
+
+    # Then
+    assert [frame.index for frame in frames] == indexes
+    assert [bytes(frame.content) for frame in frames] == [
+        bytes([index % 256]) for index in indexes
+    ]
+    assert len(rings) == 1
+    assert rings[0].allocation_count == max_pending_frames + 1
+    assert f"into {max_pending_frames + 1} allocated buffers (peak RSS" in caplog.text
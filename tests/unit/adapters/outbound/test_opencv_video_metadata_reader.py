@@ -98,3 +98,28 @@ def test_should_raise_error_on_video_metadata_reading_exception(mocker: MockerFi
     )
 
     mock_capture.release.assert_called_once()
+
+
+def test_should_read_zero_duration_when_fps_is_unknown(mocker: MockerFixture):
+    """Given a TempFile containing a video whose container reports no frame rate
+    When reading the video metadata using OpenCVVideoMetadataReader
+    Then it should return a zero duration instead of dividing by zero
+    """
+
+    # Given
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.get_size.return_value = 1024
+    reader = OpenCVVideoMetadataReader(temp_file_manager)
+    mock_capture = mocker.Mock()
+    mock_capture.isOpened.return_value = True
+    mock_capture.get.side_effect = lambda prop_id: (
+        100 if prop_id == cv2.CAP_PROP_FRAME_COUNT else 0.0
+    )
+    mocker.patch("cv2.VideoCapture", return_value=mock_capture)
+
+    # When
+    result = reader.read(TempFile(path="temp_video.mp4"))
+
+    # Then
+    assert result.duration_seconds == 0.0
+    assert result.frame_count == 100
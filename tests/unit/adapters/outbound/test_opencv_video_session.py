@@ -0,0 +1,45 @@
+"""Tests for the OpenCVVideoSession class"""
+
+import cv2
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import (
+    OpenCVFrameExtractor,
+    OpenCVVideoMetadataReader,
+    OpenCVVideoSessionOpener,
+)
+from video_processor.domain.value_objects import FrameSelection, TempFile
+
+
+def test_should_open_video_once_for_metadata_and_frames(
+    mocker: MockerFixture, tmp_path, write_video
+):
+    """Given a video and an OpenCVVideoSession opened on it
+    When reading its metadata and extracting frames through the session
+    Then it should open the video only once and release it when the session closes
+    """
+
+    # Given
+    temp_file = TempFile(path=str(tmp_path / "video.avi"))
+    write_video(temp_file.path, frame_count=20)
+    video_capture = mocker.spy(cv2, "VideoCapture")
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.get_size.return_value = 1
+    reader = OpenCVVideoMetadataReader(temp_file_manager=temp_file_manager)
+    extractor = OpenCVFrameExtractor()
+    session = OpenCVVideoSessionOpener().open(temp_file)
+
+    # When
+    metadata = reader.read(temp_file, video_session=session)
+    frames = list(
+        extractor.extract(
+            temp_file, FrameSelection(indexes=[0, 19]), video_session=session
+        )
+    )
+    session.close()
+
+    # Then
+    assert metadata.frame_count == 20
+    assert [frame.index for frame in frames] == [0, 19]
+    video_capture.assert_called_once_with(temp_file.path)
+    assert not video_capture.spy_return.isOpened()
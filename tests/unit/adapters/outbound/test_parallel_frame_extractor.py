@@ -0,0 +1,153 @@
+"""Tests for the ParallelFrameExtractor class"""
+
+import os
+from concurrent.futures import Future
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import (
+    OpenCVFrameExtractor,
+    ParallelFrameExtractor,
+)
+from video_processor.domain.value_objects import FrameSelection, RawFrame, TempFile
+
+
+def _settings(mocker: MockerFixture):
+    settings = mocker.Mock()
+    settings.WORKERS = 2
+    settings.SEGMENT_FRAMES = 5
+    settings.MAX_PENDING_SEGMENTS = None
+    settings.START_METHOD = "forkserver"
+    return settings
+
+
+def test_should_extract_small_selection_in_process(mocker: MockerFixture):
+    """Given a selection smaller than two segments
+    When extracting frames using the ParallelFrameExtractor
+    Then it should extract them with the wrapped extractor in this process, reusing
+        the video session
+    """
+
+    # Given
+    temp_file = TempFile(path="temp_video.mp4")
+    frame_selection = FrameSelection(indexes=[0, 1, 2, 3, 4, 5, 6, 7, 8])
+    frame = RawFrame(index=0, filename="frame_0.jpg", content=b"jpg-bytes")
+    frame_extractor = mocker.Mock()
+    frame_extractor.extract.return_value = iter([frame])
+    video_session = mocker.Mock()
+    executor = mocker.patch(
+        "video_processor.adapters.outbound.parallel_frame_extractor."
+        "ProcessPoolExecutor"
+    )
+    extractor = ParallelFrameExtractor(frame_extractor, _settings(mocker))
+
+    # When
+    frames = list(
+        extractor.extract(temp_file, frame_selection, video_session=video_session)
+    )
+
+    # Then
+    assert frames == [frame]
+    frame_extractor.extract.assert_called_once_with(
+        temp_file, frame_selection, video_session=video_session, metadata=None
+    )
+    executor.assert_not_called()
+
+
+def test_should_keep_bounded_number_of_segments_pending(mocker: MockerFixture):
+    """Given a selection of seven segments and at most two pending segments
+    When extracting frames using the ParallelFrameExtractor
+    Then it should submit the next segment only as each pending one is yielded, and
+        yield every frame in index order
+    """
+
+    # Given
+    submitted: list[FrameSelection] = []
+
+    def submit(function, frame_extractor, temp_file, frame_selection, metadata):
+        submitted.append(frame_selection)
+        future: Future = Future()
+        future.set_result(
+            function(frame_extractor, temp_file, frame_selection, metadata)
+        )
+        return future
+
+    executor_class = mocker.patch(
+        "video_processor.adapters.outbound.parallel_frame_extractor."
+        "ProcessPoolExecutor"
+    )
+    executor_class.return_value.submit.side_effect = submit
+    frame_extractor = mocker.Mock()
+    frame_extractor.extract.side_effect = lambda temp_file, frame_selection, **_: (
+        RawFrame(index=index, filename=f"frame_{index}.jpg", content=b"jpg")
+        for index in frame_selection.indexes
+    )
+    settings = _settings(mocker)
+    settings.MAX_PENDING_SEGMENTS = 2
+    extractor = ParallelFrameExtractor(frame_extractor, settings)
+
+    # When
+    frames = extractor.extract(
+        TempFile(path="temp_video.mp4"), FrameSelection(indexes=range(33))
+    )
+    first_frame = next(frames)
+    submitted_before_first_frame = len(submitted)
+    remaining_frames = list(frames)
+
+    # Then
+    assert submitted_before_first_frame == 2
+    assert [len(segment.indexes) for segment in submitted] == [5] * 6 + [3]
+    assert [first_frame.index] + [frame.index for frame in remaining_frames] == list(
+        range(33)
+    )
+
+
+@pytest.mark.parametrize(
+    "in_memory",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not hasattr(os, "memfd_create"), reason="requires memfd_create"
+            ),
+        ),
+    ],
+)
+def test_should_extract_segments_in_workers_in_index_order(
+    mocker: MockerFixture, tmp_path, write_video, in_memory: bool
+):
+    """Given a video on disk or in a memory file and a selection of two segments
+    When extracting frames using the ParallelFrameExtractor
+    Then it should extract the segments in worker processes and yield the same
+        frames as the wrapped extractor, in index order
+    """
+
+    # Given
+    path = str(tmp_path / "video.avi")
+    write_video(path, frame_count=30)
+    memfd = None
+    if in_memory:
+        memfd = os.memfd_create("video.avi")
+        with open(path, "rb") as f:
+            os.write(memfd, f.read())
+        path = f"/proc/self/fd/{memfd}"
+
+    temp_file = TempFile(path=path)
+    frame_selection = FrameSelection(indexes=range(0, 30, 2))
+    frame_extractor = OpenCVFrameExtractor()
+    extractor = ParallelFrameExtractor(frame_extractor, _settings(mocker))
+
+    # When
+    try:
+        frames = list(extractor.extract(temp_file, frame_selection))
+        expected_frames = list(frame_extractor.extract(temp_file, frame_selection))
+    finally:
+        extractor.close()
+        if memfd is not None:
+            os.close(memfd)
+
+    # Then
+    assert [frame.index for frame in frames] == list(range(0, 30, 2))
+    assert frames == expected_frames
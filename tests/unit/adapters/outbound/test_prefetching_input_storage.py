@@ -0,0 +1,151 @@
+"""Tests for the PrefetchingInputStorage class"""
+
+import threading
+
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import PrefetchingInputStorage
+from video_processor.domain.exceptions import StorageError, VideoValidationError
+from video_processor.domain.value_objects import (
+    StoredFileInfo,
+    TempFile,
+    VideoValidationCost,
+)
+
+
+def _build_temp_file_manager(mocker: MockerFixture, tmp_path):
+    counter = iter(range(1000))
+    manager = mocker.Mock()
+    manager.create.side_effect = lambda content, suffix: TempFile(
+        path=str(tmp_path / f"prefetch-{next(counter)}.{suffix}")
+    )
+    return manager
+
+
+def test_should_serve_download_from_prefetched_file(mocker: MockerFixture, tmp_path):
+    """Given a video that was prefetched
+    When the use case downloads it using PrefetchingInputStorage
+    Then it should move the prefetched file into the temp file without downloading
+        it again
+    """
+
+    # Given
+    def download_to_file(source_path, temp_file, file_info=None):
+        with open(temp_file.path, "wb") as f:
+            f.write(b"video")
+
+    inner = mocker.Mock()
+    inner.download_to_file.side_effect = download_to_file
+    temp_file_manager = _build_temp_file_manager(mocker, tmp_path)
+    storage = PrefetchingInputStorage(inner, temp_file_manager)
+    temp_file = TempFile(path=str(tmp_path / "job.mp4"))
+
+    # When
+    storage.prefetch("s3://bucket/video.mp4")
+    storage.download_to_file("s3://bucket/video.mp4", temp_file)
+    storage.close()
+
+    # Then
+    with open(temp_file.path, "rb") as f:
+        assert f.read() == b"video"
+
+    inner.download_to_file.assert_called_once()
+    assert inner.download_to_file.call_args.args[1].path.endswith("prefetch-0.mp4")
+    assert not (tmp_path / "prefetch-0.mp4").exists()
+
+
+def test_should_download_again_when_prefetch_failed(mocker: MockerFixture, tmp_path):
+    """Given a video whose prefetch failed
+    When the use case downloads it using PrefetchingInputStorage
+    Then it should download it from the wrapped storage into the temp file
+    """
+
+    # Given
+    inner = mocker.Mock()
+    inner.download_to_file.side_effect = [StorageError("timeout"), None]
+    temp_file_manager = _build_temp_file_manager(mocker, tmp_path)
+    storage = PrefetchingInputStorage(inner, temp_file_manager)
+    temp_file = TempFile(path=str(tmp_path / "job.mp4"))
+
+    # When
+    storage.prefetch("s3://bucket/video.mp4")
+    storage.download_to_file("s3://bucket/video.mp4", temp_file)
+    storage.close()
+
+    # Then
+    assert inner.download_to_file.call_count == 2
+    assert inner.download_to_file.call_args.args == (
+        "s3://bucket/video.mp4",
+        temp_file,
+        None,
+    )
+    temp_file_manager.delete.assert_called_once()
+
+
+def test_should_delete_discarded_prefetched_file(mocker: MockerFixture, tmp_path):
+    """Given a video being prefetched
+    When it is discarded using PrefetchingInputStorage
+    Then it should delete the prefetched file once its download completes
+    """
+
+    # Given
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_download(path, temp_file, file_info=None):
+        started.set()
+        release.wait(timeout=5)
+
+    inner = mocker.Mock()
+    inner.download_to_file.side_effect = slow_download
+    temp_file_manager = _build_temp_file_manager(mocker, tmp_path)
+    storage = PrefetchingInputStorage(inner, temp_file_manager)
+
+    # When
+    storage.prefetch("s3://bucket/video.mp4")
+    started.wait(timeout=5)
+    storage.discard("s3://bucket/video.mp4")
+    release.set()
+    storage.close()
+
+    # Then
+    temp_file_manager.delete.assert_called_once()
+    assert temp_file_manager.delete.call_args.args[0].path.endswith("prefetch-0.mp4")
+
+
+def test_should_not_prefetch_video_rejected_by_probe_validators(
+    mocker: MockerFixture, tmp_path
+):
+    """Given a video rejected by a pre-download validator of the storage metadata,
+        and a validator needing the container header
+    When it is prefetched and then downloaded using PrefetchingInputStorage
+    Then it should only run the storage metadata validator before prefetching, not
+        download it ahead, and download it from the wrapped storage when requested
+    """
+
+    # Given
+    inner = mocker.Mock()
+    inner.get_file_info.return_value = StoredFileInfo(
+        path="s3://bucket/video.mp4", size_in_bytes=10
+    )
+    object_validator = mocker.Mock(cost=VideoValidationCost.OBJECT_INFO)
+    object_validator.validate.side_effect = VideoValidationError("Video is too large")
+    header_validator = mocker.Mock(cost=VideoValidationCost.CONTAINER_HEADER)
+    temp_file_manager = _build_temp_file_manager(mocker, tmp_path)
+    storage = PrefetchingInputStorage(
+        inner, temp_file_manager, [object_validator, header_validator]
+    )
+    temp_file = TempFile(path=str(tmp_path / "job.mp4"))
+
+    # When
+    storage.prefetch("s3://bucket/video.mp4")
+    storage.download_to_file("s3://bucket/video.mp4", temp_file)
+    storage.close()
+
+    # Then
+    object_validator.validate.assert_called_once()
+    header_validator.validate.assert_not_called()
+    temp_file_manager.create.assert_not_called()
+    inner.download_to_file.assert_called_once_with(
+        "s3://bucket/video.mp4", temp_file, None
+    )
@@ -0,0 +1,153 @@
+"""Tests for the raw ZIP entries module"""
+
+import io
+import sys
+import time
+import zipfile
+import zlib
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import raw_zip_entries
+from video_processor.adapters.outbound.raw_zip_entries import (
+    check_raw_entries_supported,
+    compress_entry_data,
+    decompress_entry_data,
+    get_local_header,
+    write_raw_entry,
+)
+
+
+class _UnseekableWriter(io.RawIOBase):
+    def __init__(self) -> None:
+        self.buffer = io.BytesIO()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        return self.buffer.write(b)
+
+    def tell(self) -> int:
+        return self.buffer.tell()
+
+
+def _compress(filename: str, content: bytes, method: int):
+    entry = zipfile.ZipInfo(filename, date_time=time.localtime()[:6])
+    entry.compress_type = method
+    entry.file_size = len(content)
+    entry.CRC = zlib.crc32(content)
+    if method == zipfile.ZIP_LZMA:
+        entry.flag_bits |= 0x02
+
+    data = compress_entry_data(content, method, None)
+    entry.compress_size = len(data)
+    return entry, data
+
+
+@pytest.mark.skipif(
+    sys.version_info[:2] > raw_zip_entries.MAX_PYTHON_VERSION,
+    reason="raw entries are not enabled on this Python version yet",
+)
+def test_should_be_supported_on_this_python_version():
+    """Given the zipfile module of this Python version
+    When checking the support of raw entries
+    Then it should not raise
+    """
+
+    # When / Then
+    check_raw_entries_supported()
+
+
+@pytest.mark.parametrize(
+    "attribute, value, error",
+    [
+        ("MAX_PYTHON_VERSION", (3, 0), "not tested with Python"),
+        ("ZIPFILE_FUNCTIONS", ("_get_compressor", "_gone"), "zipfile misses _gone"),
+        ("ZIPFILE_ATTRIBUTES", ("fp", "_gone"), "zipfile misses _gone"),
+    ],
+)
+def test_should_reject_untested_version_or_missing_internals(
+    mocker: MockerFixture, attribute: str, value, error: str
+):
+    """Given an untested Python version, or zipfile without an internal it uses
+    When checking the support of raw entries
+    Then it should raise a RuntimeError
+    """
+
+    # Given
+    mocker.patch.object(raw_zip_entries, attribute, value)
+
+    # When / Then
+    with pytest.raises(RuntimeError, match=error):
+        check_raw_entries_supported()
+
+
+@pytest.mark.parametrize("seekable", [True, False])
+def test_should_write_entries_compressed_beforehand(seekable: bool):
+    """Given entries compressed beforehand with each compression method
+    When writing them into a seekable or unseekable archive
+    Then zipfile should read them back, with their data at the offset after their
+        local header
+    """
+
+    # Given
+    methods = [
+        zipfile.ZIP_STORED,
+        zipfile.ZIP_DEFLATED,
+        zipfile.ZIP_BZIP2,
+        zipfile.ZIP_LZMA,
+    ]
+    contents = {
+        f"frame_{method}.bin": bytes([method]) * 1000 + b"tail" for method in methods
+    }
+    writer = io.BytesIO() if seekable else _UnseekableWriter()
+    offsets = {}
+
+    # When
+    with zipfile.ZipFile(writer, mode="w") as zip_file:
+        for method, (filename, content) in zip(methods, contents.items()):
+            entry, data = _compress(filename, content, method)
+            write_raw_entry(zip_file, entry, data)
+            offsets[filename] = entry.header_offset + len(get_local_header(entry))
+
+    # Then
+    archive = (writer if seekable else writer.buffer).getvalue()
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        assert zip_file.testzip() is None
+        for info in zip_file.infolist():
+            assert zip_file.read(info.filename) == contents[info.filename]
+            assert not info.flag_bits & 0x08
+            data = archive[
+                offsets[info.filename] : offsets[info.filename] + info.compress_size
+            ]
+            assert decompress_entry_data(data, info.compress_type) == (
+                contents[info.filename]
+            )
+
+
+def test_should_keep_zipfile_checks_when_writing_entries():
+    """Given an archive with an entry open for writing, an archive with an entry,
+        and a closed archive
+    When writing raw entries into them
+    Then it should raise like zipfile for the open entry and the closed archive, and
+        warn of the duplicate name
+    """
+
+    # Given
+    entry, data = _compress("frame_0.jpg", b"frame", zipfile.ZIP_STORED)
+    zip_file = zipfile.ZipFile(io.BytesIO(), mode="w")
+
+    # When / Then
+    with zip_file.open("open.bin", mode="w"):
+        with pytest.raises(ValueError, match="another write handle"):
+            write_raw_entry(zip_file, entry, data)
+
+    write_raw_entry(zip_file, entry, data)
+    with pytest.warns(UserWarning, match="Duplicate name"):
+        write_raw_entry(zip_file, *_compress("frame_0.jpg", b"frame", 0))
+
+    zip_file.close()
+    with pytest.raises(ValueError, match="already closed"):
+        write_raw_entry(zip_file, *_compress("frame_1.jpg", b"frame", 0))
@@ -2,17 +2,28 @@
 
 import pytest
 from botocore.errorfactory import ClientError
+from botocore.exceptions import ReadTimeoutError
 from pytest_mock import MockerFixture
 
 from video_processor.adapters.outbound import S3InputStorage
 from video_processor.domain.exceptions import StorageError
-from video_processor.domain.value_objects import FileContent
+from video_processor.domain.value_objects import FileContent, StoredFileInfo, TempFile
+
+
+def _build_settings(mocker: MockerFixture, bucket_name: str):
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = bucket_name
+    settings.MULTIPART_THRESHOLD_IN_BYTES = 16
+    settings.MULTIPART_PART_SIZE_IN_BYTES = 8
+    settings.MULTIPART_MAX_CONCURRENCY = 2
+    return settings
 
 
 def test_should_download_file_from_s3(mocker: MockerFixture):
     """Given a valid source path
     When downloading a file using S3InputStorage
-    Then it should return a FileContent object with the path and content of the file
+    Then it should download it with the managed transfer into a spooled file and
+        return a FileContent object reading from it
     """
 
     # Given
@@ -20,15 +31,15 @@ def test_should_download_file_from_s3(mocker: MockerFixture):
     file_content = b"file-content"
     bucket_name = "test-bucket"
     mock_s3_client = mocker.Mock()
-    mock_s3_client.get_object.return_value = {
-        "Body": mocker.Mock(read=mocker.Mock(return_value=file_content))
-    }
+    mock_s3_client.download_fileobj.side_effect = lambda **kwargs: kwargs[
+        "Fileobj"
+    ].write(file_content)
 
-    boto_session = mocker.Mock()
-    boto_session.client.return_value = mock_s3_client
-    settings = mocker.Mock()
-    settings.BUCKET_NAME = bucket_name
-    storage = S3InputStorage(boto_session=boto_session, settings=settings)
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    storage = S3InputStorage(
+        client_factory=client_factory, settings=_build_settings(mocker, bucket_name)
+    )
 
     # When
     result = storage.download_file(file_path)
@@ -36,9 +47,13 @@ def test_should_download_file_from_s3(mocker: MockerFixture):
     # Then
     assert isinstance(result, FileContent)
     assert result.path == file_path
-    assert result.content == file_content
-    boto_session.client.assert_called_once_with("s3")
-    mock_s3_client.get_object.assert_called_once_with(Bucket=bucket_name, Key=file_path)
+    assert result.size_in_bytes == len(file_content)
+    assert result.read() == file_content
+    client_factory.client.assert_called_once_with("s3")
+    download_kwargs = mock_s3_client.download_fileobj.call_args.kwargs
+    assert download_kwargs["Bucket"] == bucket_name
+    assert download_kwargs["Key"] == file_path
+    assert download_kwargs["Config"].multipart_chunksize == 8
 
 
 def test_should_raise_error_on_download_failure(mocker: MockerFixture):
@@ -51,7 +66,7 @@ def test_should_raise_error_on_download_failure(mocker: MockerFixture):
     file_path = "test/path/file.txt"
     bucket_name = "test-bucket"
     mock_s3_client = mocker.Mock()
-    mock_s3_client.get_object.side_effect = ClientError(
+    mock_s3_client.download_fileobj.side_effect = ClientError(
         error_response={
             "Error": {
                 "Code": "NoSuchKey",
@@ -61,11 +76,11 @@ def test_should_raise_error_on_download_failure(mocker: MockerFixture):
         operation_name="GetObject",
     )
 
-    boto_session = mocker.Mock()
-    boto_session.client.return_value = mock_s3_client
-    settings = mocker.Mock()
-    settings.BUCKET_NAME = bucket_name
-    storage = S3InputStorage(boto_session=boto_session, settings=settings)
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    storage = S3InputStorage(
+        client_factory=client_factory, settings=_build_settings(mocker, bucket_name)
+    )
 
     # When / Then
     with pytest.raises(StorageError) as exc_info:
@@ -77,5 +92,364 @@ def test_should_raise_error_on_download_failure(mocker: MockerFixture):
     )
 
     assert str(exc_info.value) == expected_str
-    boto_session.client.assert_called_once_with("s3")
+    client_factory.client.assert_called_once_with("s3")
+    mock_s3_client.download_fileobj.assert_called_once()
+
+
+def test_should_stream_file_from_s3_into_temp_file(mocker: MockerFixture, tmp_path):
+    """Given a valid source path and a temporary file
+    When downloading a file into the temporary file using S3InputStorage
+    Then it should write the object body to the file chunk by chunk
+    """
+
+    # Given
+    file_path = "test/path/video.mp4"
+    bucket_name = "test-bucket"
+    temp_file = TempFile(path=str(tmp_path / "video.mp4"))
+    body = mocker.Mock()
+    body.iter_chunks.return_value = iter([b"chunk-1", b"chunk-2"])
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.head_object.return_value = {"ContentLength": 14, "ETag": '"e"'}
+    mock_s3_client.get_object.return_value = {"Body": body}
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = bucket_name
+    settings.DOWNLOAD_CHUNK_SIZE_IN_BYTES = 7
+    settings.MULTIPART_THRESHOLD_IN_BYTES = 1024
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When
+    storage.download_to_file(f"s3://{bucket_name}/{file_path}", temp_file)
+
+    # Then
+    with open(temp_file.path, "rb") as f:
+        assert f.read() == b"chunk-1chunk-2"
+
     mock_s3_client.get_object.assert_called_once_with(Bucket=bucket_name, Key=file_path)
+    body.iter_chunks.assert_called_once_with(chunk_size=7)
+    body.close.assert_called_once()
+
+
+def test_should_raise_error_on_streamed_download_failure(
+    mocker: MockerFixture, tmp_path
+):
+    """Given a valid source path and a temporary file
+    When an error occurs while streaming the object body using S3InputStorage
+    Then it should raise a StorageError and close the body
+    """
+
+    # Given
+    file_path = "test/path/video.mp4"
+    bucket_name = "test-bucket"
+    temp_file = TempFile(path=str(tmp_path / "video.mp4"))
+    body = mocker.Mock()
+    body.iter_chunks.side_effect = ReadTimeoutError(endpoint_url="s3")
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.head_object.return_value = {"ContentLength": 14, "ETag": '"e"'}
+    mock_s3_client.get_object.return_value = {"Body": body}
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = bucket_name
+    settings.DOWNLOAD_CHUNK_SIZE_IN_BYTES = 1024
+    settings.MULTIPART_THRESHOLD_IN_BYTES = 1024
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When / Then
+    with pytest.raises(StorageError) as exc_info:
+        storage.download_to_file(file_path, temp_file)
+
+    assert str(exc_info.value).startswith("Failed to download file from S3: ")
+    body.close.assert_called_once()
+
+
+def _ranged_get_object(mocker: MockerFixture, content: bytes, failures: dict):
+    """Build a fake get_object that serves byte ranges of the given content and
+    raises the queued errors for a range before serving it."""
+
+    def get_object(Bucket, Key, Range, IfMatch):
+        start, end = (int(v) for v in Range.removeprefix("bytes=").split("-"))
+        errors = failures.get(start, [])
+        if errors:
+            raise errors.pop(0)
+
+        body = mocker.Mock()
+        body.iter_chunks.return_value = iter([content[start : end + 1]])
+        return {"Body": body}
+
+    return get_object
+
+
+def test_should_download_large_file_in_concurrent_ranged_parts(
+    mocker: MockerFixture, tmp_path
+):
+    """Given an object larger than the multipart threshold
+    When downloading it into a temporary file using S3InputStorage
+    Then it should fetch it as byte ranges and write each one at its offset
+    """
+
+    # Given
+    bucket_name = "test-bucket"
+    content = bytes(range(100))
+    temp_file = TempFile(path=str(tmp_path / "video.mp4"))
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.head_object.return_value = {
+        "ContentLength": len(content),
+        "ETag": '"etag"',
+    }
+    mock_s3_client.get_object.side_effect = _ranged_get_object(mocker, content, {})
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = bucket_name
+    settings.DOWNLOAD_CHUNK_SIZE_IN_BYTES = 1024
+    settings.MULTIPART_THRESHOLD_IN_BYTES = 50
+    settings.MULTIPART_PART_SIZE_IN_BYTES = 30
+    settings.MULTIPART_MAX_CONCURRENCY = 2
+    settings.MULTIPART_PART_MAX_ATTEMPTS = 3
+    settings.MULTIPART_PART_RETRY_BACKOFF_SECONDS = 0
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When
+    storage.download_to_file("video.mp4", temp_file)
+
+    # Then
+    with open(temp_file.path, "rb") as f:
+        assert f.read() == content
+
+    ranges = sorted(
+        call.kwargs["Range"] for call in mock_s3_client.get_object.call_args_list
+    )
+    assert ranges == ["bytes=0-29", "bytes=30-59", "bytes=60-89", "bytes=90-99"]
+    assert all(
+        call.kwargs["IfMatch"] == '"etag"'
+        for call in mock_s3_client.get_object.call_args_list
+    )
+
+
+def test_should_download_in_parts_without_head_request_when_file_info_is_given(
+    mocker: MockerFixture, tmp_path
+):
+    """Given an object larger than the multipart threshold whose file info is known
+    When downloading it into a temporary file with that file info using
+        S3InputStorage
+    Then it should size the ranged parts and match them against its ETag without
+        a HEAD request
+    """
+
+    # Given
+    content = bytes(range(100))
+    temp_file = TempFile(path=str(tmp_path / "video.mp4"))
+    file_info = StoredFileInfo(
+        path="video.mp4", size_in_bytes=len(content), etag='"etag"'
+    )
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.get_object.side_effect = _ranged_get_object(mocker, content, {})
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = "test-bucket"
+    settings.DOWNLOAD_CHUNK_SIZE_IN_BYTES = 1024
+    settings.MULTIPART_THRESHOLD_IN_BYTES = 50
+    settings.MULTIPART_PART_SIZE_IN_BYTES = 50
+    settings.MULTIPART_MAX_CONCURRENCY = 2
+    settings.MULTIPART_PART_MAX_ATTEMPTS = 3
+    settings.MULTIPART_PART_RETRY_BACKOFF_SECONDS = 0
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When
+    storage.download_to_file("video.mp4", temp_file, file_info)
+
+    # Then
+    with open(temp_file.path, "rb") as f:
+        assert f.read() == content
+
+    mock_s3_client.head_object.assert_not_called()
+    assert all(
+        call.kwargs["IfMatch"] == '"etag"'
+        for call in mock_s3_client.get_object.call_args_list
+    )
+
+
+def test_should_retry_only_the_failed_part(mocker: MockerFixture, tmp_path):
+    """Given an object downloaded in parts where one range fails transiently
+    When downloading it into a temporary file using S3InputStorage
+    Then it should retry that range alone and complete the download
+    """
+
+    # Given
+    content = bytes(range(100))
+    temp_file = TempFile(path=str(tmp_path / "video.mp4"))
+    failures = {50: [ReadTimeoutError(endpoint_url="s3")]}
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.head_object.return_value = {
+        "ContentLength": len(content),
+        "ETag": '"etag"',
+    }
+    mock_s3_client.get_object.side_effect = _ranged_get_object(
+        mocker, content, failures
+    )
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = "test-bucket"
+    settings.DOWNLOAD_CHUNK_SIZE_IN_BYTES = 1024
+    settings.MULTIPART_THRESHOLD_IN_BYTES = 50
+    settings.MULTIPART_PART_SIZE_IN_BYTES = 50
+    settings.MULTIPART_MAX_CONCURRENCY = 2
+    settings.MULTIPART_PART_MAX_ATTEMPTS = 3
+    settings.MULTIPART_PART_RETRY_BACKOFF_SECONDS = 0
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When
+    storage.download_to_file("video.mp4", temp_file)
+
+    # Then
+    with open(temp_file.path, "rb") as f:
+        assert f.read() == content
+
+    ranges = [call.kwargs["Range"] for call in mock_s3_client.get_object.call_args_list]
+    assert sorted(ranges) == ["bytes=0-49", "bytes=50-99", "bytes=50-99"]
+
+
+def test_should_raise_error_when_part_fails_with_non_retryable_error(
+    mocker: MockerFixture, tmp_path
+):
+    """Given an object downloaded in parts that changes while downloading
+    When downloading it into a temporary file using S3InputStorage
+    Then it should not retry the part and raise a StorageError
+    """
+
+    # Given
+    content = bytes(range(100))
+    temp_file = TempFile(path=str(tmp_path / "video.mp4"))
+    precondition_failed = ClientError(
+        error_response={
+            "Error": {"Code": "PreconditionFailed", "Message": "ETag mismatch"},
+            "ResponseMetadata": {"HTTPStatusCode": 412},
+        },
+        operation_name="GetObject",
+    )
+    failures = {0: [precondition_failed]}
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.head_object.return_value = {
+        "ContentLength": len(content),
+        "ETag": '"etag"',
+    }
+    mock_s3_client.get_object.side_effect = _ranged_get_object(
+        mocker, content, failures
+    )
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = "test-bucket"
+    settings.DOWNLOAD_CHUNK_SIZE_IN_BYTES = 1024
+    settings.MULTIPART_THRESHOLD_IN_BYTES = 50
+    settings.MULTIPART_PART_SIZE_IN_BYTES = 50
+    settings.MULTIPART_MAX_CONCURRENCY = 1
+    settings.MULTIPART_PART_MAX_ATTEMPTS = 3
+    settings.MULTIPART_PART_RETRY_BACKOFF_SECONDS = 0
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When / Then
+    with pytest.raises(StorageError) as exc_info:
+        storage.download_to_file("video.mp4", temp_file)
+
+    assert "PreconditionFailed" in str(exc_info.value)
+    ranges = [call.kwargs["Range"] for call in mock_s3_client.get_object.call_args_list]
+    assert ranges.count("bytes=0-49") == 1
+
+
+def test_should_get_file_info_from_s3(mocker: MockerFixture):
+    """Given a valid source path
+    When getting the file info using S3InputStorage
+    Then it should return the size, content type and ETag from a HEAD request
+    """
+
+    # Given
+    bucket_name = "test-bucket"
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.head_object.return_value = {
+        "ContentLength": 2048,
+        "ContentType": "video/mp4",
+        "ETag": '"etag"',
+    }
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = bucket_name
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When
+    result = storage.get_file_info(f"s3://{bucket_name}/video.mp4")
+
+    # Then
+    assert result == StoredFileInfo(
+        path="video.mp4", size_in_bytes=2048, content_type="video/mp4", etag='"etag"'
+    )
+    mock_s3_client.head_object.assert_called_once_with(
+        Bucket=bucket_name, Key="video.mp4"
+    )
+
+
+def test_should_read_range_from_s3(mocker: MockerFixture):
+    """Given a valid source path and a byte range
+    When reading the range using S3InputStorage
+    Then it should issue a ranged GET and return its body
+    """
+
+    # Given
+    bucket_name = "test-bucket"
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.get_object.return_value = {
+        "Body": mocker.Mock(read=mocker.Mock(return_value=b"header"))
+    }
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = bucket_name
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When
+    result = storage.read_range("video.mp4", 0, 512)
+
+    # Then
+    assert result == b"header"
+    mock_s3_client.get_object.assert_called_once_with(
+        Bucket=bucket_name, Key="video.mp4", Range="bytes=0-511"
+    )
+
+
+def test_should_raise_error_on_get_file_info_failure(mocker: MockerFixture):
+    """Given a source path that does not exist
+    When getting the file info using S3InputStorage
+    Then it should raise a StorageError
+    """
+
+    # Given
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.head_object.side_effect = ClientError(
+        error_response={"Error": {"Code": "404", "Message": "Not Found"}},
+        operation_name="HeadObject",
+    )
+
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = "test-bucket"
+    storage = S3InputStorage(client_factory=client_factory, settings=settings)
+
+    # When / Then
+    with pytest.raises(StorageError) as exc_info:
+        storage.get_file_info("video.mp4")
+
+    assert str(exc_info.value).startswith("Failed to get file info from S3: ")
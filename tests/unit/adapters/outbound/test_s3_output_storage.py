@@ -1,5 +1,7 @@
 """Tests for the S3OutputStorage class"""
 
+import io
+
 import pytest
 from botocore.errorfactory import ClientError
 from pytest_mock import MockerFixture
@@ -20,18 +22,18 @@ def test_should_upload_file_to_s3(mocker: MockerFixture):
     file_content_bytes = b"file-content"
     bucket_name = "test-bucket"
     mock_s3_client = mocker.Mock()
-    boto_session = mocker.Mock()
-    boto_session.client.return_value = mock_s3_client
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
     settings = mocker.Mock()
     settings.BUCKET_NAME = bucket_name
-    storage = S3OutputStorage(boto_session=boto_session, settings=settings)
+    storage = S3OutputStorage(client_factory=client_factory, settings=settings)
     file_content = FileContent(path=file_path, content=file_content_bytes)
 
     # When
     storage.upload_file(file_content=file_content, destination_path=file_path)
 
     # Then
-    boto_session.client.assert_called_once_with("s3")
+    client_factory.client.assert_called_once_with("s3")
     mock_s3_client.put_object.assert_called_once_with(
         Bucket=bucket_name,
         Key=file_path,
@@ -39,6 +41,48 @@ def test_should_upload_file_to_s3(mocker: MockerFixture):
     )
 
 
+@pytest.mark.parametrize("source", ["local_path", "fileobj"])
+def test_should_upload_file_left_on_disk_with_managed_transfer(
+    mocker: MockerFixture, source: str
+):
+    """Given a file content left in a local file or in a file object
+    When uploading it using S3OutputStorage
+    Then it should upload it with the managed transfer in parts of the configured
+        size, without reading it into memory
+    """
+
+    # Given
+    mock_s3_client = mocker.Mock()
+    storage = _streaming_storage(mocker, mock_s3_client)
+    fileobj = io.BytesIO(b"zip")
+    file_content = (
+        FileContent(path="frames.zip", local_path="/tmp/frames.zip")
+        if source == "local_path"
+        else FileContent(path="frames.zip", fileobj=fileobj)
+    )
+
+    # When
+    storage.upload_file(file_content, "s3://test-bucket/frames.zip")
+
+    # Then
+    if source == "local_path":
+        transfer = mock_s3_client.upload_file
+        transfer.assert_called_once_with(
+            Filename="/tmp/frames.zip",
+            Bucket="test-bucket",
+            Key="frames.zip",
+            Config=mocker.ANY,
+        )
+    else:
+        transfer = mock_s3_client.upload_fileobj
+        transfer.assert_called_once_with(
+            Fileobj=fileobj, Bucket="test-bucket", Key="frames.zip", Config=mocker.ANY
+        )
+
+    assert transfer.call_args.kwargs["Config"].multipart_chunksize == 4
+    mock_s3_client.put_object.assert_not_called()
+
+
 def test_should_raise_error_on_upload_failure(mocker: MockerFixture):
     """Given a valid file content and path
     When an error occurs during file upload using S3OutputStorage
@@ -60,11 +104,11 @@ def test_should_raise_error_on_upload_failure(mocker: MockerFixture):
         operation_name="PutObject",
     )
 
-    boto_session = mocker.Mock()
-    boto_session.client.return_value = mock_s3_client
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
     settings = mocker.Mock()
     settings.BUCKET_NAME = bucket_name
-    storage = S3OutputStorage(boto_session=boto_session, settings=settings)
+    storage = S3OutputStorage(client_factory=client_factory, settings=settings)
     file_content = FileContent(path=file_path, content=file_content_bytes)
 
     # When / Then
@@ -73,9 +117,116 @@ def test_should_raise_error_on_upload_failure(mocker: MockerFixture):
 
     assert "Failed to upload file to S3" in str(exc_info.value)
     assert "Access Denied" in str(exc_info.value)
-    boto_session.client.assert_called_once_with("s3")
+    client_factory.client.assert_called_once_with("s3")
     mock_s3_client.put_object.assert_called_once_with(
         Bucket=bucket_name,
         Key=file_path,
         Body=file_content_bytes,
     )
+
+
+def _streaming_storage(mocker: MockerFixture, mock_s3_client) -> S3OutputStorage:
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_s3_client
+    settings = mocker.Mock()
+    settings.BUCKET_NAME = "test-bucket"
+    settings.MULTIPART_PART_SIZE_IN_BYTES = 4
+    settings.MULTIPART_MAX_CONCURRENCY = 2
+    return S3OutputStorage(client_factory=client_factory, settings=settings)
+
+
+def test_should_stream_upload_to_s3_in_parts(mocker: MockerFixture):
+    """Given an upload opened on S3OutputStorage with parts of 4 bytes
+    When writing 10 bytes into it and completing it
+    Then it should upload them as a multipart upload of 3 parts, in order
+    """
+
+    # Given
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    mock_s3_client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+    storage = _streaming_storage(mocker, mock_s3_client)
+
+    # When
+    upload = storage.open_upload("s3://test-bucket/frames.zip")
+    upload.write(b"012345")
+    upload.write(memoryview(b"6789"))
+    upload.complete()
+
+    # Then
+    mock_s3_client.create_multipart_upload.assert_called_once_with(
+        Bucket="test-bucket", Key="frames.zip"
+    )
+    parts = sorted(
+        mock_s3_client.upload_part.call_args_list,
+        key=lambda call: call.kwargs["PartNumber"],
+    )
+    assert [call.kwargs["Body"] for call in parts] == [b"0123", b"4567", b"89"]
+    mock_s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="test-bucket",
+        Key="frames.zip",
+        UploadId="upload-id",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "etag-1", "PartNumber": 1},
+                {"ETag": "etag-2", "PartNumber": 2},
+                {"ETag": "etag-3", "PartNumber": 3},
+            ]
+        },
+    )
+    mock_s3_client.put_object.assert_not_called()
+
+
+def test_should_put_streamed_upload_smaller_than_a_part(mocker: MockerFixture):
+    """Given an upload opened on S3OutputStorage with parts of 4 bytes
+    When writing 3 bytes into it and completing it
+    Then it should upload them with a single PUT
+    """
+
+    # Given
+    mock_s3_client = mocker.Mock()
+    storage = _streaming_storage(mocker, mock_s3_client)
+
+    # When
+    upload = storage.open_upload("frames.zip")
+    upload.write(b"zip")
+    upload.complete()
+
+    # Then
+    mock_s3_client.put_object.assert_called_once_with(
+        Bucket="test-bucket", Key="frames.zip", Body=b"zip"
+    )
+    mock_s3_client.create_multipart_upload.assert_not_called()
+
+
+def test_should_raise_error_and_abort_streamed_upload_on_part_failure(
+    mocker: MockerFixture,
+):
+    """Given an upload opened on S3OutputStorage whose parts fail to upload
+    When completing it and aborting it after the error
+    Then it should raise a StorageError and abort the multipart upload
+    """
+
+    # Given
+    mock_s3_client = mocker.Mock()
+    mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    mock_s3_client.upload_part.side_effect = ClientError(
+        error_response={"Error": {"Code": "AccessDenied", "Message": "Denied"}},
+        operation_name="UploadPart",
+    )
+    storage = _streaming_storage(mocker, mock_s3_client)
+    upload = storage.open_upload("frames.zip")
+    upload.write(b"012345")
+
+    # When / Then
+    with pytest.raises(StorageError, match="Failed to upload file to S3"):
+        upload.complete()
+
+    upload.abort()
+
+    mock_s3_client.complete_multipart_upload.assert_not_called()
+    mock_s3_client.abort_multipart_upload.assert_called_once_with(
+        Bucket="test-bucket", Key="frames.zip", UploadId="upload-id"
+    )
@@ -0,0 +1,126 @@
+"""Tests for the SceneChangeFrameSelector class"""
+
+from typing import Iterator
+
+import cv2
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import (
+    OpenCVVideoSessionOpener,
+    SceneChangeFrameSelector,
+)
+from video_processor.domain.exceptions import FrameSelectionError
+from video_processor.domain.value_objects import TempFile, VideoMetadata
+
+SHOTS = [
+    # (frame count, BGR colour)
+    (10, (200, 40, 40)),
+    (15, (40, 200, 40)),
+    (15, (40, 40, 200)),
+]
+
+
+def _shot_frames() -> Iterator[np.ndarray]:
+    for frame_count, colour in SHOTS:
+        for index in range(frame_count):
+            # A slow brightness drift within the shot must not be taken for a cut
+            frame = np.full((48, 64, 3), colour, dtype=np.uint8)
+            yield cv2.add(frame, np.full_like(frame, index))
+
+
+def _settings(mocker: MockerFixture, min_frames: int = 1, max_frames: int = 10):
+    settings = mocker.Mock()
+    settings.ANALYSIS_WIDTH = 16
+    settings.ANALYSIS_STRIDE = 1
+    settings.HISTOGRAM_BINS_PER_CHANNEL = 8
+    settings.THRESHOLD = 0.35
+    settings.MIN_FRAMES = min_frames
+    settings.MAX_FRAMES = max_frames
+    return settings
+
+
+def _metadata(path: str, frame_count: int = 40) -> VideoMetadata:
+    return VideoMetadata(
+        path=path,
+        duration_seconds=frame_count / 10,
+        frame_count=frame_count,
+        fps=10.0,
+        size_in_bytes=1,
+    )
+
+
+def test_should_select_first_frame_of_each_shot_through_the_session(
+    mocker: MockerFixture, tmp_path, write_video
+):
+    """Given a video of three shots and an OpenCVVideoSession opened on it
+    When selecting frames using the SceneChangeFrameSelector
+    Then it should select the first frame of each shot, reading the video through
+        the capture of the session
+    """
+
+    # Given
+    temp_file = TempFile(path=str(tmp_path / "video.avi"))
+    write_video(temp_file.path, frames=_shot_frames())
+    session = OpenCVVideoSessionOpener().open(temp_file)
+    video_capture = mocker.spy(cv2, "VideoCapture")
+    selector = SceneChangeFrameSelector(_settings(mocker))
+
+    # When
+    selection = selector.select(_metadata(temp_file.path), video_session=session)
+
+    # Then
+    assert selection.indexes == [0, 10, 25]
+    video_capture.assert_called_once_with(temp_file.path)
+    assert session.capture.isOpened()
+    session.close()
+
+
+@pytest.mark.parametrize(
+    "min_frames, max_frames, expected_indexes",
+    [
+        # The cuts beyond the maximum are dropped
+        (1, 2, [0, 10]),
+        # The largest gaps are filled, ending with the last frame
+        (5, 10, [0, 10, 17, 25, 39]),
+    ],
+)
+def test_should_keep_selection_within_frame_budget(
+    mocker: MockerFixture,
+    tmp_path,
+    write_video,
+    min_frames: int,
+    max_frames: int,
+    expected_indexes: list[int],
+):
+    """Given a video of three shots and a minimum and maximum number of frames
+    When selecting frames using the SceneChangeFrameSelector without a session
+    Then it should open the video itself and select a number of frames within the
+        budget
+    """
+
+    # Given
+    path = str(tmp_path / "video.avi")
+    write_video(path, frames=_shot_frames())
+    selector = SceneChangeFrameSelector(_settings(mocker, min_frames, max_frames))
+
+    # When
+    selection = selector.select(_metadata(path))
+
+    # Then
+    assert selection.indexes == expected_indexes
+
+
+def test_should_raise_error_if_video_cannot_be_opened(mocker: MockerFixture, tmp_path):
+    """Given a path that is not a video
+    When selecting frames using the SceneChangeFrameSelector
+    Then it should raise a FrameSelectionError
+    """
+
+    # Given
+    selector = SceneChangeFrameSelector(_settings(mocker))
+
+    # When / Then
+    with pytest.raises(FrameSelectionError):
+        selector.select(_metadata(str(tmp_path / "missing.avi")))
@@ -21,12 +21,12 @@ def test_should_publish_event_to_sns(mocker: MockerFixture):
     # Given
     event_id = UUID("12345678-1234-5678-1234-567812345678")
     mock_sns_client = mocker.Mock()
-    boto_session = mocker.Mock()
-    boto_session.client.return_value = mock_sns_client
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_sns_client
     settings = mocker.Mock()
     settings.TOPIC_ARN = "arn:aws:sns:us-east-1:123456789012:my-topic"
     settings.GROUP_ID = "my-group"
-    publisher = SnsEventPublisher(boto_session=boto_session, settings=settings)
+    publisher = SnsEventPublisher(client_factory=client_factory, settings=settings)
     event = VideoProcessingStartedEvent(
         id=event_id,
         version=1,
@@ -38,7 +38,7 @@ def test_should_publish_event_to_sns(mocker: MockerFixture):
     publisher.publish(event)
 
     # Then
-    boto_session.client.assert_called_once_with("sns")
+    client_factory.client.assert_called_once_with("sns")
     mock_sns_client.publish.assert_called_once_with(
         TopicArn=settings.TOPIC_ARN,
         Message=event.model_dump_json(),
@@ -67,12 +67,12 @@ def test_should_raise_error_on_publish_failure(mocker: MockerFixture):
         },
         operation_name="Publish",
     )
-    boto_session = mocker.Mock()
-    boto_session.client.return_value = mock_sns_client
+    client_factory = mocker.Mock()
+    client_factory.client.return_value = mock_sns_client
     settings = mocker.Mock()
     settings.TOPIC_ARN = "arn:aws:sns:us-east-1:123456789012:my-topic"
     settings.GROUP_ID = "my-group"
-    publisher = SnsEventPublisher(boto_session=boto_session, settings=settings)
+    publisher = SnsEventPublisher(client_factory=client_factory, settings=settings)
     event = VideoProcessingStartedEvent(
         id=UUID("12345678-1234-5678-1234-567812345678"),
         version=1,
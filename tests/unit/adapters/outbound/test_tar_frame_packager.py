@@ -0,0 +1,136 @@
+"""Tests for the TarFramePackager class"""
+
+import io
+import tarfile
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import TarFramePackager
+from video_processor.domain.exceptions import FramePackagingError
+from video_processor.domain.value_objects import FileContent, RawFrame, TempFile
+
+
+def test_should_package_frames_into_tar(mocker: MockerFixture, tmp_path):
+    """Given a list of RawFrame objects
+    When packaging the frames using TarFramePackager
+    Then it should return a FileContent object referring to the tar file left in a
+        temporary file
+    """
+
+    # Given
+    temp_file_manager = mocker.Mock()
+    temp_file = TempFile(path=str(tmp_path / "temp.tar"))
+    temp_file_manager.create.return_value = temp_file
+    packager = TarFramePackager(temp_file_manager)
+    frames = [
+        RawFrame(index=0, filename="frame_0.jpg", content=b"frame0_content"),
+        RawFrame(
+            index=1,
+            filename="frame_1.jpg",
+            content=memoryview(b"frame1_content").toreadonly(),
+        ),
+    ]
+
+    # When
+    result = packager.package(iter(frames))
+
+    # Then
+    assert isinstance(result, FileContent)
+    assert result.local_path == temp_file.path
+    with tarfile.open(temp_file.path) as tar_file:
+        assert tar_file.getnames() == ["frame_0.jpg", "frame_1.jpg"]
+        assert tar_file.extractfile("frame_1.jpg").read() == b"frame1_content"
+
+    temp_file_manager.create.assert_called_once_with(b"", suffix=".tar")
+    temp_file_manager.delete.assert_not_called()
+
+
+def test_should_package_frames_into_upload_unpackable_as_stream(
+    mocker: MockerFixture,
+):
+    """Given a list of RawFrame objects and an upload
+    When packaging the frames into the upload using TarFramePackager
+    Then it should write a tar file that can be unpacked while it is read
+    """
+
+    # Given
+    packager = TarFramePackager(mocker.Mock())
+    frames = [
+        RawFrame(index=index, filename=f"frame_{index}.jpg", content=bytes([index]))
+        for index in range(3)
+    ]
+    written = io.BytesIO()
+    upload = mocker.Mock()
+    upload.write.side_effect = written.write
+
+    # When
+    packager.package_to_upload(iter(frames), upload)
+
+    # Then
+    written.seek(0)
+    with tarfile.open(fileobj=written, mode="r|") as tar_file:
+        assert [
+            (member.name, tar_file.extractfile(member).read()) for member in tar_file
+        ] == [(frame.filename, frame.content) for frame in frames]
+
+    upload.complete.assert_not_called()
+
+
+def test_should_write_frame_contents_into_upload_without_copying(
+    mocker: MockerFixture,
+):
+    """Given frames holding read-only memoryviews and an upload
+    When packaging the frames into the upload using TarFramePackager
+    Then it should write each memoryview itself into the upload, and pad the archive
+        to whole tar records
+    """
+
+    # Given
+    packager = TarFramePackager(mocker.Mock())
+    frames = [
+        RawFrame(
+            index=index,
+            filename=f"frame_{index}.jpg",
+            content=memoryview(bytes([index]) * 700).toreadonly(),
+        )
+        for index in range(3)
+    ]
+    written = []
+    upload = mocker.Mock()
+    upload.write.side_effect = lambda data: written.append(data) or len(data)
+
+    # When
+    packager.package_to_upload(iter(frames), upload)
+
+    # Then
+    for frame in frames:
+        assert any(data is frame.content for data in written)
+
+    assert sum(len(data) for data in written) % tarfile.RECORDSIZE == 0
+
+
+def test_should_raise_error_on_packaging_failure(mocker: MockerFixture, tmp_path):
+    """Given a list of RawFrame objects
+    When an error occurs during packaging using TarFramePackager
+    Then it should delete the temporary file and raise a FramePackagingError
+    """
+
+    # Given
+    temp_file_manager = mocker.Mock()
+    temp_file = TempFile(path=str(tmp_path / "temp.tar"))
+    temp_file_manager.create.return_value = temp_file
+    packager = TarFramePackager(temp_file_manager)
+
+    def frames():
+        yield RawFrame(index=0, filename="frame_0.jpg", content=b"frame0_content")
+        raise OSError("No space left on device")
+
+    # When / Then
+    with pytest.raises(FramePackagingError) as exc_info:
+        packager.package(frames())
+
+    assert str(exc_info.value) == (
+        "An error occurred during frame packaging: No space left on device"
+    )
+    temp_file_manager.delete.assert_called_once_with(temp_file)
@@ -3,9 +3,19 @@
 import pytest
 from pytest_mock import MockerFixture
 
-from video_processor.adapters.outbound import VideoSizeValidator
+from video_processor.adapters.outbound import (
+    VideoContainerValidator,
+    VideoContentTypeValidator,
+    VideoObjectSizeValidator,
+    VideoSizeValidator,
+)
 from video_processor.domain.exceptions import VideoValidationError
 from video_processor.domain.ports import VideoMetadata
+from video_processor.domain.value_objects import (
+    StoredFileInfo,
+    VideoProbe,
+    VideoValidationCost,
+)
 
 
 def test_should_do_nothing_if_video_size_is_within_limit(mocker: MockerFixture):
@@ -56,3 +66,143 @@ def test_should_raise_error_if_video_size_exceeds_limit(mocker: MockerFixture):
         "Video file size 15728640 bytes exceeds the maximum allowed size of "
         "10485760 bytes."
     )
+
+
+def test_should_reject_oversized_video_before_download(mocker: MockerFixture):
+    """Given a video probe with size exceeding the allowed limit
+    When validating it using VideoObjectSizeValidator
+    Then it should raise a VideoValidationError with an appropriate message
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.MAX_SIZE_IN_BYTES = 10 * 1024 * 1024  # 10 MB
+    validator = VideoObjectSizeValidator(settings)
+    probe = VideoProbe(
+        file_info=StoredFileInfo(path="video.mp4", size_in_bytes=15 * 1024 * 1024)
+    )
+
+    # When / Then
+    with pytest.raises(VideoValidationError) as exc_info:
+        validator.validate(probe)
+
+    assert validator.cost == VideoValidationCost.OBJECT_INFO
+    assert str(exc_info.value) == (
+        "Video file size 15728640 bytes exceeds the maximum allowed size of "
+        "10485760 bytes."
+    )
+
+
+def test_should_reject_empty_video_before_download(mocker: MockerFixture):
+    """Given a video probe of an empty file
+    When validating it using VideoObjectSizeValidator
+    Then it should raise a VideoValidationError
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.MAX_SIZE_IN_BYTES = 10 * 1024 * 1024  # 10 MB
+    validator = VideoObjectSizeValidator(settings)
+    probe = VideoProbe(file_info=StoredFileInfo(path="video.mp4", size_in_bytes=0))
+
+    # When / Then
+    with pytest.raises(VideoValidationError) as exc_info:
+        validator.validate(probe)
+
+    assert str(exc_info.value) == "Video file is empty."
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    [None, "video/mp4", "video/quicktime; charset=binary", "binary/octet-stream"],
+)
+def test_should_accept_allowed_content_types(mocker: MockerFixture, content_type):
+    """Given a video probe with an allowed or missing content type
+    When validating it using VideoContentTypeValidator
+    Then it should not raise any exceptions
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.ALLOWED_CONTENT_TYPES = ["video/*", "binary/octet-stream"]
+    validator = VideoContentTypeValidator(settings)
+    probe = VideoProbe(
+        file_info=StoredFileInfo(
+            path="video.mp4", size_in_bytes=1024, content_type=content_type
+        )
+    )
+
+    # When / Then
+    validator.validate(probe)
+
+
+def test_should_reject_disallowed_content_type(mocker: MockerFixture):
+    """Given a video probe with a content type that is not allowed
+    When validating it using VideoContentTypeValidator
+    Then it should raise a VideoValidationError
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.ALLOWED_CONTENT_TYPES = ["video/*"]
+    validator = VideoContentTypeValidator(settings)
+    probe = VideoProbe(
+        file_info=StoredFileInfo(
+            path="video.mp4", size_in_bytes=1024, content_type="image/png"
+        )
+    )
+
+    # When / Then
+    with pytest.raises(VideoValidationError) as exc_info:
+        validator.validate(probe)
+
+    assert str(exc_info.value) == "Video file content type image/png is not allowed."
+
+
+@pytest.mark.parametrize(
+    "header, container",
+    [
+        (b"\x00\x00\x00\x20ftypisom\x00\x00\x02\x00", "iso-bmff"),
+        (b"\x00\x00\x00\x08free\x00\x00\x00\x20ftyp", "iso-bmff"),
+        (b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81", "matroska"),
+        (b"RIFF\x24\x00\x00\x00AVI LIST", "avi"),
+        (b"\x47" + bytes(187) + b"\x47", "mpeg-ts"),
+        (b"FLV\x01\x05", "flv"),
+        (b"\x89PNG\r\n\x1a\n", None),
+        (b"", None),
+    ],
+)
+def test_should_detect_container_from_header(header, container):
+    """Given the first bytes of a file
+    When detecting its container using VideoContainerValidator
+    Then it should return the matching container name or None
+    """
+
+    # When / Then
+    assert VideoContainerValidator.detect_container(header) == container
+
+
+def test_should_reject_unknown_container(mocker: MockerFixture):
+    """Given a video probe whose header does not belong to a video container
+    When validating it using VideoContainerValidator
+    Then it should raise a VideoValidationError
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.HEADER_PROBE_SIZE_IN_BYTES = 512
+    validator = VideoContainerValidator(settings)
+    probe = VideoProbe(
+        file_info=StoredFileInfo(path="video.mp4", size_in_bytes=1024),
+        header=b"%PDF-1.7",
+    )
+
+    # When / Then
+    with pytest.raises(VideoValidationError) as exc_info:
+        validator.validate(probe)
+
+    assert validator.cost == VideoValidationCost.CONTAINER_HEADER
+    assert validator.header_size == 512
+    assert str(exc_info.value) == (
+        "Video file header does not match any supported container format."
+    )
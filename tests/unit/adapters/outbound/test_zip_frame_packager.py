@@ -1,24 +1,38 @@
 """Tests for the ZipFramePackager class"""
 
+import io
+import random
 import zipfile
+import zlib
 
 import pytest
 from pytest_mock import MockerFixture
 
-from video_processor.adapters.outbound import ZIPFramePackager
-from video_processor.domain.exceptions import FramePackagingError
-from video_processor.domain.value_objects import FileContent, RawFrame, TempFile
+from video_processor.adapters.outbound import (
+    SplitZIPFramePackager,
+    ZIPFramePackager,
+    zip_frame_packager,
+)
+from video_processor.adapters.outbound.raw_zip_entries import decompress_entry_data
+from video_processor.domain.exceptions import FramePackagingError, StorageError
+from video_processor.domain.value_objects import (
+    FileContent,
+    FrameArchiveManifest,
+    RawFrame,
+    TempFile,
+)
 
 
-def test_should_package_frames_into_zip(mocker: MockerFixture):
+def test_should_package_frames_into_zip(mocker: MockerFixture, tmp_path):
     """Given a list of RawFrame objects
     When packaging the frames using ZIPFramePackager
-    Then it should return a FileContent object with the path and content of the ZIP file
+    Then it should return a FileContent object referring to the ZIP file left in a
+        temporary file, without reading it into memory
     """
 
     # Given
     temp_file_manager = mocker.Mock()
-    temp_file = TempFile(path="temp.zip", content=b"")
+    temp_file = TempFile(path=str(tmp_path / "temp.zip"), content=b"")
     temp_file_manager.create.return_value = temp_file
     packager = ZIPFramePackager(temp_file_manager)
     frames = [
@@ -26,28 +40,20 @@ def test_should_package_frames_into_zip(mocker: MockerFixture):
         RawFrame(index=1, filename="frame2.txt", content=b"frame2_content"),
     ]
 
-    zip_magic = mocker.MagicMock()
-    zip_magic.__enter__.return_value = zip_magic
-    mock_zipfile = mocker.patch(
-        "video_processor.adapters.outbound.zip_frame_packager.zipfile.ZipFile",
-        return_value=zip_magic,
-    )
-
-    mocked_open = mocker.mock_open(read_data=b"fake-zip-content")
-    mocker.patch("builtins.open", mocked_open)
-
     # When
     result = packager.package(frames)
 
     # Then
     assert isinstance(result, FileContent)
-    assert result.path == "temp.zip"
-    assert result.content == b"fake-zip-content"
-    mock_zipfile.assert_called_once_with("temp.zip", mode="w")
-    zip_magic.writestr.assert_any_call("frame1.txt", b"frame1_content")
-    zip_magic.writestr.assert_any_call("frame2.txt", b"frame2_content")
+    assert result.path == temp_file.path
+    assert result.local_path == temp_file.path
+    assert result.content is None
+    with zipfile.ZipFile(temp_file.path) as zip_file:
+        assert zip_file.read("frame1.txt") == b"frame1_content"
+        assert zip_file.read("frame2.txt") == b"frame2_content"
+
     temp_file_manager.create.assert_called_once_with(b"", suffix=".zip")
-    temp_file_manager.delete.assert_called_once_with(temp_file)
+    temp_file_manager.delete.assert_not_called()
 
 
 def test_should_raise_error_on_packaging_failure(mocker: MockerFixture):
@@ -81,3 +87,495 @@ def test_should_raise_error_on_packaging_failure(mocker: MockerFixture):
     temp_file_manager.create.assert_called_once_with(b"", suffix=".zip")
     temp_file_manager.delete.assert_called_once_with(temp_file)
     mock_zipfile.writestr.assert_not_called()
+
+
+def test_should_package_frames_held_as_memoryviews(mocker: MockerFixture, tmp_path):
+    """Given RawFrame objects whose content is a read-only memoryview
+    When packaging the frames using ZIPFramePackager
+    Then it should write their content to the ZIP file
+    """
+
+    # Given
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.create.return_value = TempFile(path=str(tmp_path / "temp.zip"))
+    packager = ZIPFramePackager(temp_file_manager)
+    frames = [
+        RawFrame(
+            index=0,
+            filename="frame_0.jpg",
+            content=memoryview(bytearray(b"frame0_content")).toreadonly(),
+        ),
+    ]
+
+    # When
+    packager.package(frames)
+
+    # Then
+    with zipfile.ZipFile(tmp_path / "temp.zip") as zip_file:
+        assert zip_file.read("frame_0.jpg") == b"frame0_content"
+
+
+def test_should_package_frames_into_upload(mocker: MockerFixture):
+    """Given a list of RawFrame objects and an upload
+    When packaging the frames into the upload using ZIPFramePackager
+    Then it should write a valid ZIP file into the upload without a temporary file,
+        with the manifest after the frames
+    """
+
+    # Given
+    temp_file_manager = mocker.Mock()
+    packager = ZIPFramePackager(temp_file_manager)
+    frames = [
+        RawFrame(index=0, filename="frame_0.jpg", content=b"frame0_content"),
+        RawFrame(index=1, filename="frame_1.jpg", content=b"frame1_content"),
+    ]
+    written = io.BytesIO()
+    upload = mocker.Mock()
+    upload.write.side_effect = written.write
+
+    # When
+    packager.package_to_upload(iter(frames), upload)
+
+    # Then
+    with zipfile.ZipFile(written) as zip_file:
+        assert zip_file.namelist() == ["frame_0.jpg", "frame_1.jpg", "manifest.json"]
+        assert zip_file.read("frame_1.jpg") == b"frame1_content"
+
+    upload.complete.assert_not_called()
+    temp_file_manager.create.assert_not_called()
+
+
+@pytest.mark.parametrize("compression_threads", [0, 2])
+@pytest.mark.parametrize("to_upload", [False, True])
+def test_should_compress_entries_following_compression_policy(
+    mocker: MockerFixture, tmp_path, compression_threads: int, to_upload: bool
+):
+    """Given frames of several image formats and a compression policy by extension
+    When packaging the frames using ZIPFramePackager, with or without compression
+        threads, into a temporary file or an upload
+    Then it should write a valid ZIP file, in frame order, whose entries are
+        compressed with the method of their extension
+    """
+
+    # Given
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.create.return_value = TempFile(path=str(tmp_path / "temp.zip"))
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {
+        "jpg": "stored",
+        "PNG": "deflate:9",
+        "*": "bzip2:1",
+    }
+    settings.COMPRESSION_THREADS = compression_threads
+    settings.WRITE_MANIFEST = False
+    packager = ZIPFramePackager(temp_file_manager, settings)
+    frames = [
+        RawFrame(index=index, filename=f"frame_{index}.{extension}", content=content)
+        for index, (extension, content) in enumerate(
+            [
+                ("jpg", b"jpeg" * 100),
+                ("png", memoryview(b"png" * 100).toreadonly()),
+                ("bmp", b"bmp" * 100),
+            ]
+            * 3
+        )
+    ]
+    written = io.BytesIO()
+    upload = mocker.Mock()
+    upload.write.side_effect = written.write
+
+    # When
+    if to_upload:
+        packager.package_to_upload(iter(frames), upload)
+        archive = written
+    else:
+        archive = packager.package(iter(frames)).local_path
+
+    # Then
+    with zipfile.ZipFile(archive) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == [frame.filename for frame in frames]
+        assert [entry.compress_type for entry in zip_file.infolist()[:3]] == [
+            zipfile.ZIP_STORED,
+            zipfile.ZIP_DEFLATED,
+            zipfile.ZIP_BZIP2,
+        ]
+        assert all(
+            zip_file.read(frame.filename) == bytes(frame.content) for frame in frames
+        )
+
+
+@pytest.mark.parametrize("compression_threads", [0, 2])
+def test_should_write_manifest_locating_each_frame(
+    mocker: MockerFixture, tmp_path, compression_threads: int
+):
+    """Given frames with their timestamp, some of them compressed
+    When packaging the frames using ZIPFramePackager
+    Then it should write a manifest after the frames giving the index, timestamp,
+        CRC, compression and location of the stored data of each frame
+    """
+
+    # Given
+    temp_file_manager = mocker.Mock()
+    temp_file_manager.create.return_value = TempFile(path=str(tmp_path / "temp.zip"))
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"jpg": "stored", "*": "deflate:6"}
+    settings.COMPRESSION_THREADS = compression_threads
+    settings.WRITE_MANIFEST = True
+    packager = ZIPFramePackager(temp_file_manager, settings)
+    frames = [
+        RawFrame(
+            index=index * 10,
+            filename=f"frame_{index * 10}.{'jpg' if index % 2 else 'bmp'}",
+            content=bytes([index]) * 100,
+            timestamp=index / 3,
+        )
+        for index in range(4)
+    ]
+
+    # When
+    packager.package(iter(frames))
+
+    # Then
+    archive = (tmp_path / "temp.zip").read_bytes()
+    with zipfile.ZipFile(tmp_path / "temp.zip") as zip_file:
+        assert zip_file.namelist()[-1] == "manifest.json"
+        manifest = FrameArchiveManifest.model_validate_json(
+            zip_file.read("manifest.json")
+        )
+        infos = zip_file.infolist()
+
+    assert [
+        (entry.index, entry.filename, entry.timestamp) for entry in manifest.frames
+    ] == [(frame.index, frame.filename, frame.timestamp) for frame in frames]
+    for entry, info, frame in zip(manifest.frames, infos, frames):
+        assert entry.header_offset == info.header_offset
+        assert entry.compression == info.compress_type
+        assert entry.crc == zlib.crc32(frame.content)
+        data = archive[entry.offset : entry.offset + entry.size]
+        if entry.compression == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+        assert data == frame.content
+
+
+def test_should_reject_unknown_compression_method(mocker: MockerFixture):
+    """Given a compression policy with an unknown method
+    When creating a ZIPFramePackager
+    Then it should raise a ValueError
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"*": "brotli"}
+    settings.COMPRESSION_THREADS = 0
+
+    # When / Then
+    with pytest.raises(ValueError, match="Unknown compression method 'brotli'"):
+        ZIPFramePackager(mocker.Mock(), settings)
+
+
+def test_should_package_frames_into_upload_of_output_path(mocker: MockerFixture):
+    """Given a list of RawFrame objects and an output storage
+    When packaging the frames into the output storage using ZIPFramePackager
+    Then it should write the ZIP file into an upload of the destination path and
+        complete it
+    """
+
+    # Given
+    packager = ZIPFramePackager(mocker.Mock())
+    frames = [RawFrame(index=0, filename="frame_0.jpg", content=b"frame0_content")]
+    written = io.BytesIO()
+    output_storage = mocker.Mock()
+    upload = output_storage.open_upload.return_value
+    upload.write.side_effect = written.write
+
+    # When
+    packager.package_to_output(iter(frames), output_storage, "s3://bucket/video.zip")
+
+    # Then
+    output_storage.open_upload.assert_called_once_with("s3://bucket/video.zip")
+    upload.complete.assert_called_once_with()
+    upload.abort.assert_not_called()
+    with zipfile.ZipFile(written) as zip_file:
+        assert zip_file.read("frame_0.jpg") == b"frame0_content"
+
+
+@pytest.mark.parametrize(
+    "failing_step, error",
+    [
+        ("write", StorageError("Failed to upload file part")),
+        ("complete", StorageError("Failed to upload file")),
+    ],
+)
+def test_should_abort_upload_of_output_path_on_failure(
+    mocker: MockerFixture, failing_step: str, error: Exception
+):
+    """Given a list of RawFrame objects and an output storage
+    When packaging the frames into the output storage using ZIPFramePackager and
+        writing or completing the upload fails
+    Then it should abort the upload and raise the error
+    """
+
+    # Given
+    packager = ZIPFramePackager(mocker.Mock())
+    frames = [RawFrame(index=0, filename="frame_0.jpg", content=b"frame0_content")]
+    output_storage = mocker.Mock()
+    upload = output_storage.open_upload.return_value
+    upload.write.side_effect = len
+    getattr(upload, failing_step).side_effect = error
+
+    # When
+    with pytest.raises(StorageError) as exc_info:
+        packager.package_to_output(iter(frames), output_storage, "video.zip")
+
+    # Then
+    assert exc_info.value is error
+    upload.abort.assert_called_once_with()
+
+
+@pytest.mark.parametrize("compression_threads", [0, 2])
+@pytest.mark.parametrize("write_manifest", [False, True])
+def test_should_split_frames_into_parts_of_maximum_size(
+    mocker: MockerFixture, compression_threads: int, write_manifest: bool
+):
+    """Given frames and a maximum part size of a few frames
+    When packaging the frames into the output storage using SplitZIPFramePackager,
+        with or without manifest
+    Then it should upload complete ZIP files of at most the maximum size under the
+        destination path, holding the frames in order and their own manifest
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"*": "stored"}
+    settings.COMPRESSION_THREADS = compression_threads
+    settings.WRITE_MANIFEST = write_manifest
+    settings.MAX_PART_SIZE_IN_BYTES = 1000
+    packager = SplitZIPFramePackager(mocker.Mock(), settings)
+    frames = [
+        RawFrame(index=index, filename=f"frame_{index}.jpg", content=bytes(150))
+        for index in range(10)
+    ]
+    parts: dict[str, io.BytesIO] = {}
+
+    def open_upload(destination_path: str):
+        written = parts[destination_path] = io.BytesIO()
+        upload = mocker.Mock()
+        upload.write.side_effect = written.write
+        return upload
+
+    output_storage = mocker.Mock()
+    output_storage.open_upload.side_effect = open_upload
+
+    # When
+    packager.package_to_output(iter(frames), output_storage, "s3://bucket/video/")
+
+    # Then
+    assert len(parts) > 1
+    assert list(parts) == [
+        f"s3://bucket/video/part-{number:04d}.zip"
+        for number in range(1, len(parts) + 1)
+    ]
+    names = []
+    for written in parts.values():
+        assert len(written.getvalue()) <= 1000
+        with zipfile.ZipFile(written) as zip_file:
+            assert zip_file.testzip() is None
+            part_names = zip_file.namelist()
+            if write_manifest:
+                assert part_names.pop() == "manifest.json"
+                manifest = FrameArchiveManifest.model_validate_json(
+                    zip_file.read("manifest.json")
+                )
+                assert [entry.filename for entry in manifest.frames] == part_names
+
+            names += part_names
+
+    assert names == [frame.filename for frame in frames]
+
+
+def test_should_write_frame_larger_than_maximum_size_alone_in_part(
+    mocker: MockerFixture,
+):
+    """Given a frame larger than the maximum part size
+    When packaging the frames into the output storage using SplitZIPFramePackager
+    Then it should write the frame alone in its part
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"*": "stored"}
+    settings.COMPRESSION_THREADS = 0
+    settings.MAX_PART_SIZE_IN_BYTES = 100
+    packager = SplitZIPFramePackager(mocker.Mock(), settings)
+    frames = [
+        RawFrame(index=0, filename="frame_0.jpg", content=bytes(10)),
+        RawFrame(index=1, filename="frame_1.jpg", content=bytes(1000)),
+    ]
+    output_storage = mocker.Mock()
+    output_storage.open_upload.return_value.write.side_effect = len
+
+    # When
+    packager.package_to_output(iter(frames), output_storage, "video/")
+
+    # Then
+    assert output_storage.open_upload.call_args_list == [
+        mocker.call("video/part-0001.zip"),
+        mocker.call("video/part-0002.zip"),
+    ]
+    assert output_storage.open_upload.return_value.complete.call_count == 2
+
+
+def test_should_abort_failing_part(mocker: MockerFixture):
+    """Given frames split into several parts
+    When packaging the frames into the output storage using SplitZIPFramePackager
+        and uploading the second part fails
+    Then it should abort that part, keep the completed first part and raise the
+        error
+    """
+
+    # Given
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"*": "stored"}
+    settings.COMPRESSION_THREADS = 2
+    settings.MAX_PART_SIZE_IN_BYTES = 100
+    packager = SplitZIPFramePackager(mocker.Mock(), settings)
+    frames = [
+        RawFrame(index=index, filename=f"frame_{index}.jpg", content=bytes(80))
+        for index in range(3)
+    ]
+    first_upload, second_upload = mocker.Mock(), mocker.Mock()
+    first_upload.write.side_effect = len
+    second_upload.write.side_effect = StorageError("Failed to upload file part")
+    output_storage = mocker.Mock()
+    output_storage.open_upload.side_effect = [first_upload, second_upload]
+
+    # When
+    with pytest.raises(StorageError):
+        packager.package_to_output(iter(frames), output_storage, "video/")
+
+    # Then
+    first_upload.complete.assert_called_once_with()
+    first_upload.abort.assert_not_called()
+    second_upload.complete.assert_not_called()
+    second_upload.abort.assert_called_once_with()
+
+
+@pytest.mark.parametrize("compression_threads", [0, 2])
+def test_should_write_entries_raw_only_when_compressed_on_threads(
+    mocker: MockerFixture, compression_threads: int
+):
+    """Given frames stored or compressed following the compression policy
+    When packaging the frames into an upload using ZIPFramePackager, with or without
+        compression threads
+    Then it should write the entries compressed on threads as they are, and every
+        other entry through zipfile
+    """
+
+    # Given
+    write_raw_entry = mocker.patch(
+        "video_processor.adapters.outbound.zip_frame_packager.write_raw_entry",
+        wraps=zip_frame_packager.write_raw_entry,
+    )
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"jpg": "stored", "*": "deflate:6"}
+    settings.COMPRESSION_THREADS = compression_threads
+    settings.WRITE_MANIFEST = True
+    packager = ZIPFramePackager(mocker.Mock(), settings)
+    frames = [
+        RawFrame(
+            index=index,
+            filename=f"frame_{index}.{'jpg' if index % 2 else 'bmp'}",
+            content=bytes([index]) * 100,
+        )
+        for index in range(4)
+    ]
+    written = io.BytesIO()
+    upload = mocker.Mock()
+    upload.write.side_effect = written.write
+
+    # When
+    packager.package_to_upload(iter(frames), upload)
+
+    # Then
+    raw_names = [call.args[1].filename for call in write_raw_entry.call_args_list]
+    assert raw_names == (["frame_0.bmp", "frame_2.bmp"] if compression_threads else [])
+    with zipfile.ZipFile(written) as zip_file:
+        assert zip_file.testzip() is None
+        assert all(zip_file.read(frame.filename) == frame.content for frame in frames)
+
+
+def test_should_package_without_raw_entries_on_untested_python(
+    mocker: MockerFixture,
+):
+    """Given a Python version the raw ZIP entries were not tested with, and frames of
+        incompressible data to compress
+    When packaging the frames into an upload and into parts using ZIPFramePackager
+        and SplitZIPFramePackager with compression threads
+    Then it should compress the entries while writing them through zipfile, with a
+        manifest locating them, and keep the parts under the maximum size
+    """
+
+    # Given
+    mocker.patch(
+        "video_processor.adapters.outbound.zip_frame_packager."
+        "check_raw_entries_supported",
+        side_effect=RuntimeError("Raw ZIP entries are not tested with Python 3.99"),
+    )
+    write_raw_entry = mocker.patch(
+        "video_processor.adapters.outbound.zip_frame_packager.write_raw_entry"
+    )
+    settings = mocker.Mock()
+    settings.COMPRESSION_POLICY = {"*": "lzma"}
+    settings.COMPRESSION_THREADS = 2
+    settings.WRITE_MANIFEST = True
+    settings.MAX_PART_SIZE_IN_BYTES = 5000
+    rng = random.Random(0)
+    frames = [
+        RawFrame(
+            index=index, filename=f"frame_{index}.bin", content=rng.randbytes(1000)
+        )
+        for index in range(10)
+    ]
+    written = io.BytesIO()
+    upload = mocker.Mock()
+    upload.write.side_effect = written.write
+    parts: dict[str, io.BytesIO] = {}
+
+    def open_upload(destination_path: str):
+        part = parts[destination_path] = io.BytesIO()
+        part_upload = mocker.Mock()
+        part_upload.write.side_effect = part.write
+        return part_upload
+
+    output_storage = mocker.Mock()
+    output_storage.open_upload.side_effect = open_upload
+
+    # When
+    ZIPFramePackager(mocker.Mock(), settings).package_to_upload(iter(frames), upload)
+    SplitZIPFramePackager(mocker.Mock(), settings).package_to_output(
+        iter(frames), output_storage, "video/"
+    )
+
+    # Then
+    write_raw_entry.assert_not_called()
+    archive = written.getvalue()
+    with zipfile.ZipFile(written) as zip_file:
+        manifest = FrameArchiveManifest.model_validate_json(
+            zip_file.read("manifest.json")
+        )
+        assert all(zip_file.read(frame.filename) == frame.content for frame in frames)
+
+    for entry, frame in zip(manifest.frames, frames):
+        data = archive[entry.offset : entry.offset + entry.size]
+        assert decompress_entry_data(data, entry.compression) == frame.content
+
+    assert len(parts) > 1
+    names = []
+    for part in parts.values():
+        assert len(part.getvalue()) <= 5000
+        with zipfile.ZipFile(part) as zip_file:
+            assert zip_file.testzip() is None
+            names += zip_file.namelist()[:-1]
+
+    assert names == [frame.filename for frame in frames]
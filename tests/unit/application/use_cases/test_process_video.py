@@ -27,9 +27,12 @@ from video_processor.domain.value_objects import (
     FileContent,
     FrameSelection,
     RawFrame,
+    StoredFileInfo,
     TempFile,
     VideoMetadata,
+    VideoProbe,
     VideoProcessingStatus,
+    VideoValidationCost,
 )
 
 
@@ -44,7 +47,6 @@ def test_should_process_video(mocker: MockerFixture):
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -80,7 +82,7 @@ def test_should_process_video(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     frame_selector_mock.select = mocker.Mock(return_value=frame_selection)
@@ -103,15 +105,21 @@ def test_should_process_video(mocker: MockerFixture):
     process_video_use_case.execute(command)
 
     # Then
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
-    frame_selector_mock.select.assert_called_once_with(metadata)
-    frame_extractor_mock.extract.assert_called_once_with(temp_file, frame_selection)
+    frame_selector_mock.select.assert_called_once_with(metadata, video_session=None)
+    frame_extractor_mock.extract.assert_called_once_with(
+        temp_file, frame_selection, video_session=None, metadata=metadata
+    )
     frame_packager.package.assert_called_once_with(frames_iter)
     dp = f"s3://video2frames-extracted-frames/{video_id}.zip"
     output_storage_mock.upload_file.assert_called_once_with(
@@ -185,7 +193,7 @@ def test_should_raise_invalid_transition_error_when_starting_processing(
 
     assert str(exc.value) == expected_message
     start_processing_mock.assert_called_once_with()
-    input_storage_mock.download_file.assert_not_called()
+    input_storage_mock.download_to_file.assert_not_called()
     temp_file_manager.create.assert_not_called()
     video_metadata_reader_mock.read.assert_not_called()
     video_validator_mock.validate.assert_not_called()
@@ -209,6 +217,7 @@ def test_should_fail_with_download_file_storage_error(mocker: MockerFixture):
     # Given
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     upload_path = "uploads/video123.mp4"
+    temp_file = TempFile(path="temp_video.mp4")
 
     command = ProcessVideoCommand(
         video_id=video_id,
@@ -225,7 +234,8 @@ def test_should_fail_with_download_file_storage_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(
+    temp_file_manager.create = mocker.Mock(return_value=temp_file)
+    input_storage_mock.download_to_file = mocker.Mock(
         side_effect=StorageError("Failed to download file")
     )
 
@@ -247,15 +257,19 @@ def test_should_fail_with_download_file_storage_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Failed to download file"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
-    temp_file_manager.create.assert_not_called()
+    temp_file_manager.create.assert_called_once_with(
+        content=b"", suffix="mp4", size_hint=None
+    )
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     video_metadata_reader_mock.read.assert_not_called()
     video_validator_mock.validate.assert_not_called()
     frame_selector_mock.select.assert_not_called()
     frame_extractor_mock.extract.assert_not_called()
     frame_packager.package.assert_not_called()
     output_storage_mock.upload_file.assert_not_called()
-    temp_file_manager.delete.assert_not_called()
+    temp_file_manager.delete.assert_called_once_with(temp_file)
     published_events = event_publisher_mock.publish.call_args_list
     assert len(published_events) == 2
     assert isinstance(published_events[0].args[0], VideoProcessingStartedEvent) is True
@@ -271,9 +285,7 @@ def test_should_fail_with_temp_file_creation_error(mocker: MockerFixture):
 
     # Given
     video_id = UUID("12345678-1234-5678-1234-567812345678")
-    video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     command = ProcessVideoCommand(
         video_id=video_id,
         upload_path=upload_path,
@@ -289,7 +301,7 @@ def test_should_fail_with_temp_file_creation_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(
         side_effect=TempFileManagerError("Failed to create temp file")
     )
@@ -312,10 +324,10 @@ def test_should_fail_with_temp_file_creation_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Failed to create temp file"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
+    input_storage_mock.download_to_file.assert_not_called()
     video_metadata_reader_mock.read.assert_not_called()
     video_validator_mock.validate.assert_not_called()
     frame_selector_mock.select.assert_not_called()
@@ -338,9 +350,7 @@ def test_should_fail_with_video_metadata_reading_error(mocker: MockerFixture):
 
     # Given
     video_id = UUID("12345678-1234-5678-1234-567812345678")
-    video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     command = ProcessVideoCommand(
         video_id=video_id,
@@ -357,7 +367,7 @@ def test_should_fail_with_video_metadata_reading_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(
         side_effect=VideoMetadataReadingError("Failed to read video metadata")
@@ -381,12 +391,16 @@ def test_should_fail_with_video_metadata_reading_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Failed to read video metadata"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_not_called()
     frame_selector_mock.select.assert_not_called()
     frame_extractor_mock.extract.assert_not_called()
@@ -410,7 +424,6 @@ def test_should_fail_with_video_validation_error(mocker: MockerFixture):
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -435,7 +448,7 @@ def test_should_fail_with_video_validation_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     video_validator_mock.validate = mocker.Mock(
@@ -460,12 +473,16 @@ def test_should_fail_with_video_validation_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Video failed validation"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
     frame_selector_mock.select.assert_not_called()
     frame_extractor_mock.extract.assert_not_called()
@@ -489,7 +506,6 @@ def test_should_fail_with_frame_selection_error(mocker: MockerFixture):
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -514,7 +530,7 @@ def test_should_fail_with_frame_selection_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     video_validator_mock.validate = mocker.Mock(return_value=None)
@@ -540,14 +556,18 @@ def test_should_fail_with_frame_selection_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Failed to select frames"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
-    frame_selector_mock.select.assert_called_once_with(metadata)
+    frame_selector_mock.select.assert_called_once_with(metadata, video_session=None)
     frame_extractor_mock.extract.assert_not_called()
     frame_packager.package.assert_not_called()
     output_storage_mock.upload_file.assert_not_called()
@@ -569,7 +589,6 @@ def test_should_fail_with_frame_extraction_error(mocker: MockerFixture):
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -596,7 +615,7 @@ def test_should_fail_with_frame_extraction_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     video_validator_mock.validate = mocker.Mock(return_value=None)
@@ -623,15 +642,21 @@ def test_should_fail_with_frame_extraction_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Failed to extract frames"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
-    frame_selector_mock.select.assert_called_once_with(metadata)
-    frame_extractor_mock.extract.assert_called_once_with(temp_file, frame_selection)
+    frame_selector_mock.select.assert_called_once_with(metadata, video_session=None)
+    frame_extractor_mock.extract.assert_called_once_with(
+        temp_file, frame_selection, video_session=None, metadata=metadata
+    )
     frame_packager.package.assert_not_called()
     output_storage_mock.upload_file.assert_not_called()
     temp_file_manager.delete.assert_called_once_with(temp_file)
@@ -652,7 +677,6 @@ def test_should_fail_with_frame_packaging_error(mocker: MockerFixture):
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -686,7 +710,7 @@ def test_should_fail_with_frame_packaging_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     video_validator_mock.validate = mocker.Mock(return_value=None)
@@ -714,15 +738,21 @@ def test_should_fail_with_frame_packaging_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Failed to package frames"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
-    frame_selector_mock.select.assert_called_once_with(metadata)
-    frame_extractor_mock.extract.assert_called_once_with(temp_file, frame_selection)
+    frame_selector_mock.select.assert_called_once_with(metadata, video_session=None)
+    frame_extractor_mock.extract.assert_called_once_with(
+        temp_file, frame_selection, video_session=None, metadata=metadata
+    )
     frame_packager.package.assert_called_once_with(frames_iter)
     output_storage_mock.upload_file.assert_not_called()
     temp_file_manager.delete.assert_called_once_with(temp_file)
@@ -743,7 +773,6 @@ def test_should_fail_with_upload_output_file_error(mocker: MockerFixture):
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -779,7 +808,7 @@ def test_should_fail_with_upload_output_file_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     video_validator_mock.validate = mocker.Mock(return_value=None)
@@ -808,15 +837,21 @@ def test_should_fail_with_upload_output_file_error(mocker: MockerFixture):
 
     # Then
     assert str(exc.value) == "Failed to upload output file"
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
-    frame_selector_mock.select.assert_called_once_with(metadata)
-    frame_extractor_mock.extract.assert_called_once_with(temp_file, frame_selection)
+    frame_selector_mock.select.assert_called_once_with(metadata, video_session=None)
+    frame_extractor_mock.extract.assert_called_once_with(
+        temp_file, frame_selection, video_session=None, metadata=metadata
+    )
     frame_packager.package.assert_called_once_with(frames_iter)
     dp = f"s3://video2frames-extracted-frames/{video_id}.zip"
     output_storage_mock.upload_file.assert_called_once_with(
@@ -844,7 +879,6 @@ def test_should_raises_invalid_transition_error_when_completing_processing(
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -880,7 +914,7 @@ def test_should_raises_invalid_transition_error_when_completing_processing(
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     video_validator_mock.validate = mocker.Mock(return_value=None)
@@ -921,15 +955,21 @@ def test_should_raises_invalid_transition_error_when_completing_processing(
     )
 
     assert str(exc.value) == expected_message
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
-    frame_selector_mock.select.assert_called_once_with(metadata)
-    frame_extractor_mock.extract.assert_called_once_with(temp_file, frame_selection)
+    frame_selector_mock.select.assert_called_once_with(metadata, video_session=None)
+    frame_extractor_mock.extract.assert_called_once_with(
+        temp_file, frame_selection, video_session=None, metadata=metadata
+    )
     frame_packager.package.assert_called_once_with(frames_iter)
     dp = f"s3://video2frames-extracted-frames/{video_id}.zip"
     output_storage_mock.upload_file.assert_called_once_with(
@@ -993,7 +1033,7 @@ def test_should_raise_event_publishing_error_when_publishing_event(
 
     # Then
     assert str(exc.value) == "Failed to publish event"
-    input_storage_mock.download_file.assert_not_called()
+    input_storage_mock.download_to_file.assert_not_called()
     temp_file_manager.create.assert_not_called()
     video_metadata_reader_mock.read.assert_not_called()
     video_validator_mock.validate.assert_not_called()
@@ -1019,7 +1059,6 @@ def test_should_not_fail_with_temp_file_deletion_error(mocker: MockerFixture):
     video_id = UUID("12345678-1234-5678-1234-567812345678")
     video_content_bytes = b"fake-video-content"
     upload_path = "uploads/video123.mp4"
-    video_content = FileContent(path=upload_path, content=video_content_bytes)
     temp_file = TempFile(path="temp_video.mp4")
     metadata = VideoMetadata(
         path=upload_path,
@@ -1055,7 +1094,7 @@ def test_should_not_fail_with_temp_file_deletion_error(mocker: MockerFixture):
     frame_packager = mocker.Mock()
     temp_file_manager = mocker.Mock()
 
-    input_storage_mock.download_file = mocker.Mock(return_value=video_content)
+    input_storage_mock.download_to_file = mocker.Mock(return_value=None)
     temp_file_manager.create = mocker.Mock(return_value=temp_file)
     video_metadata_reader_mock.read = mocker.Mock(return_value=metadata)
     video_validator_mock.validate = mocker.Mock(return_value=None)
@@ -1083,15 +1122,21 @@ def test_should_not_fail_with_temp_file_deletion_error(mocker: MockerFixture):
     process_video_use_case.execute(command)
 
     # Then
-    input_storage_mock.download_file.assert_called_once_with(upload_path)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file, None
+    )
     temp_file_manager.create.assert_called_once_with(
-        content=video_content_bytes, suffix="mp4"
+        content=b"", suffix="mp4", size_hint=None
     )
 
-    video_metadata_reader_mock.read.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=None
+    )
     video_validator_mock.validate.assert_called_once_with(metadata)
-    frame_selector_mock.select.assert_called_once_with(metadata)
-    frame_extractor_mock.extract.assert_called_once_with(temp_file, frame_selection)
+    frame_selector_mock.select.assert_called_once_with(metadata, video_session=None)
+    frame_extractor_mock.extract.assert_called_once_with(
+        temp_file, frame_selection, video_session=None, metadata=metadata
+    )
     frame_packager.package.assert_called_once_with(frames_iter)
     dp = f"s3://video2frames-extracted-frames/{video_id}.zip"
     output_storage_mock.upload_file.assert_called_once_with(
@@ -1104,3 +1149,472 @@ def test_should_not_fail_with_temp_file_deletion_error(mocker: MockerFixture):
     assert len(published_events) == 2
     assert isinstance(published_events[0].args[0], VideoProcessingStartedEvent) is True
     assert isinstance(published_events[1].args[0], VideoProcessedEvent) is True
+
+
+def test_should_reject_video_before_download_with_probe_validator(
+    mocker: MockerFixture,
+):
+    """Given a valid ProcessVideoCommand
+    When executing the ProcessVideoUseCase and a cheap pre-download validator rejects
+        the video
+    Then it should fail before reading the header or downloading the video
+    """
+
+    # Given
+    video_id = UUID("12345678-1234-5678-1234-567812345678")
+    upload_path = "uploads/video123.mp4"
+    file_info = StoredFileInfo(path=upload_path, size_in_bytes=1024)
+    command = ProcessVideoCommand(
+        video_id=video_id,
+        upload_path=upload_path,
+    )
+
+    input_storage_mock = mocker.Mock()
+    output_storage_mock = mocker.Mock()
+    event_publisher_mock = mocker.Mock()
+    video_metadata_reader_mock = mocker.Mock()
+    video_validator_mock = mocker.Mock()
+    frame_selector_mock = mocker.Mock()
+    frame_extractor_mock = mocker.Mock()
+    frame_packager = mocker.Mock()
+    temp_file_manager = mocker.Mock()
+    header_validator_mock = mocker.Mock(
+        cost=VideoValidationCost.CONTAINER_HEADER, header_size=512
+    )
+    size_validator_mock = mocker.Mock(cost=VideoValidationCost.OBJECT_INFO)
+
+    input_storage_mock.get_file_info = mocker.Mock(return_value=file_info)
+    size_validator_mock.validate = mocker.Mock(
+        side_effect=VideoValidationError("Video too large")
+    )
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=input_storage_mock,
+        output_storage=output_storage_mock,
+        event_publisher=event_publisher_mock,
+        video_metadata_reader=video_metadata_reader_mock,
+        frame_selector=frame_selector_mock,
+        frame_extractor=frame_extractor_mock,
+        frame_packager=frame_packager,
+        temp_file_manager=temp_file_manager,
+        video_validators=[video_validator_mock],
+        video_probe_validators=[header_validator_mock, size_validator_mock],
+    )
+
+    # When
+    with pytest.raises(VideoValidationError) as exc:
+        process_video_use_case.execute(command)
+
+    # Then
+    assert str(exc.value) == "Video too large"
+    input_storage_mock.get_file_info.assert_called_once_with(upload_path)
+    size_validator_mock.validate.assert_called_once_with(
+        VideoProbe(file_info=file_info)
+    )
+    input_storage_mock.read_range.assert_not_called()
+    header_validator_mock.validate.assert_not_called()
+    temp_file_manager.create.assert_not_called()
+    input_storage_mock.download_to_file.assert_not_called()
+    video_metadata_reader_mock.read.assert_not_called()
+    published_events = event_publisher_mock.publish.call_args_list
+    assert len(published_events) == 2
+    assert isinstance(published_events[0].args[0], VideoProcessingStartedEvent) is True
+    assert isinstance(published_events[1].args[0], VideoProcessingFailedEvent) is True
+
+
+def test_should_read_header_once_for_header_probe_validators(mocker: MockerFixture):
+    """Given a valid ProcessVideoCommand and pre-download validators of every cost
+    When executing the ProcessVideoUseCase
+    Then it should run the cheap validators first and read the header only once,
+        before the header validators
+    """
+
+    # Given
+    video_id = UUID("12345678-1234-5678-1234-567812345678")
+    upload_path = "uploads/video123.mp4"
+    file_info = StoredFileInfo(path=upload_path, size_in_bytes=100)
+    command = ProcessVideoCommand(
+        video_id=video_id,
+        upload_path=upload_path,
+    )
+
+    input_storage_mock = mocker.Mock()
+    event_publisher_mock = mocker.Mock()
+    calls = mocker.Mock()
+    header_validator_mock = mocker.Mock(
+        cost=VideoValidationCost.CONTAINER_HEADER, header_size=512
+    )
+    other_header_validator_mock = mocker.Mock(
+        cost=VideoValidationCost.CONTAINER_HEADER, header_size=16
+    )
+    size_validator_mock = mocker.Mock(cost=VideoValidationCost.OBJECT_INFO)
+    calls.attach_mock(header_validator_mock.validate, "header_validate")
+    calls.attach_mock(size_validator_mock.validate, "size_validate")
+    calls.attach_mock(input_storage_mock.read_range, "read_range")
+    input_storage_mock.get_file_info = mocker.Mock(return_value=file_info)
+    input_storage_mock.read_range.return_value = b"header"
+    frame_selector_mock = mocker.Mock()
+    frame_selector_mock.select.return_value = FrameSelection(indexes=[0])
+    temp_file_manager_mock = mocker.Mock()
+
+    frame_packager_mock = mocker.Mock()
+    frame_packager_mock.package.return_value = FileContent(
+        path="frames.zip", content=b"zip"
+    )
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=input_storage_mock,
+        output_storage=mocker.Mock(),
+        event_publisher=event_publisher_mock,
+        video_metadata_reader=mocker.Mock(),
+        frame_selector=frame_selector_mock,
+        frame_extractor=mocker.Mock(),
+        frame_packager=frame_packager_mock,
+        temp_file_manager=temp_file_manager_mock,
+        video_validators=[],
+        video_probe_validators=[
+            header_validator_mock,
+            size_validator_mock,
+            other_header_validator_mock,
+        ],
+    )
+
+    # When
+    process_video_use_case.execute(command)
+
+    # Then
+    probe = VideoProbe(file_info=file_info)
+    probe_with_header = VideoProbe(file_info=file_info, header=b"header")
+    assert calls.mock_calls == [
+        mocker.call.size_validate(probe),
+        mocker.call.read_range(upload_path, 0, 100),
+        mocker.call.header_validate(probe_with_header),
+    ]
+    other_header_validator_mock.validate.assert_called_once_with(probe_with_header)
+    input_storage_mock.download_to_file.assert_called_once_with(
+        upload_path, temp_file_manager_mock.create.return_value, file_info
+    )
+    temp_file_manager_mock.create.assert_called_once_with(
+        content=b"", suffix="mp4", size_hint=100
+    )
+
+
+def test_should_share_video_session_and_close_it_before_deleting_temp_file(
+    mocker: MockerFixture,
+):
+    """Given a valid ProcessVideoCommand and a video session opener
+    When executing the ProcessVideoUseCase
+    Then it should open one session on the downloaded video, pass it to the metadata
+        reader, the frame selector and the frame extractor, and close it before
+        deleting the temp file
+    """
+
+    # Given
+    upload_path = "uploads/video123.mp4"
+    temp_file = TempFile(path="temp_video.mp4")
+    frame_selection = FrameSelection(indexes=[0])
+    command = ProcessVideoCommand(
+        video_id=UUID("12345678-1234-5678-1234-567812345678"),
+        upload_path=upload_path,
+    )
+
+    calls = mocker.Mock()
+    temp_file_manager_mock = mocker.Mock()
+    temp_file_manager_mock.create.return_value = temp_file
+    video_session_opener_mock = mocker.Mock()
+    video_session = video_session_opener_mock.open.return_value
+    video_metadata_reader_mock = mocker.Mock()
+    frame_selector_mock = mocker.Mock()
+    frame_selector_mock.select.return_value = frame_selection
+    frame_extractor_mock = mocker.Mock()
+    calls.attach_mock(video_session.close, "close")
+    calls.attach_mock(temp_file_manager_mock.delete, "delete")
+
+    frame_packager_mock = mocker.Mock()
+    frame_packager_mock.package.return_value = FileContent(
+        path="frames.zip", content=b"zip"
+    )
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=mocker.Mock(),
+        output_storage=mocker.Mock(),
+        event_publisher=mocker.Mock(),
+        video_metadata_reader=video_metadata_reader_mock,
+        frame_selector=frame_selector_mock,
+        frame_extractor=frame_extractor_mock,
+        frame_packager=frame_packager_mock,
+        temp_file_manager=temp_file_manager_mock,
+        video_validators=[],
+        video_session_opener=video_session_opener_mock,
+    )
+
+    # When
+    process_video_use_case.execute(command)
+
+    # Then
+    video_session_opener_mock.open.assert_called_once_with(temp_file)
+    video_metadata_reader_mock.read.assert_called_once_with(
+        temp_file, video_session=video_session
+    )
+    frame_selector_mock.select.assert_called_once_with(
+        video_metadata_reader_mock.read.return_value, video_session=video_session
+    )
+    frame_extractor_mock.extract.assert_called_once_with(
+        temp_file,
+        frame_selection,
+        video_session=video_session,
+        metadata=video_metadata_reader_mock.read.return_value,
+    )
+    assert calls.mock_calls == [mocker.call.close(), mocker.call.delete(temp_file)]
+
+
+def test_should_record_frame_cost_after_packaging_frames(mocker: MockerFixture):
+    """Given a valid ProcessVideoCommand and a frame cost tracker
+    When executing the ProcessVideoUseCase
+    Then it should record the number of selected frames and the time taken to
+        extract and package them
+    """
+
+    # Given
+    command = ProcessVideoCommand(
+        video_id=UUID("12345678-1234-5678-1234-567812345678"),
+        upload_path="uploads/video123.mp4",
+    )
+    frame_selector_mock = mocker.Mock()
+    frame_selector_mock.select.return_value = FrameSelection(indexes=[0, 10, 20])
+    frame_cost_tracker_mock = mocker.Mock()
+    mocker.patch(
+        "video_processor.application.use_cases.time.perf_counter",
+        side_effect=[10.0, 11.5],
+    )
+
+    frame_packager_mock = mocker.Mock()
+    frame_packager_mock.package.return_value = FileContent(
+        path="frames.zip", content=b"zip"
+    )
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=mocker.Mock(),
+        output_storage=mocker.Mock(),
+        event_publisher=mocker.Mock(),
+        video_metadata_reader=mocker.Mock(),
+        frame_selector=frame_selector_mock,
+        frame_extractor=mocker.Mock(),
+        frame_packager=frame_packager_mock,
+        temp_file_manager=mocker.Mock(),
+        video_validators=[],
+        frame_cost_tracker=frame_cost_tracker_mock,
+    )
+
+    # When
+    process_video_use_case.execute(command)
+
+    # Then
+    frame_cost_tracker_mock.record.assert_called_once_with(3, 1.5)
+
+
+def test_should_record_frame_cost_without_upload_waits_when_streaming(
+    mocker: MockerFixture,
+):
+    """Given a valid ProcessVideoCommand, a frame cost tracker and a use case
+        streaming its output
+    When executing the ProcessVideoUseCase and the upload makes packaging wait
+    Then it should record the time taken to extract and package the frames, without
+        the time spent waiting for the upload
+    """
+
+    # Given
+    command = ProcessVideoCommand(
+        video_id=UUID("12345678-1234-5678-1234-567812345678"),
+        upload_path="uploads/video123.mp4",
+    )
+    frame_selector_mock = mocker.Mock()
+    frame_selector_mock.select.return_value = FrameSelection(indexes=[0, 10, 20])
+    frame_cost_tracker_mock = mocker.Mock()
+    mocker.patch(
+        "video_processor.application.use_cases.time.perf_counter",
+        side_effect=[10.0, 10.2, 11.0, 11.1, 11.3, 11.5],
+    )
+
+    def package_to_output(frames, output_storage, destination_path):
+        upload = output_storage.open_upload(destination_path)
+        upload.write(b"archive")
+        upload.complete()
+
+    frame_packager_mock = mocker.Mock()
+    frame_packager_mock.package_to_output.side_effect = package_to_output
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=mocker.Mock(),
+        output_storage=mocker.Mock(),
+        event_publisher=mocker.Mock(),
+        video_metadata_reader=mocker.Mock(),
+        frame_selector=frame_selector_mock,
+        frame_extractor=mocker.Mock(),
+        frame_packager=frame_packager_mock,
+        temp_file_manager=mocker.Mock(),
+        video_validators=[],
+        frame_cost_tracker=frame_cost_tracker_mock,
+        stream_output=True,
+    )
+
+    # When
+    process_video_use_case.execute(command)
+
+    # Then
+    frame_count, elapsed_seconds = frame_cost_tracker_mock.record.call_args.args
+    assert frame_count == 3
+    assert elapsed_seconds == pytest.approx(0.5)
+
+
+def test_should_stream_packaged_frames_to_output_storage(mocker: MockerFixture):
+    """Given a valid ProcessVideoCommand and a use case streaming its output as a tar
+        file
+    When executing the ProcessVideoUseCase
+    Then it should package the frames straight into the output storage at an output
+        path with the suffix of the archive and publish a VideoProcessedEvent
+    """
+
+    # Given
+    command = ProcessVideoCommand(
+        video_id=UUID("12345678-1234-5678-1234-567812345678"),
+        upload_path="uploads/video123.mp4",
+    )
+    output_storage_mock = mocker.Mock()
+    frame_extractor_mock = mocker.Mock()
+    frame_packager = mocker.Mock()
+    event_publisher_mock = mocker.Mock()
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=mocker.Mock(),
+        output_storage=output_storage_mock,
+        event_publisher=event_publisher_mock,
+        video_metadata_reader=mocker.Mock(),
+        frame_selector=mocker.Mock(),
+        frame_extractor=frame_extractor_mock,
+        frame_packager=frame_packager,
+        temp_file_manager=mocker.Mock(),
+        video_validators=[],
+        stream_output=True,
+        output_suffix=".tar",
+    )
+
+    # When
+    video = process_video_use_case.execute(command)
+
+    # Then
+    assert video.output_path == (
+        "s3://video2frames-extracted-frames/12345678-1234-5678-1234-567812345678.tar"
+    )
+    frame_packager.package_to_output.assert_called_once()
+    frames, output_storage, output_path = (
+        frame_packager.package_to_output.call_args.args
+    )
+    assert frames is frame_extractor_mock.extract.return_value
+    assert output_path == video.output_path
+    output_storage.open_upload(output_path).write(b"archive")
+    output_storage_mock.open_upload.assert_called_once_with(video.output_path)
+    output_storage_mock.open_upload.return_value.write.assert_called_once_with(
+        b"archive"
+    )
+    frame_packager.package.assert_not_called()
+    output_storage_mock.upload_file.assert_not_called()
+    published_events = event_publisher_mock.publish.call_args_list
+    assert isinstance(published_events[-1].args[0], VideoProcessedEvent) is True
+    assert published_events[-1].args[0].output_path == video.output_path
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        FramePackagingError("Failed to package frames"),
+        StorageError("Failed to upload file"),
+    ],
+)
+def test_should_fail_when_streaming_output_fails(
+    mocker: MockerFixture, error: Exception
+):
+    """Given a valid ProcessVideoCommand and a use case streaming its output
+    When executing the ProcessVideoUseCase and packaging or uploading fails
+    Then it should raise the error and publish a VideoProcessingFailedEvent
+    """
+
+    # Given
+    command = ProcessVideoCommand(
+        video_id=UUID("12345678-1234-5678-1234-567812345678"),
+        upload_path="uploads/video123.mp4",
+    )
+    frame_packager = mocker.Mock()
+    frame_packager.package_to_output.side_effect = error
+    event_publisher_mock = mocker.Mock()
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=mocker.Mock(),
+        output_storage=mocker.Mock(),
+        event_publisher=event_publisher_mock,
+        video_metadata_reader=mocker.Mock(),
+        frame_selector=mocker.Mock(),
+        frame_extractor=mocker.Mock(),
+        frame_packager=frame_packager,
+        temp_file_manager=mocker.Mock(),
+        video_validators=[],
+        stream_output=True,
+    )
+
+    # When
+    with pytest.raises(type(error)) as exc:
+        process_video_use_case.execute(command)
+
+    # Then
+    assert exc.value is error
+    published_events = event_publisher_mock.publish.call_args_list
+    assert isinstance(published_events[-1].args[0], VideoProcessingFailedEvent) is True
+
+
+def test_should_delete_packaged_archive_left_on_disk_after_upload(
+    mocker: MockerFixture,
+):
+    """Given a valid ProcessVideoCommand and a packager leaving the archive on disk
+    When executing the ProcessVideoUseCase
+    Then it should upload the archive and delete its temporary file afterwards
+    """
+
+    # Given
+    command = ProcessVideoCommand(
+        video_id=UUID("12345678-1234-5678-1234-567812345678"),
+        upload_path="uploads/video123.mp4",
+    )
+    temp_file = TempFile(path="temp_video.mp4")
+    zip_file = FileContent(path="frames.zip", local_path="/tmp/frames.zip")
+    calls = mocker.Mock()
+    output_storage_mock = mocker.Mock()
+    temp_file_manager_mock = mocker.Mock()
+    temp_file_manager_mock.create.return_value = temp_file
+    frame_packager_mock = mocker.Mock()
+    frame_packager_mock.package.return_value = zip_file
+    calls.attach_mock(output_storage_mock.upload_file, "upload_file")
+    calls.attach_mock(temp_file_manager_mock.delete, "delete")
+
+    process_video_use_case = ProcessVideoUseCase(
+        input_storage=mocker.Mock(),
+        output_storage=output_storage_mock,
+        event_publisher=mocker.Mock(),
+        video_metadata_reader=mocker.Mock(),
+        frame_selector=mocker.Mock(),
+        frame_extractor=mocker.Mock(),
+        frame_packager=frame_packager_mock,
+        temp_file_manager=temp_file_manager_mock,
+        video_validators=[],
+    )
+
+    # When
+    video = process_video_use_case.execute(command)
+
+    # Then
+    assert calls.mock_calls == [
+        mocker.call.upload_file(
+            file_content=zip_file, destination_path=video.output_path
+        ),
+        mocker.call.delete(temp_file),
+        mocker.call.delete(TempFile(path="/tmp/frames.zip")),
+    ]
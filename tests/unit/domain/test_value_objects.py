@@ -0,0 +1,130 @@
+"""Test cases for domain value objects"""
+
+import io
+from array import array
+
+import pytest
+from pydantic import ValidationError
+
+from video_processor.domain.value_objects import (
+    FileContent,
+    FrameIndexRuns,
+    FrameSelection,
+)
+
+
+@pytest.mark.parametrize(
+    "indexes",
+    [
+        range(0, 10_000_000, 1),
+        array("I", [0, 10, 20]),
+        FrameIndexRuns([(0, 5_000_000), (5_000_010, 5_000_000)]),
+    ],
+)
+def test_should_keep_compact_frame_indexes_as_given(indexes):
+    """Given frame indexes stored as a range, an array or runs of frames
+    When creating a FrameSelection
+    Then it should keep them as given instead of copying them into a list
+    """
+
+    # When
+    frame_selection = FrameSelection(indexes=indexes)
+
+    # Then
+    assert frame_selection.indexes is indexes
+    assert frame_selection.count == len(indexes)
+
+
+def test_should_iterate_and_index_frame_index_runs():
+    """Given runs of consecutive frames
+    When iterating and indexing FrameIndexRuns
+    Then it should produce the indexes of every run in order
+    """
+
+    # Given
+    runs = FrameIndexRuns([(0, 3), (10, 2), (20, 1)])
+
+    # When / Then
+    assert list(runs) == [0, 1, 2, 10, 11, 20]
+    assert [runs[3], runs[-1], runs[1:4]] == [10, 20, [1, 2, 10]]
+    assert runs.runs == [(0, 3), (10, 2), (20, 1)]
+    with pytest.raises(ValueError):
+        FrameIndexRuns([(10, 2), (5, 2)])
+
+
+def test_should_summarise_large_frame_selection_in_repr():
+    """Given a small and a large FrameSelection
+    When getting their repr
+    Then it should list the indexes of the small one and summarise the large one
+    """
+
+    # Given
+    small_selection = FrameSelection(indexes=[0, 5, 9])
+    large_selection = FrameSelection(indexes=range(0, 10_000_000, 2))
+
+    # When / Then
+    assert repr(small_selection) == "FrameSelection(indexes=[0, 5, 9])"
+    assert repr(large_selection) == (
+        "FrameSelection(count=5000000, first=0, last=9999998, encoding='range')"
+    )
+
+
+@pytest.mark.parametrize(
+    "indexes",
+    [
+        range(10, 0, -1),
+        array("d", [0.0, 1.0]),
+        array("I", [5, 3, 3]),
+        array("I", [5, 3]),
+        array("q", [0, 2, 2, 4]),
+        array("q", [-1, 0, 1]),
+    ],
+)
+def test_should_reject_invalid_compact_frame_indexes(indexes):
+    """Given a descending range, an array of floats, or an array of integers that
+        are not positive and strictly ascending
+    When creating a FrameSelection
+    Then it should raise a ValidationError
+    """
+
+    # When / Then
+    with pytest.raises(ValidationError):
+        FrameSelection(indexes=indexes)
+
+
+@pytest.mark.parametrize("source", ["content", "local_path", "fileobj"])
+def test_should_read_file_content_in_chunks_whatever_its_source(tmp_path, source):
+    """Given a FileContent held in memory, left in a local file or in a file object
+    When getting its size and iterating over it in chunks
+    Then it should give the same size and bytes, reading files lazily
+    """
+
+    # Given
+    data = b"0123456789"
+    (tmp_path / "file.zip").write_bytes(data)
+    sources = {
+        "content": {"content": data},
+        "local_path": {"local_path": str(tmp_path / "file.zip")},
+        "fileobj": {"fileobj": io.BytesIO(data)},
+    }
+    file_content = FileContent(path="file.zip", **sources[source])
+
+    # When
+    size = file_content.size_in_bytes
+    chunks = list(file_content.iter_chunks(chunk_size=4))
+
+    # Then
+    assert size == 10
+    assert chunks == [b"0123", b"4567", b"89"]
+
+
+@pytest.mark.parametrize("sources", [{}, {"content": b"zip", "local_path": "file.zip"}])
+def test_should_reject_file_content_without_a_single_source(sources):
+    """Given no content source, or several of them
+    When creating a FileContent
+    Then it should raise a ValidationError
+    """
+
+    # When / Then
+    with pytest.raises(ValidationError, match="Exactly one of content"):
+        FileContent(path="file.zip", **sources)
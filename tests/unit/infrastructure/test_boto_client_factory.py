@@ -0,0 +1,113 @@
+"""Tests for the BotoClientFactory class"""
+
+import os
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_processor.adapters.outbound import (
+    S3InputStorage,
+    S3OutputStorage,
+    SnsEventPublisher,
+)
+from video_processor.infrastructure import boto_client_factory
+from video_processor.infrastructure.boto_client_factory import BotoClientFactory
+
+
+def _build_settings(mocker: MockerFixture):
+    aws_settings = mocker.Mock()
+    settings = mocker.Mock()
+    settings.MAX_POOL_CONNECTIONS = 64
+    settings.RETRY_MODE = "adaptive"
+    settings.MAX_ATTEMPTS = 5
+    settings.TCP_KEEPALIVE = True
+    settings.CONNECT_TIMEOUT_SECONDS = 5.0
+    settings.READ_TIMEOUT_SECONDS = 60.0
+    return aws_settings, settings
+
+
+def test_should_share_one_tuned_client_per_service(mocker: MockerFixture):
+    """Given a BotoClientFactory
+    When several adapters get clients from it
+    Then it should create a single client per service with the tuned configuration
+    """
+
+    # Given
+    session_class = mocker.patch.object(boto_client_factory, "Session")
+    session = session_class.return_value
+    session.client.side_effect = lambda service_name, config: mocker.Mock()
+    factory = BotoClientFactory(*_build_settings(mocker))
+
+    # When
+    first_s3_client = factory.client("s3")
+    second_s3_client = factory.client("s3")
+    sns_client = factory.client("sns")
+
+    # Then
+    assert first_s3_client is second_s3_client
+    assert sns_client is not first_s3_client
+    session_class.assert_called_once()
+    assert session.client.call_count == 2
+    config = session.client.call_args.kwargs["config"]
+    assert config.max_pool_connections == 64
+    assert config.retries == {"mode": "adaptive", "max_attempts": 5}
+    assert config.tcp_keepalive is True
+
+
+def test_should_recreate_clients_after_fork(mocker: MockerFixture):
+    """Given a BotoClientFactory whose clients were created in the parent process
+    When the process is forked
+    Then it should create new clients from a new session in the child process
+    """
+
+    # Given
+    session_class = mocker.patch.object(boto_client_factory, "Session")
+    session_class.side_effect = lambda **kwargs: mocker.Mock()
+    factory = BotoClientFactory(*_build_settings(mocker))
+    parent_client = factory.client("s3")
+
+    # When
+    boto_client_factory._reset_factories_after_fork()
+    child_client = factory.client("s3")
+
+    # Then
+    assert child_client is not parent_client
+    assert session_class.call_count == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+@pytest.mark.parametrize(
+    "adapter_class, client_attribute",
+    [
+        (S3InputStorage, "_s3_client"),
+        (S3OutputStorage, "_s3_client"),
+        (SnsEventPublisher, "_sns_client"),
+    ],
+)
+def test_should_give_adapters_new_clients_in_forked_child(
+    mocker: MockerFixture, adapter_class, client_attribute: str
+):
+    """Given an AWS adapter built and used in the parent process
+    When the process is forked
+    Then the adapter should use a new client in the child process, and keep its
+        client in the parent process
+    """
+
+    # Given
+    session_class = mocker.patch.object(boto_client_factory, "Session")
+    session_class.side_effect = lambda **kwargs: mocker.Mock()
+    factory = BotoClientFactory(*_build_settings(mocker))
+    adapter = adapter_class(client_factory=factory, settings=mocker.Mock())
+    parent_client = getattr(adapter, client_attribute)
+
+    # When
+    pid = os.fork()
+    if pid == 0:
+        # Child process: report through the exit status, without running pytest
+        os._exit(0 if getattr(adapter, client_attribute) is not parent_client else 1)
+
+    _, status = os.waitpid(pid, 0)
+
+    # Then
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert getattr(adapter, client_attribute) is parent_client
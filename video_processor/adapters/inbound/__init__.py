@@ -1,5 +1,6 @@
 """Inbound adapters package"""
 
+from .directory_queue_listener import DirectoryQueueListener
 from .video_uploaded_listener import VideoUploadedListener
 
-__all__ = ["VideoUploadedListener"]
+__all__ = ["VideoUploadedListener", "DirectoryQueueListener"]
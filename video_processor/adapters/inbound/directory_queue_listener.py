@@ -0,0 +1,132 @@
+"""Module for handling video upload events queued as files in a local directory."""
+
+import json
+import logging
+import os
+import time
+
+from video_processor.adapters.inbound.video_uploaded_listener import (
+    VideoUploadedEvent,
+)
+from video_processor.application.commands import ProcessVideoCommand
+from video_processor.application.use_cases import ProcessVideoUseCase
+from video_processor.infrastructure.config import DirectoryQueueListenerSettings
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_SUFFIX = ".json"
+PROCESSING_DIRECTORY = "processing"
+FAILED_DIRECTORY = "failed"
+
+
+class DirectoryQueueListener:
+    """Listener for video uploaded events queued as files in a local directory.
+
+    Each `*.json` file in the queue directory holds one event, either as the raw
+    event or wrapped in an SNS envelope like the SQS messages. Files are processed in
+    name order and claimed by renaming them into the `processing` directory, so
+    several listeners can share the same queue. Processed files are deleted, and
+    files that failed are moved into the `failed` directory.
+
+    Producers should write a message under another name, e.g. with a leading dot,
+    and rename it once complete.
+    """
+
+    def __init__(
+        self,
+        use_case: ProcessVideoUseCase,
+        settings: DirectoryQueueListenerSettings,
+    ):
+        self._use_case = use_case
+        self._directory = settings.DIRECTORY
+        self._poll_interval = settings.POLL_INTERVAL_SECONDS
+        self._processing_directory = os.path.join(self._directory, PROCESSING_DIRECTORY)
+        self._failed_directory = os.path.join(self._directory, FAILED_DIRECTORY)
+
+    def listen(self, shutdown_event=None) -> None:
+        """Listen for video uploaded events and process them."""
+
+        os.makedirs(self._processing_directory, exist_ok=True)
+        os.makedirs(self._failed_directory, exist_ok=True)
+
+        while True:
+            if shutdown_event and shutdown_event.shutdown:
+                logger.info("Shutdown requested, stopping listener")
+                break
+
+            message_path = self._claim_next()
+            if message_path is None:
+                logger.debug("No messages found in %s", self._directory)
+                time.sleep(self._poll_interval)
+                continue
+
+            self._handle_message(message_path)
+
+    def _claim_next(self) -> str | None:
+        """Claim the first message of the queue.
+
+        Returns:
+            str | None: The path of the claimed message, or None if the queue is empty.
+        """
+
+        names = sorted(
+            entry.name
+            for entry in os.scandir(self._directory)
+            if entry.is_file()
+            and entry.name.endswith(MESSAGE_SUFFIX)
+            and not entry.name.startswith(".")
+        )
+
+        for name in names:
+            claimed_path = os.path.join(self._processing_directory, name)
+            try:
+                os.rename(os.path.join(self._directory, name), claimed_path)
+                return claimed_path
+            except FileNotFoundError:
+                # Claimed by another listener in the meantime
+                continue
+
+        return None
+
+    def _parse_message(self, message_path: str) -> ProcessVideoCommand:
+        """Parse a queued message file into a command.
+
+        Args:
+            message_path: The path of the claimed message file.
+
+        Returns:
+            ProcessVideoCommand: The command to process the uploaded video.
+        """
+
+        with open(message_path, encoding="utf-8") as f:
+            body = f.read()
+
+        body_dict = json.loads(body)
+        if "Message" in body_dict:
+            body = body_dict["Message"]
+
+        video_uploaded_event = VideoUploadedEvent.model_validate_json(body)
+        return ProcessVideoCommand(
+            video_id=video_uploaded_event.video_id,
+            upload_path=video_uploaded_event.upload_path,
+        )
+
+    def _handle_message(self, message_path: str) -> None:
+        """Handle a claimed message file.
+
+        Args:
+            message_path: The path of the claimed message file.
+        """
+
+        name = os.path.basename(message_path)
+        try:
+            command = self._parse_message(message_path)
+            self._use_case.execute(command)
+            os.remove(message_path)
+            logger.info("Processed and deleted message %s", name)
+
+        except Exception:  # pylint: disable=W0718
+            logger.error("Failed to process message %s", name, exc_info=True)
+
+            os.replace(message_path, os.path.join(self._failed_directory, name))
+            logger.warning("Moved message %s to %s", name, self._failed_directory)
@@ -2,18 +2,24 @@
 
 import json
 import logging
+from collections import deque
 from uuid import UUID
 
-from boto3 import Session
 from botocore.exceptions import ClientError as BotoCoreClientError
 from pydantic import BaseModel
 
 from video_processor.application.commands import ProcessVideoCommand
 from video_processor.application.use_cases import ProcessVideoUseCase
+from video_processor.domain.ports import VideoPrefetcher
+from video_processor.infrastructure.boto_client_factory import BotoClientFactory
 from video_processor.infrastructure.config import VideoUploadedListenerSettings
 
 logger = logging.getLogger(__name__)
 
+# SQS limits for a single ReceiveMessage call and for a visibility timeout
+MAX_MESSAGES_PER_RECEIVE = 10
+MAX_VISIBILITY_TIMEOUT_SECONDS = 12 * 60 * 60
+
 
 class VideoUploadedEvent(BaseModel):
     """Event representing a video upload."""
@@ -23,26 +29,38 @@ class VideoUploadedEvent(BaseModel):
 
 
 class VideoUploadedListener:
-    """Listener for video uploaded events."""
+    """Listener for video uploaded events.
+
+    With a prefetch depth greater than zero and a prefetcher, the listener receives
+    messages ahead of the one being processed and downloads their videos in the
+    background while the current job runs.
+    """
 
     def __init__(
         self,
-        boto_session: Session,
+        client_factory: BotoClientFactory,
         use_case: ProcessVideoUseCase,
         settings: VideoUploadedListenerSettings,
+        prefetcher: VideoPrefetcher | None = None,
     ):
         self._use_case = use_case
-        self._boto_session = boto_session
+        self._client_factory = client_factory
+        self._prefetcher = prefetcher
         self._queue_name = settings.QUEUE_NAME
         self._wait_time = settings.WAIT_TIME_SECONDS
         self._visibility_timeout = settings.VISIBILITY_TIMEOUT_SECONDS
         self._max_messages = settings.MAX_NUMBER_OF_MESSAGES_PER_BATCH
+        self._prefetch_depth = settings.PREFETCH_DEPTH if prefetcher else 0
 
     def listen(self, shutdown_event=None) -> None:
         """Listen for video uploaded events and process them."""
 
-        sqs_resource = self._boto_session.resource("sqs")
+        sqs_resource = self._client_factory.resource("sqs")
         queue = sqs_resource.get_queue_by_name(QueueName=self._queue_name)
+        if self._prefetch_depth > 0:
+            self._listen_with_prefetch(queue=queue, shutdown_event=shutdown_event)
+            return
+
         while True:
             if shutdown_event and shutdown_event.shutdown:
                 logger.info("Shutdown requested, stopping listener")
@@ -54,12 +72,25 @@ class VideoUploadedListener:
                 continue
 
     def _consume(self, queue):
+        messages = self._receive(
+            queue=queue,
+            max_messages=self._max_messages,
+            wait_time=self._wait_time,
+            visibility_timeout=self._visibility_timeout,
+        )
+
+        for message in messages:
+            self._handle_message(message)
+
+        return messages
+
+    def _receive(self, queue, max_messages, wait_time, visibility_timeout):
         try:
-            messages = queue.receive_messages(
+            return queue.receive_messages(
                 MessageAttributeNames=["All"],
-                MaxNumberOfMessages=self._max_messages,
-                WaitTimeSeconds=self._wait_time,
-                VisibilityTimeout=self._visibility_timeout,
+                MaxNumberOfMessages=max_messages,
+                WaitTimeSeconds=wait_time,
+                VisibilityTimeout=visibility_timeout,
             )
 
         except BotoCoreClientError as error:
@@ -69,10 +100,139 @@ class VideoUploadedListener:
 
             raise error
 
-        for message in messages:
-            self._handle_message(message)
+    def _listen_with_prefetch(self, queue, shutdown_event=None) -> None:
+        """Listen for messages, keeping up to `PREFETCH_DEPTH` messages received and
+        downloading ahead of the one being processed.
 
-        return messages
+        Messages received ahead are kept invisible long enough to wait for the jobs
+        before them, and get a fresh visibility timeout when their own job starts.
+        Messages that were not started when the listener stops are returned to the
+        queue.
+        """
+
+        pending: deque = deque()
+        ahead_visibility_timeout = min(
+            self._visibility_timeout * (self._prefetch_depth + 1),
+            MAX_VISIBILITY_TIMEOUT_SECONDS,
+        )
+
+        try:
+            while True:
+                if shutdown_event and shutdown_event.shutdown:
+                    logger.info("Shutdown requested, stopping listener")
+                    break
+
+                missing = self._prefetch_depth + 1 - len(pending)
+                if missing > 0:
+                    messages = self._receive(
+                        queue=queue,
+                        max_messages=min(missing, MAX_MESSAGES_PER_RECEIVE),
+                        wait_time=0 if pending else self._wait_time,
+                        visibility_timeout=ahead_visibility_timeout,
+                    )
+
+                    for message in messages:
+                        pending.append(self._prefetch_message(message))
+
+                if not pending:
+                    logger.debug("No messages received in %d seconds", self._wait_time)
+                    continue
+
+                message, upload_path = pending.popleft()
+                if not self._start_message(message, upload_path):
+                    continue
+
+                try:
+                    self._handle_message(message)
+                finally:
+                    # A job failing before its download never claims the video
+                    self._discard_prefetched(upload_path)
+        finally:
+            self._return_messages(pending)
+
+    def _prefetch_message(self, message):
+        """Start downloading the video of a message received ahead.
+
+        Returns:
+            tuple: The message and the upload path being prefetched. The path is None
+                if the message could not be parsed, it is then handled as a failure
+                when its turn comes.
+        """
+
+        try:
+            upload_path = self._parse_message(message).upload_path
+        except Exception:  # pylint: disable=W0718
+            return message, None
+
+        if self._prefetcher:
+            self._prefetcher.prefetch(upload_path)
+
+        return message, upload_path
+
+    def _start_message(self, message, upload_path: str | None) -> bool:
+        """Reset the visibility timeout of a message before processing it.
+
+        Returns:
+            bool: False if the message is no longer owned by this listener, e.g.
+                because its visibility timeout expired while it was waiting.
+        """
+
+        try:
+            message.change_visibility(VisibilityTimeout=self._visibility_timeout)
+            return True
+        except BotoCoreClientError:
+            logger.warning(
+                "Skipping message ID: %s, it is no longer in flight",
+                message.message_id,
+                exc_info=True,
+            )
+
+            self._discard_prefetched(upload_path)
+            return False
+
+    def _return_messages(self, pending: deque) -> None:
+        """Make the messages that were not started visible again in the queue."""
+
+        while pending:
+            message, upload_path = pending.popleft()
+            self._discard_prefetched(upload_path)
+
+            try:
+                message.change_visibility(VisibilityTimeout=0)
+                logger.info("Returned message ID: %s to the queue", message.message_id)
+            except BotoCoreClientError:
+                logger.warning(
+                    "Failed to return message ID: %s to the queue",
+                    message.message_id,
+                    exc_info=True,
+                )
+
+    def _discard_prefetched(self, upload_path: str | None) -> None:
+        """Drop the prefetched video of a message, if it was not handed over to its
+        job."""
+
+        if upload_path and self._prefetcher:
+            self._prefetcher.discard(upload_path)
+
+    def _parse_message(self, message) -> ProcessVideoCommand:
+        """Parse a video uploaded message into a command.
+
+        Args:
+            message: The SQS message containing the video uploaded event data.
+
+        Returns:
+            ProcessVideoCommand: The command to process the uploaded video.
+        """
+
+        body_dict = json.loads(message.body)
+        video_uploaded_event = VideoUploadedEvent.model_validate_json(
+            body_dict["Message"]
+        )
+
+        return ProcessVideoCommand(
+            video_id=video_uploaded_event.video_id,
+            upload_path=video_uploaded_event.upload_path,
+        )
 
     def _handle_message(self, message) -> None:
         """Handle a video uploaded message.
@@ -82,17 +242,7 @@ class VideoUploadedListener:
         """
 
         try:
-            body = message.body
-            body_dict = json.loads(body)
-            video_uploaded_event = VideoUploadedEvent.model_validate_json(
-                body_dict["Message"]
-            )
-
-            command = ProcessVideoCommand(
-                video_id=video_uploaded_event.video_id,
-                upload_path=video_uploaded_event.upload_path,
-            )
-
+            command = self._parse_message(message)
             self._use_case.execute(command)
             message.delete()
             logger.info("Processed and deleted message ID: %s", message.message_id)
@@ -1,23 +1,57 @@
 """Outbound adapters package"""
 
-from .frame_selectors import UniformFrameSelector
+from .caching_input_storage import CachingInputStorage
+from .frame_archive_reader import FrameArchiveReader
+from .frame_selectors import KeyframeAlignedFrameSelector, UniformFrameSelector
+from .jsonl_event_publisher import JsonlEventPublisher
+from .local_file_storage import LocalInputStorage, LocalOutputStorage
+from .moving_average_frame_cost_tracker import MovingAverageFrameCostTracker
+from .mp4_video_metadata_reader import MP4VideoMetadataReader
 from .named_temp_file_manager import NamedTempFileManager
 from .opencv_frame_extractor import OpenCVFrameExtractor
 from .opencv_video_metadata_reader import OpenCVVideoMetadataReader
+from .opencv_video_session import OpenCVVideoSession, OpenCVVideoSessionOpener
+from .parallel_frame_extractor import ParallelFrameExtractor
+from .prefetching_input_storage import PrefetchingInputStorage
 from .s3_input_storage import S3InputStorage
 from .s3_output_storage import S3OutputStorage
+from .scene_change_frame_selector import SceneChangeFrameSelector
 from .sns_event_publisher import SnsEventPublisher
-from .video_validators import VideoSizeValidator
-from .zip_frame_packager import ZIPFramePackager
+from .tar_frame_packager import TarFramePackager
+from .video_validators import (
+    VideoContainerValidator,
+    VideoContentTypeValidator,
+    VideoObjectSizeValidator,
+    VideoSizeValidator,
+)
+from .zip_frame_packager import SplitZIPFramePackager, ZIPFramePackager
 
 __all__ = [
     "S3InputStorage",
+    "CachingInputStorage",
+    "PrefetchingInputStorage",
     "S3OutputStorage",
     "SnsEventPublisher",
+    "LocalInputStorage",
+    "LocalOutputStorage",
+    "JsonlEventPublisher",
+    "OpenCVVideoSession",
+    "OpenCVVideoSessionOpener",
     "OpenCVVideoMetadataReader",
+    "MP4VideoMetadataReader",
     "VideoSizeValidator",
+    "VideoObjectSizeValidator",
+    "VideoContentTypeValidator",
+    "VideoContainerValidator",
+    "MovingAverageFrameCostTracker",
     "UniformFrameSelector",
+    "KeyframeAlignedFrameSelector",
+    "SceneChangeFrameSelector",
     "OpenCVFrameExtractor",
+    "ParallelFrameExtractor",
     "ZIPFramePackager",
+    "SplitZIPFramePackager",
+    "TarFramePackager",
     "NamedTempFileManager",
+    "FrameArchiveReader",
 ]
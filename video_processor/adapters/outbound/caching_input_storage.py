@@ -0,0 +1,248 @@
+"""Caching Input Storage Adapter"""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+
+from pydantic import BaseModel, ConfigDict
+
+from video_processor.adapters.outbound.named_temp_file_manager import (
+    MEMFD_PATH_PREFIX,
+)
+from video_processor.domain.exceptions import StorageError
+from video_processor.domain.ports import InputStorage
+from video_processor.domain.value_objects import FileContent, StoredFileInfo, TempFile
+from video_processor.infrastructure.config import VideoCacheSettings
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_SUFFIX = ".part"
+
+
+class VideoCacheStats(BaseModel):
+    """Counters of the video cache, used to size it against the retry rates."""
+
+    model_config = ConfigDict(frozen=True)
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_in_bytes: int
+
+
+class CachingInputStorage(InputStorage):
+    """CachingInputStorage is a decorator of the InputStorage port that keeps
+    downloaded videos in a local cache directory.
+
+    Entries are keyed by the storage path and the ETag of the object, so a video that
+    is replaced in storage is never served stale. The cache is bounded by a byte size
+    budget and evicts the least recently used entries first. Cached videos are handed
+    out as hard links into the temporary file, so a hit does not copy any data and
+    deleting the temporary file leaves the cache entry untouched. Memory-backed
+    temporary files cannot be linked, the cached video is copied into them.
+    """
+
+    def __init__(self, input_storage: InputStorage, settings: VideoCacheSettings):
+        self._input_storage = input_storage
+        self._directory = settings.DIRECTORY
+        self._max_size_in_bytes = settings.MAX_SIZE_IN_BYTES
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size_in_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._load_entries()
+
+    @property
+    def stats(self) -> VideoCacheStats:
+        """Get the current counters of the cache."""
+        with self._lock:
+            return VideoCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_in_bytes=self._size_in_bytes,
+            )
+
+    def download_file(self, source_path: str) -> FileContent:
+        return self._input_storage.download_file(source_path)
+
+    def get_file_info(self, source_path: str) -> StoredFileInfo:
+        return self._input_storage.get_file_info(source_path)
+
+    def read_range(self, source_path: str, start: int, length: int) -> bytes:
+        return self._input_storage.read_range(source_path, start, length)
+
+    def download_to_file(
+        self,
+        source_path: str,
+        temp_file: TempFile,
+        file_info: StoredFileInfo | None = None,
+    ) -> None:
+        if file_info is None:
+            file_info = self._input_storage.get_file_info(source_path)
+
+        if not file_info.etag or file_info.size_in_bytes > self._max_size_in_bytes:
+            logger.info("Video %s cannot be cached, downloading it", source_path)
+            self._input_storage.download_to_file(source_path, temp_file, file_info)
+            return
+
+        key = self._get_key(source_path, file_info.etag)
+        if self._lookup(key):
+            try:
+                self._link(key, temp_file)
+                self._count_access(hit=True, source_path=source_path)
+                return
+            except OSError:
+                # The entry was evicted between the lookup and the link
+                self._forget(key)
+
+        self._count_access(hit=False, source_path=source_path)
+        self._store(source_path, key, file_info)
+        try:
+            self._link(key, temp_file)
+        except OSError as e:
+            raise StorageError(f"Failed to read video from the cache: {e}") from e
+
+    def _get_key(self, source_path: str, etag: str) -> str:
+        return hashlib.sha256(f"{source_path}\0{etag}".encode()).hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._directory, key)
+
+    def _load_entries(self) -> None:
+        """Index the entries left in the cache directory by a previous process,
+        from the least to the most recently used."""
+
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self._directory):
+                if entry.name.endswith(PARTIAL_SUFFIX):
+                    os.remove(entry.path)
+                    continue
+
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError as e:
+            raise StorageError(f"Failed to load the video cache: {e}") from e
+
+        with self._lock:
+            for _, key, size in sorted(entries):
+                self._entries[key] = size
+                self._size_in_bytes += size
+
+            self._evict()
+
+    def _lookup(self, key: str) -> bool:
+        """Mark the entry as the most recently used one if it is cached."""
+
+        with self._lock:
+            if key not in self._entries:
+                return False
+
+            self._entries.move_to_end(key)
+
+        try:
+            os.utime(self._get_path(key))
+        except OSError:
+            pass
+
+        return True
+
+    def _store(self, source_path: str, key: str, file_info: StoredFileInfo) -> None:
+        """Download the video into a partial file and publish it as a cache entry."""
+
+        path = self._get_path(key)
+        partial_path = f"{path}.{uuid.uuid4().hex}{PARTIAL_SUFFIX}"
+        try:
+            self._input_storage.download_to_file(
+                source_path, TempFile(path=partial_path), file_info
+            )
+
+            # Entries are shared through hard links, protect them from writes
+            os.chmod(partial_path, 0o444)
+            os.replace(partial_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            raise StorageError(f"Failed to store video in the cache: {e}") from e
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        with self._lock:
+            self._size_in_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._size_in_bytes -= self._entries.pop(key, 0)
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits its budget.
+
+        Must be called with the lock held. Temporary files linked to an evicted entry
+        keep its data alive until they are deleted.
+        """
+
+        while self._size_in_bytes > self._max_size_in_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size_in_bytes -= size
+            self._evictions += 1
+            try:
+                os.remove(self._get_path(key))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.warning("Failed to evict video cache entry %s", key)
+
+    def _link(self, key: str, temp_file: TempFile) -> None:
+        """Replace the temporary file with a hard link to the cache entry, falling
+        back to a copy when both are not on the same filesystem."""
+
+        path = self._get_path(key)
+        if temp_file.path.startswith(MEMFD_PATH_PREFIX):
+            # A memfd has no directory to link into, its content is replaced instead
+            with open(path, "rb") as source, open(temp_file.path, "wb") as target:
+                shutil.copyfileobj(source, target)
+
+            return
+
+        link_path = f"{temp_file.path}.{uuid.uuid4().hex}.link"
+        try:
+            os.link(path, link_path)
+            os.replace(link_path, temp_file.path)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            if os.path.exists(link_path):
+                os.remove(link_path)
+
+            logger.warning("Hard link to the video cache failed, copying the video")
+            shutil.copyfile(path, temp_file.path)
+
+    def _count_access(self, hit: bool, source_path: str) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        stats = self.stats
+        logger.info(
+            "Video cache %s for %s (hits=%d misses=%d evictions=%d size=%d bytes)",
+            "hit" if hit else "miss",
+            source_path,
+            stats.hits,
+            stats.misses,
+            stats.evictions,
+            stats.size_in_bytes,
+        )
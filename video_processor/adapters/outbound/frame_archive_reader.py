@@ -0,0 +1,280 @@
+"""Frame Archive Reader"""
+
+import io
+import logging
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from typing import Any
+
+from pydantic import ValidationError
+
+from video_processor.adapters.outbound.raw_zip_entries import (
+    decompress_entry_data,
+)
+from video_processor.adapters.outbound.zip_frame_packager import (
+    LOCAL_HEADER_SIZE,
+    MANIFEST_FILENAME,
+)
+from video_processor.domain.exceptions import FrameArchiveReadingError
+from video_processor.domain.ports import InputStorage
+from video_processor.domain.value_objects import (
+    FrameArchiveEntry,
+    FrameArchiveManifest,
+)
+from video_processor.infrastructure.config import FrameArchiveReaderSettings
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+# Name of the frames written by the frame extractors, giving the frame index
+FRAME_FILENAME_PATTERN = re.compile(r"frame_(\d+)\.\w+")
+
+
+def _locate_central_directory_entry(
+    entry: zipfile.ZipInfo,
+) -> FrameArchiveEntry | None:
+    """Get the location of a frame from the central directory of an archive without
+    a manifest, assuming its local header has the extra field of the central one.
+
+    Returns:
+        FrameArchiveEntry | None: The location of the frame, or None if the entry is
+            not a frame.
+    """
+
+    match = FRAME_FILENAME_PATTERN.fullmatch(entry.filename)
+    if match is None:
+        return None
+
+    return FrameArchiveEntry(
+        index=int(match.group(1)),
+        filename=entry.filename,
+        header_offset=entry.header_offset,
+        offset=entry.header_offset
+        + LOCAL_HEADER_SIZE
+        + len(entry.filename.encode("utf-8"))
+        + len(entry.extra),
+        size=entry.compress_size,
+        crc=entry.CRC,
+        compression=entry.compress_type,
+    )
+
+
+class _ArchiveFile(io.RawIOBase):
+    """A seekable file object over the end of an archive in storage, read from
+    memory and extended to the start of any read before it."""
+
+    def __init__(
+        self,
+        input_storage: InputStorage,
+        archive_path: str,
+        size: int,
+        tail: bytes,
+    ):
+        self._input_storage = input_storage
+        self._archive_path = archive_path
+        self._size = size
+        self._tail = tail
+        self._tail_start = size - len(tail)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:
+        end = min(self._position + len(buffer), self._size)
+        if end <= self._position:
+            return 0
+
+        if self._position < self._tail_start:
+            # The index is at the end of the archive, so the bytes up to the tail
+            # are read at once, rather than each header and name on their own
+            head = self._input_storage.read_range(
+                self._archive_path,
+                self._position,
+                self._tail_start - self._position,
+            )
+            self._tail = head + self._tail
+            self._tail_start = self._position
+
+        content = self._tail[self._position - self._tail_start : end - self._tail_start]
+        memoryview(buffer).cast("B")[: len(content)] = content
+        self._position += len(content)
+        return len(content)
+
+
+class FrameArchiveReader:
+    """FrameArchiveReader reads single frames from the ZIP archives of the frame
+    packagers with ranged reads, instead of downloading the archives.
+
+    The index of an archive is loaded from its end with one ranged read of
+    `INDEX_READ_SIZE_IN_BYTES`, which holds the central directory and the manifest
+    written after the frames, and more only for archives of many frames. Archives
+    without a manifest are indexed from their central directory, by the frame index
+    in the name of each entry. The indexes of the `INDEX_CACHE_SIZE` most recently
+    used archives are kept in memory, so reading a frame of a known archive is a
+    single ranged read of the frame.
+
+    Given an S3InputStorage of the output bucket, frames are fetched with S3 ranged
+    GETs.
+    """
+
+    def __init__(
+        self,
+        input_storage: InputStorage,
+        settings: FrameArchiveReaderSettings | None = None,
+    ):
+        settings = settings or FrameArchiveReaderSettings()
+        self._input_storage = input_storage
+        self._index_read_size = settings.INDEX_READ_SIZE_IN_BYTES
+        self._index_cache_size = max(settings.INDEX_CACHE_SIZE, 1)
+        self._lock = threading.Lock()
+        self._indexes: OrderedDict[str, dict[int, FrameArchiveEntry]] = OrderedDict()
+
+    def get_index(self, archive_path: str) -> list[FrameArchiveEntry]:
+        """Get the location of each frame in an archive.
+
+        Args:
+            archive_path (str): The path of the archive in storage.
+
+        Returns:
+            list[FrameArchiveEntry]: The frames of the archive, in archive order.
+
+        Raises:
+            FrameArchiveReadingError: If the archive cannot be indexed.
+            StorageError: If an error occurs while reading the archive.
+        """
+
+        return list(self._get_index(archive_path).values())
+
+    def read_frame(self, archive_path: str, frame_index: int) -> bytes:
+        """Read a frame from an archive.
+
+        The index of the archive is dropped if the frame does not match it, as the
+        archive may have been replaced, so the next read loads it again.
+
+        Args:
+            archive_path (str): The path of the archive in storage.
+            frame_index (int): The index of the frame in the video.
+
+        Returns:
+            bytes: The content of the frame.
+
+        Raises:
+            FrameArchiveReadingError: If the frame is not in the archive or cannot be
+                read.
+            StorageError: If an error occurs while reading the archive.
+        """
+
+        entry = self._get_index(archive_path).get(frame_index)
+        if entry is None:
+            raise FrameArchiveReadingError(
+                f"Frame {frame_index} is not in archive {archive_path}"
+            )
+
+        try:
+            content = self._read_entry(archive_path, entry)
+        except FrameArchiveReadingError:
+            with self._lock:
+                self._indexes.pop(archive_path, None)
+
+            raise
+
+        return content
+
+    def _get_index(self, archive_path: str) -> dict[int, FrameArchiveEntry]:
+        with self._lock:
+            index = self._indexes.get(archive_path)
+            if index is not None:
+                self._indexes.move_to_end(archive_path)
+                return index
+
+        index = self._load_index(archive_path)
+        with self._lock:
+            self._indexes[archive_path] = index
+            self._indexes.move_to_end(archive_path)
+            while len(self._indexes) > self._index_cache_size:
+                self._indexes.popitem(last=False)
+
+        return index
+
+    def _load_index(self, archive_path: str) -> dict[int, FrameArchiveEntry]:
+        size = self._input_storage.get_file_info(archive_path).size_in_bytes
+        tail_start = max(size - self._index_read_size, 0)
+        tail = self._input_storage.read_range(
+            archive_path, tail_start, size - tail_start
+        )
+        archive_file = _ArchiveFile(self._input_storage, archive_path, size, tail)
+        try:
+            with zipfile.ZipFile(archive_file) as zip_file:
+                if MANIFEST_FILENAME in zip_file.namelist():
+                    entries = FrameArchiveManifest.model_validate_json(
+                        zip_file.read(MANIFEST_FILENAME)
+                    ).frames
+                else:
+                    entries = [
+                        entry
+                        for info in zip_file.infolist()
+                        if (entry := _locate_central_directory_entry(info)) is not None
+                    ]
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, ValidationError) as e:
+            raise FrameArchiveReadingError(
+                f"Failed to read the index of archive {archive_path}: {e}"
+            ) from e
+
+        logger.debug("Loaded the index of %d frames of %s", len(entries), archive_path)
+        return {entry.index: entry for entry in entries}
+
+    def _read_entry(self, archive_path: str, entry: FrameArchiveEntry) -> bytes:
+        """Read a frame with its local header, which is checked to find its data
+        even if the local header is not the one assumed by the index."""
+
+        raw = self._input_storage.read_range(
+            archive_path,
+            entry.header_offset,
+            entry.offset + entry.size - entry.header_offset,
+        )
+        if len(raw) < LOCAL_HEADER_SIZE or raw[:4] != LOCAL_HEADER_SIGNATURE:
+            raise FrameArchiveReadingError(
+                f"No entry at offset {entry.header_offset} of archive {archive_path}"
+            )
+
+        name_length, extra_length = struct.unpack("<HH", raw[26:LOCAL_HEADER_SIZE])
+        data_offset = LOCAL_HEADER_SIZE + name_length + extra_length
+        data = raw[data_offset : data_offset + entry.size]
+        if len(data) < entry.size:
+            data = self._input_storage.read_range(
+                archive_path, entry.header_offset + data_offset, entry.size
+            )
+
+        try:
+            content = decompress_entry_data(data, entry.compression)
+        except (NotImplementedError, zlib.error, OSError, EOFError) as e:
+            raise FrameArchiveReadingError(
+                f"Failed to decompress frame {entry.index} of {archive_path}: {e}"
+            ) from e
+
+        if zlib.crc32(content) != entry.crc:
+            raise FrameArchiveReadingError(
+                f"Bad CRC-32 for frame {entry.index} of archive {archive_path}"
+            )
+
+        return content
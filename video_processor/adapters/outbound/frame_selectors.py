@@ -1,32 +1,178 @@
+import logging
+from bisect import bisect_left
+from typing import Sequence
+
 from video_processor.domain.exceptions import FrameSelectionError
-from video_processor.domain.ports import FrameSelector
+from video_processor.domain.ports import FrameCostTracker, FrameSelector, VideoSession
 from video_processor.domain.value_objects import FrameSelection, VideoMetadata
-from video_processor.infrastructure.config import UniformFrameSelectorSettings
+from video_processor.infrastructure.config import (
+    KeyframeAlignedFrameSelectorSettings,
+    UniformFrameSelectorSettings,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class UniformFrameSelector(FrameSelector):
-    """A frame selector that selects frames uniformly across the video duration"""
+    """A frame selector that selects frames uniformly across the video duration
 
-    def __init__(self, settings: UniformFrameSelectorSettings):
+    The number of frames depends on the mode: a percentage of the frames, one frame
+    every `INTERVAL_SECONDS`, or as many frames as the frame cost tracker estimates
+    can be extracted and packaged within `TARGET_PROCESSING_SECONDS`. In every mode
+    the number of frames is kept between `MIN_FRAMES` and `MAX_FRAMES`, so the work
+    done per video is bounded.
+    """
+
+    def __init__(
+        self,
+        settings: UniformFrameSelectorSettings,
+        frame_cost_tracker: FrameCostTracker | None = None,
+    ):
+        self.mode = settings.MODE
         self.percentage_threshold = settings.PERCENTAGE_THRESHOLD
+        self.interval_seconds = settings.INTERVAL_SECONDS
+        self.target_processing_seconds = settings.TARGET_PROCESSING_SECONDS
+        self.min_frames = settings.MIN_FRAMES
+        self.max_frames = settings.MAX_FRAMES
+        self._frame_cost_tracker = frame_cost_tracker
 
-    def select(self, metadata: VideoMetadata) -> FrameSelection:
-        if self.percentage_threshold <= 0 or self.percentage_threshold > 1:
+    def select(
+        self, metadata: VideoMetadata, video_session: VideoSession | None = None
+    ) -> FrameSelection:
+        if self.mode == "percentage" and (
+            self.percentage_threshold <= 0 or self.percentage_threshold > 1
+        ):
             raise FrameSelectionError("percentage_threshold must be between 0 and 1")
 
         total_frames = metadata.frame_count
         if total_frames == 0:
             raise FrameSelectionError("Video has no frames to select")
 
-        desired_count = max(1, int(total_frames * self.percentage_threshold))
+        if self.mode == "interval":
+            indexes = self._select_by_interval(metadata)
+            if self.min_frames <= len(indexes) <= self.max_frames:
+                return FrameSelection(indexes=indexes)
+
+            desired_count = len(indexes)
+        elif self.mode == "budget":
+            desired_count = self._get_budget_count()
+        else:
+            desired_count = int(total_frames * self.percentage_threshold)
+
+        desired_count = min(
+            max(desired_count, self.min_frames, 1), self.max_frames, total_frames
+        )
         # If the desired count is 1, we can just select the first frame to
         # avoid division by zero in the calculation of indexes
-        if desired_count == 1:
+        if desired_count <= 1:
             return FrameSelection(indexes=[0])
 
+        if desired_count == total_frames:
+            return FrameSelection(indexes=range(total_frames))
+
         indexes = [
             int(i * (total_frames - 1) / (desired_count - 1))
             for i in range(desired_count)
         ]
 
         return FrameSelection(indexes=indexes)
+
+    def _select_by_interval(self, metadata: VideoMetadata) -> list[int]:
+        """Select the frames shown every `INTERVAL_SECONDS` from the start."""
+
+        if self.interval_seconds <= 0:
+            raise FrameSelectionError("interval_seconds must be greater than 0")
+
+        timestamps = metadata.frame_timestamps
+        if not timestamps and metadata.fps <= 0:
+            raise FrameSelectionError("Video has no frame rate to select frames by")
+
+        last_index = metadata.frame_count - 1
+        duration = timestamps[-1] if timestamps else last_index / metadata.fps
+        indexes: list[int] = []
+        for step in range(int(duration / self.interval_seconds) + 1):
+            time = step * self.interval_seconds
+            if timestamps:
+                index = bisect_left(timestamps, time)
+            else:
+                index = round(time * metadata.fps)
+
+            index = min(index, last_index)
+            if not indexes or index != indexes[-1]:
+                indexes.append(index)
+
+        return indexes
+
+    def _get_budget_count(self) -> int:
+        """Get the number of frames that fit in the target processing time."""
+
+        if self._frame_cost_tracker is None:
+            raise FrameSelectionError("budget mode requires a frame cost tracker")
+
+        seconds_per_frame = self._frame_cost_tracker.seconds_per_frame
+        if seconds_per_frame <= 0:
+            return self.max_frames
+
+        return int(self.target_processing_seconds / seconds_per_frame)
+
+
+class KeyframeAlignedFrameSelector(FrameSelector):
+    """A frame selector that moves the frames selected by another selector onto the
+    nearest keyframe.
+
+    Seeking to a frame decodes from the preceding keyframe up to it, so frames that
+    are keyframes are extracted with a single decode. A frame is only moved when a
+    keyframe is at most `MAX_DRIFT_IN_FRAMES` away and not already selected.
+    Videos without a keyframe index keep the selection of the wrapped selector.
+    """
+
+    def __init__(
+        self,
+        frame_selector: FrameSelector,
+        settings: KeyframeAlignedFrameSelectorSettings,
+    ):
+        self._frame_selector = frame_selector
+        self._max_drift = settings.MAX_DRIFT_IN_FRAMES
+
+    def select(
+        self, metadata: VideoMetadata, video_session: VideoSession | None = None
+    ) -> FrameSelection:
+        selection = self._frame_selector.select(metadata, video_session=video_session)
+        keyframes = metadata.keyframe_indexes
+        if not keyframes:
+            return selection
+
+        indexes: list[int] = []
+        taken: set[int] = set()
+        aligned_count = 0
+        max_drift = 0
+        for target in selection.indexes:
+            keyframe = self._nearest_keyframe(keyframes, target)
+            index = target
+            if keyframe is not None and keyframe not in taken:
+                index = keyframe
+                aligned_count += 1
+            elif target in taken:
+                continue
+
+            taken.add(index)
+            indexes.append(index)
+            max_drift = max(max_drift, abs(index - target))
+
+        logger.info(
+            "Aligned %d of %d frames on keyframes, max drift %d frames (%.3f s)",
+            aligned_count,
+            len(indexes),
+            max_drift,
+            max_drift / metadata.fps if metadata.fps > 0 else 0.0,
+        )
+
+        return FrameSelection(indexes=sorted(indexes))
+
+    def _nearest_keyframe(self, keyframes: Sequence[int], index: int) -> int | None:
+        """Get the keyframe closest to the index within the allowed drift."""
+
+        position = bisect_left(keyframes, index)
+        candidates = keyframes[max(position - 1, 0) : position + 1]
+        nearest = min(candidates, key=lambda keyframe: abs(keyframe - index))
+        return nearest if abs(nearest - index) <= self._max_drift else None
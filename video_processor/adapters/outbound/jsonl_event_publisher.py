@@ -0,0 +1,40 @@
+"""An outbound adapter that implements the EventPublisher port by appending events
+to a local JSON Lines file."""
+
+import json
+import os
+import threading
+
+from video_processor.domain.exceptions import EventPublishingError
+from video_processor.domain.ports import DomainEventT, EventPublisher
+from video_processor.infrastructure.config import JsonlEventPublisherSettings
+
+
+class JsonlEventPublisher(EventPublisher):
+    """An implementation of the EventPublisher port that appends events to a JSON
+    Lines file, one `{"event_type": ..., "message": ...}` object per line."""
+
+    def __init__(self, settings: JsonlEventPublisherSettings):
+        self._path = settings.PATH
+        self._lock = threading.Lock()
+
+    def publish(self, event: DomainEventT) -> None:
+        line = json.dumps(
+            {
+                "event_type": event.get_event_type(),
+                "message": json.loads(event.model_dump_json()),
+            }
+        )
+
+        try:
+            with self._lock:
+                directory = os.path.dirname(self._path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+
+                with open(self._path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            raise EventPublishingError(
+                f"Failed to publish event to {self._path}: {e}"
+            ) from e
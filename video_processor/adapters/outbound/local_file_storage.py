@@ -0,0 +1,234 @@
+"""Local File Storage Adapters"""
+
+import errno
+import logging
+import mimetypes
+import os
+import shutil
+import uuid
+
+from video_processor.domain.exceptions import StorageError
+from video_processor.domain.ports import InputStorage, OutputStorage, OutputUpload
+from video_processor.domain.value_objects import FileContent, StoredFileInfo, TempFile
+from video_processor.infrastructure.config import (
+    LocalInputStorageSettings,
+    LocalOutputStorageSettings,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning that copy_file_range cannot be used between these two files, e.g.
+# across filesystems on older kernels, in which case the copy falls back to sendfile.
+COPY_FILE_RANGE_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+}
+
+
+def _resolve_path(directory: str, path: str) -> str:
+    """Map a storage path onto the local directory.
+
+    Object storage URIs such as `s3://bucket/key` are mapped to `<directory>/key`, so
+    the events produced for the AWS runtime can be replayed locally unchanged.
+    """
+
+    if "://" in path:
+        path = path.split("://", 1)[1].split("/", 1)[-1]
+
+    root = os.path.abspath(directory)
+    resolved = os.path.abspath(os.path.join(root, path.lstrip("/")))
+    if os.path.commonpath([root, resolved]) != root:
+        raise StorageError(f"Path {path} is outside of the storage directory")
+
+    return resolved
+
+
+def _copy_file(source_path: str, destination_path: str) -> None:
+    """Copy a file inside the kernel with copy_file_range or sendfile, without
+    reading its content into user space."""
+
+    if not hasattr(os, "sendfile"):
+        shutil.copyfile(source_path, destination_path)
+        return
+
+    with open(source_path, "rb") as src, open(destination_path, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        offset = 0
+        use_copy_file_range = hasattr(os, "copy_file_range")
+        while offset < size:
+            if use_copy_file_range:
+                try:
+                    copied = os.copy_file_range(
+                        src.fileno(), dst.fileno(), size - offset, offset, offset
+                    )
+                except OSError as e:
+                    if e.errno not in COPY_FILE_RANGE_FALLBACK_ERRNOS:
+                        raise
+
+                    use_copy_file_range = False
+                    continue
+            else:
+                dst.seek(offset)
+                copied = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+
+            if copied == 0:
+                raise StorageError(f"File {source_path} was truncated while copying")
+
+            offset += copied
+
+
+class LocalInputStorage(InputStorage):
+    """LocalInputStorage is an implementation of the InputStorage port that reads
+    videos from a local directory.
+
+    Videos are handed out as hard links into the temporary file when both are on the
+    same filesystem, and copied inside the kernel otherwise. Downloaded files refer
+    to the file in the directory rather than holding its content.
+    """
+
+    def __init__(self, settings: LocalInputStorageSettings):
+        self._directory = settings.DIRECTORY
+        self._link_files = settings.LINK_FILES
+
+    def download_file(self, source_path: str) -> FileContent:
+        path = _resolve_path(self._directory, source_path)
+        if not os.path.isfile(path):
+            raise StorageError(f"Failed to read local file: {path} does not exist")
+
+        # The file is already local, so it is referenced instead of read
+        return FileContent(path=source_path, local_path=path)
+
+    def download_to_file(
+        self,
+        source_path: str,
+        temp_file: TempFile,
+        file_info: StoredFileInfo | None = None,
+    ) -> None:
+        path = _resolve_path(self._directory, source_path)
+        try:
+            if not self._link_files or not self._link(path, temp_file):
+                _copy_file(path, temp_file.path)
+        except OSError as e:
+            raise StorageError(f"Failed to read local file: {e}") from e
+
+    def get_file_info(self, source_path: str) -> StoredFileInfo:
+        path = _resolve_path(self._directory, source_path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise StorageError(f"Failed to get local file info: {e}") from e
+
+        return StoredFileInfo(
+            path=source_path,
+            size_in_bytes=stat.st_size,
+            content_type=mimetypes.guess_type(path)[0],
+            # Changes whenever the file is replaced or rewritten, like an S3 ETag
+            etag=f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        )
+
+    def read_range(self, source_path: str, start: int, length: int) -> bytes:
+        path = _resolve_path(self._directory, source_path)
+        if length <= 0:
+            return b""
+
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                return os.pread(fd, length, start)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            raise StorageError(f"Failed to read local file range: {e}") from e
+
+    def _link(self, path: str, temp_file: TempFile) -> bool:
+        """Replace the temporary file with a hard link to the video.
+
+        Returns:
+            bool: False if the files cannot be linked, e.g. across filesystems.
+        """
+
+        link_path = f"{temp_file.path}.{uuid.uuid4().hex}.link"
+        try:
+            os.link(path, link_path)
+        except OSError as e:
+            logger.debug("Hard link to %s failed, copying it: %s", path, e)
+            return False
+
+        os.replace(link_path, temp_file.path)
+        return True
+
+
+class _LocalOutputUpload(OutputUpload):
+    """An upload written into a partial file, renamed to its destination once
+    complete."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._partial_path = f"{path}.{uuid.uuid4().hex}.part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(self._partial_path, "wb")
+
+    def write(self, data: bytes | memoryview) -> int:
+        try:
+            return self._file.write(data)
+        except OSError as e:
+            raise StorageError(f"Failed to write local file: {e}") from e
+
+    def complete(self) -> None:
+        try:
+            self._file.close()
+            os.replace(self._partial_path, self._path)
+        except OSError as e:
+            raise StorageError(f"Failed to write local file: {e}") from e
+
+    def abort(self) -> None:
+        try:
+            self._file.close()
+            if os.path.exists(self._partial_path):
+                os.remove(self._partial_path)
+        except OSError as e:
+            logger.warning(
+                "Failed to remove partial file %s: %s", self._partial_path, e
+            )
+
+
+class LocalOutputStorage(OutputStorage):
+    """LocalOutputStorage is an implementation of the OutputStorage port that writes
+    files into a local directory.
+
+    Files are written under a temporary name and renamed once complete, so readers
+    never see a partially written archive. Streamed uploads are written the same
+    way as they are produced, and files left on disk are copied inside the kernel.
+    """
+
+    def __init__(self, settings: LocalOutputStorageSettings):
+        self._directory = settings.DIRECTORY
+
+    def upload_file(self, file_content: FileContent, destination_path: str) -> None:
+        path = _resolve_path(self._directory, destination_path)
+        partial_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if file_content.local_path is not None:
+                _copy_file(file_content.local_path, partial_path)
+            else:
+                with open(partial_path, "wb") as f:
+                    for chunk in file_content.iter_chunks():
+                        f.write(chunk)
+
+            os.replace(partial_path, path)
+        except OSError as e:
+            raise StorageError(f"Failed to write local file: {e}") from e
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    def open_upload(self, destination_path: str) -> OutputUpload:
+        path = _resolve_path(self._directory, destination_path)
+        try:
+            return _LocalOutputUpload(path)
+        except OSError as e:
+            raise StorageError(f"Failed to write local file: {e}") from e
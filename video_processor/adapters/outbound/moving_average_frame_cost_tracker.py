@@ -0,0 +1,42 @@
+import logging
+import threading
+
+from video_processor.domain.ports import FrameCostTracker
+from video_processor.infrastructure.config import FrameCostTrackerSettings
+
+logger = logging.getLogger(__name__)
+
+
+class MovingAverageFrameCostTracker(FrameCostTracker):
+    """An implementation of the FrameCostTracker port that keeps an exponential
+    moving average of the time taken per frame.
+
+    The estimate starts at `INITIAL_SECONDS_PER_FRAME` and moves towards each
+    measurement by `SMOOTHING`, so it follows the videos processed by this worker
+    without being swayed by a single unusual one.
+    """
+
+    def __init__(self, settings: FrameCostTrackerSettings):
+        self._seconds_per_frame = settings.INITIAL_SECONDS_PER_FRAME
+        self._smoothing = settings.SMOOTHING
+        self._lock = threading.Lock()
+
+    @property
+    def seconds_per_frame(self) -> float:
+        with self._lock:
+            return self._seconds_per_frame
+
+    def record(self, frame_count: int, elapsed_seconds: float) -> None:
+        if frame_count <= 0 or elapsed_seconds < 0:
+            return
+
+        measured = elapsed_seconds / frame_count
+        with self._lock:
+            self._seconds_per_frame += self._smoothing * (
+                measured - self._seconds_per_frame
+            )
+            estimate = self._seconds_per_frame
+
+        logger.debug(
+            "Measured %.4f s per frame, estimate is now %.4f s", measured, estimate
+        )
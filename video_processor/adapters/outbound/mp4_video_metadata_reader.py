@@ -0,0 +1,262 @@
+"""MP4 Video Metadata Reader Adapter"""
+
+import logging
+import os
+import struct
+from array import array
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+from video_processor.domain.exceptions import (
+    TempFileManagerError,
+    VideoMetadataReadingError,
+)
+from video_processor.domain.ports import (
+    TempFileManager,
+    VideoMetadataReader,
+    VideoSession,
+)
+from video_processor.domain.value_objects import TempFile, VideoMetadata
+
+logger = logging.getLogger(__name__)
+
+VIDEO_HANDLER_TYPE = b"vide"
+
+
+class _VideoTrack(NamedTuple):
+    """The boxes of a video track needed to read its metadata."""
+
+    mdhd: memoryview
+    stbl: memoryview
+
+
+def _iter_boxes(data: memoryview) -> Iterator[tuple[bytes, memoryview]]:
+    """Iterate over the boxes of an ISO base media buffer.
+
+    Yields:
+        tuple[bytes, memoryview]: The type and the payload of each box.
+    """
+
+    offset = 0
+    while offset + 8 <= len(data):
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", data, offset + 8)
+            header_size = 16
+        elif size == 0:
+            size = len(data) - offset
+
+        if size < header_size or offset + size > len(data):
+            raise ValueError(f"Invalid size {size} for box {box_type!r}")
+
+        yield box_type, data[offset + header_size : offset + size]
+        offset += size
+
+
+def _find_box(data: memoryview, box_type: bytes) -> memoryview | None:
+    for child_type, payload in _iter_boxes(data):
+        if child_type == box_type:
+            return payload
+
+    return None
+
+
+def _count_samples(stbl: memoryview) -> int:
+    """Count the samples of a sample table, zero when its tables are empty."""
+
+    stts = _find_box(stbl, b"stts")
+    if stts is None or len(stts) < 8:
+        return 0
+
+    count = int(_read_table(stts, 2, ">u4")[:, 0].sum())
+    stsz = _find_box(stbl, b"stsz")
+    if stsz is not None:
+        (stsz_count,) = struct.unpack_from(">I", stsz, 8) if len(stsz) >= 12 else (0,)
+        count = min(count, stsz_count)
+
+    return count
+
+
+def _read_table(
+    box: memoryview, columns: int, dtype: str, header_size: int = 8
+) -> np.ndarray:
+    """Read the entries of a full box table preceded by its entry count."""
+
+    (entry_count,) = struct.unpack_from(">I", box, header_size - 4)
+    return np.frombuffer(
+        box, dtype=dtype, count=entry_count * columns, offset=header_size
+    ).reshape(entry_count, columns)
+
+
+class MP4VideoMetadataReader(VideoMetadataReader):
+    """An implementation of the VideoMetadataReader port that reads the sample tables
+    of MP4 and MOV files without decoding them.
+
+    The `moov` box of the file is parsed to get the exact frame count, the
+    presentation timestamp of every frame and the keyframe index of the first video
+    track. Only the `moov` box is read, the media data is skipped over.
+
+    Files that are not MP4 or MOV, fragmented files and files without a video track
+    are read by the fallback reader when one is given.
+    """
+
+    def __init__(
+        self,
+        temp_file_manager: TempFileManager,
+        fallback_reader: VideoMetadataReader | None = None,
+    ):
+        self._temp_file_manager = temp_file_manager
+        self._fallback_reader = fallback_reader
+
+    def read(
+        self, temp_file: TempFile, video_session: VideoSession | None = None
+    ) -> VideoMetadata:
+        try:
+            track = self._read_video_track(temp_file.path)
+            if track is not None:
+                return self._read_metadata(temp_file, track)
+
+            reason = "no video sample table found"
+        except (OSError, ValueError, struct.error) as e:
+            reason = f"invalid container: {e}"
+        except TempFileManagerError as e:
+            raise VideoMetadataReadingError(
+                f"An error occurred while reading video metadata: {e}"
+            ) from e
+
+        if self._fallback_reader is None:
+            raise VideoMetadataReadingError(
+                f"Failed to read MP4 video metadata: {reason}"
+            )
+
+        logger.info("Video is not a readable MP4 (%s), using the fallback", reason)
+        return self._fallback_reader.read(temp_file, video_session=video_session)
+
+    def _read_video_track(self, path: str) -> _VideoTrack | None:
+        """Find the first video track with a non-empty sample table, or None for
+        fragmented files whose samples are described by their `moof` boxes."""
+
+        moov = self._read_moov(path)
+        if moov is None or _find_box(moov, b"mvex") is not None:
+            return None
+
+        for box_type, trak in _iter_boxes(moov):
+            if box_type != b"trak":
+                continue
+
+            mdia = _find_box(trak, b"mdia")
+            hdlr = _find_box(mdia, b"hdlr") if mdia is not None else None
+            if mdia is None or hdlr is None or bytes(hdlr[8:12]) != VIDEO_HANDLER_TYPE:
+                continue
+
+            mdhd = _find_box(mdia, b"mdhd")
+            minf = _find_box(mdia, b"minf")
+            stbl = _find_box(minf, b"stbl") if minf is not None else None
+            if mdhd is not None and stbl is not None and _count_samples(stbl):
+                return _VideoTrack(mdhd=mdhd, stbl=stbl)
+
+        return None
+
+    def _read_moov(self, path: str) -> memoryview | None:
+        """Read the `moov` box of the file, seeking over the other top-level boxes
+        so the media data is never read."""
+
+        with open(path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            offset = 0
+            while offset + 8 <= file_size:
+                f.seek(offset)
+                size, box_type = struct.unpack(">I4s", f.read(8))
+                header_size = 8
+                if size == 1:
+                    (size,) = struct.unpack(">Q", f.read(8))
+                    header_size = 16
+                elif size == 0:
+                    size = file_size - offset
+
+                if size < header_size:
+                    raise ValueError(f"Invalid size {size} for box {box_type!r}")
+
+                if box_type == b"moov":
+                    return memoryview(f.read(size - header_size))
+
+                offset += size
+
+        return None
+
+    def _read_metadata(self, temp_file: TempFile, track: _VideoTrack) -> VideoMetadata:
+        version = track.mdhd[0]
+        if version == 1:
+            timescale, duration = struct.unpack_from(">IQ", track.mdhd, 20)
+        else:
+            timescale, duration = struct.unpack_from(">II", track.mdhd, 12)
+
+        if timescale == 0:
+            raise ValueError("Invalid media timescale 0")
+
+        stts_box = _find_box(track.stbl, b"stts")
+        if stts_box is None:
+            raise ValueError("Missing stts box")
+
+        stts = _read_table(stts_box, 2, ">u4")
+        deltas = np.repeat(stts[:, 1].astype(np.int64), stts[:, 0].astype(np.int64))
+        frame_count = len(deltas)
+
+        stsz = _find_box(track.stbl, b"stsz")
+        if stsz is not None:
+            (frame_count,) = struct.unpack_from(">I", stsz, 8)
+            if frame_count > len(deltas):
+                raise ValueError("Sample table has fewer timestamps than samples")
+
+            deltas = deltas[:frame_count]
+
+        # Decoding timestamps, shifted by the composition offsets of reordered frames
+        timestamps = np.cumsum(deltas) - deltas
+        ctts = _find_box(track.stbl, b"ctts")
+        if ctts is not None:
+            entries = _read_table(ctts, 2, ">i4" if ctts[0] == 1 else ">u4")
+            offsets = np.repeat(
+                entries[:, 1].astype(np.int64), entries[:, 0].astype(np.int64)
+            )[:frame_count]
+            timestamps[: len(offsets)] += offsets
+
+        # Frame indexes count frames in presentation order, samples are stored in
+        # decoding order
+        presentation_order = np.argsort(timestamps, kind="stable")
+        frame_indexes = np.empty(frame_count, dtype=np.int64)
+        frame_indexes[presentation_order] = np.arange(frame_count)
+        timestamps = timestamps[presentation_order]
+        if frame_count:
+            timestamps -= timestamps[0]
+
+        stss = _find_box(track.stbl, b"stss")
+        if stss is None:
+            # Every sample is a sync sample
+            keyframes = np.arange(frame_count, dtype=np.int64)
+        else:
+            sync_samples = _read_table(stss, 1, ">u4")[:, 0].astype(np.int64) - 1
+            sync_samples = sync_samples[
+                (sync_samples >= 0) & (sync_samples < frame_count)
+            ]
+            keyframes = np.sort(frame_indexes[sync_samples])
+
+        if duration in (0, 0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+            duration = int(deltas.sum())
+
+        duration_seconds = duration / timescale
+        frame_timestamps = array("d")
+        frame_timestamps.frombytes((timestamps / timescale).astype("=f8").tobytes())
+        keyframe_indexes = array("q")
+        keyframe_indexes.frombytes(keyframes.astype("=i8").tobytes())
+
+        return VideoMetadata(
+            path=temp_file.path,
+            duration_seconds=duration_seconds,
+            frame_count=frame_count,
+            fps=frame_count / duration_seconds if duration_seconds > 0 else 0.0,
+            size_in_bytes=self._temp_file_manager.get_size(temp_file),
+            frame_timestamps=frame_timestamps,
+            keyframe_indexes=keyframe_indexes,
+        )
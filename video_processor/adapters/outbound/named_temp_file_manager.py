@@ -1,26 +1,129 @@
+import logging
 import os
 import tempfile
+import threading
 
 from video_processor.domain.exceptions import TempFileManagerError
 from video_processor.domain.ports import TempFileManager
 from video_processor.domain.value_objects import TempFile
+from video_processor.infrastructure.config import TempFileManagerSettings
+
+logger = logging.getLogger(__name__)
+
+MEMFD_PATH_PREFIX = "/proc/self/fd/"
+MEMINFO_PATH = "/proc/meminfo"
+CGROUP_MEMORY_FILES = [
+    # cgroup v2
+    ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+    # cgroup v1
+    (
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+        "/sys/fs/cgroup/memory/memory.usage_in_bytes",
+    ),
+]
+# cgroup v1 reports an unlimited memory as a huge page-aligned value
+CGROUP_UNLIMITED_THRESHOLD = 1 << 60
+
+
+def _read_int(path: str) -> int | None:
+    try:
+        with open(path, encoding="ascii") as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+
+    return int(value) if value.isdigit() else None
+
+
+def _get_available_memory() -> int | None:
+    """Get the memory available to this process in bytes, as the lowest of the
+    cgroup headroom and the MemAvailable of the host.
+
+    Returns:
+        int | None: The available memory, or None if it cannot be determined.
+    """
+
+    candidates = []
+    for limit_path, usage_path in CGROUP_MEMORY_FILES:
+        limit = _read_int(limit_path)
+        usage = _read_int(usage_path)
+        if limit is not None and usage is not None:
+            if limit < CGROUP_UNLIMITED_THRESHOLD:
+                candidates.append(max(limit - usage, 0))
+            break
+
+    try:
+        with open(MEMINFO_PATH, encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    candidates.append(int(line.split()[1]) * 1024)
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return min(candidates) if candidates else None
 
 
 class NamedTempFileManager(TempFileManager):
-    """An implementation of the TempFileManager port that uses named temporary files"""
+    """An implementation of the TempFileManager port that uses named temporary files
+
+    Files are created on disk by default. With the `memfd` or `tmpfs` storage, files
+    whose expected size is below `MEMORY_MAX_FILE_SIZE_IN_BYTES` are placed in memory
+    when enough memory is available, either as an anonymous memory file exposed as
+    `/proc/self/fd/N` or in a tmpfs directory. Files of unknown size, larger files and
+    files that do not fit in the available memory fall back to disk.
+    """
+
+    def __init__(self, settings: TempFileManagerSettings | None = None):
+        settings = settings or TempFileManagerSettings()
+        self._storage = settings.STORAGE
+        self._directory = settings.DIRECTORY
+        self._tmpfs_directory = settings.TMPFS_DIRECTORY
+        self._memory_max_file_size = settings.MEMORY_MAX_FILE_SIZE_IN_BYTES
+        self._memory_headroom = settings.MEMORY_HEADROOM_IN_BYTES
+        self._fadvise = settings.FADVISE and hasattr(os, "posix_fadvise")
+        self._lock = threading.Lock()
+        # Memory files created by this manager, with the size reserved for them
+        self._memory_files: dict[str, int] = {}
+        self._memfds: dict[str, int] = {}
 
-    def create(self, content: bytes, suffix: str = "") -> TempFile:
+        if self._storage == "memfd" and not hasattr(os, "memfd_create"):
+            logger.warning("memfd_create is not available, using tmpfs instead")
+            self._storage = "tmpfs"
+
+    def create(
+        self, content: bytes, suffix: str = "", size_hint: int | None = None
+    ) -> TempFile:
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-                temp_file.write(content)
-                temp_file.flush()
-                return TempFile(path=temp_file.name)
+            size = max(size_hint or 0, len(content))
+            if self._should_use_memory(size):
+                try:
+                    temp_file = self._create_in_memory(content, suffix, size)
+                    if temp_file is not None:
+                        return temp_file
+                except (IOError, OSError):
+                    logger.warning(
+                        "Failed to create temporary file in memory, using disk",
+                        exc_info=True,
+                    )
+
+            return self._create_on_disk(content, suffix, self._directory)
         except (IOError, OSError) as e:
             raise TempFileManagerError(f"Failed to create temporary file: {e}") from e
 
     def delete(self, temp_file: TempFile) -> None:
         try:
-            os.remove(temp_file.path)
+            with self._lock:
+                memfd = self._memfds.pop(temp_file.path, None)
+
+            if memfd is not None:
+                os.close(memfd)
+            else:
+                self._drop_page_cache(temp_file)
+                os.remove(temp_file.path)
+
+            with self._lock:
+                self._memory_files.pop(temp_file.path, None)
         except (IOError, OSError) as e:
             raise TempFileManagerError(f"Failed to delete temporary file: {e}") from e
 
@@ -29,3 +132,89 @@ class NamedTempFileManager(TempFileManager):
             return os.path.getsize(temp_file.path)
         except (IOError, OSError) as e:
             raise TempFileManagerError(f"Failed to get file size: {e}") from e
+
+    def _should_use_memory(self, size: int) -> bool:
+        return self._storage != "disk" and 0 < size <= self._memory_max_file_size
+
+    def _create_in_memory(
+        self, content: bytes, suffix: str, size: int
+    ) -> TempFile | None:
+        """Create the file in memory if it fits in the available memory.
+
+        The size of the memory files that are still being filled is not yet
+        accounted by the kernel, so the size expected for every memory file created
+        by this manager is subtracted from the available memory.
+
+        Returns:
+            TempFile | None: The created file, or None if it does not fit in memory.
+        """
+
+        available = _get_available_memory()
+        with self._lock:
+            reserved = sum(self._memory_files.values())
+            if available is None or size + reserved + self._memory_headroom > available:
+                logger.info(
+                    "Not enough memory for a %d bytes temporary file, using disk",
+                    size,
+                )
+                return None
+
+            if self._storage == "memfd":
+                temp_file = self._create_memfd(content, suffix)
+            else:
+                temp_file = self._create_on_disk(content, suffix, self._tmpfs_directory)
+
+            self._memory_files[temp_file.path] = size
+            return temp_file
+
+    def _create_memfd(self, content: bytes, suffix: str) -> TempFile:
+        """Create an anonymous memory file, open until the file is deleted.
+
+        Must be called with the lock held.
+        """
+
+        memfd = os.memfd_create(f"video_processor{suffix}", os.MFD_CLOEXEC)
+        try:
+            with open(memfd, "wb", closefd=False) as f:
+                f.write(content)
+        except BaseException:
+            os.close(memfd)
+            raise
+
+        temp_file = TempFile(path=f"{MEMFD_PATH_PREFIX}{memfd}")
+        self._memfds[temp_file.path] = memfd
+        return temp_file
+
+    def _create_on_disk(
+        self, content: bytes, suffix: str, directory: str | None
+    ) -> TempFile:
+        with tempfile.NamedTemporaryFile(
+            delete=False, suffix=suffix, dir=directory
+        ) as temp_file:
+            temp_file.write(content)
+            temp_file.flush()
+            return TempFile(path=temp_file.name)
+
+    def _drop_page_cache(self, temp_file: TempFile) -> None:
+        """Drop the cached pages of a file that is still linked elsewhere.
+
+        Videos handed out as hard links, e.g. by the video cache, keep their pages
+        cached after the temporary file is removed, although this job will not read
+        them again.
+        """
+
+        if not self._fadvise or temp_file.path in self._memory_files:
+            return
+
+        try:
+            fd = os.open(temp_file.path, os.O_RDONLY)
+        except OSError:
+            return
+
+        try:
+            if os.fstat(fd).st_nlink > 1:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -1,49 +1,359 @@
-from typing import Iterator
+import logging
+import queue
+import resource
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Sequence
 
 import cv2
+import numpy as np
 
+from video_processor.adapters.outbound.opencv_video_session import (
+    OpenCVVideoSession,
+)
 from video_processor.domain.exceptions import FrameExtractionError
-from video_processor.domain.ports import FrameExtractor
-from video_processor.domain.value_objects import FrameSelection, RawFrame, TempFile
+from video_processor.domain.ports import FrameExtractor, VideoSession
+from video_processor.domain.value_objects import (
+    FrameSelection,
+    RawFrame,
+    TempFile,
+    VideoMetadata,
+)
+from video_processor.infrastructure.config import (
+    FrameEncodingSettings,
+    FrameExtractorSettings,
+)
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {"jpeg": "jpg", "webp": "webp", "png": "png"}
+JPEG_SAMPLING_FACTORS = {
+    "444": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_444,
+    "422": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_422,
+    "420": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420,
+    "411": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_411,
+    "440": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_440,
+}
+
+
+def _get_encoding_params(settings: FrameEncodingSettings) -> list[int]:
+    """Get the imencode parameters of the encoding profile."""
+
+    params: list[int] = []
+    if settings.FORMAT == "jpeg":
+        if settings.QUALITY is not None:
+            params += [cv2.IMWRITE_JPEG_QUALITY, settings.QUALITY]
+        if settings.JPEG_CHROMA_SUBSAMPLING is not None:
+            params += [
+                cv2.IMWRITE_JPEG_SAMPLING_FACTOR,
+                JPEG_SAMPLING_FACTORS[settings.JPEG_CHROMA_SUBSAMPLING],
+            ]
+        if settings.JPEG_OPTIMIZE:
+            params += [cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+    elif settings.FORMAT == "webp":
+        if settings.QUALITY is not None:
+            params += [cv2.IMWRITE_WEBP_QUALITY, settings.QUALITY]
+    elif settings.PNG_COMPRESSION is not None:
+        params += [cv2.IMWRITE_PNG_COMPRESSION, settings.PNG_COMPRESSION]
+
+    return params
+
+
+def _get_frame_timestamp(
+    metadata: VideoMetadata | None, frame_index: int
+) -> float | None:
+    """Get the presentation timestamp of a frame from the container index, or from
+    the frame rate when the index is unknown."""
+
+    if metadata is None:
+        return None
+
+    timestamps = metadata.frame_timestamps
+    if timestamps is not None and frame_index < len(timestamps):
+        return timestamps[frame_index]
+
+    return frame_index / metadata.fps if metadata.fps > 0 else None
+
+
+class _FrameBufferRing:
+    """A ring of decoded frame buffers, reused by the capture for the next reads
+    once the frame they hold is encoded.
+
+    Buffers are allocated by the capture on the first reads, so they have the shape
+    of the decoded frames, and again only if that shape changes.
+    """
+
+    def __init__(self, size: int):
+        self._free: queue.SimpleQueue[np.ndarray | None] = queue.SimpleQueue()
+        for _ in range(size):
+            self._free.put(None)
+
+        self.allocation_count = 0
+
+    def read(self, capture: cv2.VideoCapture) -> tuple[bool, np.ndarray | None]:
+        """Read the next frame into a free buffer, waiting for one if needed."""
+
+        buffer = self._free.get()
+        if buffer is None:
+            ret, frame = capture.read()
+        else:
+            ret, frame = capture.read(image=buffer)
+
+        if not ret:
+            self._free.put(buffer)
+        elif frame is not buffer:
+            self.allocation_count += 1
+
+        return ret, frame
+
+    def release(self, frame: np.ndarray) -> None:
+        """Give back the buffer of a frame that is no longer used."""
+        self._free.put(frame)
 
 
 class OpenCVFrameExtractor(FrameExtractor):
     """The OpenCVFrameExtractor is an implementation of the FrameExtractor port that
-    uses OpenCV to extract frames from video files."""
+    uses OpenCV to extract frames from video files.
+
+    When given an OpenCVVideoSession, frames are read from its capture instead of
+    opening the video again.
+
+    Seeking to a frame decodes from the keyframe before it, so with dense selections
+    the same frames would be decoded several times. For each gap between two
+    selected frames, the extractor either seeks or decodes forward with `grab()`,
+    which skips the colour conversion of the frames in the gap, depending on which
+    decodes fewer frames. The keyframe index of the metadata is used when known,
+    otherwise keyframes are assumed every `ESTIMATED_GOP_SIZE` frames.
+
+    Decoded frames are encoded by `ENCODER_THREADS` threads while the next frames
+    are decoded, as both release the GIL. At most `MAX_PENDING_FRAMES` decoded
+    frames wait to be encoded, and frames are yielded in selection order. Frames
+    are decoded into a ring of one more buffer than that, so decoding does not
+    allocate a new image for every frame.
+
+    Frames are encoded following the encoding profile: they are downscaled with
+    `INTER_AREA` to fit `MAX_WIDTH` and `MAX_HEIGHT`, optionally converted to
+    grayscale, and written in `FORMAT` with the extension of the format. Frames
+    carry their presentation timestamp when metadata is given.
+    """
+
+    def __init__(
+        self,
+        settings: FrameExtractorSettings | None = None,
+        encoding_settings: FrameEncodingSettings | None = None,
+    ):
+        settings = settings or FrameExtractorSettings()
+        encoding_settings = encoding_settings or FrameEncodingSettings()
+        self._read_mode = settings.READ_MODE
+        self._estimated_gop_size = settings.ESTIMATED_GOP_SIZE
+        self._seek_cost = settings.SEEK_COST_IN_FRAMES
+        self._encoder_threads = settings.ENCODER_THREADS
+        self._max_pending_frames = max(settings.MAX_PENDING_FRAMES, 1)
+        self._extension = IMAGE_EXTENSIONS[encoding_settings.FORMAT]
+        self._encoding_params = _get_encoding_params(encoding_settings)
+        self._max_width = encoding_settings.MAX_WIDTH
+        self._max_height = encoding_settings.MAX_HEIGHT
+        self._grayscale = encoding_settings.GRAYSCALE
 
     def extract(
-        self, temp_file: TempFile, frame_selection: FrameSelection
+        self,
+        temp_file: TempFile,
+        frame_selection: FrameSelection,
+        video_session: VideoSession | None = None,
+        metadata: VideoMetadata | None = None,
     ) -> Iterator[RawFrame]:
+        owns_capture = not isinstance(video_session, OpenCVVideoSession)
+        capture = None
         try:
-            capture = cv2.VideoCapture(temp_file.path)
+            if isinstance(video_session, OpenCVVideoSession):
+                capture = video_session.capture
+            else:
+                capture = cv2.VideoCapture(temp_file.path)
+
             if not capture.isOpened():
                 raise FrameExtractionError(
                     "Failed to open video file for frame extraction."
                 )
 
-            for frame_index in frame_selection.indexes:
-                capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
-                ret, frame = capture.read()
-                if not ret:
-                    raise FrameExtractionError(
-                        f"Failed to read frame at index {frame_index}."
-                    )
-
-                ret_buffer, buffer = cv2.imencode(".jpg", frame)
-                if not ret_buffer:
-                    raise FrameExtractionError(
-                        f"Failed to encode frame at index {frame_index}."
-                    )
-
-                yield RawFrame(
-                    index=frame_index,
-                    filename=f"frame_{frame_index}.jpg",
-                    content=buffer.tobytes(),
-                )
+            # One buffer per pending frame and one for the frame being decoded
+            ring = _FrameBufferRing(self._max_pending_frames + 1)
+            decoded_frames = self._decode(capture, frame_selection, metadata, ring)
+            if self._encoder_threads <= 0:
+                for frame_index, timestamp, frame in decoded_frames:
+                    yield self._encode(frame_index, timestamp, frame, ring)
+            else:
+                yield from self._encode_in_threads(decoded_frames, ring)
         except cv2.error as exc:
             raise FrameExtractionError(
                 f"An error occurred during frame extraction: {exc}"
             ) from exc
         finally:
-            if capture is not None:
+            if capture is not None and owns_capture:
                 capture.release()
+
+    def _decode(
+        self,
+        capture: cv2.VideoCapture,
+        frame_selection: FrameSelection,
+        metadata: VideoMetadata | None,
+        ring: _FrameBufferRing,
+    ) -> Iterator[tuple[int, float | None, np.ndarray]]:
+        """Decode the selected frames into the buffers of the ring, seeking or
+        grabbing through each gap.
+
+        Yields:
+            tuple[int, float | None, np.ndarray]: The index, the timestamp when known
+                and the decoded image of each frame.
+        """
+
+        keyframes = metadata.keyframe_indexes if metadata is not None else None
+        seek_count = 0
+        scanned_count = 0
+        # Index of the next frame decoded by the capture, unknown until the first
+        # seek as a shared capture may have been read by another adapter
+        position: int | None = None
+        for frame_index in frame_selection.indexes:
+            if position is not None and self._should_scan(
+                position, frame_index, keyframes
+            ):
+                for skipped_index in range(position, frame_index):
+                    if not capture.grab():
+                        raise FrameExtractionError(
+                            f"Failed to read frame at index {skipped_index}."
+                        )
+
+                scanned_count += frame_index - position
+            else:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+                seek_count += 1
+
+            ret, frame = ring.read(capture)
+            if not ret or frame is None:
+                raise FrameExtractionError(
+                    f"Failed to read frame at index {frame_index}."
+                )
+
+            position = frame_index + 1
+            yield frame_index, _get_frame_timestamp(metadata, frame_index), frame
+
+        logger.debug(
+            "Decoded %d frames into %d allocated buffers (peak RSS %d KiB) with %d "
+            "seeks and %d frames grabbed in between",
+            frame_selection.count,
+            ring.allocation_count,
+            # Kilobytes on Linux, where the service runs
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            seek_count,
+            scanned_count,
+        )
+
+    def _encode_in_threads(
+        self,
+        decoded_frames: Iterator[tuple[int, float | None, np.ndarray]],
+        ring: _FrameBufferRing,
+    ) -> Iterator[RawFrame]:
+        """Encode the decoded frames on a thread pool, keeping at most
+        `MAX_PENDING_FRAMES` decoded frames in memory."""
+
+        pending: deque[Future[RawFrame]] = deque()
+        with ThreadPoolExecutor(
+            max_workers=self._encoder_threads, thread_name_prefix="frame-encoder"
+        ) as executor:
+            try:
+                for frame_index, timestamp, frame in decoded_frames:
+                    if len(pending) >= self._max_pending_frames:
+                        yield pending.popleft().result()
+
+                    pending.append(
+                        executor.submit(
+                            self._encode, frame_index, timestamp, frame, ring
+                        )
+                    )
+
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _encode(
+        self,
+        frame_index: int,
+        timestamp: float | None,
+        decoded_frame: np.ndarray,
+        ring: _FrameBufferRing,
+    ) -> RawFrame:
+        try:
+            frame = self._resize(decoded_frame)
+            if self._grayscale:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+            extension = f".{self._extension}"
+            if self._encoding_params:
+                ret_buffer, buffer = cv2.imencode(
+                    extension, frame, self._encoding_params
+                )
+            else:
+                ret_buffer, buffer = cv2.imencode(extension, frame)
+        finally:
+            ring.release(decoded_frame)
+
+        if not ret_buffer:
+            raise FrameExtractionError(
+                f"Failed to encode frame at index {frame_index}."
+            )
+
+        # The frame holds a read-only view of the encoded buffer instead of a copy
+        return RawFrame(
+            index=frame_index,
+            filename=f"frame_{frame_index}{extension}",
+            content=buffer.data.toreadonly().cast("B"),
+            timestamp=timestamp,
+        )
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale the frame to fit the maximum width and height."""
+
+        if self._max_width is None and self._max_height is None:
+            return frame
+
+        height, width = frame.shape[:2]
+        scale = min(
+            self._max_width / width if self._max_width else 1.0,
+            self._max_height / height if self._max_height else 1.0,
+        )
+        if scale >= 1.0:
+            return frame
+
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def _should_scan(
+        self, position: int, target: int, keyframes: Sequence[int] | None
+    ) -> bool:
+        """Decide whether to decode forward to the target rather than seeking.
+
+        Args:
+            position (int): The index of the next frame the capture decodes.
+            target (int): The index of the frame to read.
+            keyframes (Sequence[int] | None): The keyframe indexes of the video.
+
+        Returns:
+            bool: True to grab the frames up to the target, False to seek to it.
+        """
+
+        if target < position or self._read_mode == "seek":
+            return False
+
+        if self._read_mode == "scan":
+            return True
+
+        if keyframes:
+            keyframe = keyframes[max(bisect_right(keyframes, target) - 1, 0)]
+            seek_decodes = target - keyframe
+        else:
+            # On average the target is half a GOP away from its keyframe
+            seek_decodes = min(target, self._estimated_gop_size // 2)
+
+        return target - position <= seek_decodes + self._seek_cost
@@ -1,10 +1,17 @@
 import cv2
 
+from video_processor.adapters.outbound.opencv_video_session import (
+    OpenCVVideoSession,
+)
 from video_processor.domain.exceptions import (
     TempFileManagerError,
     VideoMetadataReadingError,
 )
-from video_processor.domain.ports import TempFileManager, VideoMetadataReader
+from video_processor.domain.ports import (
+    TempFileManager,
+    VideoMetadataReader,
+    VideoSession,
+)
 from video_processor.domain.value_objects import TempFile, VideoMetadata
 
 
@@ -15,11 +22,15 @@ class OpenCVVideoMetadataReader(VideoMetadataReader):
     def __init__(self, temp_file_manager: TempFileManager):
         self._temp_file_manager = temp_file_manager
 
-    def read(self, temp_file: TempFile) -> VideoMetadata:
+    def read(
+        self, temp_file: TempFile, video_session: VideoSession | None = None
+    ) -> VideoMetadata:
         """Read metadata from the given video file.
 
         Args:
             temp_file (TempFile): The temporary file containing the video.
+            video_session (VideoSession | None, optional): The session whose capture
+                is reused if it is an OpenCVVideoSession. Defaults to None.
 
         Returns:
             VideoMetadata: The metadata of the video.
@@ -28,8 +39,14 @@ class OpenCVVideoMetadataReader(VideoMetadataReader):
             VideoMetadataReadingError: If an error occurs during video metadata reading.
         """
 
+        owns_capture = not isinstance(video_session, OpenCVVideoSession)
+        capture = None
         try:
-            capture = cv2.VideoCapture(temp_file.path)
+            if isinstance(video_session, OpenCVVideoSession):
+                capture = video_session.capture
+            else:
+                capture = cv2.VideoCapture(temp_file.path)
+
             if not capture.isOpened():
                 raise VideoMetadataReadingError(
                     "Failed to open video file for metadata reading."
@@ -37,9 +54,8 @@ class OpenCVVideoMetadataReader(VideoMetadataReader):
 
             frames_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
             fps = capture.get(cv2.CAP_PROP_FPS)
-            duration_seconds = capture.get(cv2.CAP_PROP_FRAME_COUNT) / capture.get(
-                cv2.CAP_PROP_FPS
-            )
+            # Some containers do not report a frame rate
+            duration_seconds = frames_count / fps if fps > 0 else 0.0
 
             return VideoMetadata(
                 path=temp_file.path,
@@ -56,5 +72,5 @@ class OpenCVVideoMetadataReader(VideoMetadataReader):
                 f"An error occurred while reading video metadata: {e}"
             ) from e
         finally:
-            if capture is not None:
+            if capture is not None and owns_capture:
                 capture.release()
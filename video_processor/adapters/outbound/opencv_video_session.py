@@ -0,0 +1,48 @@
+import cv2
+
+from video_processor.domain.ports import VideoSession, VideoSessionOpener
+from video_processor.domain.value_objects import TempFile
+
+
+class OpenCVVideoSession(VideoSession):
+    """An implementation of the VideoSession port that shares one OpenCV capture
+    between the OpenCV adapters.
+
+    The capture is opened on first use, so the errors raised while opening it are
+    reported by the adapter that needed it.
+    """
+
+    def __init__(self, temp_file: TempFile):
+        self._temp_file = temp_file
+        self._capture: cv2.VideoCapture | None = None
+
+    @property
+    def temp_file(self) -> TempFile:
+        """Get the temporary file the session is opened on."""
+        return self._temp_file
+
+    @property
+    def capture(self) -> cv2.VideoCapture:
+        """Get the capture of the video, opening it on first use.
+
+        The adapters using the capture must not release it, and must set its
+        position before reading from it.
+        """
+
+        if self._capture is None:
+            self._capture = cv2.VideoCapture(self._temp_file.path)
+
+        return self._capture
+
+    def close(self) -> None:
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class OpenCVVideoSessionOpener(VideoSessionOpener):
+    """An implementation of the VideoSessionOpener port that opens OpenCV video
+    sessions."""
+
+    def open(self, temp_file: TempFile) -> OpenCVVideoSession:
+        return OpenCVVideoSession(temp_file)
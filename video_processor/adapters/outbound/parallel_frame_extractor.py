@@ -0,0 +1,171 @@
+"""Parallel Frame Extractor Adapter"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator
+
+from video_processor.adapters.outbound.named_temp_file_manager import (
+    MEMFD_PATH_PREFIX,
+)
+from video_processor.domain.exceptions import FrameExtractionError
+from video_processor.domain.ports import FrameExtractor, VideoSession
+from video_processor.domain.value_objects import (
+    FrameSelection,
+    RawFrame,
+    TempFile,
+    VideoMetadata,
+)
+from video_processor.infrastructure.config import ParallelFrameExtractorSettings
+
+logger = logging.getLogger(__name__)
+
+
+def _get_usable_cpu_count() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+
+    return os.cpu_count() or 1
+
+
+def _extract_segment(
+    frame_extractor: FrameExtractor,
+    temp_file: TempFile,
+    frame_selection: FrameSelection,
+    metadata: VideoMetadata | None,
+) -> list[RawFrame]:
+    """Extract a segment of the selection in a worker process, with the content of
+    the frames as bytes so they can be sent back."""
+
+    return [
+        RawFrame(
+            index=frame.index,
+            filename=frame.filename,
+            content=bytes(frame.content),
+            timestamp=frame.timestamp,
+        )
+        for frame in frame_extractor.extract(
+            temp_file, frame_selection, metadata=metadata
+        )
+    ]
+
+
+class ParallelFrameExtractor(FrameExtractor):
+    """ParallelFrameExtractor is a decorator of the FrameExtractor port that extracts
+    contiguous segments of the selection in worker processes.
+
+    The selection is split into segments of `SEGMENT_FRAMES` frames, each extracted
+    by the wrapped extractor in a worker process opening the video itself. At most
+    `MAX_PENDING_SEGMENTS` segments are submitted and not yet yielded, so only their
+    frames are held in memory, and the next segment is submitted as each one is
+    yielded. Frames are yielded in index order. Selections too small to be split
+    are extracted by the wrapped extractor in this process, reusing the video
+    session.
+
+    The wrapped extractor must be picklable. The worker processes are started on
+    first use and reused across videos until the extractor is closed.
+    """
+
+    def __init__(
+        self, frame_extractor: FrameExtractor, settings: ParallelFrameExtractorSettings
+    ):
+        self._frame_extractor = frame_extractor
+        self._workers = settings.WORKERS or _get_usable_cpu_count()
+        self._segment_frames = max(settings.SEGMENT_FRAMES, 1)
+        self._max_pending_segments = max(
+            settings.MAX_PENDING_SEGMENTS or 2 * self._workers, 1
+        )
+        self._start_method = settings.START_METHOD
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def extract(
+        self,
+        temp_file: TempFile,
+        frame_selection: FrameSelection,
+        video_session: VideoSession | None = None,
+        metadata: VideoMetadata | None = None,
+    ) -> Iterator[RawFrame]:
+        if self._workers < 2 or frame_selection.count < 2 * self._segment_frames:
+            yield from self._frame_extractor.extract(
+                temp_file,
+                frame_selection,
+                video_session=video_session,
+                metadata=metadata,
+            )
+            return
+
+        worker_temp_file = self._get_worker_temp_file(temp_file)
+        indexes = frame_selection.indexes
+        pending: deque[Future[list[RawFrame]]] = deque()
+        try:
+            executor = self._get_executor()
+            logger.info(
+                "Extracting %d frames in segments of %d frames",
+                frame_selection.count,
+                self._segment_frames,
+            )
+            for start in range(0, len(indexes), self._segment_frames):
+                if len(pending) >= self._max_pending_segments:
+                    yield from pending.popleft().result()
+
+                pending.append(
+                    executor.submit(
+                        _extract_segment,
+                        self._frame_extractor,
+                        worker_temp_file,
+                        FrameSelection(
+                            indexes=indexes[start : start + self._segment_frames]
+                        ),
+                        metadata,
+                    )
+                )
+
+            while pending:
+                yield from pending.popleft().result()
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._executor = None
+
+            raise FrameExtractionError(
+                f"A frame extraction worker terminated abruptly: {e}"
+            ) from e
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context(self._start_method),
+                )
+
+            return self._executor
+
+    def _get_worker_temp_file(self, temp_file: TempFile) -> TempFile:
+        """Get the path of the video as seen from a worker process.
+
+        Memory files are only reachable through a descriptor of this process, which
+        workers open through the descriptor table of this process.
+        """
+
+        if not temp_file.path.startswith(MEMFD_PATH_PREFIX):
+            return temp_file
+
+        fd = temp_file.path.removeprefix(MEMFD_PATH_PREFIX)
+        return TempFile(path=f"/proc/{os.getpid()}/fd/{fd}")
@@ -0,0 +1,171 @@
+"""Prefetching Input Storage Adapter"""
+
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from video_processor.domain.exceptions import (
+    StorageError,
+    TempFileManagerError,
+    VideoValidationError,
+)
+from video_processor.domain.ports import (
+    InputStorage,
+    TempFileManager,
+    VideoPrefetcher,
+    VideoProbeValidator,
+)
+from video_processor.domain.value_objects import (
+    FileContent,
+    StoredFileInfo,
+    TempFile,
+    VideoProbe,
+    VideoValidationCost,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchingInputStorage(InputStorage, VideoPrefetcher):
+    """PrefetchingInputStorage is a decorator of the InputStorage port that downloads
+    videos on a background I/O worker before they are requested.
+
+    When the use case downloads a prefetched video, the prefetched file is moved into
+    its temporary file instead of being downloaded again. Videos that were not
+    prefetched, or whose prefetch failed, are downloaded from the wrapped storage.
+
+    The pre-download validators that only need the storage metadata are run before
+    a video is prefetched, so uploads they reject are not downloaded ahead.
+    """
+
+    def __init__(
+        self,
+        input_storage: InputStorage,
+        temp_file_manager: TempFileManager,
+        video_probe_validators: list[VideoProbeValidator] | None = None,
+    ):
+        self._input_storage = input_storage
+        self._temp_file_manager = temp_file_manager
+        self._video_probe_validators = [
+            validator
+            for validator in video_probe_validators or []
+            if validator.cost <= VideoValidationCost.OBJECT_INFO
+        ]
+        self._lock = threading.Lock()
+        self._prefetched: dict[str, Future[TempFile]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="video-prefetch"
+        )
+
+    def download_file(self, source_path: str) -> FileContent:
+        return self._input_storage.download_file(source_path)
+
+    def get_file_info(self, source_path: str) -> StoredFileInfo:
+        return self._input_storage.get_file_info(source_path)
+
+    def read_range(self, source_path: str, start: int, length: int) -> bytes:
+        return self._input_storage.read_range(source_path, start, length)
+
+    def prefetch(self, source_path: str) -> None:
+        with self._lock:
+            if source_path in self._prefetched:
+                return
+
+            self._prefetched[source_path] = self._executor.submit(
+                self._download, source_path
+            )
+
+        logger.info("Prefetching video %s", source_path)
+
+    def discard(self, source_path: str) -> None:
+        with self._lock:
+            future = self._prefetched.pop(source_path, None)
+
+        if future is None:
+            return
+
+        if not future.cancel():
+            future.add_done_callback(self._delete_prefetched)
+
+        logger.info("Discarded prefetched video %s", source_path)
+
+    def download_to_file(
+        self,
+        source_path: str,
+        temp_file: TempFile,
+        file_info: StoredFileInfo | None = None,
+    ) -> None:
+        with self._lock:
+            future = self._prefetched.pop(source_path, None)
+
+        if future is None:
+            self._input_storage.download_to_file(source_path, temp_file, file_info)
+            return
+
+        try:
+            prefetched = future.result()
+        except (StorageError, TempFileManagerError, VideoValidationError):
+            logger.warning(
+                "Prefetch of video %s failed, downloading it again",
+                source_path,
+                exc_info=True,
+            )
+
+            self._input_storage.download_to_file(source_path, temp_file, file_info)
+            return
+
+        try:
+            self._move(prefetched, temp_file)
+            logger.info("Video %s served from prefetch", source_path)
+        except (IOError, OSError) as e:
+            raise StorageError(f"Failed to move prefetched video: {e}") from e
+
+    def close(self) -> None:
+        """Discard every pending prefetch and stop the background worker."""
+
+        with self._lock:
+            source_paths = list(self._prefetched)
+
+        for source_path in source_paths:
+            self.discard(source_path)
+
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _download(self, source_path: str) -> TempFile:
+        file_info = None
+        if self._video_probe_validators:
+            file_info = self._input_storage.get_file_info(source_path)
+            probe = VideoProbe(file_info=file_info)
+            for validator in self._video_probe_validators:
+                validator.validate(probe)
+
+        suffix = source_path.split(".")[-1] if "." in source_path else ""
+        temp_file = self._temp_file_manager.create(content=b"", suffix=suffix)
+        try:
+            self._input_storage.download_to_file(source_path, temp_file, file_info)
+        except StorageError:
+            self._temp_file_manager.delete(temp_file)
+            raise
+
+        return temp_file
+
+    def _move(self, prefetched: TempFile, temp_file: TempFile) -> None:
+        """Move the prefetched file over the temporary file, copying it when the
+        files cannot be renamed onto each other."""
+
+        try:
+            os.replace(prefetched.path, temp_file.path)
+        except OSError:
+            shutil.copyfile(prefetched.path, temp_file.path)
+            self._temp_file_manager.delete(prefetched)
+
+    def _delete_prefetched(self, future: Future[TempFile]) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        try:
+            self._temp_file_manager.delete(future.result())
+        except TempFileManagerError:
+            logger.warning("Failed to delete discarded prefetched video", exc_info=True)
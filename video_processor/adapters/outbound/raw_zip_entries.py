@@ -0,0 +1,124 @@
+"""Raw ZIP entries
+
+ZipFile only writes the data it compresses itself, on the thread writing the
+archive. Entries compressed beforehand, on a thread pool or to know their size, are
+written as they are, which relies on zipfile internals that are not part of its
+documented API. Every use of those internals is kept in this module, which is only
+used on the Python versions its round-trip tests were run with.
+"""
+
+import io
+import sys
+import zipfile
+from typing import Any
+
+# Python versions whose zipfile internals this module was tested with
+MIN_PYTHON_VERSION = (3, 11)
+MAX_PYTHON_VERSION = (3, 13)
+# The zipfile internals used by this module
+ZIPFILE_FUNCTIONS = ("_get_compressor", "_get_decompressor")
+ZIPFILE_ATTRIBUTES = (
+    "fp",
+    "start_dir",
+    "filelist",
+    "NameToInfo",
+    "_lock",
+    "_writing",
+    "_seekable",
+    "_writecheck",
+    "_didModify",
+)
+ZIPINFO_METHODS = ("FileHeader",)
+
+
+def check_raw_entries_supported() -> None:
+    """Check that the zipfile internals used to write raw entries are available.
+
+    Raises:
+        RuntimeError: If the Python version was not tested or misses an internal.
+    """
+
+    version = sys.version_info[:2]
+    if not MIN_PYTHON_VERSION <= version <= MAX_PYTHON_VERSION:
+        raise RuntimeError(
+            f"Raw ZIP entries are not tested with Python {version[0]}.{version[1]}"
+        )
+
+    with zipfile.ZipFile(io.BytesIO(), mode="w") as zip_file:
+        missing = [
+            *(name for name in ZIPFILE_FUNCTIONS if not hasattr(zipfile, name)),
+            *(name for name in ZIPFILE_ATTRIBUTES if not hasattr(zip_file, name)),
+            *(name for name in ZIPINFO_METHODS if not hasattr(zipfile.ZipInfo, name)),
+        ]
+
+    if missing:
+        raise RuntimeError(f"zipfile misses {', '.join(missing)} to write raw entries")
+
+
+def compress_entry_data(
+    content: bytes | memoryview, method: int, level: int | None
+) -> bytes | memoryview:
+    """Compress the data of an entry with the compressor zipfile itself uses."""
+
+    compressor = getattr(zipfile, "_get_compressor")(method, level)
+    if compressor is None:
+        return content
+
+    return compressor.compress(content) + compressor.flush()
+
+
+def decompress_entry_data(data: bytes, method: int) -> bytes:
+    """Decompress the data of an entry with the decompressor zipfile itself uses."""
+
+    decompressor = getattr(zipfile, "_get_decompressor")(method)
+    if decompressor is None:
+        return data
+
+    return decompressor.decompress(data)
+
+
+def is_zip64(entry: zipfile.ZipInfo) -> bool:
+    return max(entry.file_size, entry.compress_size) > zipfile.ZIP64_LIMIT
+
+
+def get_local_header(entry: zipfile.ZipInfo) -> bytes:
+    """Get the local header of an entry whose sizes and CRC are known."""
+    return entry.FileHeader(is_zip64(entry))
+
+
+def write_raw_entry(
+    zip_file: zipfile.ZipFile, entry: zipfile.ZipInfo, data: bytes | memoryview
+) -> None:
+    """Write an entry compressed beforehand at the end of the archive.
+
+    This does what `ZipFile.open(entry, "w")` does once the data is compressed,
+    with the same checks. As the sizes and CRC are known before writing, the local
+    header is final and no data descriptor is needed, even when the archive cannot
+    seek back.
+
+    Raises:
+        ValueError: If the archive is closed, not writable or has an entry open for
+            writing.
+    """
+
+    # The attributes used are checked by check_raw_entries_supported
+    internals: Any = zip_file
+    with internals._lock:
+        if internals._writing:
+            raise ValueError(
+                "Can't write to the ZIP file while there is another write handle "
+                "open on it"
+            )
+
+        # Checks the mode, the compression method and warns of duplicate names
+        internals._writecheck(entry)
+        internals._didModify = True
+        if internals._seekable:
+            internals.fp.seek(internals.start_dir)
+
+        entry.header_offset = internals.fp.tell()
+        internals.fp.write(get_local_header(entry))
+        internals.fp.write(data)
+        internals.start_dir = internals.fp.tell()
+        internals.filelist.append(entry)
+        internals.NameToInfo[entry.filename] = entry
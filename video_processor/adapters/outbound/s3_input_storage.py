@@ -1,31 +1,263 @@
 """S3 Input Storage Adapter"""
 
-from boto3 import Session
+import logging
+import tempfile
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any
+
 from boto3.exceptions import Boto3Error
+from boto3.s3.transfer import TransferConfig
 from botocore.errorfactory import ClientError
+from botocore.exceptions import BotoCoreError
 
 from video_processor.domain.exceptions import StorageError
 from video_processor.domain.ports import InputStorage
-from video_processor.domain.value_objects import FileContent
+from video_processor.domain.value_objects import (
+    FileContent,
+    StoredFileInfo,
+    TempFile,
+)
+from video_processor.infrastructure.boto_client_factory import BotoClientFactory
 from video_processor.infrastructure.config import S3InputStorageSettings
 
+logger = logging.getLogger(__name__)
+
+# Client errors worth retrying for a single part, everything else (missing key,
+# access denied, object changed while downloading) fails the download right away.
+RETRYABLE_ERROR_CODES = {
+    "InternalError",
+    "RequestTimeout",
+    "ServiceUnavailable",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+}
+
 
 class S3InputStorage(InputStorage):
     """S3InputStorage is an implementation of the InputStorage port that
     interacts with S3 storage.
+
+    Objects larger than the multipart threshold are downloaded as concurrent ranged
+    GETs, each written into the temporary file at its own offset. Files downloaded
+    without a temporary file are spooled by the managed transfer of boto3, in memory
+    up to the multipart threshold and on disk beyond it, and must be closed.
     """
 
-    def __init__(self, boto_session: Session, settings: S3InputStorageSettings):
+    def __init__(
+        self, client_factory: BotoClientFactory, settings: S3InputStorageSettings
+    ):
         self._bucket_name = settings.BUCKET_NAME
-        self._s3_client = boto_session.client("s3")
+        self._chunk_size = settings.DOWNLOAD_CHUNK_SIZE_IN_BYTES
+        self._multipart_threshold = settings.MULTIPART_THRESHOLD_IN_BYTES
+        self._part_size = settings.MULTIPART_PART_SIZE_IN_BYTES
+        self._max_concurrency = settings.MULTIPART_MAX_CONCURRENCY
+        self._part_max_attempts = settings.MULTIPART_PART_MAX_ATTEMPTS
+        self._part_retry_backoff = settings.MULTIPART_PART_RETRY_BACKOFF_SECONDS
+        self._client_factory = client_factory
+
+    @property
+    def _s3_client(self) -> Any:
+        """Get the S3 client of the current process, as the factory
+        replaces its clients in a forked child process."""
+        return self._client_factory.client("s3")
 
     def download_file(self, source_path: str) -> FileContent:
         source_path = source_path.replace(f"s3://{self._bucket_name}/", "")
+        # Kept in memory up to the multipart threshold, and on disk beyond it
+        spooled_file = tempfile.SpooledTemporaryFile(max_size=self._multipart_threshold)
         try:
-            response = self._s3_client.get_object(
+            self._s3_client.download_fileobj(
+                Bucket=self._bucket_name,
+                Key=source_path,
+                Fileobj=spooled_file,
+                Config=TransferConfig(
+                    multipart_threshold=self._multipart_threshold,
+                    multipart_chunksize=self._part_size,
+                    max_concurrency=self._max_concurrency,
+                ),
+            )
+        except (Boto3Error, BotoCoreError, ClientError) as e:
+            spooled_file.close()
+            raise StorageError(f"Failed to download file from S3: {e}") from e
+
+        spooled_file.seek(0)
+        return FileContent(path=source_path, fileobj=spooled_file)
+
+    def get_file_info(self, source_path: str) -> StoredFileInfo:
+        source_path = source_path.replace(f"s3://{self._bucket_name}/", "")
+        try:
+            response = self._s3_client.head_object(
                 Bucket=self._bucket_name, Key=source_path
             )
-            content = response["Body"].read()
-            return FileContent(path=source_path, content=content)
-        except (Boto3Error, ClientError) as e:
+            return StoredFileInfo(
+                path=source_path,
+                size_in_bytes=response["ContentLength"],
+                content_type=response.get("ContentType"),
+                etag=response.get("ETag"),
+            )
+        except (Boto3Error, BotoCoreError, ClientError) as e:
+            raise StorageError(f"Failed to get file info from S3: {e}") from e
+
+    def read_range(self, source_path: str, start: int, length: int) -> bytes:
+        source_path = source_path.replace(f"s3://{self._bucket_name}/", "")
+        if length <= 0:
+            return b""
+
+        try:
+            response = self._s3_client.get_object(
+                Bucket=self._bucket_name,
+                Key=source_path,
+                Range=f"bytes={start}-{start + length - 1}",
+            )
+            return response["Body"].read()
+        except (Boto3Error, BotoCoreError, ClientError) as e:
+            raise StorageError(f"Failed to read file range from S3: {e}") from e
+
+    def download_to_file(
+        self,
+        source_path: str,
+        temp_file: TempFile,
+        file_info: StoredFileInfo | None = None,
+    ) -> None:
+        source_path = source_path.replace(f"s3://{self._bucket_name}/", "")
+        try:
+            if file_info is not None and file_info.etag:
+                size, etag = file_info.size_in_bytes, file_info.etag
+            else:
+                head = self._s3_client.head_object(
+                    Bucket=self._bucket_name, Key=source_path
+                )
+                size, etag = head["ContentLength"], head["ETag"]
+
+            if size > self._multipart_threshold:
+                self._download_in_parts(source_path, etag, size, temp_file)
+            else:
+                self._download_in_one_stream(source_path, temp_file)
+        except (Boto3Error, BotoCoreError, ClientError) as e:
             raise StorageError(f"Failed to download file from S3: {e}") from e
+        except (IOError, OSError) as e:
+            raise StorageError(f"Failed to write downloaded file: {e}") from e
+
+    def _download_in_one_stream(self, key: str, temp_file: TempFile) -> None:
+        """Stream the whole object into the temporary file over one connection."""
+
+        response = self._s3_client.get_object(Bucket=self._bucket_name, Key=key)
+        with open(temp_file.path, "wb") as f:
+            self._write_body(response["Body"], f)
+
+    def _download_in_parts(
+        self, key: str, etag: str, size: int, temp_file: TempFile
+    ) -> None:
+        """Download the object as concurrent ranged GETs.
+
+        The temporary file is preallocated to the object size so that every part can
+        be written at its offset independently of the others.
+        """
+
+        with open(temp_file.path, "wb") as f:
+            f.truncate(size)
+
+        ranges = [
+            (start, min(start + self._part_size, size) - 1)
+            for start in range(0, size, self._part_size)
+        ]
+
+        logger.info(
+            "Downloading s3://%s/%s (%d bytes) in %d parts",
+            self._bucket_name,
+            key,
+            size,
+            len(ranges),
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=min(self._max_concurrency, len(ranges)),
+            thread_name_prefix="s3-input-part",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._download_part, key, etag, temp_file.path, start, end
+                )
+                for start, end in ranges
+            ]
+
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+
+            for future in done:
+                future.result()
+
+    def _download_part(
+        self, key: str, etag: str, path: str, start: int, end: int
+    ) -> None:
+        """Download a single byte range, retrying it on transient failures.
+
+        The range is requested with `IfMatch` on the ETag read before the download,
+        so parts can never mix two versions of the same key.
+        """
+
+        attempt = 1
+        while True:
+            try:
+                response = self._s3_client.get_object(
+                    Bucket=self._bucket_name,
+                    Key=key,
+                    Range=f"bytes={start}-{end}",
+                    IfMatch=etag,
+                )
+
+                with open(path, "r+b") as f:
+                    f.seek(start)
+                    written = self._write_body(response["Body"], f)
+
+                if written != end - start + 1:
+                    raise StorageError(
+                        f"Incomplete part bytes={start}-{end}: got {written} bytes"
+                    )
+
+                return
+            except (BotoCoreError, ClientError, StorageError) as e:
+                if attempt >= self._part_max_attempts or not self._is_retryable(e):
+                    raise
+
+                logger.warning(
+                    "Retrying part bytes=%d-%d of s3://%s/%s after attempt %d: %s",
+                    start,
+                    end,
+                    self._bucket_name,
+                    key,
+                    attempt,
+                    e,
+                )
+
+                time.sleep(self._part_retry_backoff * 2 ** (attempt - 1))
+                attempt += 1
+
+    def _write_body(self, body, f) -> int:
+        """Copy a streaming body into an open file in bounded chunks.
+
+        Returns:
+            int: The number of bytes written.
+        """
+
+        written = 0
+        try:
+            for chunk in body.iter_chunks(chunk_size=self._chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+        finally:
+            body.close()
+
+        return written
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, ClientError):
+            code = error.response.get("Error", {}).get("Code", "")
+            status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            return code in RETRYABLE_ERROR_CODES or (status or 0) >= 500
+
+        return True
@@ -1,31 +1,235 @@
 """S3 Output Storage Adapter"""
 
-from boto3 import Session
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
 from boto3.exceptions import Boto3Error
+from boto3.s3.transfer import TransferConfig
 from botocore.errorfactory import ClientError
+from botocore.exceptions import BotoCoreError
 
 from video_processor.domain.exceptions import StorageError
-from video_processor.domain.ports import OutputStorage
+from video_processor.domain.ports import OutputStorage, OutputUpload
 from video_processor.domain.value_objects import FileContent
+from video_processor.infrastructure.boto_client_factory import BotoClientFactory
 from video_processor.infrastructure.config import S3OutputStorageSettings
 
+logger = logging.getLogger(__name__)
+
+
+class _S3MultipartUpload(OutputUpload):
+    """An upload streamed to S3 as a multipart upload.
+
+    Written data is buffered until it fills a part, which is then uploaded in the
+    background while the next one fills. Once `max_concurrency` parts are being
+    uploaded, writes wait for one of them to finish, so memory stays at a few part
+    sizes whatever the size of the file. The multipart upload is only created when
+    the first part is full, so files smaller than a part are sent with a single PUT.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket_name: str,
+        key: str,
+        part_size: int,
+        max_concurrency: int,
+    ):
+        self._s3_client = s3_client
+        self._bucket_name = bucket_name
+        self._key = key
+        self._part_size = part_size
+        self._max_concurrency = max(max_concurrency, 1)
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: set[Future[dict]] = set()
+        self._parts: list[dict] = []
+        self._size = 0
+
+    def write(self, data: bytes | memoryview) -> int:
+        view = memoryview(data).cast("B")
+        written = len(view)
+        try:
+            while view:
+                room = self._part_size - len(self._buffer)
+                self._buffer += view[:room]
+                view = view[room:]
+                if len(self._buffer) >= self._part_size:
+                    self._send_part()
+        except (Boto3Error, BotoCoreError, ClientError) as e:
+            raise StorageError(f"Failed to upload file part to S3: {e}") from e
+
+        self._size += written
+        return written
+
+    def complete(self) -> None:
+        try:
+            if self._upload_id is None:
+                self._s3_client.put_object(
+                    Bucket=self._bucket_name, Key=self._key, Body=bytes(self._buffer)
+                )
+                return
+
+            if self._buffer:
+                self._send_part()
+
+            self._collect_parts(wait(self._pending).done)
+            self._s3_client.complete_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=self._key,
+                UploadId=self._upload_id,
+                MultipartUpload={
+                    "Parts": sorted(self._parts, key=lambda part: part["PartNumber"])
+                },
+            )
+        except (Boto3Error, BotoCoreError, ClientError) as e:
+            raise StorageError(f"Failed to upload file to S3: {e}") from e
+        finally:
+            self._shutdown()
+
+        logger.info(
+            "Uploaded s3://%s/%s (%d bytes) in %d parts",
+            self._bucket_name,
+            self._key,
+            self._size,
+            len(self._parts),
+        )
+
+    def abort(self) -> None:
+        self._buffer = bytearray()
+        # Parts still being sent would otherwise be stored after the abort
+        self._shutdown()
+        if self._upload_id is None:
+            return
+
+        try:
+            self._s3_client.abort_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key, UploadId=self._upload_id
+            )
+            logger.info(
+                "Aborted multipart upload of s3://%s/%s", self._bucket_name, self._key
+            )
+        except (Boto3Error, BotoCoreError, ClientError) as e:
+            logger.warning(
+                "Failed to abort multipart upload %s of s3://%s/%s: %s",
+                self._upload_id,
+                self._bucket_name,
+                self._key,
+                e,
+            )
+
+    def _send_part(self) -> None:
+        """Upload the buffer as the next part in the background, waiting for a part
+        to finish first if `max_concurrency` parts are being uploaded."""
+
+        if self._executor is None:
+            response = self._s3_client.create_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key
+            )
+            self._upload_id = response["UploadId"]
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_concurrency, thread_name_prefix="s3-output-part"
+            )
+
+        if len(self._pending) >= self._max_concurrency:
+            self._collect_parts(wait(self._pending, return_when=FIRST_COMPLETED).done)
+
+        part_number = len(self._parts) + len(self._pending) + 1
+        self._pending.add(
+            self._executor.submit(self._upload_part, part_number, self._buffer)
+        )
+        self._buffer = bytearray()
+
+    def _collect_parts(self, done: set[Future[dict]]) -> None:
+        """Record the uploaded parts, raising the error of a failed one."""
+
+        self._pending -= done
+        for future in done:
+            self._parts.append(future.result())
+
+    def _upload_part(self, part_number: int, body: bytearray) -> dict:
+        response = self._s3_client.upload_part(
+            Bucket=self._bucket_name,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+        self._pending = set()
+
 
 class S3OutputStorage(OutputStorage):
     """S3OutputStorage is an implementation of the OutputStorage port that
     interacts with S3 storage.
+
+    Streamed uploads are sent as multipart uploads of `MULTIPART_PART_SIZE_IN_BYTES`
+    parts, with up to `MULTIPART_MAX_CONCURRENCY` parts uploaded at once. Files left
+    on disk or in a file object are sent by the managed transfer of boto3 with the
+    same parts, reading them in chunks instead of loading them into memory.
     """
 
-    def __init__(self, boto_session: Session, settings: S3OutputStorageSettings):
+    def __init__(
+        self, client_factory: BotoClientFactory, settings: S3OutputStorageSettings
+    ):
         self._bucket_name = settings.BUCKET_NAME
-        self._s3_client = boto_session.client("s3")
+        self._part_size = settings.MULTIPART_PART_SIZE_IN_BYTES
+        self._max_concurrency = settings.MULTIPART_MAX_CONCURRENCY
+        self._client_factory = client_factory
+
+    @property
+    def _s3_client(self) -> Any:
+        """Get the S3 client of the current process, as the factory
+        replaces its clients in a forked child process."""
+        return self._client_factory.client("s3")
 
     def upload_file(self, file_content: FileContent, destination_path: str) -> None:
         destination_path = destination_path.replace(f"s3://{self._bucket_name}/", "")
         try:
-            self._s3_client.put_object(
-                Bucket=self._bucket_name,
-                Key=destination_path,
-                Body=file_content.content,
-            )
-        except (Boto3Error, ClientError) as e:
+            if file_content.local_path is not None:
+                self._s3_client.upload_file(
+                    Filename=file_content.local_path,
+                    Bucket=self._bucket_name,
+                    Key=destination_path,
+                    Config=self._get_transfer_config(),
+                )
+            elif file_content.fileobj is not None:
+                self._s3_client.upload_fileobj(
+                    Fileobj=file_content.fileobj,
+                    Bucket=self._bucket_name,
+                    Key=destination_path,
+                    Config=self._get_transfer_config(),
+                )
+            else:
+                self._s3_client.put_object(
+                    Bucket=self._bucket_name,
+                    Key=destination_path,
+                    Body=file_content.content,
+                )
+        except (Boto3Error, BotoCoreError, ClientError) as e:
             raise StorageError(f"Failed to upload file to S3: {e}") from e
+
+    def open_upload(self, destination_path: str) -> OutputUpload:
+        destination_path = destination_path.replace(f"s3://{self._bucket_name}/", "")
+        return _S3MultipartUpload(
+            self._s3_client,
+            self._bucket_name,
+            destination_path,
+            self._part_size,
+            self._max_concurrency,
+        )
+
+    def _get_transfer_config(self) -> TransferConfig:
+        return TransferConfig(
+            multipart_threshold=self._part_size,
+            multipart_chunksize=self._part_size,
+            max_concurrency=self._max_concurrency,
+        )
@@ -0,0 +1,179 @@
+"""Scene Change Frame Selector Adapter"""
+
+import logging
+
+import cv2
+import numpy as np
+
+from video_processor.adapters.outbound.opencv_video_session import (
+    OpenCVVideoSession,
+)
+from video_processor.domain.exceptions import FrameSelectionError
+from video_processor.domain.ports import FrameSelector, VideoSession
+from video_processor.domain.value_objects import FrameSelection, VideoMetadata
+from video_processor.infrastructure.config import SceneChangeFrameSelectorSettings
+
+logger = logging.getLogger(__name__)
+
+
+class SceneChangeFrameSelector(FrameSelector):
+    """A frame selector that selects the first frame of the video and the frames
+    starting a new shot.
+
+    The video is read once sequentially. Every `ANALYSIS_STRIDE` frames, the decoded
+    frame is downscaled to `ANALYSIS_WIDTH` pixels wide and its colour histogram is
+    compared with the one of the previous analysed frame. The frames whose histogram
+    distance is above `THRESHOLD` are cuts. The frames in between are grabbed but
+    never converted, and no frame is encoded, so the pass is much cheaper than
+    extracting every frame.
+
+    When more than `MAX_FRAMES` cuts are found the strongest ones are kept, and when
+    fewer than `MIN_FRAMES` are found the largest gaps between the selected frames
+    are filled.
+    """
+
+    def __init__(self, settings: SceneChangeFrameSelectorSettings):
+        self._analysis_width = settings.ANALYSIS_WIDTH
+        self._analysis_stride = max(settings.ANALYSIS_STRIDE, 1)
+        self._bins = settings.HISTOGRAM_BINS_PER_CHANNEL
+        self._threshold = settings.THRESHOLD
+        self._max_frames = max(settings.MAX_FRAMES, 1)
+        self._min_frames = min(settings.MIN_FRAMES, self._max_frames)
+
+    def select(
+        self, metadata: VideoMetadata, video_session: VideoSession | None = None
+    ) -> FrameSelection:
+        """Select the frames starting a new shot.
+
+        Args:
+            metadata (VideoMetadata): The metadata of the video file.
+            video_session (VideoSession | None, optional): The session whose capture
+                is reused if it is an OpenCVVideoSession. Defaults to None.
+
+        Returns:
+            FrameSelection: The selected frames.
+
+        Raises:
+            FrameSelectionError: If the video cannot be read or has no frames.
+        """
+
+        if metadata.frame_count == 0:
+            raise FrameSelectionError("Video has no frames to select")
+
+        owns_capture = not isinstance(video_session, OpenCVVideoSession)
+        capture = None
+        try:
+            if isinstance(video_session, OpenCVVideoSession):
+                capture = video_session.capture
+            else:
+                capture = cv2.VideoCapture(metadata.path)
+
+            if not capture.isOpened():
+                raise FrameSelectionError(
+                    "Failed to open video file for frame selection."
+                )
+
+            frame_count, cuts, scores = self._detect_cuts(capture)
+        except cv2.error as e:
+            raise FrameSelectionError(
+                f"An error occurred while detecting scene changes: {e}"
+            ) from e
+        finally:
+            if capture is not None and owns_capture:
+                capture.release()
+
+        if frame_count == 0:
+            raise FrameSelectionError("Failed to decode any frame of the video")
+
+        indexes = self._apply_budget(frame_count, cuts, scores)
+        logger.info(
+            "Detected %d scene changes in %d frames, selected %d frames",
+            len(cuts),
+            frame_count,
+            len(indexes),
+        )
+
+        return FrameSelection(indexes=indexes)
+
+    def _detect_cuts(
+        self, capture: cv2.VideoCapture
+    ) -> tuple[int, list[int], list[float]]:
+        """Read the video once and find the frames starting a new shot.
+
+        Returns:
+            tuple[int, list[int], list[float]]: The number of frames read, the cut
+                frame indexes and their histogram distances.
+        """
+
+        capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+        cuts: list[int] = []
+        scores: list[float] = []
+        previous: np.ndarray | None = None
+        index = 0
+        while capture.grab():
+            if index % self._analysis_stride == 0:
+                success, frame = capture.retrieve()
+                if not success:
+                    break
+
+                histogram = self._histogram(frame)
+                if previous is not None:
+                    # Half the L1 distance of normalised histograms is between 0 and 1
+                    score = float(np.abs(histogram - previous).sum()) / 2
+                    if score >= self._threshold:
+                        cuts.append(index)
+                        scores.append(score)
+
+                previous = histogram
+
+            index += 1
+
+        return index, cuts, scores
+
+    def _histogram(self, frame: np.ndarray) -> np.ndarray:
+        """Get the normalised colour histogram of a downscaled frame."""
+
+        height, width = frame.shape[:2]
+        if width > self._analysis_width:
+            analysis_height = max(1, round(height * self._analysis_width / width))
+            frame = cv2.resize(
+                frame,
+                (self._analysis_width, analysis_height),
+                interpolation=cv2.INTER_AREA,
+            )
+
+        # Quantise every channel to its bin and combine them into one bin number
+        quantised = (np.atleast_3d(frame).astype(np.uint32) * self._bins) >> 8
+        codes = np.zeros(quantised.shape[:2], dtype=np.uint32)
+        for channel in range(quantised.shape[2]):
+            codes = codes * self._bins + quantised[:, :, channel]
+
+        histogram = np.bincount(
+            codes.ravel(), minlength=self._bins ** quantised.shape[2]
+        )
+        return histogram / codes.size
+
+    def _apply_budget(
+        self, frame_count: int, cuts: list[int], scores: list[float]
+    ) -> list[int]:
+        """Keep the strongest cuts within the maximum number of frames, and fill the
+        largest gaps up to the minimum number of frames."""
+
+        if len(cuts) + 1 > self._max_frames:
+            strongest = sorted(range(len(cuts)), key=lambda i: scores[i], reverse=True)
+            cuts = [cuts[i] for i in strongest[: self._max_frames - 1]]
+
+        selected = {0, *cuts}
+        last_frame = frame_count - 1
+        while len(selected) < min(self._min_frames, frame_count):
+            points = sorted(selected)
+            # The end of the video counts as a gap ending on the last frame
+            gap, candidate = last_frame - points[-1], last_frame
+            for start, end in zip(points, points[1:]):
+                if (end - start) // 2 > gap:
+                    gap, candidate = (end - start) // 2, (start + end) // 2
+
+            selected.add(candidate)
+
+        return sorted(selected)
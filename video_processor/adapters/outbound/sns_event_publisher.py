@@ -2,13 +2,14 @@
 to an AWS SNS topic."""
 
 import uuid
+from typing import Any
 
-from boto3 import Session
 from boto3.exceptions import Boto3Error
 from botocore.errorfactory import ClientError
 
 from video_processor.domain.exceptions import EventPublishingError
 from video_processor.domain.ports import DomainEventT, EventPublisher
+from video_processor.infrastructure.boto_client_factory import BotoClientFactory
 from video_processor.infrastructure.config import SnsEventPublisherSettings
 
 
@@ -16,10 +17,18 @@ class SnsEventPublisher(EventPublisher):
     """An implementation of the EventPublisher port that publishes events to
     an AWS SNS topic."""
 
-    def __init__(self, boto_session: Session, settings: SnsEventPublisherSettings):
+    def __init__(
+        self, client_factory: BotoClientFactory, settings: SnsEventPublisherSettings
+    ):
         self._topic_arn = settings.TOPIC_ARN
         self._group_id = settings.GROUP_ID
-        self._sns_client = boto_session.client("sns")
+        self._client_factory = client_factory
+
+    @property
+    def _sns_client(self) -> Any:
+        """Get the SNS client of the current process, as the factory
+        replaces its clients in a forked child process."""
+        return self._client_factory.client("sns")
 
     def publish(self, event: DomainEventT) -> None:
         try:
@@ -0,0 +1,82 @@
+"""Tar Frame Packager Adapter"""
+
+import io
+import tarfile
+import time
+from typing import Iterator
+
+from video_processor.adapters.outbound.upload_writer import UploadWriter
+from video_processor.domain.exceptions import FramePackagingError
+from video_processor.domain.ports import FramePackager, OutputUpload, TempFileManager
+from video_processor.domain.value_objects import FileContent, RawFrame
+
+
+class TarFramePackager(FramePackager):
+    """TarFramePackager is an implementation of the FramePackager port that packages
+    frames into an uncompressed tar file.
+
+    Unlike a ZIP file, a tar file has no central directory at its end: each frame is
+    preceded by its header, so consumers can unpack frames as the file is read. The
+    archive is written as a stream of blocks, which needs no seeking whether it is
+    left in a temporary file or written into an upload. Tarfile copies the data of
+    each member into its buffers, so the blocks are written here from the headers
+    tarfile builds, and the content of each frame is written as is.
+    """
+
+    output_suffix = ".tar"
+
+    def __init__(self, temp_file_manager: TempFileManager):
+        self._temp_file_manager = temp_file_manager
+
+    def package(self, frames: Iterator[RawFrame]) -> FileContent:
+        try:
+            temp_file = self._temp_file_manager.create(b"", suffix=".tar")
+            try:
+                with open(temp_file.path, "wb") as archive_file:
+                    self._write_frames(archive_file, frames)
+            except BaseException:
+                self._temp_file_manager.delete(temp_file)
+                raise
+
+            # The archive is left in the temporary file for the caller to upload
+            return FileContent(path=temp_file.path, local_path=temp_file.path)
+        except (tarfile.TarError, IOError, OSError) as e:
+            raise FramePackagingError(
+                f"An error occurred during frame packaging: {e}"
+            ) from e
+
+    def package_to_upload(
+        self, frames: Iterator[RawFrame], upload: OutputUpload
+    ) -> None:
+        try:
+            self._write_frames(UploadWriter(upload), frames)
+        except (tarfile.TarError, IOError, OSError) as e:
+            raise FramePackagingError(
+                f"An error occurred during frame packaging: {e}"
+            ) from e
+
+    def _write_frames(
+        self,
+        archive_file: io.RawIOBase | io.BufferedIOBase,
+        frames: Iterator[RawFrame],
+    ) -> None:
+        """Write the header of each frame, followed by its content padded to a whole
+        block, then the end-of-archive blocks padded to a whole record."""
+
+        size = 0
+        for frame in frames:
+            member = tarfile.TarInfo(frame.filename)
+            member.size = len(frame.content)
+            member.mtime = int(time.time())
+            member.mode = 0o600
+            header = member.tobuf(tarfile.DEFAULT_FORMAT, "utf-8", "surrogateescape")
+            padding = -member.size % tarfile.BLOCKSIZE
+            archive_file.write(header)
+            archive_file.write(frame.content)
+            if padding:
+                archive_file.write(tarfile.NUL * padding)
+            size += len(header) + member.size + padding
+
+        end_size = 2 * tarfile.BLOCKSIZE
+        end_size += -(size + end_size) % tarfile.RECORDSIZE
+        archive_file.write(tarfile.NUL * end_size)
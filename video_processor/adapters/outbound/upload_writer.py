@@ -0,0 +1,26 @@
+"""Upload Writer"""
+
+import io
+from typing import Any
+
+from video_processor.domain.ports import OutputUpload
+
+
+class UploadWriter(io.RawIOBase):
+    """An unseekable file object writing into an upload, which tells the number of
+    bytes written."""
+
+    def __init__(self, upload: OutputUpload):
+        self._upload = upload
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        written = self._upload.write(b)
+        self._position += written
+        return written
+
+    def tell(self) -> int:
+        return self._position
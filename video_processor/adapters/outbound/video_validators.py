@@ -1,7 +1,22 @@
+from fnmatch import fnmatch
+
 from video_processor.domain.exceptions import VideoValidationError
-from video_processor.domain.ports import VideoMetadata
+from video_processor.domain.ports import VideoMetadata, VideoProbeValidator
+from video_processor.domain.value_objects import VideoProbe, VideoValidationCost
 from video_processor.infrastructure.config import VideoValidatorsSettings
 
+# Top-level box types an MP4/MOV/3GP file can start with
+ISO_BMFF_BOX_TYPES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot"}
+
+# Magic numbers of the other containers OpenCV can decode
+CONTAINER_SIGNATURES = {
+    b"\x1a\x45\xdf\xa3": "matroska",
+    b"\x30\x26\xb2\x75\x8e\x66\xcf\x11": "asf",
+    b"\x00\x00\x01\xba": "mpeg-ps",
+    b"FLV": "flv",
+    b"OggS": "ogg",
+}
+
 
 class VideoSizeValidator:
     """A validator for validating the size of a video file"""
@@ -25,3 +40,114 @@ class VideoSizeValidator:
                 f"Video file size {video_metadata.size_in_bytes} bytes exceeds the "
                 f"maximum allowed size of {self.max_size_in_bytes} bytes."
             )
+
+
+class VideoObjectSizeValidator(VideoProbeValidator):
+    """A pre-download validator for the size of a video file in storage"""
+
+    cost = VideoValidationCost.OBJECT_INFO
+
+    def __init__(self, settings: VideoValidatorsSettings):
+        self.max_size_in_bytes = settings.MAX_SIZE_IN_BYTES
+
+    def validate(self, probe: VideoProbe) -> None:
+        """Validate the size of the video file before downloading it.
+
+        Args:
+            probe (VideoProbe): The probe of the video file to be validated.
+
+        Raises:
+            VideoValidationError: If the video file is empty or its size exceeds the
+                maximum allowed size.
+        """
+        size_in_bytes = probe.file_info.size_in_bytes
+        if size_in_bytes == 0:
+            raise VideoValidationError("Video file is empty.")
+
+        if size_in_bytes > self.max_size_in_bytes:
+            raise VideoValidationError(
+                f"Video file size {size_in_bytes} bytes exceeds the "
+                f"maximum allowed size of {self.max_size_in_bytes} bytes."
+            )
+
+
+class VideoContentTypeValidator(VideoProbeValidator):
+    """A pre-download validator for the content type of a video file in storage"""
+
+    cost = VideoValidationCost.OBJECT_INFO
+
+    def __init__(self, settings: VideoValidatorsSettings):
+        self.allowed_content_types = settings.ALLOWED_CONTENT_TYPES
+
+    def validate(self, probe: VideoProbe) -> None:
+        """Validate the content type of the video file before downloading it.
+
+        Files stored without a content type are accepted, as the container header
+        is a more reliable signal for them.
+
+        Args:
+            probe (VideoProbe): The probe of the video file to be validated.
+
+        Raises:
+            VideoValidationError: If the content type is not allowed.
+        """
+        content_type = probe.file_info.content_type
+        if not content_type:
+            return
+
+        media_type = content_type.split(";")[0].strip().lower()
+        if not any(
+            fnmatch(media_type, allowed) for allowed in self.allowed_content_types
+        ):
+            raise VideoValidationError(
+                f"Video file content type {content_type} is not allowed."
+            )
+
+
+class VideoContainerValidator(VideoProbeValidator):
+    """A pre-download validator that sniffs the container format of a video file
+    from its first bytes"""
+
+    cost = VideoValidationCost.CONTAINER_HEADER
+
+    def __init__(self, settings: VideoValidatorsSettings):
+        self.header_size = settings.HEADER_PROBE_SIZE_IN_BYTES
+
+    def validate(self, probe: VideoProbe) -> None:
+        """Validate that the header of the video file belongs to a known container.
+
+        Args:
+            probe (VideoProbe): The probe of the video file, including its header.
+
+        Raises:
+            VideoValidationError: If the header does not match any known container.
+        """
+        if self.detect_container(probe.header) is None:
+            raise VideoValidationError(
+                "Video file header does not match any supported container format."
+            )
+
+    @staticmethod
+    def detect_container(header: bytes) -> str | None:
+        """Detect the container format from the first bytes of a file.
+
+        Args:
+            header (bytes): The first bytes of the file.
+
+        Returns:
+            str | None: The name of the container, or None if it is not recognised.
+        """
+        if header[4:8] in ISO_BMFF_BOX_TYPES:
+            return "iso-bmff"
+
+        if header[:4] == b"RIFF" and header[8:12] == b"AVI ":
+            return "avi"
+
+        if header[:1] == b"\x47" and (len(header) <= 188 or header[188:189] == b"\x47"):
+            return "mpeg-ts"
+
+        for signature, container in CONTAINER_SIGNATURES.items():
+            if header.startswith(signature):
+                return container
+
+        return None
@@ -1,32 +1,528 @@
+import logging
+import os
+import time
 import zipfile
-from typing import Iterator
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from typing import Generator, Iterator, NamedTuple
 
+from video_processor.adapters.outbound.raw_zip_entries import (
+    check_raw_entries_supported,
+    compress_entry_data,
+    get_local_header,
+    write_raw_entry,
+)
+from video_processor.adapters.outbound.upload_writer import UploadWriter
 from video_processor.domain.exceptions import FramePackagingError
-from video_processor.domain.ports import FramePackager, TempFileManager
-from video_processor.domain.value_objects import FileContent, RawFrame, TempFile
+from video_processor.domain.ports import (
+    FramePackager,
+    OutputStorage,
+    OutputUpload,
+    TempFileManager,
+)
+from video_processor.domain.value_objects import (
+    FileContent,
+    FrameArchiveEntry,
+    RawFrame,
+)
+from video_processor.infrastructure.config import FramePackagerSettings
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+# Zstandard entries are only supported by zipfile from Python 3.14
+ZIP_ZSTANDARD: int | None = getattr(zipfile, "ZIP_ZSTANDARD", None)
+# Flag of LZMA entries whose compressed data ends with an end-of-stream marker
+LZMA_EOS_FLAG = 0x02
+DEFAULT_POLICY_KEY = "*"
+# Sizes of the fixed part of the ZIP records written for each entry and archive
+LOCAL_HEADER_SIZE = 30
+CENTRAL_DIRECTORY_HEADER_SIZE = 46
+END_OF_CENTRAL_DIRECTORY_SIZE = 22
+ZIP64_EXTRA_SIZE = 20
+# Data descriptor written by zipfile after the entries of unseekable archives
+DATA_DESCRIPTOR_SIZE = 16
+ZIP64_DATA_DESCRIPTOR_SIZE = 24
+# Compressing incompressible data makes it up to 2% and this many bytes larger
+MAX_COMPRESSION_OVERHEAD = 1024
+MAX_CRC = 0xFFFFFFFF
+# Entry written after the frames, serialized as a FrameArchiveManifest
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_PREFIX = b'{"frames":['
+MANIFEST_SUFFIX = b"]}"
+MANIFEST_ENTRY_SIZE = (
+    LOCAL_HEADER_SIZE
+    + DATA_DESCRIPTOR_SIZE
+    + CENTRAL_DIRECTORY_HEADER_SIZE
+    + 2 * len(MANIFEST_FILENAME)
+)
+
+
+class _PreparedFrame(NamedTuple):
+    """A frame with the entry it is written as.
+
+    The data of a precompressed frame is its content compressed beforehand, written
+    as it is. Otherwise it is the content itself, compressed by zipfile while it is
+    written.
+    """
+
+    frame: RawFrame
+    entry: zipfile.ZipInfo
+    data: bytes | memoryview
+    level: int | None
+    precompressed: bool
+
+
+def _parse_compression(spec: str) -> tuple[int, int | None]:
+    """Get the zipfile compression method and level of a policy entry such as
+    `deflate:6`."""
+
+    method_name, _, level = spec.partition(":")
+    if method_name == "zstd":
+        if ZIP_ZSTANDARD is not None:
+            return ZIP_ZSTANDARD, int(level) if level else None
+
+        logger.warning("Zstandard is not available, compressing with lzma instead")
+        return zipfile.ZIP_LZMA, None
+
+    if method_name not in COMPRESSION_METHODS:
+        raise ValueError(f"Unknown compression method {method_name!r}")
+
+    return COMPRESSION_METHODS[method_name], int(level) if level else None
+
+
+def _raw_entries_supported() -> bool:
+    """Check whether entries can be compressed beforehand, warning when they are
+    compressed while they are written instead."""
+
+    try:
+        check_raw_entries_supported()
+    except RuntimeError as e:
+        logger.warning("%s, entries are compressed while they are written", e)
+        return False
+
+    return True
+
+
+def _new_entry(filename: str, method: int, size: int) -> zipfile.ZipInfo:
+    entry = zipfile.ZipInfo(filename, date_time=time.localtime()[:6])
+    entry.compress_type = method
+    entry.external_attr = 0o600 << 16
+    entry.file_size = size
+    return entry
+
+
+def _compress_entry(
+    filename: str, content: bytes | memoryview, method: int, level: int | None
+) -> tuple[zipfile.ZipInfo, bytes | memoryview]:
+    """Compress a file and compute its CRC, which both release the GIL.
+
+    Returns:
+        tuple[zipfile.ZipInfo, bytes | memoryview]: The entry, with its sizes and
+            CRC filled in, and its compressed data.
+    """
+
+    entry = _new_entry(filename, method, len(content))
+    entry.CRC = zlib.crc32(content)
+    if method == zipfile.ZIP_LZMA:
+        entry.flag_bits |= LZMA_EOS_FLAG
+
+    data = compress_entry_data(content, method, level)
+    entry.compress_size = len(data)
+    return entry, data
+
+
+def _get_local_header_size(prepared: _PreparedFrame) -> int:
+    if prepared.precompressed:
+        return len(get_local_header(prepared.entry))
+
+    # zipfile adds a ZIP64 extra field to the local header of the entries it writes
+    # when their size may not fit in 32 bits once compressed
+    zip64 = prepared.entry.file_size * 1.05 > zipfile.ZIP64_LIMIT
+    return (
+        LOCAL_HEADER_SIZE
+        + len(prepared.entry.filename.encode("utf-8"))
+        + len(prepared.entry.extra)
+        + (ZIP64_EXTRA_SIZE if zip64 else 0)
+    )
+
+
+def _write_entry(zip_file: zipfile.ZipFile, prepared: _PreparedFrame) -> int:
+    """Write a prepared frame at the end of the archive.
+
+    Returns:
+        int: The offset of the data of the frame in the archive.
+    """
+
+    if prepared.precompressed:
+        write_raw_entry(zip_file, prepared.entry, prepared.data)
+    else:
+        zip_file.writestr(prepared.entry, prepared.data, compresslevel=prepared.level)
+
+    return prepared.entry.header_offset + _get_local_header_size(prepared)
+
+
+def _locate_entry(prepared: _PreparedFrame, offset: int) -> FrameArchiveEntry:
+    """Get the manifest entry of a written frame whose data is at `offset`."""
+
+    return FrameArchiveEntry(
+        index=prepared.frame.index,
+        filename=prepared.entry.filename,
+        timestamp=prepared.frame.timestamp,
+        header_offset=prepared.entry.header_offset,
+        offset=offset,
+        size=prepared.entry.compress_size,
+        crc=prepared.entry.CRC,
+        compression=prepared.entry.compress_type,
+    )
+
+
+class _FrameManifest:
+    """The manifest of the frames written into an archive, serialized as they are
+    written so that its size is known before it is written."""
+
+    def __init__(self) -> None:
+        self._records: list[bytes] = []
+        self.size = len(MANIFEST_PREFIX) + len(MANIFEST_SUFFIX)
+
+    def add(self, record: bytes) -> None:
+        self.size += len(record) + (1 if self._records else 0)
+        self._records.append(record)
+
+    def write(self, zip_file: zipfile.ZipFile) -> None:
+        """Write the manifest as an uncompressed entry, which can be read from the
+        archive with a ranged read like the frames."""
+
+        content = MANIFEST_PREFIX + b",".join(self._records) + MANIFEST_SUFFIX
+        zip_file.writestr(
+            _new_entry(MANIFEST_FILENAME, zipfile.ZIP_STORED, len(content)), content
+        )
+
+
+def _get_part_path(destination_path: str, part_number: int) -> str:
+    return f"{destination_path.rstrip('/')}/part-{part_number:04d}.zip"
 
 
 class ZIPFramePackager(FramePackager):
     """The FramePackager port defines the interface for packaging extracted frames into
-    a ZIP file."""
+    a ZIP file.
+
+    Packaged archives are left in a temporary file, referenced by the returned file
+    content rather than read into memory. Entries are written with
+    `ZipFile.writestr`, which follows each entry with a data descriptor when packaging
+    into an upload, as the file object cannot seek back to fill in its size.
+
+    Each entry is compressed following the `COMPRESSION_POLICY` of its extension.
+    With `COMPRESSION_THREADS`, compressed entries are compressed and their CRC
+    computed on threads while the entries before them are written in order. These
+    entries are then written as they are through the raw ZIP entries module, on the
+    Python versions it was tested with, and compressed while written otherwise.
+
+    With `WRITE_MANIFEST`, a `manifest.json` entry is written after the frames,
+    locating the data of each frame in the archive with its index and timestamp,
+    so a single frame can be read with a ranged read.
+    """
+
+    # Whether the size of compressed entries is needed before writing them
+    _needs_entry_sizes = False
 
-    def __init__(self, temp_file_manager: TempFileManager):
+    def __init__(
+        self,
+        temp_file_manager: TempFileManager,
+        settings: FramePackagerSettings | None = None,
+    ):
+        settings = settings or FramePackagerSettings()
         self._temp_file_manager = temp_file_manager
+        self._compression_policy = {
+            extension.lower(): _parse_compression(spec)
+            for extension, spec in settings.COMPRESSION_POLICY.items()
+        }
+        self._default_compression = self._compression_policy.get(
+            DEFAULT_POLICY_KEY, (zipfile.ZIP_STORED, None)
+        )
+        self._compression_threads = settings.COMPRESSION_THREADS
+        self._write_manifest = settings.WRITE_MANIFEST
+        compresses = any(
+            method != zipfile.ZIP_STORED
+            for method, _ in [
+                *self._compression_policy.values(),
+                self._default_compression,
+            ]
+        )
+        self._precompress = (
+            compresses
+            and (self._compression_threads > 0 or self._needs_entry_sizes)
+            and _raw_entries_supported()
+        )
 
     def package(self, frames: Iterator[RawFrame]) -> FileContent:
-        temp_file: TempFile | None = None
         try:
             temp_file = self._temp_file_manager.create(b"", suffix=".zip")
-            with zipfile.ZipFile(temp_file.path, mode="w") as zip_file:
+            try:
+                with zipfile.ZipFile(temp_file.path, mode="w") as zip_file:
+                    self._write_frames(zip_file, frames)
+            except BaseException:
+                self._temp_file_manager.delete(temp_file)
+                raise
+
+            # The archive is left in the temporary file for the caller to upload
+            return FileContent(path=temp_file.path, local_path=temp_file.path)
+        except (
+            zipfile.BadZipFile,
+            zipfile.LargeZipFile,
+            zlib.error,
+            IOError,
+            OSError,
+        ) as e:
+            raise FramePackagingError(
+                f"An error occurred during frame packaging: {e}"
+            ) from e
+
+    def package_to_upload(
+        self, frames: Iterator[RawFrame], upload: OutputUpload
+    ) -> None:
+        try:
+            with zipfile.ZipFile(UploadWriter(upload), mode="w") as zip_file:
+                self._write_frames(zip_file, frames)
+        except (
+            zipfile.BadZipFile,
+            zipfile.LargeZipFile,
+            zlib.error,
+            IOError,
+            OSError,
+        ) as e:
+            raise FramePackagingError(
+                f"An error occurred during frame packaging: {e}"
+            ) from e
+
+    def _write_frames(
+        self, zip_file: zipfile.ZipFile, frames: Iterator[RawFrame]
+    ) -> None:
+        manifest = _FrameManifest()
+        # Closed on failure so that the compressor threads stop
+        with closing(self._prepare_frames(frames)) as prepared_frames:
+            for prepared in prepared_frames:
+                offset = _write_entry(zip_file, prepared)
+                if self._write_manifest:
+                    location = _locate_entry(prepared, offset)
+                    manifest.add(location.model_dump_json().encode())
+
+        if self._write_manifest:
+            manifest.write(zip_file)
+
+    def _prepare_frames(
+        self, frames: Iterator[RawFrame]
+    ) -> Generator[_PreparedFrame, None, None]:
+        """Prepare the frames, compressing them beforehand on the thread pool when
+        they are precompressed, keeping at most two frames per thread in memory.
+
+        Yields:
+            _PreparedFrame: Each frame with its entry and data, in frame order.
+        """
+
+        if not self._precompress or self._compression_threads <= 0:
+            for frame in frames:
+                yield self._prepare(frame)
+
+            return
+
+        max_pending = 2 * self._compression_threads
+        pending: deque[Future[_PreparedFrame]] = deque()
+        with ThreadPoolExecutor(
+            max_workers=self._compression_threads, thread_name_prefix="zip-compressor"
+        ) as executor:
+            try:
                 for frame in frames:
-                    zip_file.writestr(frame.filename, frame.content)
+                    if len(pending) >= max_pending:
+                        yield pending.popleft().result()
+
+                    pending.append(executor.submit(self._prepare, frame))
+
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _prepare(self, frame: RawFrame) -> _PreparedFrame:
+        extension = os.path.splitext(frame.filename)[1].lstrip(".").lower()
+        method, level = self._compression_policy.get(
+            extension, self._default_compression
+        )
+        if self._precompress and method != zipfile.ZIP_STORED:
+            entry, data = _compress_entry(frame.filename, frame.content, method, level)
+            return _PreparedFrame(frame, entry, data, level, precompressed=True)
+
+        entry = _new_entry(frame.filename, method, len(frame.content))
+        return _PreparedFrame(frame, entry, frame.content, level, precompressed=False)
+
+
+class SplitZIPFramePackager(ZIPFramePackager):
+    """SplitZIPFramePackager is an implementation of the FramePackager port that
+    packages frames into ZIP files of at most `MAX_PART_SIZE_IN_BYTES`, written
+    under the output path as `part-0001.zip`, `part-0002.zip`, ...
 
-            with open(temp_file.path, "rb") as f:
-                return FileContent(path=temp_file.path, content=f.read())
-        except (zipfile.BadZipFile, zipfile.LargeZipFile, IOError, OSError) as e:
+    Each part is a complete ZIP file, uploaded as soon as the next frame would make
+    it larger than the maximum size, so consumers can unpack the parts on their own.
+    A frame larger than the maximum size is written alone in its part. Entries are
+    compressed as by the ZIPFramePackager, but always beforehand when the raw ZIP
+    entries module supports it, so that their size is known before writing them.
+    Otherwise their size is bounded by the size of their content.
+
+    Only packaging into the output storage splits the frames, as packaging into a
+    file or a single upload writes a single archive. If a part fails, its upload is
+    aborted but the parts uploaded before it are left in place.
+    """
+
+    output_suffix = "/"
+    _needs_entry_sizes = True
+
+    def __init__(
+        self,
+        temp_file_manager: TempFileManager,
+        settings: FramePackagerSettings | None = None,
+    ):
+        settings = settings or FramePackagerSettings()
+        super().__init__(temp_file_manager, settings)
+        self._max_part_size = settings.MAX_PART_SIZE_IN_BYTES
+
+    def package_to_output(
+        self,
+        frames: Iterator[RawFrame],
+        output_storage: OutputStorage,
+        destination_path: str,
+    ) -> None:
+        part_number = 0
+        try:
+            # Closed on failure so that the compressor threads stop
+            with closing(self._prepare_frames(frames)) as prepared_frames:
+                next_frame = next(prepared_frames, None)
+                while part_number == 0 or next_frame is not None:
+                    part_number += 1
+                    upload = output_storage.open_upload(
+                        _get_part_path(destination_path, part_number)
+                    )
+                    try:
+                        writer = UploadWriter(upload)
+                        with zipfile.ZipFile(writer, mode="w") as zip_file:
+                            next_frame = self._write_part(
+                                zip_file, writer, next_frame, prepared_frames
+                            )
+
+                        upload.complete()
+                    except BaseException:
+                        upload.abort()
+                        raise
+        except (
+            zipfile.BadZipFile,
+            zipfile.LargeZipFile,
+            zlib.error,
+            IOError,
+            OSError,
+        ) as e:
             raise FramePackagingError(
                 f"An error occurred during frame packaging: {e}"
             ) from e
-        finally:
-            if temp_file is not None:
-                self._temp_file_manager.delete(temp_file)
+
+        logger.info(
+            "Packaged frames into %d parts at %s", part_number, destination_path
+        )
+
+    def _write_part(
+        self,
+        zip_file: zipfile.ZipFile,
+        writer: UploadWriter,
+        first_frame: _PreparedFrame | None,
+        prepared_frames: Iterator[_PreparedFrame],
+    ) -> _PreparedFrame | None:
+        """Write frames into the part until the next one would make it larger than
+        the maximum size, followed by the manifest of the part.
+
+        Returns:
+            _PreparedFrame | None: The frame that did not fit in the part, or None
+                once all the frames are written.
+        """
+
+        manifest = _FrameManifest()
+        central_directory_size = 0
+        prepared = first_frame
+        while prepared is not None:
+            # The archive is written sequentially into the upload, so the next entry
+            # starts at the bytes written so far
+            header_offset = writer.tell()
+            offset = header_offset + _get_local_header_size(prepared)
+            max_size = self._get_max_entry_size(prepared)
+            entry_central_directory_size = CENTRAL_DIRECTORY_HEADER_SIZE + len(
+                prepared.entry.filename.encode("utf-8")
+            )
+            part_size = (
+                offset
+                + max_size
+                + self._get_data_descriptor_size(prepared)
+                + central_directory_size
+                + entry_central_directory_size
+                + END_OF_CENTRAL_DIRECTORY_SIZE
+            )
+            if self._write_manifest:
+                # The CRC and size of the entry are not known before writing it
+                max_location = FrameArchiveEntry(
+                    index=prepared.frame.index,
+                    filename=prepared.entry.filename,
+                    timestamp=prepared.frame.timestamp,
+                    header_offset=header_offset,
+                    offset=offset,
+                    size=max_size,
+                    crc=MAX_CRC,
+                    compression=prepared.entry.compress_type,
+                )
+                part_size += (
+                    MANIFEST_ENTRY_SIZE
+                    + manifest.size
+                    + len(max_location.model_dump_json())
+                    + 1
+                )
+
+            if zip_file.infolist() and part_size > self._max_part_size:
+                break
+
+            location = _locate_entry(prepared, _write_entry(zip_file, prepared))
+            manifest.add(location.model_dump_json().encode())
+            central_directory_size += entry_central_directory_size
+            prepared = next(prepared_frames, None)
+
+        if self._write_manifest:
+            manifest.write(zip_file)
+
+        return prepared
+
+    @staticmethod
+    def _get_max_entry_size(prepared: _PreparedFrame) -> int:
+        """Get the size of the data of an entry, or an upper bound of it when it is
+        compressed while written."""
+
+        if prepared.precompressed:
+            return len(prepared.data)
+
+        size = prepared.entry.file_size
+        if prepared.entry.compress_type == zipfile.ZIP_STORED:
+            return size
+
+        return size + size // 50 + MAX_COMPRESSION_OVERHEAD
+
+    @staticmethod
+    def _get_data_descriptor_size(prepared: _PreparedFrame) -> int:
+        if prepared.precompressed:
+            return 0
+
+        # As zipfile decides whether the entry may need ZIP64 sizes
+        if prepared.entry.file_size * 1.05 > zipfile.ZIP64_LIMIT:
+            return ZIP64_DATA_DESCRIPTOR_SIZE
+
+        return DATA_DESCRIPTOR_SIZE
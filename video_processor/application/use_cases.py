@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Iterator, NoReturn
 
 from video_processor.application.commands import ProcessVideoCommand
@@ -16,26 +17,80 @@ from video_processor.domain.exceptions import (
 )
 from video_processor.domain.ports import (
     EventPublisher,
+    FrameCostTracker,
     FrameExtractor,
     FramePackager,
     FrameSelector,
     InputStorage,
     OutputStorage,
+    OutputUpload,
     TempFileManager,
     VideoMetadataReader,
+    VideoProbeValidator,
+    VideoSession,
+    VideoSessionOpener,
     VideoValidator,
 )
 from video_processor.domain.value_objects import (
     FileContent,
     FrameSelection,
     RawFrame,
+    StoredFileInfo,
     TempFile,
     VideoMetadata,
+    VideoProbe,
+    VideoValidationCost,
 )
 
 logger = logging.getLogger(__name__)
 
 
+class _UploadWaitTimer(OutputStorage):
+    """A decorator of the output storage measuring the time spent waiting for it,
+    so that the cost of packaging frames into an upload excludes the upload."""
+
+    def __init__(self, output_storage: OutputStorage):
+        self._output_storage = output_storage
+        self.waited_seconds = 0.0
+
+    def upload_file(self, file_content: FileContent, destination_path: str) -> None:
+        started_at = time.perf_counter()
+        try:
+            self._output_storage.upload_file(file_content, destination_path)
+        finally:
+            self.waited_seconds += time.perf_counter() - started_at
+
+    def open_upload(self, destination_path: str) -> OutputUpload:
+        return _TimedOutputUpload(
+            self._output_storage.open_upload(destination_path), self
+        )
+
+
+class _TimedOutputUpload(OutputUpload):
+    """An upload adding the time its writes and completion wait to a timer."""
+
+    def __init__(self, upload: OutputUpload, timer: _UploadWaitTimer):
+        self._upload = upload
+        self._timer = timer
+
+    def write(self, data: bytes | memoryview) -> int:
+        started_at = time.perf_counter()
+        try:
+            return self._upload.write(data)
+        finally:
+            self._timer.waited_seconds += time.perf_counter() - started_at
+
+    def complete(self) -> None:
+        started_at = time.perf_counter()
+        try:
+            self._upload.complete()
+        finally:
+            self._timer.waited_seconds += time.perf_counter() - started_at
+
+    def abort(self) -> None:
+        self._upload.abort()
+
+
 class ProcessVideoUseCase:
     """Use case for processing a video."""
 
@@ -50,6 +105,11 @@ class ProcessVideoUseCase:
         frame_packager: FramePackager,
         temp_file_manager: TempFileManager,
         video_validators: list[VideoValidator],
+        video_probe_validators: list[VideoProbeValidator] | None = None,
+        video_session_opener: VideoSessionOpener | None = None,
+        frame_cost_tracker: FrameCostTracker | None = None,
+        stream_output: bool = False,
+        output_suffix: str = ".zip",
     ):
         self._input_storage = input_storage
         self._output_storage = output_storage
@@ -60,6 +120,13 @@ class ProcessVideoUseCase:
         self._frame_packager = frame_packager
         self._temp_file_manager = temp_file_manager
         self._video_validators = video_validators
+        self._video_probe_validators = sorted(
+            video_probe_validators or [], key=lambda validator: validator.cost
+        )
+        self._video_session_opener = video_session_opener
+        self._frame_cost_tracker = frame_cost_tracker
+        self._stream_output = stream_output
+        self._output_suffix = output_suffix
 
     def execute(self, command: ProcessVideoCommand) -> Video:
         """Execute the use case to process a video.
@@ -72,24 +139,58 @@ class ProcessVideoUseCase:
         """
 
         temp_video_file: TempFile | None = None
+        video_session: VideoSession | None = None
+        zip_content: FileContent | None = None
         logger.info("Starting the use case to process video ID %s", command.video_id)
         try:
-            video = Video(video_id=command.video_id, upload_path=command.upload_path)
+            video = Video(
+                video_id=command.video_id,
+                upload_path=command.upload_path,
+                output_suffix=self._output_suffix,
+            )
             self._start_processing(video)
-            video_content = self._download_video(video)
-            temp_video_file = self._create_temp_file(video, video_content)
-            video_metadata = self._get_video_metadata(video, temp_video_file)
+            file_info = self._validate_video_before_download(video)
+            temp_video_file = self._create_temp_file(video, file_info)
+            self._download_video(video, temp_video_file, file_info)
+            video_session = self._open_video_session(temp_video_file)
+            video_metadata = self._get_video_metadata(
+                video, temp_video_file, video_session
+            )
             self._validate_video(video, video_metadata)
-            frame_selection = self._select_frames(video, video_metadata)
-            raw_frames = self._extract_frames(video, temp_video_file, frame_selection)
-            zip_content = self._package_frames(video, raw_frames)
-            self._upload_output_file(video=video, file_content=zip_content)
+            frame_selection = self._select_frames(video, video_metadata, video_session)
+            raw_frames = self._extract_frames(
+                video, temp_video_file, frame_selection, video_session, video_metadata
+            )
+            # Frames are extracted lazily while they are packaged
+            packaging_started_at = time.perf_counter()
+            if self._stream_output:
+                upload_wait_timer = _UploadWaitTimer(self._output_storage)
+                self._package_frames_to_output(video, raw_frames, upload_wait_timer)
+                upload_wait_seconds = upload_wait_timer.waited_seconds
+            else:
+                zip_content = self._package_frames(video, raw_frames)
+                upload_wait_seconds = 0.0
+
+            self._record_frame_cost(
+                frame_selection.count,
+                time.perf_counter() - packaging_started_at - upload_wait_seconds,
+            )
+            if zip_content is not None:
+                self._upload_output_file(video=video, file_content=zip_content)
+
             self._complete_processing(video)
             return video
         finally:
+            if video_session:
+                video_session.close()
+
             if temp_video_file:
                 self._delete_temp_file(temp_video_file)
 
+            # The packaged archive may be left on disk rather than in memory
+            if zip_content and zip_content.local_path:
+                self._delete_temp_file(TempFile(path=zip_content.local_path))
+
     def _publish_events(self, video: Video) -> None:
         """Publish domain events for the video.
 
@@ -128,36 +229,86 @@ class ProcessVideoUseCase:
         finally:
             self._publish_events(video)
 
-    def _download_video(self, video: Video) -> FileContent:
-        """Download the video content from storage.
+    def _validate_video_before_download(self, video: Video) -> StoredFileInfo | None:
+        """Validate the video in storage before downloading it.
+
+        Validators run from the cheapest to the most expensive, and the container
+        header is only read once a validator that needs it is reached, so most
+        invalid uploads are rejected with a single metadata request.
 
         Args:
-            video (Video): The video entity containing upload path.
+            video (Video): The video entity to validate.
 
         Returns:
-            FileContent: The downloaded video content.
+            StoredFileInfo | None: The storage metadata of the video, or None if no
+                pre-download validator is configured.
 
         Raises:
-            StorageError: If an error occurs during file download.
+            StorageError: If an error occurs while probing the video in storage.
+            VideoValidationError: If any validation fails.
         """
 
+        if not self._video_probe_validators:
+            return None
+
         try:
-            video_content: FileContent = self._input_storage.download_file(
-                video.upload_path
-            )
+            file_info = self._input_storage.get_file_info(video.upload_path)
+            probe = VideoProbe(file_info=file_info)
+            header_read = False
+            for validator in self._video_probe_validators:
+                needs_header = validator.cost >= VideoValidationCost.CONTAINER_HEADER
+                if needs_header and not header_read:
+                    probe = self._read_video_header(video, probe)
+                    header_read = True
+
+                validator.validate(probe)
+                logger.info(
+                    "Video ID %s passed pre-download validation with %s",
+                    video.video_id,
+                    validator.__class__.__name__,
+                )
 
-            logger.info("Video ID %s downloaded from storage", video.video_id)
-            return video_content
-        except StorageError as exc:
+            return file_info
+        except (StorageError, VideoValidationError) as exc:
             self._fail_processing(video, exc)
 
-    def _create_temp_file(self, video: Video, video_content: FileContent) -> TempFile:
-        """Create a temporary file for the video content.
+    def _read_video_header(self, video: Video, probe: VideoProbe) -> VideoProbe:
+        """Read the container header needed by the pre-download validators.
+
+        Args:
+            video (Video): The video entity being validated.
+            probe (VideoProbe): The probe built from the storage metadata.
+
+        Returns:
+            VideoProbe: The probe including the header of the video.
+
+        Raises:
+            StorageError: If an error occurs while reading the header.
+        """
+
+        header_size = max(
+            validator.header_size
+            for validator in self._video_probe_validators
+            if validator.cost >= VideoValidationCost.CONTAINER_HEADER
+        )
+
+        header = self._input_storage.read_range(
+            video.upload_path,
+            0,
+            min(header_size, probe.file_info.size_in_bytes),
+        )
+
+        return probe.model_copy(update={"header": header})
+
+    def _create_temp_file(
+        self, video: Video, file_info: StoredFileInfo | None = None
+    ) -> TempFile:
+        """Create an empty temporary file to download the video content into.
 
         Args:
             video (Video): The video entity for which to create the temp file.
-            video_content (FileContent): The content of the video to write to the
-                temp file.
+            file_info (StoredFileInfo | None): The storage metadata of the video,
+                used to size the temp file when known.
 
         Returns:
             TempFile: The created temporary file.
@@ -166,12 +317,13 @@ class ProcessVideoUseCase:
             TempFileManagerError: If an error occurs during temp file creation.
         """
 
-        suffix = video_content.path.split(".")[-1] if "." in video_content.path else ""
+        suffix = video.upload_path.split(".")[-1] if "." in video.upload_path else ""
         try:
             temp_file = self._temp_file_manager.create(
-                content=video_content.content, suffix=suffix
+                content=b"",
+                suffix=suffix,
+                size_hint=file_info.size_in_bytes if file_info else None,
             )
-
             logger.info(
                 "Temporary file created for video ID %s at path %s",
                 video.video_id,
@@ -182,12 +334,65 @@ class ProcessVideoUseCase:
         except TempFileManagerError as exc:
             self._fail_processing(video, exc)
 
-    def _get_video_metadata(self, video: Video, temp_file: TempFile) -> VideoMetadata:
+    def _download_video(
+        self,
+        video: Video,
+        temp_file: TempFile,
+        file_info: StoredFileInfo | None = None,
+    ) -> None:
+        """Stream the video content from storage into the temporary file.
+
+        Args:
+            video (Video): The video entity containing upload path.
+            temp_file (TempFile): The temporary file to download the video into.
+            file_info (StoredFileInfo | None): The storage metadata of the video,
+                if it was already read by the pre-download validation.
+
+        Raises:
+            StorageError: If an error occurs during file download.
+        """
+
+        try:
+            self._input_storage.download_to_file(
+                video.upload_path, temp_file, file_info
+            )
+            logger.info(
+                "Video ID %s downloaded from storage to path %s",
+                video.video_id,
+                temp_file.path,
+            )
+        except StorageError as exc:
+            self._fail_processing(video, exc)
+
+    def _open_video_session(self, temp_file: TempFile) -> VideoSession | None:
+        """Open the session shared by the steps reading the video, so the video is
+        only opened once.
+
+        Args:
+            temp_file (TempFile): The temporary file containing the video content.
+
+        Returns:
+            VideoSession | None: The opened session, or None if no session opener is
+                configured and every step opens the video on its own.
+        """
+
+        if self._video_session_opener is None:
+            return None
+
+        return self._video_session_opener.open(temp_file)
+
+    def _get_video_metadata(
+        self,
+        video: Video,
+        temp_file: TempFile,
+        video_session: VideoSession | None = None,
+    ) -> VideoMetadata:
         """Get metadata of the video.
 
         Args:
             video (Video): The video entity for which to get metadata.
             temp_file (TempFile): The temporary file containing the video content.
+            video_session (VideoSession | None): The session opened on the video.
 
         Returns:
             VideoMetadata: The metadata of the video.
@@ -197,7 +402,9 @@ class ProcessVideoUseCase:
         """
 
         try:
-            metadata = self._video_metadata_reader.read(temp_file)
+            metadata = self._video_metadata_reader.read(
+                temp_file, video_session=video_session
+            )
             logger.info("Metadata read for video ID %s: %s", video.video_id, metadata)
             return metadata
         except VideoMetadataReadingError as exc:
@@ -225,13 +432,19 @@ class ProcessVideoUseCase:
             except VideoValidationError as exc:
                 self._fail_processing(video, exc)
 
-    def _select_frames(self, video: Video, metadata: VideoMetadata) -> FrameSelection:
+    def _select_frames(
+        self,
+        video: Video,
+        metadata: VideoMetadata,
+        video_session: VideoSession | None = None,
+    ) -> FrameSelection:
         """Select frames from the video based on its metadata.
 
         Args:
             video (Video): The video entity for which to select frames.
             metadata (VideoMetadata): The metadata of the video to use for
                 frame selection.
+            video_session (VideoSession | None): The session opened on the video.
         Returns:
             FrameSelection: The selected frames for processing.
         Raises:
@@ -239,18 +452,25 @@ class ProcessVideoUseCase:
         """
 
         try:
-            frame_selection = self._frame_selector.select(metadata)
+            frame_selection = self._frame_selector.select(
+                metadata, video_session=video_session
+            )
             logger.info(
                 "Frames selected for video ID %s: %s",
                 video.video_id,
-                ", ".join([str(index) for index in frame_selection.indexes]),
+                frame_selection,
             )
             return frame_selection
         except FrameSelectionError as exc:
             self._fail_processing(video, exc)
 
     def _extract_frames(
-        self, video: Video, temp_file: TempFile, frame_selection: FrameSelection
+        self,
+        video: Video,
+        temp_file: TempFile,
+        frame_selection: FrameSelection,
+        video_session: VideoSession | None = None,
+        metadata: VideoMetadata | None = None,
     ) -> Iterator[RawFrame]:
         """Extract frames from the video based on the selected frames.
 
@@ -258,6 +478,8 @@ class ProcessVideoUseCase:
             video (Video): The video entity for which to extract frames.
             temp_file (TempFile): The temporary file containing the video content.
             frame_selection (FrameSelection): The selected frames to extract.
+            video_session (VideoSession | None): The session opened on the video.
+            metadata (VideoMetadata | None): The metadata of the video.
         Returns:
             Iterator[RawFrame]: An iterator over the extracted raw frames.
         Raises:
@@ -265,7 +487,12 @@ class ProcessVideoUseCase:
         """
 
         try:
-            raw_frames = self._frame_extractor.extract(temp_file, frame_selection)
+            raw_frames = self._frame_extractor.extract(
+                temp_file,
+                frame_selection,
+                video_session=video_session,
+                metadata=metadata,
+            )
             logger.info("Frames extracted for video ID %s", video.video_id)
             return raw_frames
         except FrameExtractionError as exc:
@@ -298,6 +525,54 @@ class ProcessVideoUseCase:
         except FramePackagingError as exc:
             self._fail_processing(video, exc)
 
+    def _package_frames_to_output(
+        self,
+        video: Video,
+        raw_frames: Iterator[RawFrame],
+        output_storage: OutputStorage,
+    ) -> None:
+        """Package the extracted frames into an archive uploaded to storage while it
+        is written.
+
+        The upload is aborted if packaging or uploading fails, so no partial file is
+        left at the output path.
+
+        Args:
+            video (Video): The video entity for which to package frames.
+            raw_frames (Iterator[RawFrame]): The extracted raw frames to package.
+            output_storage (OutputStorage): The output storage to upload into,
+                measuring the time spent waiting for it.
+
+        Raises:
+            FramePackagingError: If an error occurs during frame packaging.
+            StorageError: If an error occurs during file upload.
+        """
+
+        try:
+            self._frame_packager.package_to_output(
+                raw_frames, output_storage, video.output_path
+            )
+
+            logger.info(
+                "Frames of video ID %s packaged and uploaded to storage",
+                video.video_id,
+            )
+        except (FramePackagingError, StorageError) as exc:
+            self._fail_processing(video, exc)
+
+    def _record_frame_cost(self, frame_count: int, elapsed_seconds: float) -> None:
+        """Record the time taken to extract and package the frames, for the frame
+        selectors sizing their selection from it. The time spent waiting for the
+        output storage while packaging into an upload is not part of it.
+
+        Args:
+            frame_count (int): The number of frames extracted and packaged.
+            elapsed_seconds (float): The time taken to extract and package them.
+        """
+
+        if self._frame_cost_tracker is not None:
+            self._frame_cost_tracker.record(frame_count, elapsed_seconds)
+
     def _upload_output_file(self, video: Video, file_content: FileContent) -> None:
         """Upload the processed frames to storage.
 
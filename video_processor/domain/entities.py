@@ -50,10 +50,19 @@ class Video(BaseModel):
         frozen=True,
     )
 
+    output_suffix: str = Field(
+        ".zip",
+        description=(
+            "The suffix of the output path after the video ID: the extension of the "
+            "archive, or a slash when frames are stored as several files."
+        ),
+        frozen=True,
+    )
+
     @property
     def output_path(self) -> str:
         """Get the output path where processed frames will be stored."""
-        return f"s3://video2frames-extracted-frames/{self.video_id}.zip"
+        return f"s3://video2frames-extracted-frames/{self.video_id}{self.output_suffix}"
 
     @property
     def status(self) -> VideoProcessingStatus:
@@ -58,5 +58,9 @@ class FramePackagingError(VideoProcessorError):
     """Exception for errors that occur while packaging frames."""
 
 
+class FrameArchiveReadingError(VideoProcessorError):
+    """Exception for errors that occur while reading frames from an archive."""
+
+
 class TempFileManagerError(VideoProcessorError):
     """Exception for errors that occur while managing temporary files."""
@@ -8,8 +8,11 @@ from .value_objects import (
     FileContent,
     FrameSelection,
     RawFrame,
+    StoredFileInfo,
     TempFile,
     VideoMetadata,
+    VideoProbe,
+    VideoValidationCost,
 )
 
 DomainEventT = TypeVar("DomainEventT", bound=DomainEvent)
@@ -48,6 +51,120 @@ class InputStorage(ABC):
             StorageError: If an error occurs during file download.
         """
 
+    @abstractmethod
+    def download_to_file(
+        self,
+        source_path: str,
+        temp_file: TempFile,
+        file_info: StoredFileInfo | None = None,
+    ) -> None:
+        """Stream a file from the storage system into a temporary file.
+
+        Unlike `download_file`, the content is written to disk in bounded chunks, so
+        memory usage does not grow with the size of the file.
+
+        Args:
+            source_path (str): The source path in the storage system.
+            temp_file (TempFile): The temporary file the content is written to.
+            file_info (StoredFileInfo | None): The metadata of the file when the
+                caller already read it, so it is not read from the storage again.
+
+        Raises:
+            StorageError: If an error occurs during file download.
+        """
+
+    @abstractmethod
+    def get_file_info(self, source_path: str) -> StoredFileInfo:
+        """Get the metadata of a file without downloading its content.
+
+        Args:
+            source_path (str): The source path in the storage system.
+
+        Returns:
+            StoredFileInfo: The metadata of the file.
+
+        Raises:
+            StorageError: If an error occurs while reading the file metadata.
+        """
+
+    @abstractmethod
+    def read_range(self, source_path: str, start: int, length: int) -> bytes:
+        """Read a byte range of a file without downloading all of it.
+
+        Args:
+            source_path (str): The source path in the storage system.
+            start (int): The offset of the first byte to read.
+            length (int): The number of bytes to read. Fewer bytes are returned if
+                the file ends before the range does.
+
+        Returns:
+            bytes: The content of the range.
+
+        Raises:
+            StorageError: If an error occurs while reading the range.
+        """
+
+
+class VideoPrefetcher(ABC):
+    """The VideoPrefetcher port defines the interface for downloading videos in the
+    background ahead of the jobs that will process them."""
+
+    @abstractmethod
+    def prefetch(self, source_path: str) -> None:
+        """Start downloading a file in the background.
+
+        The prefetched file is handed over by the next download of the same path.
+
+        Args:
+            source_path (str): The source path in the storage system.
+        """
+
+    @abstractmethod
+    def discard(self, source_path: str) -> None:
+        """Cancel or drop a prefetched file that will not be processed.
+
+        Args:
+            source_path (str): The source path in the storage system.
+        """
+
+
+class OutputUpload(ABC):
+    """The OutputUpload port defines the interface for a file uploaded to the output
+    storage system while it is being written."""
+
+    @abstractmethod
+    def write(self, data: bytes | memoryview) -> int:
+        """Append data to the file.
+
+        The data may be buffered and sent in the background, so failures of earlier
+        writes can be raised by a later call.
+
+        Args:
+            data (bytes | memoryview): The data to append.
+
+        Returns:
+            int: The number of bytes written, always the length of the data.
+
+        Raises:
+            StorageError: If an error occurs while uploading the file.
+        """
+
+    @abstractmethod
+    def complete(self) -> None:
+        """Upload the rest of the file and make it visible at its destination.
+
+        Raises:
+            StorageError: If an error occurs while uploading the file.
+        """
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discard the file, leaving nothing at its destination.
+
+        Failures are logged rather than raised, so aborting never hides the error
+        that caused it.
+        """
+
 
 class OutputStorage(ABC):
     """The storage port to interacting with the output storage system"""
@@ -64,17 +181,68 @@ class OutputStorage(ABC):
             StorageError: If an error occurs during file upload.
         """
 
+    @abstractmethod
+    def open_upload(self, destination_path: str) -> OutputUpload:
+        """Start uploading a file that is written as it is produced.
+
+        Unlike `upload_file`, the content is never held in full, so memory usage
+        does not grow with the size of the file. The upload must be completed or
+        aborted.
+
+        Args:
+            destination_path (str): The destination path in the storage system.
+
+        Returns:
+            OutputUpload: The upload to write the file into.
+
+        Raises:
+            StorageError: If the upload cannot be started.
+        """
+
+
+class VideoSession(ABC):
+    """The VideoSession port defines the interface of a video opened once for a job
+    and shared by the steps that read it."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the resources held by the session.
+
+        Closing a session that is already closed does nothing.
+        """
+
+
+class VideoSessionOpener(ABC):
+    """The VideoSessionOpener port defines the interface for opening video
+    sessions."""
+
+    @abstractmethod
+    def open(self, temp_file: TempFile) -> VideoSession:
+        """Open a session on the given video file.
+
+        Args:
+            temp_file (TempFile): The temporary file containing the video.
+
+        Returns:
+            VideoSession: The session, to be closed once the video is processed.
+        """
+
 
 class VideoMetadataReader(ABC):
     """The VideoMetadataReader port defines the interface for reading metadata from
     video files."""
 
     @abstractmethod
-    def read(self, temp_file: TempFile) -> VideoMetadata:
+    def read(
+        self, temp_file: TempFile, video_session: VideoSession | None = None
+    ) -> VideoMetadata:
         """Read metadata from the given video file.
 
         Args:
             temp_file (TempFile): The temporary file containing the video.
+            video_session (VideoSession | None, optional): The session opened on the
+                video, reused instead of opening the file again when it comes from
+                the same family of adapters. Defaults to None.
 
 
         Returns:
@@ -102,16 +270,45 @@ class VideoValidator(ABC):
         """
 
 
+class VideoProbeValidator(ABC):
+    """The VideoProbeValidator port defines the interface for validating a video
+    before it is downloaded.
+
+    Validators declare the cost of the data they need so that the cheapest ones run
+    first and invalid uploads are rejected before any expensive read is made.
+    """
+
+    cost: VideoValidationCost = VideoValidationCost.OBJECT_INFO
+    header_size: int = 0  # Bytes of the file header needed by the validator.
+
+    @abstractmethod
+    def validate(self, probe: VideoProbe) -> None:
+        """Validate the given video probe.
+
+        Args:
+            probe (VideoProbe): What is known about the video before downloading it.
+                The header is only populated for validators whose cost is
+                `VideoValidationCost.CONTAINER_HEADER`.
+
+        Raises:
+            VideoValidationError: If the video is invalid.
+        """
+
+
 class FrameSelector(ABC):
     """The FrameSelector port defines the interface for selecting frames to be
     extracted from a video."""
 
     @abstractmethod
-    def select(self, metadata: VideoMetadata) -> FrameSelection:
+    def select(
+        self, metadata: VideoMetadata, video_session: VideoSession | None = None
+    ) -> FrameSelection:
         """Select frames to be extracted from the video based on its metadata.
 
         Args:
             metadata (VideoMetadata): The metadata of the video file.
+            video_session (VideoSession | None, optional): The session opened on the
+                video, for selectors that analyse its content. Defaults to None.
 
         Returns:
             FrameSelection: The selection of frames to be extracted.
@@ -121,13 +318,36 @@ class FrameSelector(ABC):
         """
 
 
+class FrameCostTracker(ABC):
+    """The FrameCostTracker port defines the interface for measuring the time taken to
+    extract and package a frame."""
+
+    @property
+    @abstractmethod
+    def seconds_per_frame(self) -> float:
+        """Get the estimated time taken to extract and package one frame."""
+
+    @abstractmethod
+    def record(self, frame_count: int, elapsed_seconds: float) -> None:
+        """Record the time taken to extract and package frames.
+
+        Args:
+            frame_count (int): The number of frames extracted and packaged.
+            elapsed_seconds (float): The time taken to extract and package them.
+        """
+
+
 class FrameExtractor(ABC):
     """The FrameExtractor port defines the interface for extracting frames
     from a video."""
 
     @abstractmethod
     def extract(
-        self, temp_file: TempFile, frame_selection: FrameSelection
+        self,
+        temp_file: TempFile,
+        frame_selection: FrameSelection,
+        video_session: VideoSession | None = None,
+        metadata: VideoMetadata | None = None,
     ) -> Iterator[RawFrame]:
         """Extract frames from the given video file based on the specified
         frame selection.
@@ -135,6 +355,11 @@ class FrameExtractor(ABC):
         Args:
             temp_file (TempFile): The temporary file containing the video.
             frame_selection (FrameSelection): The selection of frames to be extracted.
+            video_session (VideoSession | None, optional): The session opened on the
+                video, reused instead of opening the file again when it comes from
+                the same family of adapters. Defaults to None.
+            metadata (VideoMetadata | None, optional): The metadata of the video,
+                used to plan how the frames are read. Defaults to None.
 
         Returns:
             Iterator[RawFrame]: An iterator of raw frames extracted from the video.
@@ -146,7 +371,13 @@ class FrameExtractor(ABC):
 
 class FramePackager(ABC):
     """The FramePackager port defines the interface for packaging extracted frames into
-    a ZIP file."""
+    a ZIP file.
+
+    Packagers may write other archive formats, whose output path ends with their
+    `output_suffix` instead of the extension of a ZIP file.
+    """
+
+    output_suffix: str = ".zip"  # Suffix of the output path after the video ID.
 
     @abstractmethod
     def package(self, frames: Iterator[RawFrame]) -> FileContent:
@@ -155,6 +386,10 @@ class FramePackager(ABC):
         Args:
             frames (Iterator[RawFrame]): An iterator of raw frames to be packaged.
 
+        The ZIP file may be left in a temporary file of the TempFileManager,
+        referenced by the `local_path` of the result, which the caller deletes once
+        it is uploaded.
+
         Returns:
             FileContent: The content and path of the resulting ZIP file.
 
@@ -162,17 +397,70 @@ class FramePackager(ABC):
             FramePackagingError: If an error occurs during frame packaging.
         """
 
+    @abstractmethod
+    def package_to_upload(
+        self, frames: Iterator[RawFrame], upload: OutputUpload
+    ) -> None:
+        """Package the given frames into a ZIP file written straight into an upload,
+        as the frames are produced.
+
+        The upload is neither completed nor aborted by the packager.
+
+        Args:
+            frames (Iterator[RawFrame]): An iterator of raw frames to be packaged.
+            upload (OutputUpload): The upload the ZIP file is written into.
+
+        Raises:
+            FramePackagingError: If an error occurs during frame packaging.
+            StorageError: If an error occurs while writing into the upload.
+        """
+
+    def package_to_output(
+        self,
+        frames: Iterator[RawFrame],
+        output_storage: OutputStorage,
+        destination_path: str,
+    ) -> None:
+        """Package the given frames into the output storage, as the frames are
+        produced.
+
+        The archive is written into an upload of the destination path, which is
+        aborted if packaging or uploading fails, so no partial file is left there.
+        Packagers writing several files override it to open one upload per file.
+
+        Args:
+            frames (Iterator[RawFrame]): An iterator of raw frames to be packaged.
+            output_storage (OutputStorage): The storage the archive is written into.
+            destination_path (str): The output path of the archive.
+
+        Raises:
+            FramePackagingError: If an error occurs during frame packaging.
+            StorageError: If an error occurs during file upload.
+        """
+
+        upload = output_storage.open_upload(destination_path)
+        try:
+            self.package_to_upload(frames, upload)
+            upload.complete()
+        except BaseException:
+            upload.abort()
+            raise
+
 
 class TempFileManager(ABC):
     """The TempFileManager port defines the interface for managing temporary files."""
 
     @abstractmethod
-    def create(self, content: bytes, suffix: str = "") -> TempFile:
+    def create(
+        self, content: bytes, suffix: str = "", size_hint: int | None = None
+    ) -> TempFile:
         """Create a temporary file with the given content.
 
         Args:
             content (bytes): The content to be written to the temporary file.
             suffix (str, optional): The suffix for the temporary file. Defaults to "".
+            size_hint (int | None, optional): The size the file is expected to grow
+                to, used to decide where to place it. Defaults to None.
 
         Returns:
             TempFile: The created temporary file.
@@ -1,8 +1,14 @@
 """Value objects for the Video Processor Domain"""
 
+import io
+import os
+from array import array
+from bisect import bisect_right
 from enum import Enum, unique
+from typing import Any, BinaryIO, Iterable, Iterator, Sequence, cast
 
-from pydantic import BaseModel, ConfigDict
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 @unique
@@ -15,44 +21,312 @@ class VideoProcessingStatus(str, Enum):
     FAILED = "FAILED"
 
 
+@unique
+class VideoValidationCost(int, Enum):
+    """Enumeration of the data a pre-download validator needs, ordered from the
+    cheapest to the most expensive to fetch."""
+
+    OBJECT_INFO = 1  # Storage metadata only (e.g. an S3 HEAD request).
+    CONTAINER_HEADER = 2  # The first bytes of the file (a small ranged read).
+
+
+FILE_CONTENT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
 class FileContent(BaseModel):
-    """Value object representing file content and its path."""
+    """Value object representing file content and its path.
+
+    The content is either held in memory in `content`, left in the local file at
+    `local_path`, or read from the open binary file `fileobj`, so large files can be
+    passed between ports without loading them into memory. `size_in_bytes`,
+    `iter_chunks` and `read` give access to the content whatever its source. A file
+    object is read from its current position and consumed by reading it.
+    """
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
+    path: str
+    content: bytes | None = None
+    local_path: str | None = None
+    fileobj: io.IOBase | None = None
+
+    @model_validator(mode="after")
+    def _validate_single_source(self) -> "FileContent":
+        sources = (self.content, self.local_path, self.fileobj)
+        if sum(source is not None for source in sources) != 1:
+            raise ValueError(
+                "Exactly one of content, local_path and fileobj must be given"
+            )
+
+        return self
+
+    @property
+    def size_in_bytes(self) -> int:
+        """The size of the content, or what is left to read of the file object."""
+
+        if self.content is not None:
+            return len(self.content)
+
+        if self.local_path is not None:
+            return os.path.getsize(self.local_path)
+
+        fileobj = cast(BinaryIO, self.fileobj)
+        position = fileobj.tell()
+        end = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(position)
+        return end - position
+
+    def iter_chunks(self, chunk_size: int = FILE_CONTENT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Iterate over the content in chunks of at most `chunk_size` bytes, reading
+        files lazily."""
+
+        if self.content is not None:
+            for start in range(0, len(self.content), chunk_size):
+                yield self.content[start : start + chunk_size]
+
+            return
+
+        if self.local_path is not None:
+            with open(self.local_path, "rb") as f:
+                yield from iter(lambda: f.read(chunk_size), b"")
+
+            return
+
+        fileobj = cast(BinaryIO, self.fileobj)
+        yield from iter(lambda: fileobj.read(chunk_size), b"")
+
+    def read(self) -> bytes:
+        """Get the whole content in memory."""
+
+        if self.content is not None:
+            return self.content
+
+        return b"".join(self.iter_chunks())
+
+
+class StoredFileInfo(BaseModel):
+    """Value object representing the metadata of a file in a storage system."""
 
     model_config = ConfigDict(frozen=True)
 
     path: str
-    content: bytes
+    size_in_bytes: int
+    content_type: str | None = None
+    etag: str | None = None
 
 
-class VideoMetadata(BaseModel):
-    """Value object representing metadata of a video."""
+class VideoProbe(BaseModel):
+    """Value object representing what is known about a video before it is
+    downloaded."""
 
     model_config = ConfigDict(frozen=True)
 
+    file_info: StoredFileInfo
+    header: bytes = b""
+
+
+class VideoMetadata(BaseModel):
+    """Value object representing metadata of a video.
+
+    The frame timestamps and keyframe indexes are only known when the container
+    index of the video could be read. They are stored as compact arrays, as a long
+    video has hundreds of thousands of frames.
+    """
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
     path: str
     duration_seconds: float
     frame_count: int
     fps: float
     size_in_bytes: int
+    # Presentation timestamp in seconds of each frame, in presentation order
+    frame_timestamps: array | None = Field(default=None, repr=False)
+    # Indexes of the frames a decoder can start from, in ascending order
+    keyframe_indexes: array | None = Field(default=None, repr=False)
+
+
+class FrameIndexRuns(Sequence[int]):
+    """Frame indexes stored as runs of consecutive frames.
+
+    A run of any length takes the same memory, and the indexes are produced lazily
+    when iterating.
+    """
+
+    __slots__ = ("_starts", "_offsets", "_length")
+
+    def __init__(self, runs: Iterable[tuple[int, int]]):
+        """Create the indexes from runs of consecutive frames.
+
+        Args:
+            runs (Iterable[tuple[int, int]]): The first index and the length of each
+                run, in ascending order and without overlap.
+
+        Raises:
+            ValueError: If the runs are empty, unordered or overlapping.
+        """
+
+        self._starts = array("q")
+        # Number of indexes before each run
+        self._offsets = array("q")
+        self._length = 0
+        next_start = 0
+        for start, length in runs:
+            if length <= 0 or start < next_start:
+                raise ValueError(
+                    "Runs must be non-empty, ascending and not overlapping"
+                )
+
+            self._starts.append(start)
+            self._offsets.append(self._length)
+            self._length += length
+            next_start = start + length
+
+    @property
+    def runs(self) -> list[tuple[int, int]]:
+        """Get the first index and the length of each run."""
+
+        lengths = [*self._offsets[1:], self._length]
+        return [
+            (start, end - offset)
+            for start, offset, end in zip(self._starts, self._offsets, lengths)
+        ]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position: Any) -> Any:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._length))]
+
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("frame index position out of range")
+
+        run = bisect_right(self._offsets, position) - 1
+        return self._starts[run] + position - self._offsets[run]
+
+    def __iter__(self) -> Iterator[int]:
+        for start, length in self.runs:
+            yield from range(start, start + length)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrameIndexRuns):
+            return NotImplemented
+
+        return self.runs == other.runs
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.runs))
+
+    def __repr__(self) -> str:
+        return f"FrameIndexRuns({self.runs!r})"
+
+
+# Number of indexes above which a frame selection is summarised in its repr
+FRAME_SELECTION_REPR_MAX_INDEXES = 10
+ARRAY_INTEGER_TYPECODES = "bBhHiIlLqQ"
 
 
 class FrameSelection(BaseModel):
     """Value object representing the selection of frames to be extracted from a
-    video."""
+    video.
 
-    model_config = ConfigDict(frozen=True)
+    The indexes are in ascending order. Besides a list, they can be stored as a
+    range, an integer array or runs of consecutive frames, which stay small for very
+    long videos and are validated without a Python object per index. Large
+    selections are summarised in the repr so they can be logged.
+    """
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
 
-    indexes: list[int]
+    # Compact types are checked first, a list would accept them by copying them
+    indexes: range | array | FrameIndexRuns | list[int] = Field(
+        union_mode="left_to_right"
+    )
+
+    @field_validator("indexes")
+    @classmethod
+    def _validate_compact_indexes(
+        cls, indexes: range | array | FrameIndexRuns | list[int]
+    ) -> range | array | FrameIndexRuns | list[int]:
+        if isinstance(indexes, range) and (indexes.start < 0 or indexes.step <= 0):
+            raise ValueError("A range of frame indexes must be positive and ascending")
+
+        if isinstance(indexes, array) and indexes.typecode not in (
+            ARRAY_INTEGER_TYPECODES
+        ):
+            raise ValueError("An array of frame indexes must hold integers")
+
+        if isinstance(indexes, array) and indexes:
+            # Checked over the buffer of the array, as selections of long videos
+            # hold millions of indexes
+            values = np.asarray(memoryview(indexes))
+            if values[0] < 0 or not (values[1:] > values[:-1]).all():
+                raise ValueError(
+                    "An array of frame indexes must be positive and strictly "
+                    "ascending"
+                )
+
+        return indexes
+
+    @property
+    def count(self) -> int:
+        """Get the number of selected frames."""
+        return len(self.indexes)
+
+    def __repr_args__(self) -> Iterator[tuple[str | None, Any]]:
+        if self.count <= FRAME_SELECTION_REPR_MAX_INDEXES:
+            yield "indexes", list(self.indexes)
+            return
+
+        yield "count", self.count
+        yield "first", self.indexes[0]
+        yield "last", self.indexes[-1]
+        yield "encoding", type(self.indexes).__name__
 
 
 class RawFrame(BaseModel):
-    """Value object representing a raw frame extracted from a video."""
+    """Value object representing a raw frame extracted from a video.
+
+    The content can be a read-only memoryview over the buffer of the encoder, so the
+    encoded image is written to the package without being copied. Memoryviews cannot
+    be pickled, so frames sent to another process must hold bytes.
+    """
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
+    index: int
+    filename: str
+    content: bytes | memoryview
+    # Presentation timestamp of the frame in seconds, when known
+    timestamp: float | None = None
+
+
+class FrameArchiveEntry(BaseModel):
+    """Value object locating a frame inside a ZIP archive, so it can be read with a
+    ranged read instead of downloading the archive."""
 
     model_config = ConfigDict(frozen=True)
 
     index: int
     filename: str
-    content: bytes
+    timestamp: float | None = None
+    header_offset: int  # Offset of the local header of the entry in the archive.
+    offset: int  # Offset of the stored data of the entry in the archive.
+    size: int  # Size of the stored data, compressed or not.
+    crc: int  # CRC-32 of the uncompressed frame.
+    compression: int  # ZIP compression method of the stored data.
+
+
+class FrameArchiveManifest(BaseModel):
+    """Value object representing the manifest written into a ZIP archive, with an
+    entry per frame in archive order."""
+
+    model_config = ConfigDict(frozen=True)
+
+    frames: list[FrameArchiveEntry]
 
 
 class TempFile(BaseModel):
@@ -3,27 +3,60 @@
 import logging
 import signal
 
-from boto3 import Session
-
-from video_processor.adapters.inbound import VideoUploadedListener
+from video_processor.adapters.inbound import (
+    DirectoryQueueListener,
+    VideoUploadedListener,
+)
 from video_processor.adapters.outbound import (
+    CachingInputStorage,
+    JsonlEventPublisher,
+    KeyframeAlignedFrameSelector,
+    LocalInputStorage,
+    LocalOutputStorage,
+    MovingAverageFrameCostTracker,
+    MP4VideoMetadataReader,
     NamedTempFileManager,
     OpenCVFrameExtractor,
     OpenCVVideoMetadataReader,
+    OpenCVVideoSessionOpener,
+    ParallelFrameExtractor,
+    PrefetchingInputStorage,
     S3InputStorage,
     S3OutputStorage,
+    SceneChangeFrameSelector,
     SnsEventPublisher,
+    SplitZIPFramePackager,
+    TarFramePackager,
     UniformFrameSelector,
+    VideoContainerValidator,
+    VideoContentTypeValidator,
+    VideoObjectSizeValidator,
     VideoSizeValidator,
     ZIPFramePackager,
 )
 from video_processor.application.use_cases import ProcessVideoUseCase
+from video_processor.infrastructure.boto_client_factory import BotoClientFactory
 from video_processor.infrastructure.config import (
     AWSSettings,
+    BotoClientSettings,
+    DirectoryQueueListenerSettings,
+    FrameCostTrackerSettings,
+    FrameEncodingSettings,
+    FrameExtractorSettings,
+    FramePackagerSettings,
+    JsonlEventPublisherSettings,
+    KeyframeAlignedFrameSelectorSettings,
+    LocalInputStorageSettings,
+    LocalOutputStorageSettings,
+    ParallelFrameExtractorSettings,
+    RuntimeSettings,
     S3InputStorageSettings,
     S3OutputStorageSettings,
+    SceneChangeFrameSelectorSettings,
     SnsEventPublisherSettings,
+    TempFileManagerSettings,
     UniformFrameSelectorSettings,
+    VideoCacheSettings,
     VideoUploadedListenerSettings,
     VideoValidatorsSettings,
 )
@@ -47,42 +80,105 @@ class GracefulShutdown:
 def main():
     """Run the video uploaded event listener"""
 
-    aws_settings = AWSSettings()
+    runtime_settings = RuntimeSettings()
     video_uploaded_listener_settings = VideoUploadedListenerSettings()
-    input_storage_settings = S3InputStorageSettings()
-    output_storage_settings = S3OutputStorageSettings()
-    event_publisher_settings = SnsEventPublisherSettings()
+    video_cache_settings = VideoCacheSettings()
     frame_selector_settings = UniformFrameSelectorSettings()
+    scene_change_frame_selector_settings = SceneChangeFrameSelectorSettings()
+    keyframe_aligned_frame_selector_settings = KeyframeAlignedFrameSelectorSettings()
     video_validators_settings = VideoValidatorsSettings()
     shutdown_handler = GracefulShutdown()
-    boto_session = Session(
-        aws_access_key_id=aws_settings.ACCESS_KEY_ID,
-        aws_secret_access_key=aws_settings.SECRET_ACCESS_KEY,
-        region_name=aws_settings.REGION_NAME,
-        aws_account_id=aws_settings.ACCOUNT_ID,
-    )
-
-    event_publisher = SnsEventPublisher(
-        boto_session=boto_session, settings=event_publisher_settings
-    )
+    temp_file_manager = NamedTempFileManager(settings=TempFileManagerSettings())
+    local_profile = runtime_settings.PROFILE == "local"
+
+    if local_profile:
+        event_publisher = JsonlEventPublisher(settings=JsonlEventPublisherSettings())
+        input_storage = LocalInputStorage(settings=LocalInputStorageSettings())
+        output_storage = LocalOutputStorage(settings=LocalOutputStorageSettings())
+    else:
+        client_factory = BotoClientFactory(
+            aws_settings=AWSSettings(), settings=BotoClientSettings()
+        )
+
+        event_publisher = SnsEventPublisher(
+            client_factory=client_factory, settings=SnsEventPublisherSettings()
+        )
+
+        input_storage = S3InputStorage(
+            client_factory=client_factory, settings=S3InputStorageSettings()
+        )
+
+        output_storage = S3OutputStorage(
+            client_factory=client_factory, settings=S3OutputStorageSettings()
+        )
+
+    if video_cache_settings.ENABLED:
+        input_storage = CachingInputStorage(
+            input_storage=input_storage, settings=video_cache_settings
+        )
 
-    input_storage = S3InputStorage(
-        boto_session=boto_session, settings=input_storage_settings
+    video_validators = [VideoSizeValidator(settings=video_validators_settings)]
+    video_probe_validators = [
+        VideoObjectSizeValidator(settings=video_validators_settings),
+        VideoContentTypeValidator(settings=video_validators_settings),
+        VideoContainerValidator(settings=video_validators_settings),
+    ]
+
+    # The directory queue does not receive messages ahead, so it never prefetches
+    prefetcher = None
+    if not local_profile and video_uploaded_listener_settings.PREFETCH_DEPTH > 0:
+        input_storage = prefetcher = PrefetchingInputStorage(
+            input_storage=input_storage,
+            temp_file_manager=temp_file_manager,
+            video_probe_validators=video_probe_validators,
+        )
+
+    video_metadata_reader = MP4VideoMetadataReader(
+        temp_file_manager=temp_file_manager,
+        fallback_reader=OpenCVVideoMetadataReader(temp_file_manager=temp_file_manager),
     )
 
-    output_storage = S3OutputStorage(
-        boto_session=boto_session, settings=output_storage_settings
+    frame_cost_tracker = MovingAverageFrameCostTracker(
+        settings=FrameCostTrackerSettings()
     )
 
-    temp_file_manager = NamedTempFileManager()
-    video_metadata_reader = OpenCVVideoMetadataReader(
-        temp_file_manager=temp_file_manager
+    if scene_change_frame_selector_settings.ENABLED:
+        frame_selector = SceneChangeFrameSelector(
+            settings=scene_change_frame_selector_settings
+        )
+    else:
+        frame_selector = UniformFrameSelector(
+            settings=frame_selector_settings, frame_cost_tracker=frame_cost_tracker
+        )
+
+    if keyframe_aligned_frame_selector_settings.ENABLED:
+        frame_selector = KeyframeAlignedFrameSelector(
+            frame_selector=frame_selector,
+            settings=keyframe_aligned_frame_selector_settings,
+        )
+    frame_extractor = OpenCVFrameExtractor(
+        settings=FrameExtractorSettings(), encoding_settings=FrameEncodingSettings()
     )
+    parallel_frame_extractor_settings = ParallelFrameExtractorSettings()
+    parallel_frame_extractor = None
+    if parallel_frame_extractor_settings.ENABLED:
+        frame_extractor = parallel_frame_extractor = ParallelFrameExtractor(
+            frame_extractor=frame_extractor,
+            settings=parallel_frame_extractor_settings,
+        )
+
+    frame_packager_settings = FramePackagerSettings()
+    if frame_packager_settings.FORMAT == "tar":
+        frame_packager = TarFramePackager(temp_file_manager=temp_file_manager)
+    elif frame_packager_settings.FORMAT == "split-zip":
+        frame_packager = SplitZIPFramePackager(
+            temp_file_manager=temp_file_manager, settings=frame_packager_settings
+        )
+    else:
+        frame_packager = ZIPFramePackager(
+            temp_file_manager=temp_file_manager, settings=frame_packager_settings
+        )
 
-    frame_selector = UniformFrameSelector(settings=frame_selector_settings)
-    frame_extractor = OpenCVFrameExtractor()
-    frame_packager = ZIPFramePackager(temp_file_manager=temp_file_manager)
-    video_validators = [VideoSizeValidator(settings=video_validators_settings)]
     process_video_use_case = ProcessVideoUseCase(
         input_storage=input_storage,
         output_storage=output_storage,
@@ -93,15 +189,35 @@ def main():
         frame_packager=frame_packager,
         temp_file_manager=temp_file_manager,
         video_validators=video_validators,
+        video_probe_validators=video_probe_validators,
+        video_session_opener=OpenCVVideoSessionOpener(),
+        frame_cost_tracker=frame_cost_tracker,
+        stream_output=frame_packager_settings.STREAM_TO_OUTPUT
+        or frame_packager_settings.FORMAT == "split-zip",
+        output_suffix=frame_packager.output_suffix,
     )
 
-    listener = VideoUploadedListener(
-        boto_session=boto_session,
-        use_case=process_video_use_case,
-        settings=video_uploaded_listener_settings,
-    )
-
-    listener.listen(shutdown_event=shutdown_handler)
+    if local_profile:
+        listener = DirectoryQueueListener(
+            use_case=process_video_use_case,
+            settings=DirectoryQueueListenerSettings(),
+        )
+    else:
+        listener = VideoUploadedListener(
+            client_factory=client_factory,
+            use_case=process_video_use_case,
+            settings=video_uploaded_listener_settings,
+            prefetcher=prefetcher,
+        )
+
+    try:
+        listener.listen(shutdown_event=shutdown_handler)
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+
+        if parallel_frame_extractor is not None:
+            parallel_frame_extractor.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""Shared botocore clients module"""
+
+import logging
+import os
+import threading
+import weakref
+from typing import Any
+
+from boto3 import Session
+from botocore.config import Config
+
+from video_processor.infrastructure.config import AWSSettings, BotoClientSettings
+
+logger = logging.getLogger(__name__)
+
+_factories: "weakref.WeakSet[BotoClientFactory]" = weakref.WeakSet()
+
+
+def _reset_factories_after_fork() -> None:
+    for factory in list(_factories):
+        factory._reset()  # pylint: disable=protected-access
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_factories_after_fork)
+
+
+class BotoClientFactory:
+    """Factory of the boto3 clients and resources shared by the AWS adapters.
+
+    One client is created per service and shared by every adapter, so they share its
+    connection pool. Clients are configured with the pool size, retry mode and TCP
+    keep-alive from the settings.
+
+    Clients are thread-safe but must not be shared across processes, so the
+    factory drops them in a forked child process and creates new ones on first use.
+    """
+
+    _session: Session | None
+    _clients: dict[str, Any]
+    _resources: dict[str, Any]
+
+    def __init__(self, aws_settings: AWSSettings, settings: BotoClientSettings):
+        self._aws_settings = aws_settings
+        self._config = Config(
+            max_pool_connections=settings.MAX_POOL_CONNECTIONS,
+            retries={
+                "mode": settings.RETRY_MODE,
+                "max_attempts": settings.MAX_ATTEMPTS,
+            },
+            tcp_keepalive=settings.TCP_KEEPALIVE,
+            connect_timeout=settings.CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.READ_TIMEOUT_SECONDS,
+        )
+
+        self._reset()
+        _factories.add(self)
+
+    def client(self, service_name: str) -> Any:
+        """Get the shared client of a service.
+
+        Args:
+            service_name (str): The name of the AWS service, e.g. "s3".
+
+        Returns:
+            The botocore client of the service.
+        """
+
+        with self._lock:
+            if service_name not in self._clients:
+                self._clients[service_name] = self._get_session().client(
+                    service_name, config=self._config
+                )
+
+                logger.debug("Created %s client", service_name)
+
+            return self._clients[service_name]
+
+    def resource(self, service_name: str) -> Any:
+        """Get the shared resource of a service.
+
+        Args:
+            service_name (str): The name of the AWS service, e.g. "sqs".
+
+        Returns:
+            The boto3 resource of the service.
+        """
+
+        with self._lock:
+            if service_name not in self._resources:
+                self._resources[service_name] = self._get_session().resource(
+                    service_name, config=self._config
+                )
+
+                logger.debug("Created %s resource", service_name)
+
+            return self._resources[service_name]
+
+    def _get_session(self) -> Session:
+        """Get the session of the current process, must be called with the lock
+        held as sessions are not thread-safe."""
+
+        if self._session is None:
+            self._session = Session(
+                aws_access_key_id=self._aws_settings.ACCESS_KEY_ID,
+                aws_secret_access_key=self._aws_settings.SECRET_ACCESS_KEY,
+                region_name=self._aws_settings.REGION_NAME,
+                aws_account_id=self._aws_settings.ACCOUNT_ID,
+            )
+
+        return self._session
+
+    def _reset(self) -> None:
+        # The lock may have been held by another thread when the process forked
+        self._lock = threading.Lock()
+        self._session = None
+        self._clients = {}
+        self._resources = {}
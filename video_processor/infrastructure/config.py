@@ -1,11 +1,49 @@
 """Application configuration module"""
 
+import os
+import tempfile
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 ENV_FILE_PATH = "config/video_processor.env"
 ENV_FILE_ENCODING = "utf-8"
 
 
+class BotoClientSettings(BaseSettings):
+    """Shared boto client settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="BOTO_CLIENT_",
+        extra="ignore",
+    )
+
+    # Connections shared by every thread using a client, it should cover the
+    # multipart download concurrency plus the prefetch and the other adapters.
+    MAX_POOL_CONNECTIONS: int = 32
+    RETRY_MODE: Literal["legacy", "standard", "adaptive"] = "adaptive"
+    MAX_ATTEMPTS: int = 5
+    TCP_KEEPALIVE: bool = True
+    CONNECT_TIMEOUT_SECONDS: float = 5.0
+    READ_TIMEOUT_SECONDS: float = 60.0
+
+
+class RuntimeSettings(BaseSettings):
+    """Runtime settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="RUNTIME_",
+        extra="ignore",
+    )
+
+    # "aws" runs on S3, SQS and SNS, "local" runs on the local filesystem only
+    PROFILE: Literal["aws", "local"] = "aws"
+
+
 class AWSSettings(BaseSettings):
     """AWS integration settings"""
 
@@ -36,6 +74,23 @@ class VideoUploadedListenerSettings(BaseSettings):
     WAIT_TIME_SECONDS: int = 20
     MAX_NUMBER_OF_MESSAGES_PER_BATCH: int = 1
     VISIBILITY_TIMEOUT_SECONDS: int = 300
+    # Number of messages received and downloaded ahead of the one being processed,
+    # 0 processes messages strictly one after the other.
+    PREFETCH_DEPTH: int = 0
+
+
+class DirectoryQueueListenerSettings(BaseSettings):
+    """Directory queue listener settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="DIRECTORY_QUEUE_LISTENER_",
+        extra="ignore",
+    )
+
+    DIRECTORY: str = "local/queue"
+    POLL_INTERVAL_SECONDS: float = 1.0
 
 
 class S3InputStorageSettings(BaseSettings):
@@ -49,6 +104,45 @@ class S3InputStorageSettings(BaseSettings):
     )
 
     BUCKET_NAME: str
+    DOWNLOAD_CHUNK_SIZE_IN_BYTES: int = 1024 * 1024  # 1 MB
+    MULTIPART_THRESHOLD_IN_BYTES: int = 32 * 1024 * 1024  # 32 MB
+    MULTIPART_PART_SIZE_IN_BYTES: int = 8 * 1024 * 1024  # 8 MB
+    MULTIPART_MAX_CONCURRENCY: int = 8
+    MULTIPART_PART_MAX_ATTEMPTS: int = 3
+    MULTIPART_PART_RETRY_BACKOFF_SECONDS: float = 0.5
+
+
+class LocalInputStorageSettings(BaseSettings):
+    """Local input storage settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="LOCAL_INPUT_STORAGE_",
+        extra="ignore",
+    )
+
+    DIRECTORY: str = "local/input"
+    # Hand videos out as hard links when they are on the same filesystem as the
+    # temporary files, instead of copying them.
+    LINK_FILES: bool = True
+
+
+class VideoCacheSettings(BaseSettings):
+    """Downloaded video cache settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="VIDEO_CACHE_",
+        extra="ignore",
+    )
+
+    ENABLED: bool = False
+    # Keep the cache on the same filesystem as the temporary files, so cached videos
+    # can be handed out as hard links instead of copies.
+    DIRECTORY: str = os.path.join(tempfile.gettempdir(), "video_processor_cache")
+    MAX_SIZE_IN_BYTES: int = 1024 * 1024 * 1024  # 1 GB
 
 
 class S3OutputStorageSettings(BaseSettings):
@@ -62,6 +156,24 @@ class S3OutputStorageSettings(BaseSettings):
     )
 
     BUCKET_NAME: str
+    # Streamed uploads are sent in parts of this size, at least 5 MB but for the last
+    # one, and at most 10,000 parts, which caps them at about 80 GB by default.
+    MULTIPART_PART_SIZE_IN_BYTES: int = 8 * 1024 * 1024  # 8 MB
+    # Parts uploaded at once, each held in memory until sent
+    MULTIPART_MAX_CONCURRENCY: int = 4
+
+
+class LocalOutputStorageSettings(BaseSettings):
+    """Local output storage settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="LOCAL_OUTPUT_STORAGE_",
+        extra="ignore",
+    )
+
+    DIRECTORY: str = "local/output"
 
 
 class SnsEventPublisherSettings(BaseSettings):
@@ -78,6 +190,40 @@ class SnsEventPublisherSettings(BaseSettings):
     GROUP_ID: str = "videos"
 
 
+class JsonlEventPublisherSettings(BaseSettings):
+    """JSON Lines event publisher settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="JSONL_EVENT_PUBLISHER_",
+        extra="ignore",
+    )
+
+    PATH: str = "local/events.jsonl"
+
+
+class TempFileManagerSettings(BaseSettings):
+    """Temporary file manager settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="TEMP_FILE_MANAGER_",
+        extra="ignore",
+    )
+
+    # "disk" keeps every file on disk, "memfd" and "tmpfs" place the files whose
+    # expected size is known and small enough in memory.
+    STORAGE: Literal["disk", "memfd", "tmpfs"] = "disk"
+    DIRECTORY: str | None = None  # Defaults to the system temporary directory
+    TMPFS_DIRECTORY: str = "/dev/shm"
+    MEMORY_MAX_FILE_SIZE_IN_BYTES: int = 256 * 1024 * 1024  # 256 MB
+    # Memory left available to decoding after placing a file in memory
+    MEMORY_HEADROOM_IN_BYTES: int = 512 * 1024 * 1024  # 512 MB
+    FADVISE: bool = True
+
+
 class UniformFrameSelectorSettings(BaseSettings):
     """Uniform frame selector settings"""
 
@@ -88,7 +234,193 @@ class UniformFrameSelectorSettings(BaseSettings):
         extra="ignore",
     )
 
+    # "percentage" selects PERCENTAGE_THRESHOLD of the frames, "interval" one frame
+    # every INTERVAL_SECONDS and "budget" as many frames as can be extracted and
+    # packaged within TARGET_PROCESSING_SECONDS
+    MODE: Literal["percentage", "interval", "budget"] = "percentage"
     PERCENTAGE_THRESHOLD: float = 0.01
+    INTERVAL_SECONDS: float = 1.0
+    TARGET_PROCESSING_SECONDS: float = 120.0
+    MIN_FRAMES: int = 1
+    MAX_FRAMES: int = 1000
+
+
+class FrameCostTrackerSettings(BaseSettings):
+    """Frame cost tracker settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="FRAME_COST_TRACKER_",
+        extra="ignore",
+    )
+
+    # Cost assumed until the first video is processed
+    INITIAL_SECONDS_PER_FRAME: float = 0.05
+    # Weight of the last measurement in the moving average, between 0 and 1
+    SMOOTHING: float = 0.2
+
+
+class KeyframeAlignedFrameSelectorSettings(BaseSettings):
+    """Keyframe aligned frame selector settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="KEYFRAME_ALIGNED_FRAME_SELECTOR_",
+        extra="ignore",
+    )
+
+    ENABLED: bool = False
+    # Largest distance a selected frame may be moved to land on a keyframe
+    MAX_DRIFT_IN_FRAMES: int = 15
+
+
+class SceneChangeFrameSelectorSettings(BaseSettings):
+    """Scene change frame selector settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="SCENE_CHANGE_FRAME_SELECTOR_",
+        extra="ignore",
+    )
+
+    ENABLED: bool = False
+    # Width the frames are downscaled to before being compared
+    ANALYSIS_WIDTH: int = 64
+    # Number of frames between two compared frames
+    ANALYSIS_STRIDE: int = 1
+    HISTOGRAM_BINS_PER_CHANNEL: int = 8
+    # Histogram distance between 0 and 1 above which two frames are a cut
+    THRESHOLD: float = 0.35
+    MIN_FRAMES: int = 5
+    MAX_FRAMES: int = 100
+
+
+class FrameExtractorSettings(BaseSettings):
+    """Frame extractor settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="FRAME_EXTRACTOR_",
+        extra="ignore",
+    )
+
+    # "seek" seeks to every frame, "scan" decodes forward through the gaps and
+    # "auto" picks the cheapest of both for each gap
+    READ_MODE: Literal["auto", "seek", "scan"] = "auto"
+    # Distance between keyframes assumed for videos without a keyframe index
+    ESTIMATED_GOP_SIZE: int = 60
+    # Cost of a seek besides decoding from the keyframe, in decoded frames
+    SEEK_COST_IN_FRAMES: int = 5
+    # Threads encoding frames while the next ones are decoded, 0 encodes inline
+    ENCODER_THREADS: int = 2
+    # Decoded frames waiting to be encoded, a 4K frame takes about 25 MB
+    MAX_PENDING_FRAMES: int = 4
+
+
+class FrameEncodingSettings(BaseSettings):
+    """Frame encoding settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="FRAME_ENCODING_",
+        extra="ignore",
+    )
+
+    FORMAT: Literal["jpeg", "webp", "png"] = "jpeg"
+    # JPEG and WebP quality from 1 to 100, the encoder default when unset
+    QUALITY: int | None = None
+    # PNG compression level from 0 to 9, the encoder default when unset
+    PNG_COMPRESSION: int | None = None
+    JPEG_CHROMA_SUBSAMPLING: Literal["444", "422", "420", "411", "440"] | None = None
+    JPEG_OPTIMIZE: bool = False
+    # Frames larger than these are downscaled, keeping their aspect ratio
+    MAX_WIDTH: int | None = None
+    MAX_HEIGHT: int | None = None
+    GRAYSCALE: bool = False
+
+
+class ParallelFrameExtractorSettings(BaseSettings):
+    """Parallel frame extractor settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="PARALLEL_FRAME_EXTRACTOR_",
+        extra="ignore",
+    )
+
+    ENABLED: bool = False
+    # Number of worker processes, defaults to the number of usable CPUs
+    WORKERS: int | None = None
+    # Selections are extracted in segments of this many frames, and selections of
+    # less than two segments are extracted in this process
+    SEGMENT_FRAMES: int = 50
+    # Segments submitted to the workers and not yet yielded, bounding the frames
+    # held in memory, defaults to twice the number of workers
+    MAX_PENDING_SEGMENTS: int | None = None
+    # Forking is unsafe once the listener threads are running
+    START_METHOD: Literal["forkserver", "spawn"] = "forkserver"
+
+
+class FramePackagerSettings(BaseSettings):
+    """Frame packager settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="FRAME_PACKAGER_",
+        extra="ignore",
+    )
+
+    # Archive format: a ZIP file, an uncompressed tar stream that can be unpacked as
+    # it is read, or ZIP files of at most MAX_PART_SIZE_IN_BYTES each written under
+    # the output path as part-0001.zip, part-0002.zip, ...
+    FORMAT: Literal["zip", "tar", "split-zip"] = "zip"
+    # Write the archive straight into the output storage while frames are extracted,
+    # instead of building it in a temporary file and uploading it afterwards.
+    # Split archives are always written into the output storage.
+    STREAM_TO_OUTPUT: bool = True
+    # Size above which split archives start a new part, unless a frame is larger
+    MAX_PART_SIZE_IN_BYTES: int = 1024 * 1024 * 1024  # 1 GB
+    # Compression of the archive entries by file extension, "*" applying to the
+    # others: "stored", or "deflate", "bzip2", "lzma" or "zstd" with an optional
+    # ":<level>". Zstandard needs Python 3.14 and falls back to lzma otherwise.
+    # Encoded images are already compressed, so they are stored as is.
+    COMPRESSION_POLICY: dict[str, str] = {
+        "jpg": "stored",
+        "webp": "stored",
+        "png": "stored",
+        "*": "deflate:1",
+    }
+    # Threads compressing entries while the previous ones are written, 0 to
+    # compress them inline
+    COMPRESSION_THREADS: int = 2
+    # Write a manifest.json entry locating each frame in ZIP archives, for
+    # FrameArchiveReader to read single frames with ranged reads
+    WRITE_MANIFEST: bool = True
+
+
+class FrameArchiveReaderSettings(BaseSettings):
+    """Frame archive reader settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE_PATH,
+        env_file_encoding=ENV_FILE_ENCODING,
+        env_prefix="FRAME_ARCHIVE_READER_",
+        extra="ignore",
+    )
+
+    # Bytes read from the end of an archive to load its index. The central
+    # directory and manifest take about 250 bytes per frame, so 256 KB reads the
+    # index of about a thousand frames in one request.
+    INDEX_READ_SIZE_IN_BYTES: int = 256 * 1024  # 256 KB
+    # Archive indexes kept in memory, the least recently used being evicted first
+    INDEX_CACHE_SIZE: int = 128
 
 
 class VideoValidatorsSettings(BaseSettings):
@@ -102,3 +434,9 @@ class VideoValidatorsSettings(BaseSettings):
     )
 
     MAX_SIZE_IN_BYTES: int = 250 * 1024 * 1024  # 250 MB limit
+    ALLOWED_CONTENT_TYPES: list[str] = [
+        "video/*",
+        "application/octet-stream",
+        "binary/octet-stream",
+    ]
+    HEADER_PROBE_SIZE_IN_BYTES: int = 512